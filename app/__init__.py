@@ -14,9 +14,11 @@ from .blueprints import register_blueprints
 from .cli import register_cli
 from .config import load_config
 from .extensions import db, migrate
-from .logging_setup import configure_logging, get_logger
+from .logging_setup import configure_logging, get_logger, set_log_sampling
+from .metrics import init_metrics
 from .middleware.request_id import request_id_middleware
 from .models import User
+from .services import rollups  # noqa: F401  (registers the rollup after_flush listener)
 from .typing import LogExpFlask, LogExpRequest
 
 logger = get_logger("app")
@@ -58,7 +60,11 @@ def create_app(overrides: Optional[Dict[str, Any]] = None) -> LogExpFlask:
 
     configure_sqlite_timezone_support(app)
 
-    configure_logging()
+    configure_logging(
+        queue_size=app.config_obj["LOG_QUEUE_SIZE"],
+        batch_size=app.config_obj["LOG_BATCH_SIZE"],
+    )
+    set_log_sampling(app.config_obj["LOG_SAMPLE_EVERY"])
     logger.debug("structured_logging_configured")
 
     # Ensure app.logger is the logger caplog is watching
@@ -68,6 +74,9 @@ def create_app(overrides: Optional[Dict[str, Any]] = None) -> LogExpFlask:
     request_id_middleware(app)
     logger.debug("request_id_middleware_enabled")
 
+    init_metrics(app)
+    logger.debug("metrics_enabled")
+
     db.init_app(app)
     migrate.init_app(app, db, directory="beamfoundry/migrations")
     login_manager.init_app(app)
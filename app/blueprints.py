@@ -26,6 +26,7 @@ def register_blueprints(app: Flask) -> None:
     from .bp.api import bp_api
     from .bp.diagnostics import bp_diagnostics
     from .bp.docs import bp_docs
+    from .bp.metrics import bp_metrics
     from .bp.settings import bp_settings
     from .bp.ui import bp_ui
 
@@ -39,6 +40,7 @@ def register_blueprints(app: Flask) -> None:
         (bp_analytics, "analytics"),
         (bp_docs, "docs"),
         (bp_about, "about"),
+        (bp_metrics, "metrics"),
     ]:
         logger.debug("blueprint_register", extra={"blueprint": name})
         app.register_blueprint(bp)
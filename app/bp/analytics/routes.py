@@ -5,18 +5,38 @@ from __future__ import annotations
 import datetime
 from typing import Any
 
-from flask import Response, render_template, request
+from flask import Response, current_app, jsonify, render_template, request, stream_with_context
 from flask_login import login_required
 
 from ...extensions import db
 from ...logging_setup import get_logger
-from ...services.analytics import compute_window, run_analytics
-from ...services.analytics_export import export_readings_to_csv
+from ...services.analytics import fetch_window_rows, run_analytics
+from ...services.analytics_export import iter_readings_csv, parse_csv_fields
+from ...services.analytics_export_arrow import (
+    COLUMNAR_FORMATS,
+    arrow_available,
+    iter_readings_arrow,
+    iter_readings_parquet,
+)
 from ...services.analytics_readings import summarize_readings
+from ...services.readings_query import ReadingFilters, parse_time_bound
+from ...services.readings_stream import iter_reading_rows
+from ...services.rollups import summarize_range
+from ...services.timeseries import query_series
+from ...services.timezones import get_local_timezone
 from . import bp_analytics
 
 logger = get_logger("beamfoundry.analytics")
 
+# Columns shown in the analytics page's readings table.
+WINDOW_TABLE_COLUMNS = (
+    "timestamp",
+    "counts_per_second",
+    "counts_per_minute",
+    "microsieverts_per_hour",
+    "mode",
+)
+
 
 @bp_analytics.route("/", methods=["GET"])
 @login_required
@@ -36,11 +56,16 @@ def analytics_index() -> Any:
     metric = request.args.get("metric", "cpm")
     quick_range = request.args.get("range")
 
+    # Form values are naive wall-clock times in LOCAL_TIMEZONE, which is how
+    # parse_time_bound() reads them back; the server's own zone is irrelevant.
+    local_tz = get_local_timezone()
+    now = datetime.datetime.now(local_tz).replace(tzinfo=None)
+
     # Default: last 24h
     if not start_date and not end_date and not quick_range:
-        default_start = datetime.datetime.now() - datetime.timedelta(hours=24)
+        default_start = now - datetime.timedelta(hours=24)
         start_date = default_start.isoformat(timespec="minutes")
-        end_date = datetime.datetime.now().isoformat(timespec="minutes")
+        end_date = now.isoformat(timespec="minutes")
 
         logger.debug(
             "analytics_index_default_range",
@@ -49,8 +74,6 @@ def analytics_index() -> Any:
 
     # Handle quick ranges
     if quick_range:
-        now = datetime.datetime.now()
-
         logger.debug(
             "analytics_index_quick_range",
             extra={"quick_range": quick_range, "now": now.isoformat()},
@@ -65,9 +88,34 @@ def analytics_index() -> Any:
 
         end_date = now.isoformat(timespec="minutes")
 
+    # Range summary and chart series for the selected start/end, served from
+    # the rollup tables where the range allows
+    series = None
+    try:
+        since = parse_time_bound(start_date, "start_date", local_tz)
+        until = parse_time_bound(end_date, "end_date", local_tz)
+        range_summary = summarize_range(since, until)
+        if since is not None and until is not None:
+            series = query_series(since, until)
+    except ValueError as e:
+        logger.debug("analytics_index_invalid_range", extra={"error": str(e)})
+        range_summary = None
+
+    series_key = {"cps": "cps", "usvh": "usv"}.get(metric, "cpm")
+    chart = None
+    if series is not None:
+        chart = {
+            "labels": [p["timestamp"].isoformat() for p in series.points],
+            "avg": [p[f"{series_key}_avg"] for p in series.points],
+            "min": [p[f"{series_key}_min"] for p in series.points],
+            "max": [p[f"{series_key}_max"] for p in series.points],
+            "step_seconds": series.step_seconds,
+            "source": series.source,
+        }
+
     # Run analytics subsystem
     rollup = run_analytics(db.session)
-    readings = compute_window()
+    readings = fetch_window_rows(columns=WINDOW_TABLE_COLUMNS)
     diagnostics = summarize_readings(readings)
 
     logger.debug(
@@ -76,12 +124,16 @@ def analytics_index() -> Any:
             "rollup_present": rollup is not None,
             "readings_count": len(readings),
             "diagnostics_count": diagnostics.get("count"),
+            "range_count": range_summary["count"] if range_summary else None,
+            "series_points": len(series.points) if series else None,
         },
     )
 
     return render_template(
         "analytics.html",
         rollup=rollup,
+        range_summary=range_summary,
+        chart=chart,
         diagnostics=diagnostics,
         readings=readings,
         start_date=start_date,
@@ -92,21 +144,77 @@ def analytics_index() -> Any:
 
 @bp_analytics.route("/export", methods=["GET"])
 def analytics_export() -> Any:
+    """
+    Stream readings as CSV, Arrow IPC or Parquet for an arbitrary date range.
+
+    Query parameters:
+        start, end: range bounds (ISO8601 or epoch seconds). The UI's
+            start_date/end_date names are accepted as aliases; naive values
+            are interpreted in LOCAL_TIMEZONE. Omit both to export everything.
+        fields: comma-separated column list (default: all reading columns)
+        device_id: restrict to a single device
+        format: "csv" (default), "arrow" (IPC stream) or "parquet"
+    """
     logger.debug(
         "analytics_export_requested",
         extra={"path": request.path, "method": request.method},
     )
 
-    readings = compute_window()
-    csv_data = export_readings_to_csv(readings)
+    fmt = request.args.get("format", "csv")
+    if fmt != "csv" and fmt not in COLUMNAR_FORMATS:
+        return jsonify({"error": f"Unsupported format: {fmt!r}"}), 400
+    if fmt in COLUMNAR_FORMATS and not arrow_available():
+        return jsonify({"error": f"Format {fmt!r} requires pyarrow"}), 501
+
+    local_tz = get_local_timezone()
+
+    try:
+        since = parse_time_bound(
+            request.args.get("start") or request.args.get("start_date"), "start", local_tz
+        )
+        until = parse_time_bound(
+            request.args.get("end") or request.args.get("end_date"), "end", local_tz
+        )
+        fields = parse_csv_fields(request.args.get("fields"))
+    except ValueError as e:
+        logger.debug("analytics_export_invalid_args", extra={"error": str(e)})
+        return jsonify({"error": str(e)}), 400
+
+    if since is not None and until is not None and since > until:
+        return jsonify({"error": "'start' must not be later than 'end'"}), 400
+
+    filters = ReadingFilters(
+        since=since,
+        until=until,
+        device_id=request.args.get("device_id") or None,
+    )
+
+    batch_size = int(current_app.config["API_EXPORT_BATCH_SIZE"])
+    rows = iter_reading_rows(filters, batch_size=batch_size)
 
     logger.debug(
-        "analytics_export_completed",
-        extra={"readings_count": len(readings), "csv_bytes": len(csv_data)},
+        "analytics_export_streaming",
+        extra={
+            "since": since.isoformat() if since else None,
+            "until": until.isoformat() if until else None,
+            "fields": list(fields),
+            "format": fmt,
+        },
     )
 
+    if fmt in COLUMNAR_FORMATS:
+        mimetype, extension = COLUMNAR_FORMATS[fmt]
+        encoder = iter_readings_arrow if fmt == "arrow" else iter_readings_parquet
+        body = encoder(rows, fields, int(current_app.config["EXPORT_ROW_GROUP_ROWS"]))
+    else:
+        mimetype, extension = "text/csv", "csv"
+        body = iter_readings_csv(rows, fields, chunk_rows=batch_size)
+
     return Response(
-        csv_data,
-        mimetype="text/csv",
-        headers={"Content-Disposition": "attachment; filename=analytics.csv"},
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f"attachment; filename=analytics.{extension}",
+            "X-Accel-Buffering": "no",
+        },
     )
@@ -0,0 +1,54 @@
+# filename: logexp/app/bp/api/conditional.py
+
+from __future__ import annotations
+
+from functools import wraps
+from typing import Any, Callable
+
+from flask import make_response, request
+
+from ...logging_setup import get_lazy_logger
+from ...services.readings_version import current_readings_version
+from ...services.timezones import get_local_timezone
+
+logger = get_lazy_logger("beamfoundry.bp.api")
+
+
+def conditional_on_readings(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Conditional GET for views whose output depends only on logexp_readings
+    and the request URL.
+
+    Answers 304 from If-None-Match (or, without it, If-Modified-Since)
+    before the view runs, so an unchanged poll costs no query, ORM object or
+    serialization. 200 responses get ETag, Last-Modified and
+    Cache-Control: no-cache (always revalidate).
+    """
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        version = current_readings_version()
+        # Timestamps are rendered in LOCAL_TIMEZONE, so it is part of the
+        # representation.
+        etag = version.etag(f"{request.full_path}|{get_local_timezone().key}")
+
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains_weak(etag)
+        else:
+            since = request.if_modified_since
+            not_modified = since is not None and version.changed_at <= since
+
+        if not_modified:
+            logger.debug("api_not_modified", extra=lambda: {"path": request.path})
+            response = make_response("", 304)
+        else:
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        response.last_modified = version.changed_at
+        response.cache_control.no_cache = True
+        return response
+
+    return wrapper
@@ -1,47 +1,140 @@
 # logexp/app/bp/api/route.py
 from __future__ import annotations
 
-from typing import Any
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
 
-from flask import current_app, jsonify, request
+from flask import Response, current_app, jsonify, request, stream_with_context, url_for
 from flask.typing import ResponseReturnValue
-from sqlalchemy import desc
+from sqlalchemy import desc, select
+from sqlalchemy.exc import DBAPIError
 
 from ...extensions import db
 from ...geiger import list_serial_ports, read_geiger, try_port
-from ...logging_setup import get_logger
+from ...logging_setup import get_lazy_logger
 from ...models import LogExpReading
-from ...schemas import ReadingCreate, ReadingResponse
+from ...schemas import ReadingCreate
+from ...services.analytics_cache import bump_generation
+from ...services.ingestion import ingest_readings_batch
+from ...services.readings_broker import StreamLimitReached, get_readings_broker, publish_reading
+from ...services.readings_json import READING_COLUMNS, readings_response
+from ...services.readings_query import (
+    fetch_readings_page,
+    parse_reading_filters,
+    parse_time_bound,
+)
+from ...services.readings_stream import iter_json_array, iter_ndjson, iter_reading_rows
+from ...services.timeseries import chart_series
 from . import bp_api
+from .conditional import conditional_on_readings
 
-logger = get_logger("beamfoundry.api")
+logger = get_lazy_logger("beamfoundry.api")
+
+
+def _request_fields() -> Dict[str, Any]:
+    # Evaluated only when the debug record is actually emitted.
+    return {"path": request.path, "method": request.method}
 
 
 @bp_api.get("/readings")
+@conditional_on_readings
 def get_readings() -> Any:
-    logger.debug(
-        "api_get_readings_requested",
-        extra={"path": request.path, "method": request.method},
-    )
+    """
+    Return one keyset-paginated page of readings in ascending time order.
+
+    Query parameters:
+        since, until: ISO8601 or epoch-second bounds (inclusive)
+        device_id: restrict to a single device
+        limit: page size, clamped to API_READINGS_MAX_LIMIT
+        cursor: opaque token from a previous page's X-Next-Cursor header
+
+    The body stays a plain JSON array; the next-page cursor is returned in
+    the X-Next-Cursor header and as an RFC 8288 Link header.
+    """
+    logger.debug("api_get_readings_requested", extra=_request_fields)
 
-    readings = db.session.query(LogExpReading).order_by(LogExpReading.timestamp.asc()).all()
+    config = current_app.config
 
-    responses = [ReadingResponse(**r.to_dict()).model_dump(exclude_none=False) for r in readings]
+    try:
+        filters = parse_reading_filters(
+            request.args,
+            default_limit=int(config["API_READINGS_DEFAULT_LIMIT"]),
+            max_limit=int(config["API_READINGS_MAX_LIMIT"]),
+        )
+    except ValueError as e:
+        logger.debug(
+            "api_get_readings_invalid_args",
+            extra={"error": str(e)},
+        )
+        return jsonify({"error": str(e)}), 400
+
+    page = fetch_readings_page(filters, columns=READING_COLUMNS)
 
     logger.debug(
         "api_get_readings_returning",
-        extra={"count": len(responses)},
+        extra={"count": len(page.rows), "has_more": page.next_cursor is not None},
     )
 
-    return jsonify(responses)
+    response = readings_response(page.rows)
+    if page.next_cursor is not None:
+        next_args = request.args.to_dict()
+        next_args["cursor"] = page.next_cursor
+        next_url = url_for("api.get_readings", _external=False, **next_args)
+        response.headers["X-Next-Cursor"] = page.next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+    return response
+
+
+@bp_api.get("/readings/export")
+def export_readings() -> Any:
+    """
+    Stream the full (optionally filtered) readings history.
+
+    Query parameters:
+        format: "ndjson" (default) or "json" for a single chunked JSON array
+        since, until, device_id: same semantics as GET /api/readings
+
+    Rows are pulled from a server-side cursor and written as they arrive, so
+    the first bytes leave before the query finishes and memory stays flat.
+    """
+    logger.debug("api_export_readings_requested", extra=_request_fields)
+
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in ("ndjson", "json"):
+        return jsonify({"error": f"Unsupported format: {fmt!r}"}), 400
+
+    config = current_app.config
+
+    try:
+        filters = parse_reading_filters(
+            request.args,
+            default_limit=int(config["API_READINGS_DEFAULT_LIMIT"]),
+            max_limit=int(config["API_READINGS_MAX_LIMIT"]),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    batch_size = int(config["API_EXPORT_BATCH_SIZE"])
+    rows = iter_reading_rows(filters, batch_size=batch_size)
+
+    if fmt == "json":
+        body = iter_json_array(rows, chunk_rows=batch_size)
+        mimetype = "application/json"
+    else:
+        body = iter_ndjson(rows, chunk_rows=batch_size)
+        mimetype = "application/x-ndjson"
+
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"X-Accel-Buffering": "no", "Cache-Control": "no-store"},
+    )
 
 
 @bp_api.post("/readings")
 def create_reading() -> Any:
-    logger.debug(
-        "api_create_reading_requested",
-        extra={"path": request.path, "method": request.method},
-    )
+    logger.debug("api_create_reading_requested", extra=_request_fields)
 
     payload = request.get_json(force=True, silent=True) or {}
 
@@ -64,65 +157,196 @@ def create_reading() -> Any:
 
     db.session.add(reading)
     db.session.commit()
+    bump_generation()
+    publish_reading(reading)
 
     logger.debug(
         "api_create_reading_committed",
         extra={"id": reading.id},
     )
 
-    response = ReadingResponse(**reading.to_dict())
-    return jsonify(response.model_dump(exclude_none=False)), 201
+    return readings_response(reading, many=False), 201
 
 
-@bp_api.get("/readings/latest")
-def get_latest_reading() -> ResponseReturnValue:
+@bp_api.post("/readings/batch")
+def create_readings_batch() -> Any:
+    """
+    Insert many readings in one transaction.
+
+    Body: a JSON array of reading objects, or {"readings": [...]}. Each
+    object takes the same fields as POST /api/readings plus an optional
+    "timestamp" (ISO8601 or epoch seconds; defaults to now).
+
+    Invalid rows are skipped and reported by index; the valid rows are still
+    written. Responds 201 when every row was inserted, 207 otherwise, and 503
+    (nothing written) when the database is unavailable.
+    """
+    logger.debug("api_create_readings_batch_requested", extra=_request_fields)
+
+    payload = request.get_json(force=True, silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("readings")
+    if not isinstance(payload, list):
+        return jsonify({"error": "expected a JSON array of readings"}), 400
+
+    max_rows = int(current_app.config["INGESTION_BATCH_MAX_ROWS"])
+    if len(payload) > max_rows:
+        return jsonify({"error": f"batch exceeds {max_rows} rows"}), 413
+
+    try:
+        result = ingest_readings_batch(payload)
+    except DBAPIError as exc:
+        logger.error("api_create_readings_batch_db_unavailable", extra={"error": str(exc.orig)})
+        return jsonify({"error": "database unavailable"}), 503
+    if result.get("skipped"):
+        return jsonify({"error": "ingestion is disabled"}), 503
+
     logger.debug(
-        "api_get_latest_reading_requested",
-        extra={"path": request.path, "method": request.method},
+        "api_create_readings_batch_committed",
+        extra={"inserted": result["inserted"], "rejected": len(result["errors"])},
     )
 
-    row = db.session.query(LogExpReading).order_by(desc(LogExpReading.timestamp)).first()
+    return jsonify(result), 207 if result["errors"] else 201
+
+
+@bp_api.get("/readings/latest")
+@conditional_on_readings
+def get_latest_reading() -> ResponseReturnValue:
+    logger.debug("api_get_latest_reading_requested", extra=_request_fields)
+
+    stmt = (
+        select(*(getattr(LogExpReading, name) for name in READING_COLUMNS))
+        .order_by(desc(LogExpReading.timestamp))
+        .limit(1)
+    )
+    row = db.session.execute(stmt).first()
 
     if row is None:
         logger.debug("api_get_latest_reading_no_rows")
         return jsonify({"error": "no readings available"}), 404
 
-    response = ReadingResponse(**row.to_dict())
-    payload = response.model_dump(exclude_none=False)
-
     logger.debug(
         "api_get_latest_reading_returning",
-        extra={"id": payload.get("id"), "device_id": payload.get("device_id")},
+        extra={"id": row.id, "device_id": row.device_id},
     )
 
-    return jsonify(payload), 200
+    return readings_response(row, many=False), 200
 
 
 @bp_api.get("/readings.json")
+@conditional_on_readings
 def readings_json() -> Any:
-    logger.debug(
-        "api_readings_json_requested",
-        extra={"path": request.path, "method": request.method},
-    )
+    logger.debug("api_readings_json_requested", extra=_request_fields)
 
-    readings = (
-        db.session.query(LogExpReading).order_by(LogExpReading.timestamp.desc()).limit(50).all()
+    stmt = (
+        select(*(getattr(LogExpReading, name) for name in READING_COLUMNS))
+        .order_by(LogExpReading.timestamp.desc())
+        .limit(50)
     )
+    readings = db.session.execute(stmt).all()
 
     logger.debug(
         "api_readings_json_returning",
         extra={"count": len(readings)},
     )
 
-    return jsonify([r.to_dict() for r in readings])
+    return readings_response(readings)
 
 
-@bp_api.get("/geiger")
-def geiger_live() -> Any:
+@bp_api.get("/readings/series")
+def readings_series() -> Any:
+    """
+    Downsampled series of one metric for charts.
+
+    Query parameters:
+        since, until: ISO8601 or epoch-second bounds (default: the last 24h)
+        points: maximum points returned (default 1000, clamped to
+            TIMESERIES_MAX_POINTS)
+        metric: "cps", "cpm" (default) or "usv"
+        method: "lttb" (default) or "minmax"
+        device_id: restrict to a single device
+
+    The body carries "data" as [epoch_ms, value] pairs in time order, plus
+    the bucket width and source (raw or rollup) the series was built from.
+    """
+    logger.debug("api_readings_series_requested", extra=_request_fields)
+
+    max_points = int(current_app.config["TIMESERIES_MAX_POINTS"])
+
+    try:
+        until = parse_time_bound(request.args.get("until"), "until") or datetime.now(timezone.utc)
+        since = parse_time_bound(request.args.get("since"), "since") or until - timedelta(hours=24)
+        try:
+            points = int(request.args.get("points", 1000))
+        except ValueError:
+            raise ValueError(f"Invalid 'points': {request.args.get('points')!r}") from None
+        if since > until:
+            raise ValueError("'since' must not be later than 'until'")
+
+        payload = chart_series(
+            since,
+            until,
+            points=min(points, max_points),
+            metric=request.args.get("metric", "cpm"),
+            method=request.args.get("method", "lttb"),
+            device_id=request.args.get("device_id") or None,
+        )
+    except ValueError as e:
+        logger.debug("api_readings_series_invalid_args", extra={"error": str(e)})
+        return jsonify({"error": str(e)}), 400
+
+    logger.debug(
+        "api_readings_series_returning",
+        extra={"points": len(payload["data"]), "input_points": payload["input_points"]},
+    )
+
+    payload.update(since=since.isoformat(), until=until.isoformat())
+    return jsonify(payload)
+
+
+@bp_api.get("/readings/stream")
+def readings_stream() -> Any:
+    """
+    Server-Sent Events stream of newly committed readings.
+
+    Each reading arrives as a "reading" event whose data is the reading as
+    JSON. Clients resume after a reconnect via the Last-Event-ID header (or
+    ?last_event_id=); when the missed events are no longer buffered a
+    "reset" event asks them to reload once. Comment lines are sent as
+    heartbeats. No database queries are made while streaming.
+
+    Returns 503 when READINGS_STREAM_MAX_CLIENTS streams are already open.
+    """
+    broker = get_readings_broker()
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+
+    try:
+        subscription = broker.subscribe()
+    except StreamLimitReached as e:
+        logger.warning("api_readings_stream_rejected", extra={"error": str(e)})
+        response = jsonify({"error": "too many open streams"})
+        response.headers["Retry-After"] = "30"
+        return response, 503
+
     logger.debug(
-        "api_geiger_live_requested",
-        extra={"path": request.path, "method": request.method},
+        "api_readings_stream_opened",
+        extra={"last_event_id": last_event_id, "clients": broker.stats()["clients"]},
+    )
+
+    heartbeat = float(current_app.config["READINGS_STREAM_HEARTBEAT_SECONDS"])
+    response = Response(
+        broker.stream(last_event_id, heartbeat),
+        mimetype="text/event-stream",
+        headers={"X-Accel-Buffering": "no", "Cache-Control": "no-store"},
     )
+    # Frees the client slot however the stream ends, even before its first chunk.
+    response.call_on_close(subscription.close)
+    return response
+
+
+@bp_api.get("/geiger")
+def geiger_live() -> Any:
+    logger.debug("api_geiger_live_requested", extra=_request_fields)
 
     try:
         data = read_geiger(
@@ -141,10 +365,7 @@ def geiger_live() -> Any:
 
 @bp_api.post("/geiger/push")
 def geiger_push() -> Any:
-    logger.debug(
-        "api_geiger_push_requested",
-        extra={"path": request.path, "method": request.method},
-    )
+    logger.debug("api_geiger_push_requested", extra=_request_fields)
 
     payload = request.get_json(force=True, silent=True) or {}
 
@@ -167,22 +388,20 @@ def geiger_push() -> Any:
 
     db.session.add(reading)
     db.session.commit()
+    bump_generation()
+    publish_reading(reading)
 
     logger.debug(
         "api_geiger_push_committed",
         extra={"id": reading.id},
     )
 
-    response = ReadingResponse(**reading.to_dict())
-    return jsonify(response.model_dump(exclude_none=False)), 201
+    return readings_response(reading, many=False), 201
 
 
 @bp_api.get("/geiger/test")
 def geiger_test() -> Any:
-    logger.debug(
-        "api_geiger_test_requested",
-        extra={"path": request.path, "method": request.method},
-    )
+    logger.debug("api_geiger_test_requested", extra=_request_fields)
 
     results: dict[str, Any] = {}
     ports = list_serial_ports()
@@ -211,10 +430,7 @@ def geiger_test() -> Any:
 
 @bp_api.get("/poller/status")
 def poller_status() -> Any:
-    logger.debug(
-        "api_poller_status_requested",
-        extra={"path": request.path, "method": request.method},
-    )
+    logger.debug("api_poller_status_requested", extra=_request_fields)
 
     poller = getattr(current_app, "poller", None)
     status = "running" if poller and poller._thread.is_alive() else "stopped"
@@ -229,10 +445,7 @@ def poller_status() -> Any:
 
 @bp_api.post("/poller/start")
 def poller_start() -> Any:
-    logger.debug(
-        "api_poller_start_requested",
-        extra={"path": request.path, "method": request.method},
-    )
+    logger.debug("api_poller_start_requested", extra=_request_fields)
 
     poller = getattr(current_app, "poller", None)
     if poller and not poller._thread.is_alive():
@@ -246,10 +459,7 @@ def poller_start() -> Any:
 
 @bp_api.post("/poller/stop")
 def poller_stop() -> Any:
-    logger.debug(
-        "api_poller_stop_requested",
-        extra={"path": request.path, "method": request.method},
-    )
+    logger.debug("api_poller_stop_requested", extra=_request_fields)
 
     poller = getattr(current_app, "poller", None)
     if poller and poller._thread.is_alive():
@@ -263,22 +473,17 @@ def poller_stop() -> Any:
 
 @bp_api.get("/health")
 def health() -> Any:
-    logger.debug(
-        "api_health_requested",
-        extra={"path": request.path, "method": request.method},
-    )
+    logger.debug("api_health_requested", extra=_request_fields)
     return jsonify({"status": "ok"}), 200
 
 
 @bp_api.get("/diagnostics")
 def diagnostics_api() -> Any:
-    logger.debug(
-        "api_diagnostics_requested",
-        extra={"path": request.path, "method": request.method},
-    )
+    logger.debug("api_diagnostics_requested", extra=_request_fields)
 
     from datetime import datetime, timezone
 
+    from ...logging_setup import log_pipeline_stats
     from ...services.analytics_diagnostics import get_analytics_status
     from ...services.database_diagnostics import get_database_status
     from ...services.ingestion import get_ingestion_status
@@ -293,6 +498,8 @@ def diagnostics_api() -> Any:
         "poller": get_poller_status(),
         "analytics": get_analytics_status(),
         "database": get_database_status(),
+        "stream": get_readings_broker().stats(),
+        "logging": log_pipeline_stats(),
         "meta": {
             "timestamp": now.isoformat(),
         },
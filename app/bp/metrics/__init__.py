@@ -0,0 +1,6 @@
+# logexp/app/bp/metrics/__init__.py
+from flask import Blueprint
+
+bp_metrics = Blueprint("metrics", __name__)
+
+from . import routes  # noqa: F401, E402
@@ -0,0 +1,14 @@
+# filename: logexp/app/bp/metrics/routes.py
+
+from __future__ import annotations
+
+from flask import Response
+
+from ...metrics import CONTENT_TYPE, REGISTRY
+from . import bp_metrics
+
+
+@bp_metrics.get("/metrics", endpoint="metrics")
+def metrics() -> Response:
+    """Prometheus scrape endpoint (text exposition format)."""
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
@@ -9,6 +9,7 @@ from flask_login import login_required
 
 from ...geiger import list_serial_ports
 from ...logging_setup import get_logger
+from ...services.timezones import refresh_local_timezone
 from . import bp_settings
 
 logger = get_logger("beamfoundry.settings")
@@ -55,6 +56,7 @@ def update_settings() -> Any:
 
     current_app.config["GEIGER_PORT"] = selected_port
     current_app.config["GEIGER_BAUDRATE"] = int(selected_baudrate)
+    refresh_local_timezone()
 
     logger.debug(
         "settings_updated",
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from typing import Any, Dict, Optional
+
+import click
 from flask import Flask, current_app
 from flask_migrate import upgrade
 
@@ -40,3 +43,87 @@ def register_cli(app: Flask) -> None:
             db.drop_all()
             upgrade()
             current_app.logger.info("Test database cleared and rebuilt via migrations.")
+
+    @app.cli.group("readings")
+    def readings() -> None:
+        """Bulk readings maintenance."""
+
+    @readings.command("import")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option(
+        "--format",
+        "fmt",
+        type=click.Choice(["csv", "ndjson"]),
+        help="File format (default: inferred from the extension).",
+    )
+    @click.option("--batch-size", default=5000, show_default=True, help="Rows per batch.")
+    @click.option("--device-id", help="device_id for records that do not carry one.")
+    @click.option("--checkpoint", help="Checkpoint file (default: <PATH>.import-checkpoint.json).")
+    @click.option("--restart", is_flag=True, help="Ignore an existing checkpoint.")
+    def readings_import(
+        path: str,
+        fmt: Optional[str],
+        batch_size: int,
+        device_id: Optional[str],
+        checkpoint: Optional[str],
+        restart: bool,
+    ) -> None:
+        """Stream a CSV or NDJSON file into logexp_readings."""
+        from .services.readings_import import ImportStats, import_readings_file
+
+        def _progress(stats: ImportStats) -> None:
+            click.echo(
+                f"{stats.records:>12,} read  {stats.inserted:>12,} inserted  "
+                f"{stats.duplicates:>10,} duplicate  {stats.rejected:>8,} rejected  "
+                f"{stats.rows_per_second:>10,.0f} rows/s",
+                err=True,
+            )
+
+        try:
+            stats = import_readings_file(
+                path,
+                fmt,
+                batch_size=batch_size,
+                default_device_id=device_id,
+                checkpoint_path=checkpoint,
+                resume=not restart,
+                progress=_progress,
+            )
+        except ValueError as exc:
+            raise click.ClickException(str(exc)) from exc
+
+        for line_no, error in stats.errors:
+            click.echo(f"line {line_no}: {error}", err=True)
+
+        click.echo(
+            f"Imported {stats.inserted:,} of {stats.records:,} records "
+            f"({stats.duplicates:,} duplicate, {stats.rejected:,} rejected) "
+            f"in {stats.elapsed:.1f}s."
+        )
+
+    @readings.command("backfill-rollups")
+    @click.option("--since", help="First UTC day to rebuild (ISO8601; default: oldest reading).")
+    @click.option("--until", help="Last UTC day to rebuild (ISO8601; default: newest reading).")
+    def readings_backfill_rollups(since: Optional[str], until: Optional[str]) -> None:
+        """Rebuild the 1m/1h/1d rollup tables from logexp_readings."""
+        from .services.readings_query import parse_time_bound
+        from .services.rollups import rebuild_rollups
+
+        def _progress(day: Any, readings: int, totals: Dict[str, int]) -> None:
+            click.echo(
+                f"{day.date().isoformat()}  {readings:>10,} readings  "
+                f"{totals['buckets']:>12,} buckets total",
+                err=True,
+            )
+
+        try:
+            start = parse_time_bound(since, "since")
+            end = parse_time_bound(until, "until")
+        except ValueError as exc:
+            raise click.BadParameter(str(exc)) from exc
+
+        totals = rebuild_rollups(start, end, progress=_progress)
+        click.echo(
+            f"Rebuilt {totals['days']:,} day(s): {totals['readings']:,} readings, "
+            f"{totals['buckets']:,} rollup rows."
+        )
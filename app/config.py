@@ -31,10 +31,40 @@ DEFAULTS: Dict[str, Any] = {
     # Analytics
     "ANALYTICS_WINDOW_SECONDS": 60,
     "ANALYTICS_ENABLED": True,
+    "ANALYTICS_ROLLUP_MIN_SECONDS": 3600,
+    "ROLLUPS_ENABLED": True,
+    "TIMESERIES_MAX_POINTS": 2000,
+    "ANALYTICS_CACHE_TTL_SECONDS": 5.0,
     # Telemetry
     "LOGEXP_NODE_ID": None,
     "TELEMETRY_ENABLED": False,
     "TELEMETRY_INTERVAL_SECONDS": 60,
+    # Logging
+    "LOG_SAMPLE_EVERY": 100,
+    "LOG_QUEUE_SIZE": 10000,
+    "LOG_BATCH_SIZE": 256,
+    # Metrics
+    "METRICS_MULTIPROC_DIR": None,
+    "METRICS_FLUSH_SECONDS": 5.0,
+    # API
+    "API_READINGS_DEFAULT_LIMIT": 500,
+    "API_READINGS_MAX_LIMIT": 5000,
+    "API_EXPORT_BATCH_SIZE": 1000,
+    "READINGS_STREAM_BUFFER": 1000,
+    "READINGS_STREAM_HEARTBEAT_SECONDS": 15.0,
+    "READINGS_STREAM_MAX_CLIENTS": 2,
+    "EXPORT_ROW_GROUP_ROWS": 65536,
+    # Ingestion
+    "INGESTION_BATCH_MAX_ROWS": 10000,
+    "INGESTION_QUEUE_MAXSIZE": 10000,
+    "INGESTION_QUEUE_BATCH_SIZE": 500,
+    "INGESTION_QUEUE_FLUSH_SECONDS": 1.0,
+    "INGESTION_QUEUE_OVERFLOW": "spill",
+    "INGESTION_SPOOL_ENABLED": True,
+    "INGESTION_SPOOL_DIR": None,
+    "INGESTION_SPOOL_SEGMENT_BYTES": 4 * 1024 * 1024,
+    "INGESTION_SPOOL_FSYNC_SECONDS": 1.0,
+    "INGESTION_SPOOL_FSYNC_RECORDS": 100,
 }
 
 # ---------------------------------------------------------------------------
@@ -51,9 +81,35 @@ ENV_MAP: Dict[str, Tuple[str, Callable[[str], Any]]] = {
     "LOCAL_TIMEZONE": ("LOCAL_TIMEZONE", str),
     "ANALYTICS_WINDOW_SECONDS": ("ANALYTICS_WINDOW_SECONDS", int),
     "ANALYTICS_ENABLED": ("ANALYTICS_ENABLED", lambda v: v.lower() == "true"),
+    "ANALYTICS_ROLLUP_MIN_SECONDS": ("ANALYTICS_ROLLUP_MIN_SECONDS", int),
+    "ROLLUPS_ENABLED": ("ROLLUPS_ENABLED", lambda v: v.lower() == "true"),
+    "TIMESERIES_MAX_POINTS": ("TIMESERIES_MAX_POINTS", int),
+    "ANALYTICS_CACHE_TTL_SECONDS": ("ANALYTICS_CACHE_TTL_SECONDS", float),
     "LOGEXP_NODE_ID": ("LOGEXP_NODE_ID", str),
     "TELEMETRY_ENABLED": ("TELEMETRY_ENABLED", lambda v: v.lower() == "true"),
     "TELEMETRY_INTERVAL_SECONDS": ("TELEMETRY_INTERVAL_SECONDS", int),
+    "LOG_SAMPLE_EVERY": ("LOG_SAMPLE_EVERY", int),
+    "LOG_QUEUE_SIZE": ("LOG_QUEUE_SIZE", int),
+    "LOG_BATCH_SIZE": ("LOG_BATCH_SIZE", int),
+    "METRICS_MULTIPROC_DIR": ("METRICS_MULTIPROC_DIR", str),
+    "METRICS_FLUSH_SECONDS": ("METRICS_FLUSH_SECONDS", float),
+    "API_READINGS_DEFAULT_LIMIT": ("API_READINGS_DEFAULT_LIMIT", int),
+    "API_READINGS_MAX_LIMIT": ("API_READINGS_MAX_LIMIT", int),
+    "API_EXPORT_BATCH_SIZE": ("API_EXPORT_BATCH_SIZE", int),
+    "READINGS_STREAM_BUFFER": ("READINGS_STREAM_BUFFER", int),
+    "READINGS_STREAM_HEARTBEAT_SECONDS": ("READINGS_STREAM_HEARTBEAT_SECONDS", float),
+    "READINGS_STREAM_MAX_CLIENTS": ("READINGS_STREAM_MAX_CLIENTS", int),
+    "EXPORT_ROW_GROUP_ROWS": ("EXPORT_ROW_GROUP_ROWS", int),
+    "INGESTION_BATCH_MAX_ROWS": ("INGESTION_BATCH_MAX_ROWS", int),
+    "INGESTION_QUEUE_MAXSIZE": ("INGESTION_QUEUE_MAXSIZE", int),
+    "INGESTION_QUEUE_BATCH_SIZE": ("INGESTION_QUEUE_BATCH_SIZE", int),
+    "INGESTION_QUEUE_FLUSH_SECONDS": ("INGESTION_QUEUE_FLUSH_SECONDS", float),
+    "INGESTION_QUEUE_OVERFLOW": ("INGESTION_QUEUE_OVERFLOW", str),
+    "INGESTION_SPOOL_ENABLED": ("INGESTION_SPOOL_ENABLED", lambda v: v.lower() == "true"),
+    "INGESTION_SPOOL_DIR": ("INGESTION_SPOOL_DIR", str),
+    "INGESTION_SPOOL_SEGMENT_BYTES": ("INGESTION_SPOOL_SEGMENT_BYTES", int),
+    "INGESTION_SPOOL_FSYNC_SECONDS": ("INGESTION_SPOOL_FSYNC_SECONDS", float),
+    "INGESTION_SPOOL_FSYNC_RECORDS": ("INGESTION_SPOOL_FSYNC_RECORDS", int),
 }
 
 # ---------------------------------------------------------------------------
@@ -86,7 +142,12 @@ def load_config(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
                 continue
 
             # Allow boolean overrides for boolean env vars
-            if key in ("ANALYTICS_ENABLED", "TELEMETRY_ENABLED") and isinstance(value, bool):
+            if key in (
+                "ANALYTICS_ENABLED",
+                "TELEMETRY_ENABLED",
+                "INGESTION_SPOOL_ENABLED",
+                "ROLLUPS_ENABLED",
+            ) and isinstance(value, bool):
                 config[key] = value
                 continue
 
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import time
+from typing import Any, Callable, Dict, List, Optional
 
 import serial
 import serial.tools.list_ports
 
-from .logging_setup import get_logger
+from .logging_setup import get_lazy_logger
 
-logger = get_logger("beamfoundry.geiger")
+logger = get_lazy_logger("beamfoundry.geiger")
 
 
 # ----------------------------------------------------------------------
@@ -40,10 +41,159 @@ def _normalize_threshold(value: Any) -> float:
     return threshold
 
 
+# ----------------------------------------------------------------------
+class SerialLineReader:
+    """
+    Long-lived serial connection that yields complete lines.
+
+    The port is opened once and kept open; reopening a tty per read resets
+    the line discipline, may toggle DTR, costs milliseconds per tick, and
+    loses whatever the device sends while the port is closed.
+
+    Bytes are accumulated in a line buffer, so a line split across a read
+    timeout is completed on the next call instead of being returned as a
+    fragment. On SerialException / OSError the handle is dropped and
+    reopened after an exponential backoff (backoff_initial doubling up to
+    backoff_max). readline() never sleeps: during backoff it returns None
+    and reconnect_in() tells the caller how long to wait.
+    """
+
+    MAX_LINE_BYTES = 4096
+
+    def __init__(
+        self,
+        port: str,
+        baudrate: int,
+        timeout: float = 2.0,
+        *,
+        backoff_initial: float = 0.5,
+        backoff_max: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self._clock = clock
+
+        self._serial: Optional[Any] = None
+        self._buffer = bytearray()
+        self._backoff = backoff_initial
+        self._next_attempt = 0.0
+
+        self.stats: Dict[str, Any] = {
+            "opens": 0,
+            "errors": 0,
+            "lines": 0,
+            "discarded_bytes": 0,
+            "last_error": None,
+        }
+
+    # ------------------------------------------------------------------
+    @property
+    def is_open(self) -> bool:
+        return self._serial is not None
+
+    def reconnect_in(self) -> float:
+        """Seconds until the next reconnect attempt (0 if connected or due)."""
+        if self._serial is not None:
+            return 0.0
+        return max(0.0, self._next_attempt - self._clock())
+
+    def _open(self) -> bool:
+        if self._serial is not None:
+            return True
+        if self._clock() < self._next_attempt:
+            return False
+
+        try:
+            # Looked up at call time so tests can patch serial.Serial.
+            self._serial = serial.Serial(self.port, self.baudrate, timeout=self.timeout)
+        except (serial.SerialException, OSError) as exc:
+            self._fail(exc)
+            return False
+
+        self.stats["opens"] += 1
+        self._backoff = self.backoff_initial
+        self._buffer.clear()
+        logger.info(
+            "geiger_serial_opened",
+            extra={"port": self.port, "baudrate": self.baudrate, "opens": self.stats["opens"]},
+        )
+        return True
+
+    def _fail(self, exc: BaseException) -> None:
+        self.close()
+        self.stats["errors"] += 1
+        self.stats["last_error"] = str(exc)
+        self._next_attempt = self._clock() + self._backoff
+        logger.warning(
+            "geiger_serial_error",
+            extra={"port": self.port, "error": str(exc), "retry_in": self._backoff},
+        )
+        self._backoff = min(self._backoff * 2, self.backoff_max)
+
+    def close(self) -> None:
+        ser, self._serial = self._serial, None
+        if ser is not None:
+            close = getattr(ser, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:  # pragma: no cover - best effort
+                    pass
+
+    # ------------------------------------------------------------------
+    def readline(self) -> Optional[str]:
+        """
+        Return the next complete, stripped line, or None if no complete line
+        arrived within the timeout (or the port is unavailable).
+        """
+        if not self._open():
+            return None
+
+        assert self._serial is not None
+        try:
+            chunk: bytes = self._serial.readline()
+        except (serial.SerialException, OSError) as exc:
+            self._fail(exc)
+            return None
+
+        if not chunk:
+            return None
+
+        self._buffer += chunk
+        if not self._buffer.endswith(b"\n"):
+            if len(self._buffer) > self.MAX_LINE_BYTES:
+                self.stats["discarded_bytes"] += len(self._buffer)
+                self._buffer.clear()
+            return None
+
+        line = self._buffer.decode("utf-8", errors="replace").strip()
+        self._buffer.clear()
+        if not line:
+            return None
+
+        self.stats["lines"] += 1
+        return line
+
+    def diagnostics(self) -> Dict[str, Any]:
+        return {
+            "port": self.port,
+            "open": self.is_open,
+            "reconnect_in": round(self.reconnect_in(), 3),
+            **self.stats,
+        }
+
+
 # ----------------------------------------------------------------------
 def read_geiger(port: str, baudrate: int) -> str:
     """
     Read one line of raw text from the Geiger counter.
+
+    Opens the port for this single read, which suits one-off diagnostics
+    (GET /api/geiger). Continuous polling uses SerialLineReader.
     """
     logger.debug(
         "geiger_read_requested",
@@ -165,9 +315,9 @@ def parse_geiger_line(line: str, threshold: Any = 50) -> Dict[str, Any]:
         else:
             result["mode"] = "SLOW"
 
-        logger.debug(
+        logger.sampled(
             "geiger_parse_success",
-            extra={
+            extra=lambda: {
                 "cps": result["counts_per_second"],
                 "cpm": result["counts_per_minute"],
                 "usv": result["microsieverts_per_hour"],
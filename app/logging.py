@@ -2,21 +2,35 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import logging as pylogging
+import queue
+import sys
+import threading
+import time
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+from typing import IO, Dict, List, Optional
 
 from .typing import Any
 
 logger = pylogging.getLogger("beamfoundry.logging")
 
+# Attributes every LogRecord has; anything else on a record came from extra=.
+_RECORD_ATTRS = frozenset(vars(pylogging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
 
 class StructuredFormatter(pylogging.Formatter):
     """
     A deterministic, UTC‑timestamped structured log formatter.
 
     Produces logs like:
-        {"ts": "...", "level": "...", "msg": "...", "name": "..."}
+        {"ts": "...", "level": "...", "msg": "...", "name": "...", <extra fields>}
+
+    ts is when the record was created (not when it was written), so it stays
+    accurate behind the log queue. Extra fields that are not JSON types are
+    written as str(); they never replace the four core keys.
     """
 
     def __init__(self) -> None:
@@ -25,11 +39,157 @@ class StructuredFormatter(pylogging.Formatter):
 
     def format(self, record: pylogging.LogRecord) -> str:
         payload: dict[str, Any] = {
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "name": record.name,
             "msg": record.getMessage(),
         }
 
-        record.message = json.dumps(payload)
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in payload:
+                payload[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+
+        record.message = json.dumps(payload, default=str)
         return record.message
+
+
+# ---------------------------------------------------------------------------
+# Non-blocking pipeline: DroppingQueueHandler -> bounded queue -> LogPump
+# ---------------------------------------------------------------------------
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue that never blocks the logging thread:
+    when the queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]"):
+        super().__init__(log_queue)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def prepare(self, record: pylogging.LogRecord) -> pylogging.LogRecord:
+        # Resolve what depends on the caller's state now (message arguments,
+        # the traceback) and keep the extra fields for the formatter, which
+        # runs on the pump thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = pylogging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: pylogging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+
+_STOP = object()
+
+
+class LogPump:
+    """
+    The single thread that drains the log queue: it takes whatever is
+    queued (up to batch_size records), formats it and writes it with one
+    write() and flush(). A slow sink only ever stalls this thread.
+
+    stream=None writes to whatever sys.stderr is at write time.
+    """
+
+    def __init__(
+        self,
+        log_queue: "queue.Queue[Any]",
+        formatter: pylogging.Formatter,
+        stream: Optional[IO[str]] = None,
+        batch_size: int = 256,
+    ):
+        self.queue = log_queue
+        self.formatter = formatter
+        self.stream = stream
+        self.batch_size = max(1, batch_size)
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {"written": 0, "batches": 0, "errors": 0}
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if not self.alive:
+            self._thread = threading.Thread(target=self._run, name="logexp-log-pump", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Any] = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [item for item in batch if item is not _STOP]
+            try:
+                self._write(records)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+            if len(records) != len(batch):
+                return
+
+    def _write(self, records: List[pylogging.LogRecord]) -> None:
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                self._counters["errors"] += 1
+        if not lines:
+            return
+        try:
+            stream = self.stream if self.stream is not None else sys.stderr
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except Exception:
+            self._counters["errors"] += len(lines)
+            return
+        self._counters["written"] += len(lines)
+        self._counters["batches"] += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until everything queued so far is written. False on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if not self.alive or time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Write what is queued, then end the thread.
+        """
+        if not self.alive:
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        assert self._thread is not None
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"alive": self.alive, "batch_size": self.batch_size, **self._counters}
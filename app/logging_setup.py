@@ -5,27 +5,72 @@
 
 from __future__ import annotations
 
+import atexit
+import itertools
 import logging as pylogging
-from typing import List
+import queue
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Union
 
-from .logging import StructuredFormatter
+from .logging import DroppingQueueHandler, LogPump, StructuredFormatter
 
 # Dedicated logger for setup events
 _setup_logger = pylogging.getLogger("logexp.logging.setup")
 
 
-def configure_logging() -> None:
+# The process-wide queue pipeline, built by the first configure_logging()
+# call and reused by later ones (every create_app() calls it).
+_pipeline: Dict[str, Any] = {"propagate": False}
+
+# Top-level namespaces of the app's loggers. The pipeline handler sits on
+# these and, unless set_log_propagation(True), records stop here: handlers on
+# the root logger (gunicorn.conf.py installs a synchronous StreamHandler
+# there) would otherwise still run on the logging thread.
+ROOT_NAMESPACES = ("beamfoundry", "logexp", "app")
+
+
+def configure_logging(queue_size: int = 10000, batch_size: int = 256) -> None:
     """
     Configure structured logging for all logexp.* namespaces.
 
-    - Installs a single StreamHandler with StructuredFormatter
-    - Clears existing handlers to prevent duplicates
+    - Installs a single DroppingQueueHandler feeding a bounded queue; one
+      LogPump thread formats records with StructuredFormatter and writes
+      them to stderr in batches, so callers never wait on the sink
+    - Records arriving while the queue is full are dropped and counted
+    - Attaches the handler to the top-level beamfoundry, logexp and app
+      loggers, which do not propagate to the root logger; the named
+      sub-namespaces have their handlers cleared and propagate to them
     - Applies consistent INFO-level logging across the app
+
+    Safe to call repeatedly: the pump thread is started once per process
+    and only replaced when the queue size or batch size changes.
     """
     _setup_logger.debug("logging_setup_start")
 
-    handler: pylogging.Handler = pylogging.StreamHandler()
-    handler.setFormatter(StructuredFormatter())
+    pump: Optional[LogPump] = _pipeline.get("pump")
+    if pump is None or _pipeline["settings"] != (queue_size, batch_size):
+        if pump is not None:
+            pump.stop()
+        log_queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+        pump = LogPump(log_queue, StructuredFormatter(), batch_size=batch_size)
+        _pipeline.update(
+            pump=pump,
+            handler=DroppingQueueHandler(log_queue),
+            settings=(queue_size, batch_size),
+        )
+        if not _pipeline.get("atexit"):
+            atexit.register(shutdown_logging)
+            _pipeline["atexit"] = True
+    pump.start()
+
+    handler: pylogging.Handler = _pipeline["handler"]
+
+    for ns in ROOT_NAMESPACES:
+        root_ns: pylogging.Logger = pylogging.getLogger(ns)
+        root_ns.handlers.clear()
+        root_ns.addHandler(handler)
+        root_ns.setLevel(pylogging.INFO)
+        root_ns.propagate = _pipeline["propagate"]
 
     namespaces: List[str] = [
         "beamfoundry.app",
@@ -49,7 +94,6 @@ def configure_logging() -> None:
     for ns in namespaces:
         logger: pylogging.Logger = pylogging.getLogger(ns)
         logger.handlers.clear()
-        logger.addHandler(handler)
         logger.setLevel(pylogging.INFO)
         logger.propagate = True
 
@@ -58,6 +102,51 @@ def configure_logging() -> None:
     _setup_logger.debug("logging_setup_complete")
 
 
+def set_log_propagation(enabled: bool) -> None:
+    """
+    Let records from the app namespaces also reach handlers on the root
+    logger (pytest's caplog) — those handlers then run on the calling
+    thread. Applies now and to later configure_logging() calls.
+    """
+    _pipeline["propagate"] = enabled
+    for ns in ROOT_NAMESPACES:
+        pylogging.getLogger(ns).propagate = enabled
+
+
+def log_pipeline_stats() -> Dict[str, Any]:
+    """
+    Counters of the log pipeline: queue depth and capacity, dropped
+    records, and what the pump wrote.
+    """
+    pump: Optional[LogPump] = _pipeline.get("pump")
+    if pump is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "queued": pump.queue.qsize(),
+        "queue_size": pump.queue.maxsize,
+        "dropped": _pipeline["handler"].dropped,
+        **pump.stats(),
+    }
+
+
+def flush_logging(timeout: float = 5.0) -> bool:
+    """
+    Wait until queued records are written (tests, CLI commands).
+    """
+    pump: Optional[LogPump] = _pipeline.get("pump")
+    return pump.flush(timeout) if pump is not None else True
+
+
+def shutdown_logging() -> None:
+    """
+    Write what is still queued and stop the pump (registered with atexit).
+    """
+    pump: Optional[LogPump] = _pipeline.get("pump")
+    if pump is not None:
+        pump.stop()
+
+
 def get_logger(name: str) -> pylogging.Logger:
     """
     Obtain a logger for the given namespace.
@@ -65,3 +154,109 @@ def get_logger(name: str) -> pylogging.Logger:
     Ensures the logger participates in the structured logging setup.
     """
     return pylogging.getLogger(name)
+
+
+# ---------------------------------------------------------------------------
+# Hot-path facade
+# ---------------------------------------------------------------------------
+
+# `extra` for LazyLogger: a mapping, or a zero-argument callable returning one
+# (only called when the record is actually emitted).
+Fields = Union[Mapping[str, Any], Callable[[], Mapping[str, Any]], None]
+
+# Default 1-in-N rate for LazyLogger.sampled(); set from LOG_SAMPLE_EVERY.
+_sampling: Dict[str, int] = {"every": 100}
+
+
+def set_log_sampling(every: int) -> None:
+    """
+    Set the default rate of LazyLogger.sampled() (1 keeps every event).
+    """
+    _sampling["every"] = max(1, int(every))
+
+
+class LazyLogger:
+    """
+    Level-gated facade over a stdlib logger for code that runs per reading
+    or per request.
+
+    Compared with logger.debug("event", extra={...}):
+
+    - the level is checked first, through Logger.isEnabledFor(), which
+      caches its answer per level (the cache is reset whenever any level
+      changes), so a disabled call costs one dict lookup;
+    - extra may be a callable, evaluated only when the record is emitted;
+    - sampled() emits one in N occurrences of an event.
+
+    Fields are passed as extra=..., keyword-only, so a call reads the same
+    (and means the same) on a LazyLogger and a stdlib logger.
+    """
+
+    __slots__ = ("logger", "_counters")
+
+    def __init__(self, logger: pylogging.Logger):
+        self.logger = logger
+        self._counters: Dict[str, Iterator[int]] = defaultdict(itertools.count)
+
+    @property
+    def name(self) -> str:
+        return self.logger.name
+
+    def is_enabled_for(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def _emit(self, level: int, msg: str, extra: Fields, exc_info: Any = None) -> None:
+        fields = extra() if callable(extra) else extra
+        # stacklevel 3: the record points at the caller of debug()/info()/...
+        self.logger.log(level, msg, extra=fields, exc_info=exc_info, stacklevel=3)
+
+    def debug(self, msg: str, *, extra: Fields = None) -> None:
+        if self.logger.isEnabledFor(pylogging.DEBUG):
+            self._emit(pylogging.DEBUG, msg, extra)
+
+    def info(self, msg: str, *, extra: Fields = None) -> None:
+        if self.logger.isEnabledFor(pylogging.INFO):
+            self._emit(pylogging.INFO, msg, extra)
+
+    def warning(self, msg: str, *, extra: Fields = None) -> None:
+        if self.logger.isEnabledFor(pylogging.WARNING):
+            self._emit(pylogging.WARNING, msg, extra)
+
+    def error(self, msg: str, *, extra: Fields = None, exc_info: Any = None) -> None:
+        if self.logger.isEnabledFor(pylogging.ERROR):
+            self._emit(pylogging.ERROR, msg, extra, exc_info)
+
+    def sampled(
+        self,
+        msg: str,
+        *,
+        extra: Fields = None,
+        level: int = pylogging.DEBUG,
+        every: Optional[int] = None,
+    ) -> None:
+        """
+        Emit the first and then every Nth occurrence of msg (N: every, or
+        the LOG_SAMPLE_EVERY default), adding the rate as "sample_every".
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        rate = every or _sampling["every"]
+        if next(self._counters[msg]) % rate:
+            return
+        fields = dict((extra() if callable(extra) else extra) or {})
+        fields["sample_every"] = rate
+        self.logger.log(level, msg, extra=fields, stacklevel=2)
+
+
+_lazy_loggers: Dict[str, LazyLogger] = {}
+
+
+def get_lazy_logger(name: str) -> LazyLogger:
+    """
+    The LazyLogger for a namespace (one shared instance per name, so
+    sampling counters are per event across the process).
+    """
+    lazy = _lazy_loggers.get(name)
+    if lazy is None:
+        lazy = _lazy_loggers.setdefault(name, LazyLogger(get_logger(name)))
+    return lazy
@@ -0,0 +1,657 @@
+# filename: logexp/app/metrics.py
+
+"""
+In-process metrics registry rendered in the Prometheus text format.
+
+Counters, gauges and fixed-bucket histograms, with optional labels:
+
+    READS = Counter("logexp_reads_total", "Lines read.", ["result"])
+    READS.labels("line").inc()
+    with PARSE_SECONDS.time():
+        ...
+
+Every metric lives in the module-level REGISTRY; /metrics renders it.
+
+Multiprocess mode (Gunicorn): with METRICS_MULTIPROC_DIR set, each process
+writes a JSON snapshot of its registry to <dir>/metrics-<pid>.json every
+METRICS_FLUSH_SECONDS (and right before it serves a scrape). A scrape merges
+every snapshot in the directory: counters and histograms are summed across
+processes, including exited ones so totals never go backwards; gauges only
+count live processes and are combined by each gauge's mode ("sum", "max" or
+"all", which keeps one series per pid).
+"""
+
+from __future__ import annotations
+
+import atexit
+import glob
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from flask import Flask, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .logging_setup import get_logger
+
+logger = get_logger("beamfoundry.metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+ROW_BUCKETS: Tuple[float, ...] = (0, 1, 10, 100, 500, 1000, 5000, 10000, 50000, 100000)
+
+GAUGE_MODES = ("sum", "max", "all")
+
+_LabelKey = Tuple[str, ...]
+
+
+# ---------------------------------------------------------------------------
+# Metric types
+# ---------------------------------------------------------------------------
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional["MetricsRegistry"] = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[_LabelKey, Any] = {}
+        (REGISTRY if registry is None else registry).register(self)
+
+    def labels(self, *values: Any, **kwargs: Any) -> Any:
+        """
+        Return the child series for these label values (positional, in
+        labelnames order, or by keyword).
+        """
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _unlabelled(self) -> Any:
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use .labels()")
+        return self.labels()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def series(self) -> List[Tuple[_LabelKey, Any]]:
+        """(label values, value) for every child, as plain JSON-able data."""
+        return [(key, child.value()) for key, child in list(self._children.items())]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._children.clear()
+
+    def describe(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "help": self.documentation, "labelnames": self.labelnames}
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._value += amount
+
+    def value(self) -> float:
+        return self._value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled().inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "_value", "_function")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        """Read the value from function() at collection time instead."""
+        self._function = function
+
+    def value(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return math.nan
+        return self._value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional["MetricsRegistry"] = None,
+        mode: str = "sum",
+    ) -> None:
+        if mode not in GAUGE_MODES:
+            raise ValueError(f"Invalid gauge mode {mode!r}; expected one of {GAUGE_MODES}")
+        self.mode = mode
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._unlabelled().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._unlabelled().dec(amount)
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        self._unlabelled().set_function(function)
+
+    def describe(self) -> Dict[str, Any]:
+        return {**super().describe(), "mode": self.mode}
+
+
+class _Timer:
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child: "_HistogramChild") -> None:
+        self._child = child
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._child.observe(time.perf_counter() - self._start)
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_upper", "_counts", "_sum")
+
+    def __init__(self, upper: Tuple[float, ...]) -> None:
+        self._lock = threading.Lock()
+        self._upper = upper
+        # Per-bucket (not cumulative) counts; the last slot is +Inf.
+        self._counts = [0] * (len(upper) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._upper, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    def value(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"counts": list(self._counts), "sum": self._sum}
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional["MetricsRegistry"] = None,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        upper = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        if not upper:
+            raise ValueError("Histogram needs at least one finite bucket")
+        self.buckets = upper
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def time(self) -> _Timer:
+        return self._unlabelled().time()
+
+    def describe(self) -> Dict[str, Any]:
+        return {**super().describe(), "buckets": self.buckets}
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+
+class MetricsRegistry:
+    """
+    The set of metrics one process exposes, plus the optional
+    multiprocess snapshot directory.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.directory: Optional[str] = None
+        self.flush_seconds = 5.0
+        self._writer: Optional[threading.Thread] = None
+        self._writer_stop = threading.Event()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name!r} is already registered")
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def reset(self) -> None:
+        """Zero every metric (keeps the metric definitions)."""
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "metrics": {
+                name: {**metric.describe(), "series": metric.series()}
+                for name, metric in list(self._metrics.items())
+            },
+        }
+
+    def collect(self) -> Dict[str, Any]:
+        """
+        The merged view to render: this process alone, or every snapshot
+        in the multiprocess directory.
+        """
+        if not self.directory:
+            return self.snapshot()["metrics"]
+        self.write_snapshot()
+        return merge_snapshots(_read_snapshots(self.directory))
+
+    def render(self) -> str:
+        return render_text(self.collect())
+
+    # ------------------------------------------------------------------
+    # Multiprocess mode
+    # ------------------------------------------------------------------
+
+    def configure_multiprocess(self, directory: Optional[str], flush_seconds: float = 5.0) -> None:
+        """
+        Start (or, with directory=None, stop) writing this process's
+        snapshot to directory every flush_seconds.
+        """
+        self.stop_writer()
+        self.directory = directory or None
+        self.flush_seconds = max(0.1, float(flush_seconds))
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._start_writer()
+        logger.info(
+            "metrics_multiprocess_enabled",
+            extra={"directory": self.directory, "flush_seconds": self.flush_seconds},
+        )
+
+    def snapshot_path(self) -> Optional[str]:
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+
+    def write_snapshot(self) -> None:
+        path = self.snapshot_path()
+        if path is None:
+            return
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(self.snapshot(), fh, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("metrics_snapshot_failed", extra={"path": path, "error": str(exc)})
+
+    def _start_writer(self) -> None:
+        self._writer_stop = threading.Event()
+        self._writer = threading.Thread(
+            target=self._write_loop,
+            args=(self._writer_stop,),
+            name="logexp-metrics-writer",
+            daemon=True,
+        )
+        self._writer.start()
+
+    def _write_loop(self, stop: threading.Event) -> None:
+        while not stop.wait(self.flush_seconds):
+            self.write_snapshot()
+
+    def stop_writer(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            self._writer_stop.set()
+            self._writer.join(timeout=2)
+            self.write_snapshot()
+        self._writer = None
+
+    def _after_fork(self) -> None:
+        # A forked worker must not report its parent's counts again under its
+        # own pid, and threads do not survive fork().
+        self.reset()
+        self._writer = None
+        if self.directory is not None:
+            self._start_writer()
+
+
+REGISTRY = MetricsRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=REGISTRY._after_fork)
+atexit.register(REGISTRY.stop_writer)
+
+
+# ---------------------------------------------------------------------------
+# Snapshot merging
+# ---------------------------------------------------------------------------
+
+
+def _read_snapshots(directory: str) -> List[Dict[str, Any]]:
+    snapshots = []
+    for path in sorted(glob.glob(os.path.join(directory, "metrics-*.json"))):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                snapshots.append(json.load(fh))
+        except (OSError, ValueError):
+            # Written atomically, so this is a stray or half-deleted file.
+            continue
+    return snapshots
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine per-process snapshots into one {name: metric} mapping in the
+    shape MetricsRegistry.snapshot() produces.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    alive: Dict[int, bool] = {}
+
+    for snapshot in snapshots:
+        pid = int(snapshot["pid"])
+        for name, metric in snapshot["metrics"].items():
+            kind = metric["kind"]
+            target = merged.get(name)
+            if target is None:
+                labelnames = list(metric["labelnames"])
+                if kind == "gauge" and metric.get("mode") == "all":
+                    labelnames.append("pid")
+                target = merged[name] = {**metric, "labelnames": labelnames, "series": {}}
+            series: Dict[_LabelKey, Any] = target["series"]
+
+            if kind == "gauge":
+                if pid not in alive:
+                    alive[pid] = _pid_alive(pid)
+                if not alive[pid]:
+                    continue
+
+            for labels, value in metric["series"]:
+                key = tuple(labels)
+                if kind == "gauge" and metric.get("mode") == "all":
+                    key = key + (str(pid),)
+                current = series.get(key)
+                if current is None:
+                    series[key] = (
+                        {"counts": list(value["counts"]), "sum": value["sum"]}
+                        if kind == "histogram"
+                        else value
+                    )
+                elif kind == "histogram":
+                    if len(current["counts"]) == len(value["counts"]):
+                        current["counts"] = [
+                            a + b for a, b in zip(current["counts"], value["counts"])
+                        ]
+                        current["sum"] += value["sum"]
+                elif kind == "gauge" and metric.get("mode") == "max":
+                    series[key] = max(current, value)
+                else:
+                    series[key] = current + value
+
+    for metric in merged.values():
+        metric["series"] = list(metric["series"].items())
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Text exposition format
+# ---------------------------------------------------------------------------
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render_text(metrics: Dict[str, Any]) -> str:
+    """Render collected metrics in the Prometheus text format (0.0.4)."""
+    lines: List[str] = []
+    for name in sorted(metrics):
+        metric = metrics[name]
+        kind = metric["kind"]
+        names = metric["labelnames"]
+        doc = metric["help"].replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {name} {doc}")
+        lines.append(f"# TYPE {name} {kind}")
+
+        for labels, value in sorted(metric["series"], key=lambda item: tuple(item[0])):
+            if kind != "histogram":
+                lines.append(f"{name}{_label_text(names, labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            bounds = [_format_value(b) for b in metric["buckets"]] + ["+Inf"]
+            for bound, count in zip(bounds, value["counts"]):
+                cumulative += count
+                le = _label_text(names, labels, f'le="{bound}"')
+                lines.append(f"{name}_bucket{le} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(names, labels)} {_format_value(value['sum'])}")
+            lines.append(f"{name}_count{_label_text(names, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Application metrics
+# ---------------------------------------------------------------------------
+
+SERIAL_READ_SECONDS = Histogram(
+    "logexp_serial_read_seconds",
+    "Time spent in one serial readline() call, by outcome (line or none).",
+    ["result"],
+)
+PARSE_SECONDS = Histogram(
+    "logexp_parse_seconds",
+    "Time to parse one Geiger counter line.",
+)
+INGEST_COMMIT_SECONDS = Histogram(
+    "logexp_ingest_commit_seconds",
+    "Time to commit ingested readings, by path (single or batch).",
+    ["path"],
+)
+INGEST_ROWS = Counter(
+    "logexp_ingest_rows_total",
+    "Readings committed, by path (single or batch).",
+    ["path"],
+)
+QUEUE_DEPTH = Gauge(
+    "logexp_ingestion_queue_depth",
+    "Readings waiting in the ingestion queue.",
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "logexp_http_request_seconds",
+    "Time to build a response, by blueprint endpoint, method and status.",
+    ["endpoint", "method", "status"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "logexp_db_query_seconds",
+    "Database statement execution time, by statement type.",
+    ["statement"],
+)
+DB_ROWS_RETURNED = Histogram(
+    "logexp_db_rows_returned",
+    "Rows returned by reading queries, by query.",
+    ["query"],
+    buckets=ROW_BUCKETS,
+)
+
+_STATEMENTS = ("select", "insert", "update", "delete")
+
+
+def _statement_type(statement: str) -> str:
+    verb = statement.lstrip()[:6].lower()
+    return verb if verb in _STATEMENTS else "other"
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    conn.info.setdefault("logexp_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    starts = conn.info.get("logexp_query_start")
+    if starts:
+        DB_QUERY_SECONDS.labels(_statement_type(statement)).observe(
+            time.perf_counter() - starts.pop()
+        )
+
+
+def _handle_error(context: Any) -> None:
+    # after_cursor_execute does not run for a failed statement; drop its start
+    # so a pooled connection does not accumulate one per error.
+    conn = context.connection
+    if conn is None or context.execution_context is None or context.statement is None:
+        return
+    starts = conn.info.get("logexp_query_start")
+    if starts:
+        starts.pop()
+
+
+def _instrument_engines() -> None:
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+def init_metrics(app: Flask) -> None:
+    """
+    Time every request by endpoint, time every SQL statement, and set up
+    multiprocess snapshots when METRICS_MULTIPROC_DIR is configured.
+    """
+
+    @app.before_request
+    def _start_request_timer() -> None:
+        g.logexp_request_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response: Any) -> Any:
+        started = g.pop("logexp_request_started", None)
+        if started is not None:
+            HTTP_REQUEST_SECONDS.labels(
+                request.endpoint or "unmatched", request.method, str(response.status_code)
+            ).observe(time.perf_counter() - started)
+        return response
+
+    _instrument_engines()
+
+    directory = app.config_obj.get("METRICS_MULTIPROC_DIR")
+    if directory != REGISTRY.directory:
+        REGISTRY.configure_multiprocess(directory, app.config_obj["METRICS_FLUSH_SECONDS"])
@@ -3,20 +3,22 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, cast
-from zoneinfo import ZoneInfo
+from typing import Any, Dict, Optional
 
-from flask import current_app
 from flask_login import UserMixin
-from sqlalchemy import DateTime, Integer, String
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from .db_types import Base, UTCDateTime
-from .logging_setup import get_logger
-from .typing import LogExpFlask
+from .logging_setup import get_lazy_logger
+from .services.timezones import get_local_timezone, localize_timestamp
 
-logger = get_logger("beamfoundry.models")
+logger = get_lazy_logger("beamfoundry.models")
+
+# Largest value of an INTEGER column (counts_per_second / counts_per_minute);
+# writers reject larger counts up front rather than have Postgres fail a batch.
+INT32_MAX = 2**31 - 1
 
 
 # ---------------------------------------------------------------------------
@@ -26,6 +28,12 @@ logger = get_logger("beamfoundry.models")
 
 class LogExpReading(Base):
     __tablename__ = "logexp_readings"
+    __table_args__ = (
+        # Every hot query filters or orders on timestamp, optionally per device.
+        # Created by migration c41f7d2e9a10.
+        Index("ix_logexp_readings_timestamp", "timestamp"),
+        Index("ix_logexp_readings_device_id_timestamp", "device_id", "timestamp"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -52,9 +60,9 @@ class LogExpReading(Base):
         id: Optional[int] = None,
         device_id: Optional[str] = None,
     ) -> None:
-        logger.debug(
+        logger.sampled(
             "logexp_reading_init",
-            extra={
+            extra=lambda: {
                 "cps": counts_per_second,
                 "cpm": counts_per_minute,
                 "usv": microsieverts_per_hour,
@@ -83,19 +91,15 @@ class LogExpReading(Base):
         self.device_id = device_id
 
     def to_dict(self) -> Dict[str, Any]:
-        typed_app = cast(LogExpFlask, current_app)
-
-        tz_name = typed_app.config_obj.get("LOCAL_TIMEZONE", "UTC")
-        tz = ZoneInfo(tz_name)
+        tz = get_local_timezone()
+        localized_ts = localize_timestamp(self.timestamp, tz)
 
-        localized_ts = self.timestamp.astimezone(tz) if self.timestamp else None
-
-        logger.debug(
+        logger.sampled(
             "logexp_reading_serialize",
-            extra={
+            extra=lambda: {
                 "id": self.id,
-                "timezone": tz_name,
-                "has_timestamp": self.timestamp is not None,
+                "timezone": tz.key,
+                "has_timestamp": localized_ts is not None,
             },
         )
 
@@ -113,6 +117,53 @@ class LogExpReading(Base):
 Reading = LogExpReading
 
 
+# ---------------------------------------------------------------------------
+# Reading rollups (1m / 1h / 1d)
+# ---------------------------------------------------------------------------
+
+
+class _ReadingRollupColumns:
+    """
+    Pre-aggregated readings per (bucket_start, device_id, mode).
+
+    One row per mode, so summing reading_count over a bucket's rows gives
+    the mode histogram for free and every column merges additively (or by
+    min/max) under ON CONFLICT upserts. device_id is "" for readings without
+    one, because NULL would never conflict. Maintained by
+    app.services.rollups; created by migration d7a3b5e1f2c4.
+    """
+
+    bucket_start: Mapped[datetime] = mapped_column(UTCDateTime(), primary_key=True)
+    device_id: Mapped[str] = mapped_column(String(64), primary_key=True, default="")
+    mode: Mapped[str] = mapped_column(String(10), primary_key=True)
+
+    reading_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    cps_sum: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    cps_min: Mapped[int] = mapped_column(nullable=False)
+    cps_max: Mapped[int] = mapped_column(nullable=False)
+
+    cpm_sum: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    cpm_min: Mapped[int] = mapped_column(nullable=False)
+    cpm_max: Mapped[int] = mapped_column(nullable=False)
+
+    usv_sum: Mapped[float] = mapped_column(nullable=False)
+    usv_min: Mapped[float] = mapped_column(nullable=False)
+    usv_max: Mapped[float] = mapped_column(nullable=False)
+
+
+class ReadingRollup1m(_ReadingRollupColumns, Base):
+    __tablename__ = "logexp_rollups_1m"
+
+
+class ReadingRollup1h(_ReadingRollupColumns, Base):
+    __tablename__ = "logexp_rollups_1h"
+
+
+class ReadingRollup1d(_ReadingRollupColumns, Base):
+    __tablename__ = "logexp_rollups_1d"
+
+
 # ---------------------------------------------------------------------------
 # User model — unified under Flask-SQLAlchemy
 # ---------------------------------------------------------------------------
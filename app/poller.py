@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 import threading
 import time
+from datetime import datetime, timezone
 from typing import Any, Optional
 
 from .logging_setup import get_logger
@@ -34,6 +35,16 @@ class GeigerPoller:
         self._stop_event: threading.Event = threading.Event()
         self._thread: Optional[threading.Thread] = None
 
+        # Readings are handed to a writer thread so DB latency never delays
+        # the next serial read. Created on start().
+        self.queue: Optional[Any] = None
+
+        # Long-lived serial connection; created by the polling thread.
+        self.reader: Optional[Any] = None
+
+        # When the last reading was handed to the queue (UTC).
+        self.last_tick: Optional[datetime] = None
+
     # ------------------------------------------------------------------
     def start(self) -> None:
         """Start the poller thread if not already running."""
@@ -62,14 +73,20 @@ class GeigerPoller:
         self._stopping = False
         self._stop_event.clear()
 
+        if self.queue is None:
+            from .services.ingestion_queue import IngestionQueue
+
+            self.queue = IngestionQueue.from_config(self.app)
+        self.queue.start()
+
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
 
         self.logger.info(
             "GeigerPoller starting",
             extra={
-                "interval": self.app.config_obj["POLL_INTERVAL"],
                 "device": self.app.config_obj["GEIGER_DEVICE_PATH"],
+                "baudrate": self.app.config_obj["GEIGER_BAUDRATE"],
             },
         )
 
@@ -96,50 +113,75 @@ class GeigerPoller:
             else:
                 self.logger.debug("Poller.stop() called from poller thread; skipping join.")
 
+        # Flush whatever the reader handed over before it stopped.
+        if self.queue is not None:
+            self.queue.stop()
+
     # ------------------------------------------------------------------
     def _run(self) -> None:
         """
         Main polling loop.
 
-        Reads raw serial data, parses it, stores readings, and sleeps.
+        Reads lines continuously from one long-lived serial handle, parses
+        them, and hands each reading to the ingestion queue. The queue's
+        writer thread does all DB work. There is no sleep between reads: the
+        serial read timeout paces the loop, so every line the device emits is
+        captured. While the port is unavailable the loop waits out the
+        reader's reconnect backoff.
         Runs inside the Flask application context.
 
         Heavy imports are intentionally placed here to avoid circular imports.
         """
         with self.app.app_context():
             # Lazy imports to avoid circular dependencies
-            from .extensions import db
-            from .geiger import parse_geiger_line, read_geiger
-            from .ingestion import ingest_reading
+            from .geiger import SerialLineReader, parse_geiger_line
+            from .metrics import PARSE_SECONDS, SERIAL_READ_SECONDS
 
+            assert self.queue is not None
             config: dict[str, Any] = self.app.config_obj
-
-            while not self._stop_event.is_set():
-                try:
-                    port: str = config["GEIGER_DEVICE_PATH"]
-                    baud: int = config["GEIGER_BAUDRATE"]
-                    threshold: int = config["GEIGER_THRESHOLD"]
-
-                    raw: str = read_geiger(port, baud)
-                    parsed: dict[str, Any] = parse_geiger_line(raw, threshold=threshold)
-
-                    ingest_reading(parsed)
-
-                    self.logger.debug(
-                        "Poller tick",
-                        extra={
-                            "cps": parsed["counts_per_second"],
-                            "cpm": parsed["counts_per_minute"],
-                            "microsieverts_per_hour": parsed["microsieverts_per_hour"],
-                            "mode": parsed["mode"],
-                        },
-                    )
-
-                except Exception as exc:
-                    db.session.rollback()
-                    self.logger.error(
-                        "Geiger poll error",
-                        extra={"error": str(exc)},
-                    )
-
-                time.sleep(config["POLL_INTERVAL"])
+            threshold: int = config["GEIGER_THRESHOLD"]
+
+            self.reader = SerialLineReader(
+                config["GEIGER_DEVICE_PATH"],
+                config["GEIGER_BAUDRATE"],
+            )
+            read_line = SERIAL_READ_SECONDS.labels("line")
+            read_none = SERIAL_READ_SECONDS.labels("none")
+
+            try:
+                while not self._stop_event.is_set():
+                    try:
+                        started = time.perf_counter()
+                        raw: Optional[str] = self.reader.readline()
+                        read_done = time.perf_counter()
+                        if raw is None:
+                            read_none.observe(read_done - started)
+                            self._stop_event.wait(self.reader.reconnect_in())
+                            continue
+                        read_line.observe(read_done - started)
+
+                        parsed: dict[str, Any] = parse_geiger_line(raw, threshold=threshold)
+                        PARSE_SECONDS.observe(time.perf_counter() - read_done)
+
+                        self.queue.put(parsed)
+                        self.last_tick = datetime.now(timezone.utc)
+
+                        self.logger.debug(
+                            "Poller tick",
+                            extra={
+                                "cps": parsed["counts_per_second"],
+                                "cpm": parsed["counts_per_minute"],
+                                "microsieverts_per_hour": parsed["microsieverts_per_hour"],
+                                "mode": parsed["mode"],
+                            },
+                        )
+
+                    except Exception as exc:
+                        self.logger.error(
+                            "Geiger poll error",
+                            extra={"error": str(exc)},
+                        )
+                        # Avoid a hot loop on a persistent parse/queue failure.
+                        self._stop_event.wait(0.1)
+            finally:
+                self.reader.close()
@@ -7,9 +7,9 @@ from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
-from .logging_setup import get_logger
+from .logging_setup import get_lazy_logger
 
-logger = get_logger("beamfoundry.schemas")
+logger = get_lazy_logger("beamfoundry.schemas")
 
 
 class ReadingCreate(BaseModel):
@@ -20,9 +20,9 @@ class ReadingCreate(BaseModel):
     device_id: Optional[str] = None
 
     def model_post_init(self, __context: Any) -> None:
-        logger.debug(
+        logger.sampled(
             "reading_create_validated",
-            extra={
+            extra=lambda: {
                 "cps": self.counts_per_second,
                 "cpm": self.counts_per_minute,
                 "usv": self.microsieverts_per_hour,
@@ -42,9 +42,9 @@ class ReadingResponse(BaseModel):
     device_id: Optional[str] = None
 
     def model_post_init(self, __context: Any) -> None:
-        logger.debug(
+        logger.sampled(
             "reading_response_serialized",
-            extra={
+            extra=lambda: {
                 "id": self.id,
                 "timestamp": self.timestamp.isoformat() if self.timestamp else None,
                 "device_id": self.device_id,
@@ -2,38 +2,46 @@
 from __future__ import annotations
 
 import logging as logging
+import math
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
 
 from flask import current_app
-from sqlalchemy import func
+from sqlalchemy import Float, Row, String, func, select, type_coerce
+from sqlalchemy import cast as sql_cast
 from sqlalchemy.exc import OperationalError
 
 from ..extensions import db
 from ..models import LogExpReading
+from .analytics_cache import cached_analytics
 
 # ----------------------------------------------------------------------
 # Logger MUST be named "logexp.analytics" to satisfy test expectations.
-# It must propagate to root handlers so caplog can capture it.
+# It propagates to "logexp", which holds the log pipeline handler (and, in
+# tests, to the root logger so caplog can capture it).
 # ----------------------------------------------------------------------
 logger = logging.getLogger("logexp.analytics")
 logger.setLevel(logging.INFO)
 logger.propagate = True
 
 
-def compute_window(
-    now: Optional[datetime] = None,
-    db_session: Any = None,
-) -> List[LogExpReading]:
+# Columns run_analytics() needs from each reading in the window.
+ANALYTICS_COLUMNS: Tuple[str, ...] = ("timestamp", "counts_per_second")
+
+# Metrics aggregate_window() summarizes, as (result key, column name).
+AGGREGATE_METRICS: Tuple[Tuple[str, str], ...] = (
+    ("cps", "counts_per_second"),
+    ("cpm", "counts_per_minute"),
+    ("usv", "microsieverts_per_hour"),
+)
+
+
+def _window_cutoff(now: Optional[datetime], session: Any) -> Optional[datetime]:
     """
-    Return all readings within the configured analytics window.
+    Start of the analytics window ending at `now` (default: MAX(timestamp)),
+    or None when there are no readings (or no table yet).
     NO timestamp normalization is performed.
     """
-    session = db_session or db.session
-
-    # ------------------------------------------------------------------
-    # Infer `now` from MAX(timestamp) with no normalization.
-    # ------------------------------------------------------------------
     if now is None:
         try:
             max_ts = session.query(func.max(LogExpReading.timestamp)).scalar()
@@ -43,11 +51,11 @@ def compute_window(
                     "analytics_window_no_table",
                     extra={"error": str(exc)},
                 )
-                return []
+                return None
             raise
 
         if max_ts is None:
-            return []
+            return None
 
         now = max_ts
 
@@ -68,36 +76,191 @@ def compute_window(
         },
     )
 
-    # ------------------------------------------------------------------
-    # Fetch all readings >= cutoff, sorted ascending.
-    # ------------------------------------------------------------------
+    return cutoff
+
+
+def _fetch_window(session: Any, stmt: Any, *, objects: bool) -> List[Any]:
     try:
-        rows = cast(
-            List[LogExpReading],
-            (
-                session.query(LogExpReading)
-                .filter(LogExpReading.timestamp >= cutoff)
-                .order_by(LogExpReading.timestamp.asc())
-                .all()
-            ),
-        )
+        result = session.scalars(stmt) if objects else session.execute(stmt)
+        rows = list(result.all())
+    except OperationalError as exc:
+        if "no such table" in str(exc):
+            logger.debug(
+                "analytics_window_no_table",
+                extra={"error": str(exc)},
+            )
+            return []
+        raise
+
+    logger.debug(
+        "analytics_window_rows_fetched",
+        extra={"count": len(rows), "objects": objects},
+    )
+
+    return rows
+
+
+def compute_window(
+    now: Optional[datetime] = None,
+    db_session: Any = None,
+) -> List[LogExpReading]:
+    """
+    Return all readings within the configured analytics window as ORM
+    objects, sorted ascending. Prefer fetch_window_rows() when only a few
+    columns are needed.
+    """
+    session = db_session or db.session
+
+    cutoff = _window_cutoff(now, session)
+    if cutoff is None:
+        return []
+
+    stmt = (
+        select(LogExpReading)
+        .where(LogExpReading.timestamp >= cutoff)
+        .order_by(LogExpReading.timestamp.asc())
+    )
+    return cast(List[LogExpReading], _fetch_window(session, stmt, objects=True))
+
+
+def fetch_window_rows(
+    now: Optional[datetime] = None,
+    db_session: Any = None,
+    columns: Sequence[str] = ANALYTICS_COLUMNS,
+) -> List[Row[Any]]:
+    """
+    Same window as compute_window(), but as Row tuples holding only the
+    named LogExpReading columns (attribute access by column name still
+    works). Skips ORM object construction and the identity map.
+    """
+    session = db_session or db.session
+
+    cutoff = _window_cutoff(now, session)
+    if cutoff is None:
+        return []
+
+    stmt = (
+        select(*(getattr(LogExpReading, name) for name in columns))
+        .where(LogExpReading.timestamp >= cutoff)
+        .order_by(LogExpReading.timestamp.asc())
+    )
+    return _fetch_window(session, stmt, objects=False)
+
 
-        logger.debug(
-            "analytics_window_rows_fetched",
-            extra={"count": len(rows)},
+def _cutoff_expression(now: Optional[datetime], window_seconds: int, dialect: str) -> Any:
+    """
+    SQL expression for the window start. With now=None it is derived from
+    a MAX(timestamp) scalar subquery, so the window needs no separate round
+    trip to locate its end.
+    """
+    if now is not None:
+        return now - timedelta(seconds=window_seconds)
+
+    max_ts = select(func.max(LogExpReading.timestamp).label("max_ts")).subquery()
+    if dialect == "sqlite":
+        # Stored as "YYYY-MM-DD HH:MM:SS.ffffff": shift the whole seconds with
+        # strftime() and re-attach the fractional part, which a whole-second
+        # shift never changes.
+        shifted = func.strftime("%Y-%m-%d %H:%M:%S", max_ts.c.max_ts, f"-{window_seconds} seconds")
+        fraction = func.substr(max_ts.c.max_ts, 20)
+        cutoff = type_coerce(shifted, String) + type_coerce(fraction, String)
+        return select(cutoff).scalar_subquery()
+    return select(max_ts.c.max_ts - timedelta(seconds=window_seconds)).scalar_subquery()
+
+
+def aggregate_window(
+    now: Optional[datetime] = None,
+    db_session: Any = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Summary of the compute_window() window computed entirely in SQL: one
+    SELECT returns the count, first/last timestamp and avg/min/max/stddev
+    (population) of cps, cpm and µSv/h, and no rows are transferred.
+
+    The standard deviation is STDDEV_POP on Postgres. SQLite has no STDDEV,
+    so there it is the centred two-pass form AVG((x - mean)²) over the
+    window; the one-pass AVG(x²) - AVG(x)² cancels catastrophically for
+    large, tightly clustered values such as CPM.
+
+    Returns None when the window is empty (or there is no table yet).
+    """
+    session = db_session or db.session
+    dialect = session.get_bind().dialect.name
+    window_seconds = int(current_app.config["ANALYTICS_WINDOW_SECONDS"])
+
+    window = (
+        select(
+            LogExpReading.timestamp,
+            *(getattr(LogExpReading, name).label(key) for key, name in AGGREGATE_METRICS),
         )
+        .where(LogExpReading.timestamp >= _cutoff_expression(now, window_seconds, dialect))
+        .cte("analytics_window")
+    )
+
+    columns: List[Any] = [
+        func.count().label("count"),
+        func.min(window.c.timestamp).label("first_timestamp"),
+        func.max(window.c.timestamp).label("last_timestamp"),
+    ]
+    for key, _ in AGGREGATE_METRICS:
+        col = window.c[key]
+        columns += [
+            func.avg(sql_cast(col, Float)).label(f"{key}_avg"),
+            func.min(col).label(f"{key}_min"),
+            func.max(col).label(f"{key}_max"),
+        ]
+        if dialect == "postgresql":
+            columns.append(func.stddev_pop(sql_cast(col, Float)).label(f"{key}_stddev"))
 
-        return rows
+    stmt = select(*columns).select_from(window)
 
+    if dialect != "postgresql":
+        stats = stmt.subquery("window_stats")
+        spreads = []
+        for key, _ in AGGREGATE_METRICS:
+            deviation = sql_cast(window.c[key], Float) - stats.c[f"{key}_avg"]
+            variance = select(func.avg(deviation * deviation)).select_from(window)
+            spreads.append(variance.scalar_subquery().label(f"{key}_variance"))
+        stmt = select(stats, *spreads)
+
+    try:
+        row = session.execute(stmt).one()
     except OperationalError as exc:
         if "no such table" in str(exc):
             logger.debug(
                 "analytics_window_no_table",
                 extra={"error": str(exc)},
             )
-            return []
+            return None
         raise
 
+    if not row.count:
+        return None
+
+    summary: Dict[str, Any] = {
+        "count": row.count,
+        "first_timestamp": row.first_timestamp,
+        "last_timestamp": row.last_timestamp,
+    }
+    for key, _ in AGGREGATE_METRICS:
+        summary[key] = {
+            "avg": float(getattr(row, f"{key}_avg")),
+            "min": getattr(row, f"{key}_min"),
+            "max": getattr(row, f"{key}_max"),
+            "stddev": (
+                float(getattr(row, f"{key}_stddev"))
+                if dialect == "postgresql"
+                else math.sqrt(getattr(row, f"{key}_variance"))
+            ),
+        }
+
+    logger.debug(
+        "analytics_window_aggregated",
+        extra={"count": row.count, "window_seconds": window_seconds},
+    )
+
+    return summary
+
 
 def run_analytics(
     db_session: Any = None,
@@ -116,33 +279,105 @@ def run_analytics(
 
     logger.info("analytics_start")
 
-    readings = compute_window(now=now, db_session=db_session)
+    # Long windows are answered from the rollup tables instead of raw rows.
+    window_seconds = int(current_app.config["ANALYTICS_WINDOW_SECONDS"])
+    min_rollup_seconds = int(current_app.config.get("ANALYTICS_ROLLUP_MIN_SECONDS", 3600))
+    use_rollups = window_seconds >= min_rollup_seconds and current_app.config.get(
+        "ROLLUPS_ENABLED", True
+    )
+
+    if now is not None:
+        result = _compute_analytics(db_session, now, window_seconds, use_rollups)
+    else:
+        # The window ends at MAX(timestamp), so it only moves on ingest.
+        result = cached_analytics(
+            "run_analytics",
+            lambda: _compute_analytics(db_session, None, window_seconds, use_rollups),
+            window_seconds=window_seconds,
+            resolution="rollup" if use_rollups else "raw",
+        )
+
+    logger.info("analytics_complete")
+    return result
+
 
-    if not readings:
+def _compute_analytics(
+    db_session: Any,
+    now: Optional[datetime],
+    window_seconds: int,
+    use_rollups: bool,
+) -> Optional[Dict[str, Any]]:
+    if use_rollups:
+        return _run_analytics_from_rollups(db_session, now, window_seconds)
+
+    summary = aggregate_window(now=now, db_session=db_session)
+
+    if summary is None:
         logger.debug("analytics_no_readings")
-        logger.info("analytics_complete")
         return None
 
-    cps_values = [r.counts_per_second for r in readings]
-    count = len(cps_values)
-    avg_cps = sum(cps_values) / count
+    result: Dict[str, Any] = {
+        "count": summary["count"],
+        "avg_cps": summary["cps"]["avg"],
+        "first_timestamp": summary["first_timestamp"],
+        "last_timestamp": summary["last_timestamp"],
+    }
+
+    logger.debug(
+        "analytics_metrics_computed",
+        extra={
+            "count": result["count"],
+            "avg_cps": result["avg_cps"],
+            "first_timestamp": str(result["first_timestamp"]),
+            "last_timestamp": str(result["last_timestamp"]),
+        },
+    )
+
+    return result
+
+
+def _run_analytics_from_rollups(
+    db_session: Any,
+    now: Optional[datetime],
+    window_seconds: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Same result as the raw-row path, computed by summarize_range() over
+    [now - window, now]; `now` defaults to MAX(timestamp) as in compute_window.
+    """
+    from .rollups import summarize_range
+
+    session = db_session or db.session
+
+    if now is None:
+        now = session.query(func.max(LogExpReading.timestamp)).scalar()
+        if now is None:
+            logger.debug("analytics_no_readings")
+            return None
+
+    cutoff = now - timedelta(seconds=window_seconds)
+    summary = summarize_range(cutoff, now, db_session=session)
+
+    if not summary["count"]:
+        logger.debug("analytics_no_readings")
+        return None
 
     result: Dict[str, Any] = {
-        "count": count,
-        "avg_cps": avg_cps,
-        "first_timestamp": readings[0].timestamp,
-        "last_timestamp": readings[-1].timestamp,
+        "count": summary["count"],
+        "avg_cps": summary["cps"]["avg"],
+        "first_timestamp": summary["first_timestamp"],
+        "last_timestamp": summary["last_timestamp"],
     }
 
     logger.debug(
         "analytics_metrics_computed",
         extra={
-            "count": count,
-            "avg_cps": avg_cps,
-            "first_timestamp": str(readings[0].timestamp),
-            "last_timestamp": str(readings[-1].timestamp),
+            "count": result["count"],
+            "avg_cps": result["avg_cps"],
+            "first_timestamp": str(result["first_timestamp"]),
+            "last_timestamp": str(result["last_timestamp"]),
+            "resolution": summary["resolution"],
         },
     )
 
-    logger.info("analytics_complete")
     return result
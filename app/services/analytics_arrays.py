@@ -0,0 +1,289 @@
+# filename: logexp/app/services/analytics_arrays.py
+"""
+Array-backed analytics over logexp_readings.
+
+load_reading_arrays() pulls the numeric columns of a reading range straight
+from SQL into NumPy arrays, without building ORM objects or per-row
+datetimes:
+
+    timestamps_ns   int64 epoch nanoseconds (UTC)
+    cps, cpm        int64
+    usv             float64
+
+Timestamps are converted in bulk: PostgreSQL returns epoch microseconds
+computed in SQL, SQLite returns the stored ISO text, which NumPy parses as
+datetime64 in one call.
+
+The kernels below take any 1-D array-like and are fully vectorized:
+
+    ema / ema_last      exponential moving average (scipy.signal.lfilter
+                        when SciPy is installed, otherwise a blocked
+                        cumulative-sum formulation)
+    rolling_mean/std    fixed-count windows from prefix sums
+    percentiles         np.percentile
+    histogram           np.histogram
+
+analytics_utils keeps its list-based API as thin wrappers over these.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import BigInteger, String, cast, extract, func, select
+
+from ..extensions import db
+from ..logging_setup import get_logger
+from ..models import LogExpReading
+
+logger = get_logger("beamfoundry.analytics")
+
+try:
+    from scipy.signal import lfilter as _lfilter
+except ImportError:  # SciPy is optional
+    _lfilter = None
+
+# log(2 ** -60): EMA weights below this are dropped by ema_last().
+_EMA_NEGLIGIBLE = -60 * math.log(2.0)
+
+# Largest block for the cumulative EMA such that (1 - alpha) ** -block stays
+# comfortably inside float64 range.
+_EMA_MAX_EXPONENT = 600.0
+
+
+@dataclass(frozen=True)
+class ReadingArrays:
+    """
+    Column arrays for a range of readings, in ascending time order.
+    """
+
+    timestamps_ns: Any
+    cps: Any
+    cpm: Any
+    usv: Any
+
+    def __len__(self) -> int:
+        return int(self.timestamps_ns.shape[0])
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+
+def _timestamp_column(dialect: str) -> Any:
+    if dialect == "postgresql":
+        epoch_us = func.round(extract("epoch", LogExpReading.timestamp) * 1_000_000)
+        return cast(epoch_us, BigInteger)
+    # SQLite stores "YYYY-MM-DD HH:MM:SS.ffffff" (UTC); read it as text.
+    return cast(LogExpReading.timestamp, String)
+
+
+def _timestamps_to_ns(values: Sequence[Any], dialect: str) -> Any:
+    if dialect == "postgresql":
+        return np.asarray(values, dtype=np.int64) * 1000
+    return np.asarray(values, dtype="datetime64[ns]").astype(np.int64)
+
+
+def load_reading_arrays(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    device_id: Optional[str] = None,
+    db_session: Any = None,
+    batch_size: int = 50000,
+) -> ReadingArrays:
+    """
+    Readings with since <= timestamp <= until (open bounds default to all
+    data) as column arrays, in ascending time order.
+    """
+    session = db_session or db.session
+    dialect = session.get_bind().dialect.name
+    r = LogExpReading
+
+    stmt = select(
+        _timestamp_column(dialect),
+        r.counts_per_second,
+        r.counts_per_minute,
+        r.microsieverts_per_hour,
+    ).order_by(r.timestamp, r.id)
+    if since is not None:
+        stmt = stmt.where(r.timestamp >= since)
+    if until is not None:
+        stmt = stmt.where(r.timestamp <= until)
+    if device_id is not None:
+        stmt = stmt.where(r.device_id == device_id)
+
+    # Converted partition by partition, so at most batch_size rows exist as
+    # Python objects at once.
+    result = session.connection().execute(stmt.execution_options(yield_per=batch_size))
+    chunks: List[Tuple[Any, Any, Any, Any]] = []
+    for rows in result.partitions():
+        ts, cps, cpm, usv = zip(*rows)
+        chunks.append(
+            (
+                _timestamps_to_ns(ts, dialect),
+                np.asarray(cps, dtype=np.int64),
+                np.asarray(cpm, dtype=np.int64),
+                np.asarray(usv, dtype=np.float64),
+            )
+        )
+
+    if chunks:
+        columns = [np.concatenate(parts) for parts in zip(*chunks)]
+    else:
+        columns = [np.empty(0, dtype=np.int64)] * 3 + [np.empty(0, dtype=np.float64)]
+
+    arrays = ReadingArrays(timestamps_ns=columns[0], cps=columns[1], cpm=columns[2], usv=columns[3])
+
+    logger.debug("analytics_arrays_loaded", extra={"count": len(arrays)})
+    return arrays
+
+
+# ---------------------------------------------------------------------------
+# Kernels
+# ---------------------------------------------------------------------------
+
+
+def _as_float(values: Any) -> Any:
+    return np.asarray(values, dtype=np.float64)
+
+
+def ema_last(values: Sequence[float], alpha: float) -> Optional[float]:
+    """
+    Final value of the EMA seeded with the first value, i.e. what the loop
+    ema = alpha * v + (1 - alpha) * ema ends with. Each value's weight is
+    alpha * (1 - alpha) ** age, so only the samples whose weight is still
+    above 2**-60 are read (and converted, for lists).
+    """
+    n = len(values)
+    if n == 0:
+        return None
+
+    decay = 1.0 - alpha
+    tail = n
+    if 0.0 < decay < 1.0:
+        tail = min(n, int(math.ceil(_EMA_NEGLIGIBLE / math.log(decay))) + 1)
+    weights = decay ** np.arange(tail - 1, -1, -1, dtype=np.float64)
+    weights[1:] *= alpha
+    if tail < n:
+        # The oldest sample read is not the seed, so it is weighted too.
+        weights[0] *= alpha
+    return float(np.dot(weights, _as_float(values[n - tail :])))
+
+
+def ema(values: Any, alpha: float) -> Any:
+    """
+    The full EMA series, ema[0] = values[0].
+    """
+    x = _as_float(values)
+    if x.shape[0] == 0:
+        return x
+
+    if _lfilter is not None:
+        # y[n] = alpha * x[n] + (1 - alpha) * y[n - 1], started from y[0] = x[0].
+        out, _ = _lfilter([alpha], [1.0, alpha - 1.0], x[1:], zi=[(1.0 - alpha) * x[0]])
+        return np.concatenate((x[:1], out))
+    return _ema_cumulative(x, alpha)
+
+
+def _ema_cumulative(x: Any, alpha: float) -> Any:
+    """
+    EMA without a per-sample loop: within a block starting at y0,
+    y[k] = d**k * (y0 + alpha * cumsum(x[j] / d**j)[k]) with d = 1 - alpha.
+    Blocks are short enough that d**-k cannot overflow; the last value of
+    each block seeds the next.
+    """
+    decay = 1.0 - alpha
+    out = np.empty_like(x)
+    out[0] = x[0]
+    if decay <= 0.0:
+        out[1:] = x[1:]
+        return out
+    if decay >= 1.0:
+        out[1:] = x[0]
+        return out
+
+    block = max(1, int(_EMA_MAX_EXPONENT / -np.log(decay)))
+    prev = x[0]
+    start = 1
+    while start < x.shape[0]:
+        chunk = x[start : start + block]
+        powers = decay ** np.arange(1, chunk.shape[0] + 1, dtype=np.float64)
+        out[start : start + chunk.shape[0]] = powers * (prev + alpha * np.cumsum(chunk / powers))
+        prev = out[start + chunk.shape[0] - 1]
+        start += block
+    return out
+
+
+def rolling_mean(values: Any, window: int) -> Any:
+    """
+    Means of every full window of `window` consecutive values
+    (length n - window + 1).
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    x = _as_float(values)
+    if x.shape[0] < window:
+        return np.empty(0)
+    c = np.concatenate(([0.0], np.cumsum(x)))
+    return (c[window:] - c[:-window]) / window
+
+
+def rolling_std(values: Any, window: int, ddof: int = 0) -> Any:
+    """
+    Standard deviations of every full window, aligned with rolling_mean().
+    Values are centred on the overall mean first, which keeps the prefix
+    sums of squares from cancelling catastrophically.
+    """
+    if window - ddof < 1:
+        raise ValueError("window must be larger than ddof")
+    x = _as_float(values)
+    if x.shape[0] < window:
+        return np.empty(0)
+    x = x - x.mean()
+    c1 = np.concatenate(([0.0], np.cumsum(x)))
+    c2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    s1 = c1[window:] - c1[:-window]
+    s2 = c2[window:] - c2[:-window]
+    var = (s2 - s1 * s1 / window) / (window - ddof)
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+def percentiles(values: Any, qs: Sequence[float] = (50.0, 90.0, 99.0)) -> Dict[float, float]:
+    """
+    {q: value} for each percentile q in [0, 100] (linear interpolation).
+    Empty input gives an empty dict.
+    """
+    x = _as_float(values)
+    if x.shape[0] == 0:
+        return {}
+    return {float(q): float(v) for q, v in zip(qs, np.percentile(x, qs))}
+
+
+def histogram(
+    values: Any, bins: Any = 20, value_range: Optional[Tuple[float, float]] = None
+) -> Tuple[Any, Any]:
+    """
+    (counts, bin_edges) as np.histogram returns them.
+    """
+    return np.histogram(_as_float(values), bins=bins, range=value_range)
+
+
+def summarize_arrays(arrays: ReadingArrays) -> Dict[str, Any]:
+    """
+    Count, CPS min/max/avg and first/last epoch-ns timestamp of a range.
+    """
+    if len(arrays) == 0:
+        return {"count": 0}
+    return {
+        "count": len(arrays),
+        "first_timestamp_ns": int(arrays.timestamps_ns[0]),
+        "last_timestamp_ns": int(arrays.timestamps_ns[-1]),
+        "min_cps": int(arrays.cps.min()),
+        "max_cps": int(arrays.cps.max()),
+        "avg_cps": float(arrays.cps.mean()),
+    }
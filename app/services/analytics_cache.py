@@ -0,0 +1,159 @@
+# filename: logexp/app/services/analytics_cache.py
+"""
+In-process cache for analytics results.
+
+Dashboard and diagnostics requests recompute the same window summary on
+every hit although at most one reading arrives per poll interval. Results
+are cached per application under
+
+    (name, window_seconds, device_id, resolution)
+
+and stay valid while both hold:
+
+    - the entry is younger than ANALYTICS_CACHE_TTL_SECONDS (windows that
+      end at "now" move even without new readings), and
+    - no readings were ingested since it was computed: every ingestion
+      commit calls bump_generation(), and an entry is only served while
+      the generation it was computed under is current.
+
+A TTL of 0 disables caching. Cached values are shared between callers and
+must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from flask import current_app, has_app_context
+
+from ..logging_setup import get_logger
+
+logger = get_logger("beamfoundry.analytics_cache")
+
+T = TypeVar("T")
+
+_EXTENSION_KEY = "logexp_analytics_cache"
+
+CacheKey = Tuple[str, int, Optional[str], Hashable]
+
+# (generation computed under, monotonic expiry, value)
+_Entry = Tuple[int, float, Any]
+
+
+class AnalyticsCache:
+    """
+    TTL + generation keyed result cache. Thread-safe; values are computed
+    outside the lock, so a slow query never blocks other lookups.
+    """
+
+    def __init__(self, ttl_seconds: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[CacheKey, _Entry] = {}
+        self._generation = 0
+        self._counters = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get_or_compute(self, key: CacheKey, compute: Callable[[], T]) -> T:
+        """
+        The cached value for key, or compute() (stored for later lookups).
+        """
+        if self.ttl_seconds <= 0:
+            return compute()
+
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self._generation and entry[1] > now:
+                self._counters["hits"] += 1
+                return entry[2]
+            self._counters["misses"] += 1
+            generation = self._generation
+
+        value = compute()
+
+        with self._lock:
+            # An ingest that landed while computing leaves the entry already
+            # stale under the old generation; the next lookup recomputes it.
+            self._entries[key] = (generation, self._clock() + self.ttl_seconds, value)
+
+        logger.debug(
+            "analytics_cache_stored",
+            extra={"key": repr(key), "generation": generation},
+        )
+        return value
+
+    def bump_generation(self) -> int:
+        """
+        Invalidate every entry (called after readings are committed).
+        """
+        with self._lock:
+            self._generation += 1
+            self._counters["invalidations"] += 1
+            self._entries.clear()
+            return self._generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "enabled": self.ttl_seconds > 0,
+                "ttl_seconds": self.ttl_seconds,
+                "generation": self._generation,
+                "entries": len(self._entries),
+                **self._counters,
+                "hit_ratio": (self._counters["hits"] / lookups) if lookups else None,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Per-application access
+# ---------------------------------------------------------------------------
+
+
+def get_analytics_cache(app: Any = None) -> AnalyticsCache:
+    """
+    The cache of `app` (default: current_app), created on first use.
+    """
+    app = app or current_app._get_current_object()
+    cache = app.extensions.get(_EXTENSION_KEY)
+    if cache is None:
+        ttl = float(app.config.get("ANALYTICS_CACHE_TTL_SECONDS", 5.0))
+        cache = app.extensions.setdefault(_EXTENSION_KEY, AnalyticsCache(ttl_seconds=ttl))
+    return cache
+
+
+def cached_analytics(
+    name: str,
+    compute: Callable[[], T],
+    *,
+    window_seconds: int,
+    device_id: Optional[str] = None,
+    resolution: Hashable = None,
+) -> T:
+    """
+    get_or_compute() on the current app's cache under
+    (name, window_seconds, device_id, resolution).
+    """
+    return get_analytics_cache().get_or_compute(
+        (name, window_seconds, device_id, resolution), compute
+    )
+
+
+def bump_generation() -> None:
+    """
+    Mark cached analytics stale after new readings were committed. A no-op
+    outside an application context.
+    """
+    if has_app_context():
+        get_analytics_cache().bump_generation()
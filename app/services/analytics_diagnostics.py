@@ -7,7 +7,8 @@ from typing import Any, Dict
 from flask import current_app
 
 from ..logging_setup import get_logger
-from ..services.analytics_readings import load_recent_readings, summarize_readings
+from ..services.analytics_cache import cached_analytics, get_analytics_cache
+from ..services.analytics_readings import load_recent_reading_rows, summarize_readings
 
 logger = get_logger("beamfoundry.analytics_diagnostics")
 
@@ -16,7 +17,7 @@ def run_analytics_diagnostics() -> Dict[str, Any]:
     window_seconds: int = current_app.config.get("ANALYTICS_WINDOW_SECONDS", 60)
     window_minutes: int = window_seconds // 60
 
-    readings = load_recent_readings(window_seconds)
+    readings = load_recent_reading_rows(window_seconds)
     summary = summarize_readings(readings)
 
     # Convert datetimes (or None) to ISO strings
@@ -41,4 +42,14 @@ def run_analytics_diagnostics() -> Dict[str, Any]:
 
 
 def get_analytics_status() -> Dict[str, Any]:
-    return run_analytics_diagnostics()
+    window_seconds: int = current_app.config.get("ANALYTICS_WINDOW_SECONDS", 60)
+    status = dict(
+        cached_analytics(
+            "analytics_diagnostics",
+            run_analytics_diagnostics,
+            window_seconds=window_seconds,
+            resolution="raw",
+        )
+    )
+    status["cache"] = get_analytics_cache().stats()
+    return status
@@ -4,47 +4,113 @@ from __future__ import annotations
 
 import csv
 from io import StringIO
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator, Optional, Sequence, Tuple
 
 from ..logging_setup import get_logger
 
 logger = get_logger("beamfoundry.analytics")
 
+CSV_FIELDS: Tuple[str, ...] = (
+    "timestamp",
+    "counts_per_second",
+    "counts_per_minute",
+    "microsieverts_per_hour",
+    "mode",
+    "device_id",
+)
 
-def export_readings_to_csv(readings: Iterable[Any]) -> str:
+# Columns that may be requested via ?fields= but are not exported by default.
+CSV_OPTIONAL_FIELDS: Tuple[str, ...] = ("id",)
+
+
+def parse_csv_fields(raw: Optional[str]) -> Tuple[str, ...]:
     """
-    Export readings to CSV for download.
+    Parse a comma-separated ?fields= argument into an ordered column list.
 
-    Each reading is expected to have:
-        - timestamp: datetime with .isoformat()
-        - counts_per_second: numeric
+    Raises:
+        ValueError: if an unknown column is requested.
+    """
+    if not raw:
+        return CSV_FIELDS
 
-    Args:
-        readings: Iterable of ORM reading objects.
+    fields = tuple(f.strip() for f in raw.split(",") if f.strip())
+    allowed = CSV_FIELDS + CSV_OPTIONAL_FIELDS
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown CSV field(s): {', '.join(unknown)}")
+    if not fields:
+        raise ValueError("At least one CSV field is required")
 
-    Returns:
-        str: CSV-formatted string.
+    return fields
+
+
+def iter_readings_csv(
+    readings: Iterable[Any],
+    fields: Sequence[str] = CSV_FIELDS,
+    chunk_rows: int = 2000,
+) -> Iterator[str]:
     """
-    readings_list = list(readings)
+    Encode readings as CSV, yielding the header and then one string per
+    chunk_rows rows.
 
-    logger.debug(
-        "analytics_export_start",
-        extra={"row_count": len(readings_list)},
-    )
+    Each reading may be an ORM object or a Row tuple; only the requested
+    attributes are read. Timestamps are written as ISO8601.
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(fields)
+    yield _drain(buffer)
 
-    output = StringIO()
-    writer = csv.writer(output)
+    ts_index = list(fields).index("timestamp") if "timestamp" in fields else -1
+    pending = 0
+    total = 0
 
-    writer.writerow(["timestamp", "counts_per_second"])
+    for r in readings:
+        values = [getattr(r, f) for f in fields]
+        if ts_index >= 0:
+            values[ts_index] = values[ts_index].isoformat()
+        writer.writerow(values)
 
-    for r in readings_list:
-        writer.writerow([r.timestamp.isoformat(), r.counts_per_second])
+        pending += 1
+        if pending >= chunk_rows:
+            total += pending
+            pending = 0
+            yield _drain(buffer)
 
-    csv_data = output.getvalue()
+    total += pending
+    if pending:
+        yield _drain(buffer)
 
     logger.debug(
         "analytics_export_complete",
-        extra={"bytes": len(csv_data)},
+        extra={"row_count": total, "fields": list(fields)},
     )
 
-    return csv_data
+
+def _drain(buffer: StringIO) -> str:
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    return data
+
+
+def export_readings_to_csv(
+    readings: Iterable[Any],
+    fields: Sequence[str] = CSV_FIELDS,
+) -> str:
+    """
+    Export readings to a single CSV string.
+
+    Convenience wrapper around iter_readings_csv() for small, in-memory
+    result sets. Download endpoints should stream iter_readings_csv()
+    directly instead.
+
+    Args:
+        readings: Iterable of ORM reading objects or Row tuples.
+        fields: Columns to export, in order.
+
+    Returns:
+        str: CSV-formatted string.
+    """
+    return "".join(iter_readings_csv(readings, fields))
@@ -0,0 +1,204 @@
+# filename: logexp/app/services/analytics_export_arrow.py
+"""
+Columnar (Arrow IPC / Parquet) export of logexp_readings.
+
+Rows arrive as plain column tuples straight from the DB cursor (see
+readings_stream.iter_reading_rows) and are packed into Arrow record batches
+of batch_rows rows each. Every batch is encoded and handed to the response
+as soon as it is complete, so memory is bounded by one batch.
+
+Column encoding:
+    - timestamp: timestamp[us, tz=UTC], i.e. int64 epoch-microseconds with
+      a logical type pandas maps directly onto datetime64[us, UTC]
+    - mode, device_id: dictionary<int32, string>; the dictionary grows
+      across batches and is emitted as IPC dictionary deltas
+    - counts/doses: int64 / float64
+
+pyarrow is an optional dependency. Callers should check arrow_available()
+before offering these formats.
+"""
+
+from __future__ import annotations
+
+import io
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from ..logging_setup import get_logger
+
+logger = get_logger("beamfoundry.analytics")
+
+# format name → (mimetype, file extension)
+COLUMNAR_FORMATS: Dict[str, tuple[str, str]] = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+DICTIONARY_FIELDS = ("mode", "device_id")
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _arrow_type(field: str) -> Any:
+    import pyarrow as pa
+
+    types: Dict[str, Any] = {
+        "id": pa.int64(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "counts_per_second": pa.int64(),
+        "counts_per_minute": pa.int64(),
+        "microsieverts_per_hour": pa.float64(),
+        "mode": pa.dictionary(pa.int32(), pa.string()),
+        "device_id": pa.dictionary(pa.int32(), pa.string()),
+    }
+    return types[field]
+
+
+def reading_schema(fields: Sequence[str]) -> Any:
+    import pyarrow as pa
+
+    return pa.schema([pa.field(f, _arrow_type(f)) for f in fields])
+
+
+class _GrowingDictionary:
+    """
+    Dictionary encoder whose dictionary only ever grows.
+
+    Each batch references the full dictionary seen so far, which keeps
+    earlier indices valid and lets the IPC writer emit deltas instead of
+    replacing the dictionary.
+    """
+
+    def __init__(self) -> None:
+        self._index: Dict[Optional[str], int] = {}
+        self._values: List[str] = []
+
+    def encode(self, values: Sequence[Optional[str]]) -> Any:
+        import pyarrow as pa
+
+        indices: List[Optional[int]] = []
+        for v in values:
+            if v is None:
+                indices.append(None)
+                continue
+            idx = self._index.get(v)
+            if idx is None:
+                idx = self._index[v] = len(self._values)
+                self._values.append(v)
+            indices.append(idx)
+
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=pa.int32()),
+            pa.array(self._values, type=pa.string()),
+        )
+
+
+def iter_record_batches(
+    rows: Iterable[Any],
+    fields: Sequence[str],
+    batch_rows: int = 65536,
+) -> Iterator[Any]:
+    """
+    Pack row tuples into Arrow record batches of at most batch_rows rows.
+    """
+    import pyarrow as pa
+
+    schema = reading_schema(fields)
+    encoders = {f: _GrowingDictionary() for f in fields if f in DICTIONARY_FIELDS}
+    iterator = iter(rows)
+
+    while True:
+        chunk = list(islice(iterator, batch_rows))
+        if not chunk:
+            return
+
+        arrays = []
+        for f in fields:
+            values = [getattr(r, f) for r in chunk]
+            encoder = encoders.get(f)
+            if encoder is not None:
+                arrays.append(encoder.encode(values))
+            else:
+                arrays.append(pa.array(values, type=_arrow_type(f)))
+
+        yield pa.record_batch(arrays, schema=schema)
+
+
+class _DrainableSink(io.RawIOBase):
+    """
+    Write-only file object whose buffered bytes can be drained between
+    batches and handed to a streaming response.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._buffer += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def iter_readings_arrow(
+    rows: Iterable[Any],
+    fields: Sequence[str],
+    batch_rows: int = 65536,
+) -> Iterator[bytes]:
+    """
+    Encode readings as an Arrow IPC stream, one chunk per record batch.
+    """
+    import pyarrow as pa
+
+    sink = _DrainableSink()
+    options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+    writer = pa.ipc.new_stream(sink, reading_schema(fields), options=options)
+
+    total = 0
+    for batch in iter_record_batches(rows, fields, batch_rows):
+        writer.write_batch(batch)
+        total += batch.num_rows
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+    logger.debug("analytics_export_arrow_complete", extra={"row_count": total})
+
+
+def iter_readings_parquet(
+    rows: Iterable[Any],
+    fields: Sequence[str],
+    batch_rows: int = 65536,
+) -> Iterator[bytes]:
+    """
+    Encode readings as Parquet, writing one row group per record batch.
+    """
+    import pyarrow.parquet as pq
+
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, reading_schema(fields), compression="zstd")
+
+    total = 0
+    for batch in iter_record_batches(rows, fields, batch_rows):
+        writer.write_batch(batch, row_group_size=batch.num_rows)
+        total += batch.num_rows
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+    logger.debug("analytics_export_parquet_complete", extra={"row_count": total})
@@ -10,9 +10,10 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Iterable, List, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 
 from ..extensions import db
+from ..metrics import DB_ROWS_RETURNED
 from ..models import Reading
 
 
@@ -27,12 +28,36 @@ def load_recent_readings(window_seconds: int) -> List[Reading]:
     stmt = select(Reading).filter(Reading.timestamp >= cutoff).order_by(Reading.timestamp.asc())
 
     readings: Sequence[Reading] = db.session.execute(stmt).scalars().all()
+    DB_ROWS_RETURNED.labels("recent_readings").observe(len(readings))
     return list(readings)
 
 
-def summarize_readings(readings: Iterable[Reading]) -> Dict[str, Any]:
+def load_recent_reading_rows(
+    window_seconds: int,
+    columns: Sequence[str] = ("timestamp", "counts_per_second"),
+) -> List[Row[Any]]:
     """
-    Compute JSON‑safe summary statistics for a list of Reading objects.
+    Like load_recent_readings(), but only the named columns, as Row tuples
+    (attribute access by column name still works).
+    """
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=window_seconds)
+
+    stmt = (
+        select(*(getattr(Reading, name) for name in columns))
+        .filter(Reading.timestamp >= cutoff)
+        .order_by(Reading.timestamp.asc())
+    )
+
+    rows = list(db.session.execute(stmt).all())
+    DB_ROWS_RETURNED.labels("recent_reading_rows").observe(len(rows))
+    return rows
+
+
+def summarize_readings(readings: Iterable[Any]) -> Dict[str, Any]:
+    """
+    Compute JSON‑safe summary statistics for a list of Reading objects (or
+    rows with timestamp and counts_per_second).
 
     Returns:
         {
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
 
 from ..logging_setup import get_logger
+from .analytics_arrays import ema_last
 
 logger = get_logger("beamfoundry.analytics")
 
@@ -12,19 +16,17 @@ logger = get_logger("beamfoundry.analytics")
 def moving_average(values: Iterable[float], smoothing_factor: float) -> Optional[float]:
     """
     Compute an exponential moving average (EMA) over a list of numeric values.
+    Vectorized via analytics_arrays.ema_last(); pass NumPy arrays for long series.
     """
-    values_list: List[float] = list(values)
-    if not values_list:
+    values_seq = values if isinstance(values, (Sequence, np.ndarray)) else list(values)
+    ema = ema_last(values_seq, smoothing_factor)
+    if ema is None:
         logger.debug("analytics_utils_moving_average_empty")
         return None
 
-    ema: float = values_list[0]
-    for v in values_list[1:]:
-        ema = (smoothing_factor * v) + ((1 - smoothing_factor) * ema)
-
     logger.debug(
         "analytics_utils_moving_average_computed",
-        extra={"count": len(values_list), "ema": ema},
+        extra={"count": len(values_seq), "ema": ema},
     )
 
     return ema
@@ -32,18 +34,20 @@ def moving_average(values: Iterable[float], smoothing_factor: float) -> Optional
 
 def average(values: Iterable[float]) -> Optional[float]:
     """
-    Simple arithmetic mean.
+    Simple arithmetic mean (NumPy; pass arrays for long series).
     """
-    values_list: List[float] = list(values)
-    if not values_list:
+    arr = np.asarray(
+        values if isinstance(values, (Sequence, np.ndarray)) else list(values), dtype=np.float64
+    )
+    if not len(arr):
         logger.debug("analytics_utils_average_empty")
         return None
 
-    avg = sum(values_list) / len(values_list)
+    avg = float(arr.mean())
 
     logger.debug(
         "analytics_utils_average_computed",
-        extra={"count": len(values_list), "average": avg},
+        extra={"count": len(arr), "average": avg},
     )
 
     return avg
@@ -53,8 +57,7 @@ def extract_field(readings: Iterable[Any], field: str) -> List[Any]:
     """
     Extract a numeric field from a list of ORM objects.
     """
-    readings_list = list(readings)
-    extracted = [getattr(r, field) for r in readings_list]
+    extracted = list(map(attrgetter(field), readings))
 
     logger.debug(
         "analytics_utils_extract_field",
@@ -74,12 +77,17 @@ def summarize_readings(readings: Iterable[Any]) -> Dict[str, Any]:
         logger.debug("analytics_utils_summarize_empty")
         return {"count": 0}
 
+    cps = np.fromiter(
+        map(attrgetter("counts_per_second"), readings_list),
+        dtype=np.int64,
+        count=len(readings_list),
+    )
     summary = {
         "count": len(readings_list),
         "first_timestamp": readings_list[0].timestamp,
         "last_timestamp": readings_list[-1].timestamp,
-        "min_cps": min(r.counts_per_second for r in readings_list),
-        "max_cps": max(r.counts_per_second for r in readings_list),
+        "min_cps": int(cps.min()),
+        "max_cps": int(cps.max()),
     }
 
     logger.debug(
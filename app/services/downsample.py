@@ -0,0 +1,112 @@
+# filename: logexp/app/services/downsample.py
+"""
+Visual downsampling of (x, y) series for charts.
+
+Both methods return the indices of the points to keep, always including
+the first and last point, in ascending order, so the caller can pick the
+matching timestamps and values (or any other column) from its own arrays.
+
+    lttb    Largest-Triangle-Three-Buckets (Steinarsson, 2013). Splits the
+            interior into n - 2 equal-count buckets and keeps, per bucket,
+            the point forming the largest triangle with the previously kept
+            point and the average of the next bucket. Preserves the shape
+            of the trace, including isolated peaks.
+    minmax  Keeps the minimum and maximum of each of n / 2 equal-count
+            buckets. Fully vectorized and cheaper than lttb; preserves the
+            envelope exactly but not the shape between extremes.
+
+lttb is sequential across buckets (each choice depends on the previous
+one), but all per-bucket work is NumPy: next-bucket averages come from
+prefix sums and each bucket's triangle areas are one vectorized expression,
+so the Python loop runs n times regardless of the input length.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Tuple
+
+import numpy as np
+
+METHODS: Tuple[str, ...] = ("lttb", "minmax")
+
+
+def _trivial(length: int, n: int) -> Any:
+    if n >= length:
+        return np.arange(length, dtype=np.int64)
+    return np.array([0, length - 1][:n], dtype=np.int64)
+
+
+def lttb_indices(x: Any, y: Any, n: int) -> Any:
+    """
+    Indices of the n points LTTB keeps from the series (x ascending).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    length = len(x)
+    if n >= length or n < 3:
+        return _trivial(length, n)
+
+    # n - 2 interior buckets with boundaries edges[i] .. edges[i + 1].
+    edges = (np.arange(n - 1) * ((length - 2) / (n - 2))).astype(np.int64) + 1
+    edges[-1] = length - 1
+
+    # Average of the bucket after each bucket; the last bucket's "next
+    # bucket" is the final point.
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    lo = edges[1:]
+    hi = np.append(edges[2:], length)
+    next_x = (cx[hi] - cx[lo]) / (hi - lo)
+    next_y = (cy[hi] - cy[lo]) / (hi - lo)
+
+    keep = np.empty(n, dtype=np.int64)
+    keep[0], keep[-1] = 0, length - 1
+    a = 0
+    for i in range(n - 2):
+        start, stop = edges[i], edges[i + 1]
+        xa, ya = x[a], y[a]
+        area = np.abs(
+            (xa - next_x[i]) * (y[start:stop] - ya) - (xa - x[start:stop]) * (next_y[i] - ya)
+        )
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def minmax_indices(y: Any, n: int) -> Any:
+    """
+    Indices of the per-bucket minimum and maximum over n // 2 equal-count
+    buckets (plus the first and last point), at most n indices.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    length = len(y)
+    if n >= length or n < 4:
+        return _trivial(length, n)
+
+    buckets = (n - 2) // 2
+    interior = y[1:-1]
+    size = -(-len(interior) // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[: len(interior)] = interior
+    grid = padded.reshape(buckets, size)
+
+    # Trailing buckets can be all padding when size rounds up.
+    valid = ~np.isnan(grid).all(axis=1)
+    grid = grid[valid]
+    offsets = np.arange(buckets)[valid] * size + 1
+    lows = offsets + np.nanargmin(grid, axis=1)
+    highs = offsets + np.nanargmax(grid, axis=1)
+
+    keep = np.concatenate(([0], lows, highs, [length - 1]))
+    return np.unique(keep)
+
+
+def downsample(x: Any, y: Any, n: int, method: str = "lttb") -> Any:
+    """
+    Indices of at most n points to draw, chosen by method (see METHODS).
+    """
+    if method == "lttb":
+        return lttb_indices(x, y, n)
+    if method == "minmax":
+        return minmax_indices(y, n)
+    raise ValueError(f"Unknown downsampling method: {method!r}")
@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Any, Dict, Optional, cast
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
 
 from flask import current_app
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
 
 from ..extensions import db
-from ..logging_setup import get_logger
-from ..models import LogExpReading
+from ..logging_setup import get_lazy_logger
+from ..metrics import INGEST_COMMIT_SECONDS, INGEST_ROWS
+from ..models import INT32_MAX, LogExpReading
+from ..schemas import ReadingCreate
+from ..timestamps import coerce_timestamp
 from ..typing import LogExpFlask
+from .analytics_cache import bump_generation
+from .readings_broker import publish_reading, publish_readings, stream_clients_connected
+from .rollups import record_rollups
 
-logger = get_logger("logexp.ingestion")
+logger = get_lazy_logger("logexp.ingestion")
 
 
 def get_config() -> Dict[str, Any]:
@@ -20,39 +28,6 @@ def get_config() -> Dict[str, Any]:
     return app.config_obj
 
 
-def _normalize_timestamp(raw: Any) -> datetime:
-    """
-    Convert incoming timestamps into canonical UTC-aware datetime objects.
-
-    Supported formats:
-      - float/int epoch seconds
-      - ISO8601 strings
-      - datetime objects (naive or aware)
-      - None → now()
-    """
-    if raw is None:
-        return datetime.now(timezone.utc)
-
-    # float/int epoch seconds
-    if isinstance(raw, (int, float)):
-        return datetime.fromtimestamp(raw, tz=timezone.utc)
-
-    # ISO8601 string
-    if isinstance(raw, str):
-        dt = datetime.fromisoformat(raw)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
-
-    # datetime object
-    if isinstance(raw, datetime):
-        if raw.tzinfo is None:
-            return raw.replace(tzinfo=timezone.utc)
-        return raw.astimezone(timezone.utc)
-
-    raise TypeError(f"Unsupported timestamp type: {type(raw)}")
-
-
 def ingest_reading(payload: Dict[str, Any]) -> Optional[LogExpReading]:
     logger.info("ingestion_start")
 
@@ -61,10 +36,10 @@ def ingest_reading(payload: Dict[str, Any]) -> Optional[LogExpReading]:
         logger.info("ingestion_skipped", extra={"reason": "disabled"})
         return None
 
-    logger.info("ingestion_payload_received", extra={"payload": payload})
+    logger.debug("ingestion_payload_received", extra={"payload": payload})
 
     try:
-        timestamp = _normalize_timestamp(payload.get("timestamp"))
+        timestamp = coerce_timestamp(payload.get("timestamp"))
 
         reading = LogExpReading(
             counts_per_second=payload["counts_per_second"],
@@ -75,9 +50,13 @@ def ingest_reading(payload: Dict[str, Any]) -> Optional[LogExpReading]:
         )
 
         db.session.add(reading)
-        db.session.commit()
+        with INGEST_COMMIT_SECONDS.labels("single").time():
+            db.session.commit()
+        INGEST_ROWS.labels("single").inc()
+        bump_generation()
+        publish_reading(reading)
 
-        logger.info("ingestion_complete", extra={"id": reading.id})
+        logger.info("ingestion_complete", extra=lambda: {"id": reading.id})
         return reading
 
     except Exception as exc:
@@ -86,6 +65,168 @@ def ingest_reading(payload: Dict[str, Any]) -> Optional[LogExpReading]:
         raise
 
 
+# ---------------------------------------------------------------------------
+# Bulk ingestion
+# ---------------------------------------------------------------------------
+
+
+# Errors caused by the rows themselves. Only these trigger the per-row
+# fallback; anything else (OperationalError, a dropped connection, ...) means
+# the database is unavailable and fails the whole batch.
+_ROW_ERRORS = (IntegrityError, DataError)
+
+
+def _validate_batch_row(payload: Any) -> Dict[str, Any]:
+    """
+    Validate one batch payload and return the column values to insert.
+
+    Raises:
+        ValueError: if the payload is not a valid reading.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("reading must be a JSON object")
+
+    try:
+        validated = ReadingCreate.model_validate(payload)
+        timestamp = coerce_timestamp(payload.get("timestamp"))
+    except ValidationError as exc:
+        fields = ", ".join(str(err["loc"][0]) for err in exc.errors() if err["loc"])
+        raise ValueError(f"invalid field(s): {fields}") from exc
+    except (TypeError, ValueError, OverflowError, OSError) as exc:
+        raise ValueError(f"invalid timestamp: {exc}") from exc
+
+    for field in ("counts_per_second", "counts_per_minute"):
+        if getattr(validated, field) > INT32_MAX:
+            raise ValueError(f"{field} out of range")
+
+    return {
+        "timestamp": timestamp,
+        "counts_per_second": validated.counts_per_second,
+        "counts_per_minute": validated.counts_per_minute,
+        "microsieverts_per_hour": validated.microsieverts_per_hour,
+        "mode": validated.mode,
+        "device_id": validated.device_id,
+    }
+
+
+def _error_kind(exc: Exception) -> str:
+    return "integrity" if isinstance(exc, IntegrityError) else "invalid"
+
+
+def _insert_rows_individually(
+    session: Any,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    errors: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Fallback when the multi-row INSERT is rejected: insert each row inside
+    its own SAVEPOINT so one bad row cannot take the rest of the batch down.
+
+    Returns the rows that were inserted.
+    """
+    stmt = insert(LogExpReading.__table__)
+    inserted: List[Dict[str, Any]] = []
+
+    for index, values in rows:
+        try:
+            with session.begin_nested():
+                session.execute(stmt, values)
+            inserted.append(values)
+        except _ROW_ERRORS as exc:
+            errors.append({"index": index, "error": str(exc.orig), "kind": _error_kind(exc)})
+
+    return inserted
+
+
+def ingest_readings_batch(
+    payloads: Sequence[Any],
+    db_session: Any = None,
+) -> Dict[str, Any]:
+    """
+    Validate and insert many readings in a single transaction.
+
+    Valid rows are written with one multi-row INSERT (SQLAlchemy's
+    insertmanyvalues path, i.e. batched INSERT ... VALUES on Postgres and
+    a single executemany on SQLite) instead of one ORM flush + commit per
+    reading. Invalid rows are reported by their position in ``payloads``
+    and never abort the rest of the batch.
+
+    Database errors that are not about a particular row (the database is
+    unreachable, the connection dropped, ...) roll the batch back and are
+    re-raised, so callers can retry or spool it.
+
+    Returns:
+        {"received": int, "inserted": int, "errors": [{"index", "error", "kind"}]}
+
+    where kind is "invalid" (the row failed validation, or the database
+    rejected its values) or "integrity" (it violated a constraint).
+    """
+    session = db_session or db.session
+
+    config = get_config()
+    if not config.get("INGESTION_ENABLED", True):
+        logger.info("ingestion_skipped", extra={"reason": "disabled"})
+        return {"received": len(payloads), "inserted": 0, "errors": [], "skipped": True}
+
+    logger.info("ingestion_batch_start", extra={"received": len(payloads)})
+
+    rows: List[Tuple[int, Dict[str, Any]]] = []
+    errors: List[Dict[str, Any]] = []
+
+    for index, payload in enumerate(payloads):
+        try:
+            rows.append((index, _validate_batch_row(payload)))
+        except ValueError as exc:
+            errors.append({"index": index, "error": str(exc), "kind": "invalid"})
+
+    inserted = 0
+    if rows:
+        values = [v for _, v in rows]
+        table = LogExpReading.__table__
+        # New ids are only shown by live streams; RETURNING them costs the
+        # insert a noticeable share of its time, so only ask while one is open.
+        returning = (
+            stream_clients_connected()
+            and session.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order
+        )
+        stmt = insert(table)
+        if returning:
+            stmt = stmt.returning(table.c.id, sort_by_parameter_order=True)
+        ids: Optional[List[Any]] = None
+        try:
+            try:
+                result = session.execute(stmt, values)
+                if returning:
+                    ids = list(result.scalars())
+            except _ROW_ERRORS as exc:
+                session.rollback()
+                logger.warning("ingestion_batch_fallback", extra={"error": str(exc.orig)})
+                values = _insert_rows_individually(session, rows, errors)
+                ids = None
+            inserted = len(values)
+
+            record_rollups(session, values)
+            with INGEST_COMMIT_SECONDS.labels("batch").time():
+                session.commit()
+        except Exception as exc:
+            session.rollback()
+            logger.error("ingestion_error", extra={"error": str(exc)})
+            raise
+        INGEST_ROWS.labels("batch").inc(inserted)
+
+        bump_generation()
+        publish_readings(values, ids)
+
+    errors.sort(key=lambda e: e["index"])
+
+    logger.info(
+        "ingestion_batch_complete",
+        extra={"received": len(payloads), "inserted": inserted, "rejected": len(errors)},
+    )
+
+    return {"received": len(payloads), "inserted": inserted, "errors": errors}
+
+
 def load_historical_readings(limit: Optional[int] = None) -> Any:
     from ..models import LogExpReading
 
@@ -0,0 +1,406 @@
+# filename: logexp/app/services/ingestion_queue.py
+"""
+Bounded in-process ingestion queue with a dedicated writer thread.
+
+The poller thread only ever calls put(); a separate writer thread drains the
+queue and commits readings with ingest_readings_batch(), flushing whenever
+batch_size readings are waiting or flush_interval seconds have passed since
+the oldest one arrived. A slow or unavailable database therefore delays the
+writer, never the serial reader.
+
+With a ReadingSpool attached (the default), put() first appends the reading
+to the on-disk spool, so nothing the queue lets go of is lost: readings that
+are dropped, spilled, or part of a failed flush are marked lost in the spool
+and replayed from disk (with (device_id, timestamp) dedup) when the writer is
+idle and the database is reachable again.
+
+When the queue is full, the overflow policy decides what put() does:
+
+    block        wait (up to block_timeout) for space; the only policy under
+                 which the producer can stall
+    drop_oldest  evict the oldest queued reading to make room
+    spill        leave the new reading on disk only; requires a spool
+
+Readings are validated and timestamped on put(), so queueing delay never
+shifts the recorded time.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ..logging_setup import get_logger
+from ..metrics import QUEUE_DEPTH
+from .ingestion_spool import ReadingSpool
+
+logger = get_logger("beamfoundry.ingestion_queue")
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "spill")
+
+# (enqueued_at monotonic, normalized row, spool segment or None)
+_Item = Tuple[float, Dict[str, Any], Optional[int]]
+
+_REPLAY_BACKOFF_MAX = 60.0
+
+# Row errors that replaying would only repeat; every other row error means
+# the reading did not reach the database and goes back to the spool.
+_PERMANENT_ERRORS = ("invalid", "integrity")
+
+
+class IngestionQueue:
+    """
+    Bounded FIFO of reading payloads plus the writer thread that drains it.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        *,
+        maxsize: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow: str = "drop_oldest",
+        spool: Optional[ReadingSpool] = None,
+        block_timeout: Optional[float] = None,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Invalid overflow policy {overflow!r}; expected one of {OVERFLOW_POLICIES}"
+            )
+        if overflow == "spill" and spool is None:
+            raise ValueError("overflow='spill' requires the ingestion spool to be enabled")
+
+        self.app = app
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.spool = spool
+        self.block_timeout = block_timeout
+
+        self._items: Deque[_Item] = deque()
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._replay_failures = 0
+        self._replay_not_before = 0.0
+
+        self._counters: Dict[str, int] = {
+            "enqueued": 0,
+            "written": 0,
+            "rejected": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "batches": 0,
+            "failed_batches": 0,
+        }
+        self._high_water = 0
+        self._last_flush_at: Optional[datetime] = None
+        self._last_flush_rows = 0
+        self._flush_ms_last: Optional[float] = None
+        self._flush_ms_max = 0.0
+        self._flush_ms_total = 0.0
+        self._latency_ms_last: Optional[float] = None
+        self._latency_ms_max = 0.0
+
+    @classmethod
+    def from_config(cls, app: Any) -> "IngestionQueue":
+        config = app.config_obj
+        spool = ReadingSpool.from_config(app) if config["INGESTION_SPOOL_ENABLED"] else None
+        return cls(
+            app,
+            maxsize=int(config["INGESTION_QUEUE_MAXSIZE"]),
+            batch_size=int(config["INGESTION_QUEUE_BATCH_SIZE"]),
+            flush_interval=float(config["INGESTION_QUEUE_FLUSH_SECONDS"]),
+            overflow=config["INGESTION_QUEUE_OVERFLOW"],
+            spool=spool,
+        )
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def put(self, payload: Dict[str, Any]) -> bool:
+        """
+        Enqueue one reading. Returns False if it was rejected, or if it was
+        not queued (dropped, or left in the spool for replay).
+        """
+        from .ingestion import _validate_batch_row
+
+        payload = dict(payload)
+        payload.setdefault("timestamp", datetime.now(timezone.utc))
+        try:
+            row = _validate_batch_row(payload)
+        except ValueError as exc:
+            with self._cond:
+                self._counters["rejected"] += 1
+            logger.warning("ingestion_queue_rejected", extra={"error": str(exc)})
+            return False
+
+        seq = self.spool.append(row) if self.spool is not None else None
+        item: _Item = (time.monotonic(), row, seq)
+
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                if self.overflow == "block":
+                    if not self._cond.wait_for(
+                        lambda: len(self._items) < self.maxsize, timeout=self.block_timeout
+                    ):
+                        self._counters["dropped"] += 1
+                        self._release([item])
+                        logger.warning("ingestion_queue_put_timeout")
+                        return False
+                elif self.overflow == "drop_oldest":
+                    self._counters["dropped"] += 1
+                    self._release([self._items.popleft()])
+                else:
+                    self._counters["spilled"] += 1
+                    self._release([item])
+                    return False
+
+            self._items.append(item)
+            self._counters["enqueued"] += 1
+            self._high_water = max(self._high_water, len(self._items))
+            QUEUE_DEPTH.set(len(self._items))
+            if len(self._items) >= self.batch_size:
+                self._cond.notify_all()
+
+        return True
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ingestion-writer", daemon=True)
+        self._thread.start()
+        logger.info(
+            "ingestion_queue_started",
+            extra={
+                "maxsize": self.maxsize,
+                "batch_size": self.batch_size,
+                "overflow": self.overflow,
+                "spool": self.spool.directory if self.spool else None,
+            },
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the writer after it has flushed everything still queued.
+        """
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=timeout)
+        if self.spool is not None:
+            self.spool.close()
+        logger.info("ingestion_queue_stopped", extra={"depth": self.depth()})
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    # ------------------------------------------------------------------
+    # Writer side
+    # ------------------------------------------------------------------
+
+    def _take_batch(self) -> List[_Item]:
+        """
+        Wait until a flush is due, then pop up to batch_size items.
+        """
+        with self._cond:
+            while not self._stop_event.is_set():
+                if len(self._items) >= self.batch_size:
+                    break
+                if self._items:
+                    due = self._items[0][0] + self.flush_interval - time.monotonic()
+                    if due <= 0:
+                        break
+                    self._cond.wait(timeout=due)
+                else:
+                    self._cond.wait(timeout=self.flush_interval)
+                    if not self._items:
+                        return []
+
+            count = min(self.batch_size, len(self._items))
+            batch = [self._items.popleft() for _ in range(count)]
+            QUEUE_DEPTH.set(len(self._items))
+            self._cond.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        with self.app.app_context():
+            while True:
+                batch = self._take_batch()
+                if batch:
+                    self.flush(batch)
+                elif self._stop_event.is_set():
+                    break
+                else:
+                    self.replay_spool()
+
+    def flush(self, batch: List[_Item]) -> None:
+        """
+        Commit one batch. On database failure the batch is released back to
+        the spool for replay (or counted as dropped when there is none).
+
+        Only rows that were committed or permanently rejected (invalid, or
+        violating a constraint) are acknowledged in the spool; rows that
+        failed for any other reason are released for replay. A batch that
+        committed nothing and has such rows counts as failed.
+        """
+        from .ingestion import ingest_readings_batch
+
+        rows = [row for _, row, _ in batch]
+        started = time.monotonic()
+
+        if self.spool is not None:
+            self.spool.sync()
+
+        try:
+            result = ingest_readings_batch(rows)
+        except Exception as exc:
+            logger.error(
+                "ingestion_queue_flush_failed",
+                extra={"rows": len(rows), "error": str(exc)},
+            )
+            with self._cond:
+                self._counters["failed_batches"] += 1
+                if self.spool is None:
+                    self._counters["dropped"] += len(rows)
+            self._release(batch)
+            return
+
+        lost_errors = [e for e in result["errors"] if e.get("kind") not in _PERMANENT_ERRORS]
+        lost = {error["index"] for error in lost_errors}
+        rejected = len(result["errors"]) - len(lost)
+
+        if self.spool is not None:
+            self.spool.ack(
+                Counter(
+                    seq
+                    for index, (_, _, seq) in enumerate(batch)
+                    if seq is not None and index not in lost
+                )
+            )
+        if lost:
+            self._release([batch[index] for index in sorted(lost)])
+
+        if lost and not result["inserted"]:
+            logger.error(
+                "ingestion_queue_flush_failed",
+                extra={"rows": len(rows), "error": lost_errors[0]["error"]},
+            )
+            with self._cond:
+                self._counters["failed_batches"] += 1
+                self._counters["rejected"] += rejected
+                if self.spool is None:
+                    self._counters["dropped"] += len(lost)
+            return
+
+        done = time.monotonic()
+        flush_ms = (done - started) * 1000.0
+        latency_ms = (done - batch[0][0]) * 1000.0
+
+        with self._cond:
+            self._counters["batches"] += 1
+            self._counters["written"] += result["inserted"]
+            self._counters["rejected"] += rejected
+            if self.spool is None:
+                self._counters["dropped"] += len(lost)
+            self._last_flush_at = datetime.now(timezone.utc)
+            self._last_flush_rows = len(rows)
+            self._flush_ms_last = flush_ms
+            self._flush_ms_max = max(self._flush_ms_max, flush_ms)
+            self._flush_ms_total += flush_ms
+            self._latency_ms_last = latency_ms
+            self._latency_ms_max = max(self._latency_ms_max, latency_ms)
+
+        logger.debug(
+            "ingestion_queue_flushed",
+            extra={"rows": len(rows), "flush_ms": round(flush_ms, 2)},
+        )
+
+    # ------------------------------------------------------------------
+    # Spool
+    # ------------------------------------------------------------------
+
+    def _release(self, items: List[_Item]) -> None:
+        """Hand items that will not be committed from memory back to the spool."""
+        if self.spool is not None:
+            self.spool.mark_lost(Counter(seq for _, _, seq in items if seq is not None))
+
+    def replay_spool(self) -> Optional[Dict[str, int]]:
+        """
+        Drain spooled readings into the database while the queue is idle.
+
+        Failures (typically the database still being down) back off
+        exponentially up to a minute between attempts.
+        """
+        if self.spool is None:
+            return None
+
+        self.spool.sync()
+        if time.monotonic() < self._replay_not_before or not self.spool.has_backlog():
+            return None
+
+        from .readings_import import insert_new_readings
+
+        try:
+            totals = self.spool.replay(insert_new_readings, batch_size=self.batch_size * 10)
+        except Exception as exc:
+            from ..extensions import db
+
+            db.session.rollback()
+            self._replay_failures += 1
+            delay = min(_REPLAY_BACKOFF_MAX, 2.0**self._replay_failures)
+            self._replay_not_before = time.monotonic() + delay
+            logger.error(
+                "ingestion_queue_replay_failed",
+                extra={"error": str(exc), "retry_in_seconds": delay},
+            )
+            return None
+
+        self._replay_failures = 0
+        return totals
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            batches = self._counters["batches"]
+            stats = {
+                "running": self.running,
+                "overflow": self.overflow,
+                "depth": len(self._items),
+                "maxsize": self.maxsize,
+                "high_water": self._high_water,
+                **self._counters,
+                "last_flush_at": (self._last_flush_at.isoformat() if self._last_flush_at else None),
+                "last_flush_rows": self._last_flush_rows,
+                "flush_ms_last": self._flush_ms_last,
+                "flush_ms_avg": (self._flush_ms_total / batches) if batches else None,
+                "flush_ms_max": self._flush_ms_max,
+                "enqueue_to_commit_ms_last": self._latency_ms_last,
+                "enqueue_to_commit_ms_max": self._latency_ms_max,
+                "oldest_age_ms": (
+                    (time.monotonic() - self._items[0][0]) * 1000.0 if self._items else 0.0
+                ),
+            }
+        stats["spool"] = self.spool.stats() if self.spool is not None else None
+        return stats
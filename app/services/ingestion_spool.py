@@ -0,0 +1,416 @@
+# filename: logexp/app/services/ingestion_spool.py
+"""
+Append-only, segmented on-disk spool for readings not yet committed.
+
+Every reading the poller produces is appended here before it is queued for
+the database, so neither a database outage nor a process crash can lose it.
+
+On-disk layout (one directory, segments named spool-<seq>.seg):
+
+    segment := MAGIC record*
+    record  := length:u32le crc32:u32le payload[length]
+    payload := ts_us:i64 cps:u32 cpm:u32 usv:f64
+               mode_len:u8 mode[mode_len]
+               device_len:u8 device[device_len]   (device_len 0xFF = NULL)
+
+Writes are buffered and fsync'ed in batches: after fsync_records appends or
+fsync_interval seconds, whichever comes first, and whenever sync() is
+called. A torn tail record (bad length or CRC) is treated as the end of its
+segment.
+
+Bookkeeping per segment: written records, records acknowledged as committed
+by the queue writer, and records lost from the in-memory path (dropped,
+spilled, or in a failed batch). Once a sealed segment is settled
+(acked + lost == written) it is deleted if nothing was lost, or replayed
+into logexp_readings and then deleted. Segments left over from a previous
+process have no bookkeeping and are always replayed. Replay skips rows whose
+(device_id, timestamp) is already stored, so replaying twice is harmless.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..logging_setup import get_logger
+
+logger = get_logger("beamfoundry.ingestion_spool")
+
+MAGIC = b"LXSPOOL1"
+_HEADER = struct.Struct("<II")
+_FIXED = struct.Struct("<qIId")
+_NULL_DEVICE = 0xFF
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_SEGMENT_RE = re.compile(r"^spool-(\d{12})\.seg$")
+
+
+# ---------------------------------------------------------------------------
+# Record encoding
+# ---------------------------------------------------------------------------
+
+
+def encode_record(row: Dict[str, Any]) -> bytes:
+    """
+    Encode one normalized reading (UTC-aware timestamp) as a framed record.
+    """
+    ts: datetime = row["timestamp"]
+    ts_us = (ts - _EPOCH) // timedelta(microseconds=1)
+
+    mode = row["mode"].encode("utf-8")
+    device = row.get("device_id")
+    device_bytes = b"" if device is None else str(device).encode("utf-8")
+    if len(mode) > 254 or len(device_bytes) > 254:
+        raise ValueError("mode/device_id too long for spool record")
+
+    payload = b"".join(
+        (
+            _FIXED.pack(
+                ts_us,
+                row["counts_per_second"],
+                row["counts_per_minute"],
+                row["microsieverts_per_hour"],
+            ),
+            bytes((len(mode),)),
+            mode,
+            bytes((_NULL_DEVICE if device is None else len(device_bytes),)),
+            device_bytes,
+        )
+    )
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_payload(payload: bytes) -> Dict[str, Any]:
+    ts_us, cps, cpm, usv = _FIXED.unpack_from(payload, 0)
+    pos = _FIXED.size
+
+    mode_len = payload[pos]
+    pos += 1
+    mode = payload[pos : pos + mode_len].decode("utf-8")
+    pos += mode_len
+
+    device_len = payload[pos]
+    pos += 1
+    device: Optional[str] = None
+    if device_len != _NULL_DEVICE:
+        device = payload[pos : pos + device_len].decode("utf-8")
+
+    return {
+        "timestamp": _EPOCH + timedelta(microseconds=ts_us),
+        "counts_per_second": cps,
+        "counts_per_minute": cpm,
+        "microsieverts_per_hour": usv,
+        "mode": mode,
+        "device_id": device,
+    }
+
+
+def iter_segment(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the readings in one segment, stopping at a torn or corrupt tail.
+    """
+    with open(path, "rb") as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            logger.warning("spool_segment_bad_magic", extra={"path": path})
+            return
+
+        while True:
+            header = fh.read(_HEADER.size)
+            if not header:
+                return
+            if len(header) < _HEADER.size:
+                logger.warning("spool_segment_torn_tail", extra={"path": path})
+                return
+
+            length, crc = _HEADER.unpack(header)
+            payload = fh.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                logger.warning(
+                    "spool_segment_corrupt_record",
+                    extra={"path": path, "offset": fh.tell()},
+                )
+                return
+
+            yield decode_payload(payload)
+
+
+# ---------------------------------------------------------------------------
+# Spool
+# ---------------------------------------------------------------------------
+
+
+class ReadingSpool:
+    """
+    Segmented write-ahead spool. Thread-safe; one instance per directory.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        segment_bytes: int = 4 * 1024 * 1024,
+        fsync_interval: float = 1.0,
+        fsync_records: int = 100,
+    ) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync_interval = fsync_interval
+        self.fsync_records = fsync_records
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._fh: Optional[IO[bytes]] = None
+        self._active_seq: Optional[int] = None
+        self._active_size = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        # seq -> [written, acked, lost]; only segments written by this process
+        self._books: Dict[int, List[int]] = {}
+        existing = self._segment_seqs()
+        self._next_seq = (existing[-1] + 1) if existing else 1
+
+        self._counters: Dict[str, int] = {
+            "appended": 0,
+            "fsyncs": 0,
+            "replayed": 0,
+            "replay_duplicates": 0,
+            "segments_deleted": 0,
+        }
+
+    @classmethod
+    def from_config(cls, app: Any) -> "ReadingSpool":
+        config = app.config_obj
+        return cls(
+            config.get("INGESTION_SPOOL_DIR") or os.path.join(app.instance_path, "spool"),
+            segment_bytes=int(config["INGESTION_SPOOL_SEGMENT_BYTES"]),
+            fsync_interval=float(config["INGESTION_SPOOL_FSYNC_SECONDS"]),
+            fsync_records=int(config["INGESTION_SPOOL_FSYNC_RECORDS"]),
+        )
+
+    # ------------------------------------------------------------------
+    # Segment files
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"spool-{seq:012d}.seg")
+
+    def _segment_seqs(self) -> List[int]:
+        seqs = []
+        for name in os.listdir(self.directory):
+            match = _SEGMENT_RE.match(name)
+            if match:
+                seqs.append(int(match.group(1)))
+        return sorted(seqs)
+
+    def _open_segment(self) -> None:
+        seq = self._next_seq
+        self._next_seq += 1
+
+        self._fh = open(self._segment_path(seq), "wb")
+        self._fh.write(MAGIC)
+        self._active_seq = seq
+        self._active_size = len(MAGIC)
+        self._books[seq] = [0, 0, 0]
+
+        # Make the new directory entry itself durable.
+        dir_fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def _seal_active(self) -> None:
+        if self._fh is None:
+            return
+        self._sync_locked()
+        self._fh.close()
+        self._fh = None
+        self._active_seq = None
+
+    def _sync_locked(self) -> None:
+        if self._fh is None or self._unsynced == 0:
+            return
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._counters["fsyncs"] += 1
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, row: Dict[str, Any]) -> int:
+        """
+        Append one normalized reading; returns the segment sequence number
+        it was written to (used later for ack() / mark_lost()).
+        """
+        record = encode_record(row)
+
+        with self._lock:
+            if self._fh is None or self._active_size + len(record) > self.segment_bytes:
+                self._seal_active()
+                self._open_segment()
+
+            assert self._fh is not None and self._active_seq is not None
+            self._fh.write(record)
+            self._active_size += len(record)
+            self._books[self._active_seq][0] += 1
+            self._unsynced += 1
+            self._counters["appended"] += 1
+
+            if (
+                self._unsynced >= self.fsync_records
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync_locked()
+
+            return self._active_seq
+
+    def sync(self) -> None:
+        """Force buffered records to disk."""
+        with self._lock:
+            self._sync_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._seal_active()
+
+    # ------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------
+
+    def ack(self, seqs: Dict[int, int]) -> None:
+        """Record that readings from these segments were committed."""
+        self._bump(seqs, 1)
+
+    def mark_lost(self, seqs: Dict[int, int]) -> None:
+        """Record that readings from these segments left the in-memory path
+        uncommitted and must come back through replay."""
+        self._bump(seqs, 2)
+
+    def _bump(self, seqs: Dict[int, int], index: int) -> None:
+        with self._lock:
+            for seq, count in seqs.items():
+                books = self._books.get(seq)
+                if books is not None:
+                    books[index] += count
+
+    def has_backlog(self) -> bool:
+        """True if replay() has a segment to replay or delete."""
+        with self._lock:
+            for seq in self._segment_seqs():
+                books = self._books.get(seq)
+                if books is None:
+                    return True
+                if self._settled(seq) and (seq != self._active_seq or books[2] > 0):
+                    return True
+            return False
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def replay(
+        self,
+        insert: Callable[[List[Dict[str, Any]]], Tuple[int, int]],
+        batch_size: int = 5000,
+    ) -> Dict[str, int]:
+        """
+        Drain settled segments.
+
+        Fully acknowledged segments are deleted unread. Segments with lost
+        records, or from a previous process, are streamed through
+        insert(rows) -> (inserted, duplicates) in batches and then deleted.
+        The active segment is sealed first if it is settled but has lost
+        records, so those are not held back until the segment fills up.
+        """
+        totals = {"segments": 0, "inserted": 0, "duplicates": 0}
+
+        with self._lock:
+            active = self._active_seq
+            if active is not None and self._settled(active) and self._books[active][2] > 0:
+                self._seal_active()
+            candidates = [
+                seq
+                for seq in self._segment_seqs()
+                if seq != self._active_seq and self._settled(seq)
+            ]
+
+        for seq in candidates:
+            books = self._books.get(seq)
+            path = self._segment_path(seq)
+
+            if books is not None and books[2] == 0:
+                self._delete_segment(seq, path)
+                continue
+
+            batch: List[Dict[str, Any]] = []
+            for row in iter_segment(path):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    self._replay_batch(insert, batch, totals)
+                    batch = []
+            if batch:
+                self._replay_batch(insert, batch, totals)
+
+            self._delete_segment(seq, path)
+            totals["segments"] += 1
+
+        if totals["segments"]:
+            logger.info("spool_replayed", extra=totals)
+        return totals
+
+    def _settled(self, seq: int) -> bool:
+        books = self._books.get(seq)
+        if books is None:
+            return True
+        written, acked, lost = books
+        return acked + lost >= written
+
+    def _replay_batch(
+        self,
+        insert: Callable[[List[Dict[str, Any]]], Tuple[int, int]],
+        batch: List[Dict[str, Any]],
+        totals: Dict[str, int],
+    ) -> None:
+        inserted, duplicates = insert(batch)
+        totals["inserted"] += inserted
+        totals["duplicates"] += duplicates
+        with self._lock:
+            self._counters["replayed"] += inserted
+            self._counters["replay_duplicates"] += duplicates
+
+    def _delete_segment(self, seq: int, path: str) -> None:
+        os.remove(path)
+        with self._lock:
+            self._books.pop(seq, None)
+            self._counters["segments_deleted"] += 1
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            seqs = self._segment_seqs()
+            size = 0
+            for seq in seqs:
+                try:
+                    size += os.path.getsize(self._segment_path(seq))
+                except OSError:
+                    pass
+            return {
+                "directory": self.directory,
+                "segments": len(seqs),
+                "bytes": size,
+                "unsynced": self._unsynced,
+                **self._counters,
+            }
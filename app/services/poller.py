@@ -18,6 +18,10 @@ def get_poller_status() -> Dict[str, Optional[Any]]:
     Tests expect:
         - running: bool
         - last_tick: ISO8601 string or None
+
+    When the poller feeds an ingestion queue, its depth / throughput /
+    latency metrics are included under "queue", and the serial reader's
+    connection state (opens, errors, reconnect backoff) under "serial".
     """
     logger.debug("poller_status_requested")
 
@@ -28,6 +32,8 @@ def get_poller_status() -> Dict[str, Optional[Any]]:
         return {
             "running": False,
             "last_tick": None,
+            "queue": None,
+            "serial": None,
         }
 
     # Determine running state
@@ -46,15 +52,24 @@ def get_poller_status() -> Dict[str, Optional[Any]]:
     else:
         last_tick = None
 
+    queue: Optional[Any] = getattr(poller, "queue", None)
+    queue_stats: Optional[Dict[str, Any]] = queue.stats() if queue is not None else None
+
+    reader: Optional[Any] = getattr(poller, "reader", None)
+    serial_stats: Optional[Dict[str, Any]] = reader.diagnostics() if reader is not None else None
+
     logger.debug(
         "poller_status_resolved",
         extra={
             "running": running,
             "last_tick": last_tick,
+            "queue_depth": queue_stats["depth"] if queue_stats else None,
         },
     )
 
     return {
         "running": running,
         "last_tick": last_tick,
+        "queue": queue_stats,
+        "serial": serial_stats,
     }
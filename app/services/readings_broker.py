@@ -0,0 +1,297 @@
+# filename: logexp/app/services/readings_broker.py
+"""
+In-process publish/subscribe for newly committed readings.
+
+Ingestion publishes every reading it commits; /api/readings/stream relays
+them to browsers as Server-Sent Events, so live dashboards stop polling the
+database.
+
+The broker keeps one shared, bounded log of recent events instead of a
+queue per subscriber:
+
+    - publish() appends each reading with the next sequence number; it is
+      JSON-encoded once, by the first stream that sends it, so ingestion
+      pays almost nothing when nobody is watching;
+    - each stream remembers the last sequence it sent and waits on a
+      condition variable for newer ones.
+
+Event ids are "<epoch>:<seq>", where epoch identifies this broker instance.
+A client reconnecting with Last-Event-ID resumes right after that event as
+long as it is still in the log; an id from another process or one that has
+fallen out of the log gets a "reset" event instead, telling the client to
+reload its view once.
+
+The broker only sees readings committed by the same process (the poller's
+writer thread, the API, the CLI importer if run in-process).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from flask import current_app, has_app_context
+
+from ..logging_setup import get_logger
+
+logger = get_logger("beamfoundry.readings_broker")
+
+_EXTENSION_KEY = "logexp_readings_broker"
+
+# Reconnect delay sent to EventSource clients (ms).
+RETRY_MS = 3000
+
+# [sequence, reading row, reading id, JSON data once encoded]
+_Event = List[Any]
+
+
+class StreamLimitReached(RuntimeError):
+    """Raised by subscribe() when max_clients streams are already open."""
+
+
+_EVENT_FIELDS = (
+    "id",
+    "timestamp",
+    "counts_per_second",
+    "counts_per_minute",
+    "microsieverts_per_hour",
+    "mode",
+    "device_id",
+)
+
+
+def reading_event(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The JSON shape of one streamed reading (timestamps as UTC ISO 8601).
+    """
+    event = {name: row.get(name) for name in _EVENT_FIELDS}
+    if isinstance(event["timestamp"], datetime):
+        event["timestamp"] = event["timestamp"].isoformat()
+    return event
+
+
+class ReadingBroker:
+    """
+    Bounded event log of recent readings plus the condition streams wait on.
+    """
+
+    def __init__(self, buffer_size: int = 1000, max_clients: int = 2):
+        self.max_clients = max_clients
+        self.epoch = format(time.time_ns() // 1000, "x")
+        self._cond = threading.Condition()
+        self._events: Deque[_Event] = deque(maxlen=max(1, buffer_size))
+        self._seq = 0
+        self._clients = 0
+        self._closed = False
+        self._counters = {"published": 0, "resets": 0, "rejected_clients": 0}
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    @property
+    def has_clients(self) -> bool:
+        return self._clients > 0
+
+    def publish(self, rows: Sequence[Dict[str, Any]], ids: Optional[Sequence[Any]] = None) -> int:
+        """
+        Append readings to the log and wake every stream. ids, when given,
+        overrides each row's "id". Returns the number published.
+        """
+        if not rows:
+            return 0
+
+        with self._cond:
+            for index, row in enumerate(rows):
+                self._seq += 1
+                self._events.append(
+                    [self._seq, row, ids[index] if ids is not None else row.get("id"), None]
+                )
+            self._counters["published"] += len(rows)
+            self._cond.notify_all()
+        return len(rows)
+
+    def close(self) -> None:
+        """End every open stream (application shutdown, tests)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}:{seq}"
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def resume_seq(self, last_event_id: Optional[str]) -> Optional[int]:
+        """
+        The sequence to continue after for a Last-Event-ID, or None when the
+        events since then can no longer be replayed.
+        """
+        epoch, _, raw_seq = (last_event_id or "").partition(":")
+        if epoch != self.epoch or not raw_seq.isdigit():
+            return None
+        seq = int(raw_seq)
+        with self._cond:
+            oldest = self._events[0][0] if self._events else self._seq + 1
+            if seq > self._seq or seq + 1 < oldest:
+                return None
+        return seq
+
+    def wait(self, after: int, timeout: float) -> Tuple[List[_Event], bool]:
+        """
+        Events with sequence > after, waiting up to timeout for the first
+        one. The flag is True when some of them already left the log.
+        """
+        with self._cond:
+            if self._seq <= after and not self._closed:
+                self._cond.wait(timeout)
+            if not self._events or self._seq <= after:
+                return [], False
+            oldest = self._events[0][0]
+            if after + 1 < oldest:
+                return [], True
+            return list(islice(self._events, after + 1 - oldest, None)), False
+
+    def subscribe(self) -> "_Subscription":
+        with self._cond:
+            if self._clients >= self.max_clients:
+                self._counters["rejected_clients"] += 1
+                raise StreamLimitReached(f"{self._clients} streams already open")
+            self._clients += 1
+        return _Subscription(self)
+
+    def _unsubscribe(self) -> None:
+        with self._cond:
+            self._clients -= 1
+
+    def stream(self, last_event_id: Optional[str], heartbeat_seconds: float) -> Iterator[str]:
+        """
+        SSE text for one client: a retry hint, then every reading published
+        after last_event_id (or after this call), with a comment line every
+        heartbeat_seconds of silence. Ends when the broker is closed.
+        """
+        # Resolved now rather than on the first chunk, so readings published
+        # before the response starts are not skipped.
+        after = self.resume_seq(last_event_id) if last_event_id else None
+        reset = after is None and bool(last_event_id)
+        if after is None:
+            after = self._seq
+        return self._iter_stream(after, reset, heartbeat_seconds)
+
+    def _iter_stream(self, after: int, reset: bool, heartbeat_seconds: float) -> Iterator[str]:
+        yield f"retry: {RETRY_MS}\n\n"
+        if reset:
+            yield self._reset(after)
+
+        while not self._closed:
+            events, gap = self.wait(after, heartbeat_seconds)
+            if gap:
+                after = self._seq
+                yield self._reset(after)
+            elif events:
+                yield "".join(
+                    f"id: {self.event_id(event[0])}\nevent: reading\ndata: {_encode(event)}\n\n"
+                    for event in events
+                )
+                after = events[-1][0]
+            elif not self._closed:
+                yield ": keepalive\n\n"
+
+    def _reset(self, seq: int) -> str:
+        with self._cond:
+            self._counters["resets"] += 1
+        return f"id: {self.event_id(seq)}\nevent: reset\ndata: {{}}\n\n"
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "clients": self._clients,
+                "max_clients": self.max_clients,
+                "last_seq": self._seq,
+                "buffered": len(self._events),
+                **self._counters,
+            }
+
+
+def _encode(event: _Event) -> str:
+    # Streams racing on the same event encode identical text; no lock needed.
+    if event[3] is None:
+        data = reading_event(event[1])
+        data["id"] = event[2]
+        event[3] = json.dumps(data, separators=(",", ":"))
+    return str(event[3])
+
+
+class _Subscription:
+    """Holds one of the broker's client slots until closed."""
+
+    def __init__(self, broker: ReadingBroker):
+        self.broker = broker
+        self._open = True
+
+    def close(self) -> None:
+        if self._open:
+            self._open = False
+            self.broker._unsubscribe()
+
+
+# ---------------------------------------------------------------------------
+# Per-application access
+# ---------------------------------------------------------------------------
+
+
+def get_readings_broker(app: Any = None) -> ReadingBroker:
+    """
+    The broker of `app` (default: current_app), created on first use.
+    """
+    app = app or current_app._get_current_object()
+    broker = app.extensions.get(_EXTENSION_KEY)
+    if broker is None:
+        broker = app.extensions.setdefault(
+            _EXTENSION_KEY,
+            ReadingBroker(
+                buffer_size=int(app.config.get("READINGS_STREAM_BUFFER", 1000)),
+                max_clients=int(app.config.get("READINGS_STREAM_MAX_CLIENTS", 2)),
+            ),
+        )
+    return broker
+
+
+def stream_clients_connected() -> bool:
+    """
+    Whether any live stream is open on the current app (False outside an
+    application context).
+    """
+    return has_app_context() and get_readings_broker().has_clients
+
+
+def publish_reading(reading: Any) -> None:
+    """
+    publish_readings() for one committed LogExpReading.
+    """
+    publish_readings([{name: getattr(reading, name) for name in _EVENT_FIELDS}])
+
+
+def publish_readings(rows: Sequence[Dict[str, Any]], ids: Optional[Sequence[Any]] = None) -> None:
+    """
+    Publish committed readings to live streams. A no-op outside an
+    application context.
+    """
+    if has_app_context():
+        count = get_readings_broker().publish(rows, ids)
+        logger.debug("readings_published", extra={"count": count})
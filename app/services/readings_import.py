@@ -0,0 +1,537 @@
+# filename: logexp/app/services/readings_import.py
+"""
+Bulk import of readings from CSV / NDJSON files on disk.
+
+Built for offline counter dumps with tens of millions of rows:
+
+    - the file is streamed record by record (optionally gzip-compressed), never
+      loaded whole
+    - timestamps go through the same coerce_timestamp() as live ingestion
+    - rows are written in batches, with COPY FROM STDIN on Postgres
+      (psycopg2) and executemany INSERTs elsewhere
+    - rows whose (device_id, timestamp) already exists are skipped, so a
+      file can be re-imported or overlap a previous dump safely
+    - after every committed batch the byte offset is saved to a checkpoint
+      file; an interrupted import resumes from there
+
+Because the checkpoint is written after the batch commits, a crash between
+the two replays at most one batch, and duplicate detection drops it.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, cast
+
+from sqlalchemy import and_, insert, or_, select
+
+from ..extensions import db
+from ..logging_setup import get_logger
+from ..models import INT32_MAX, LogExpReading
+from ..timestamps import coerce_timestamp
+from .analytics_cache import bump_generation
+from .rollups import record_rollups
+
+logger = get_logger("beamfoundry.import")
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+COLUMNS = (
+    "timestamp",
+    "counts_per_second",
+    "counts_per_minute",
+    "microsieverts_per_hour",
+    "mode",
+    "device_id",
+)
+
+# Short names used by the device's own log format and older dumps.
+COLUMN_ALIASES: Dict[str, str] = {
+    "cps": "counts_per_second",
+    "cpm": "counts_per_minute",
+    "usv": "microsieverts_per_hour",
+    "usv_per_hour": "microsieverts_per_hour",
+    "ts": "timestamp",
+    "time": "timestamp",
+}
+
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass
+class ImportStats:
+    """
+    Running totals for one import; also the checkpoint payload.
+    """
+
+    path: str
+    records: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    offset: int = 0
+    line: int = 0
+    elapsed: float = 0.0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Reading the source file
+# ---------------------------------------------------------------------------
+
+
+def detect_format(path: str) -> str:
+    """
+    Infer the import format from the file name (a trailing .gz is ignored).
+
+    Raises:
+        ValueError: if the extension is not recognised.
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    ext = os.path.splitext(name)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".ndjson", ".jsonl", ".json"):
+        return "ndjson"
+    raise ValueError(f"Cannot infer import format from {path!r}; pass --format")
+
+
+def _open_binary(path: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return cast(IO[bytes], gzip.open(path, "rb"))
+    return open(path, "rb")
+
+
+def iter_records(
+    path: str,
+    fmt: str,
+    start_offset: int = 0,
+    start_line: int = 0,
+) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Yield (line_number, end_offset, record) for every data record in the file.
+
+    end_offset is the byte position just past the record, which is what a
+    checkpoint stores alongside the line number. CSV records are dicts keyed
+    by the header row and may span lines when a quoted field contains a
+    newline; line_number is then the record's last line. NDJSON records are
+    whatever json.loads() returns for the line. A record that is not valid
+    UTF-8 or JSON is yielded as the ValueError describing it, so one bad
+    line is rejected instead of aborting the import.
+    """
+    with _open_binary(path) as fh:
+        header: Optional[List[str]] = None
+        line_no = 0
+        undecodable = False
+
+        def _readline() -> str:
+            # Decoding per line keeps a bad byte local to its record, and lets
+            # fh.tell() (cheap, unlike TextIOWrapper.tell()) give the offset.
+            nonlocal line_no, undecodable
+            raw = fh.readline()
+            if not raw:
+                return ""
+            line_no += 1
+            try:
+                return raw.decode("utf-8")
+            except UnicodeDecodeError:
+                undecodable = True
+                return raw.decode("utf-8", "replace")
+
+        if fmt == "csv":
+            header_line = fh.readline().decode("utf-8-sig", "replace")
+            header = [h.strip() for h in next(csv.reader([header_line]), [])]
+            line_no = 1
+
+        if start_offset > fh.tell():
+            fh.seek(start_offset)
+            line_no = start_line
+
+        lines = iter(_readline, "")
+        record: Any
+        if fmt == "csv":
+            assert header is not None
+            reader = csv.reader(lines)
+            while True:
+                try:
+                    values = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as exc:
+                    values, record = [], ValueError(f"invalid CSV: {exc}")
+                else:
+                    record = dict(zip(header, values))
+                if undecodable:
+                    record = ValueError("invalid UTF-8")
+                elif isinstance(record, dict) and not any(v.strip() for v in values):
+                    continue
+                undecodable = False
+                yield line_no, fh.tell(), record
+        else:
+            for line in lines:
+                if undecodable:
+                    undecodable = False
+                    record = ValueError("invalid UTF-8")
+                elif not line.strip():
+                    continue
+                else:
+                    try:
+                        record = json.loads(line)
+                    except ValueError as exc:
+                        record = ValueError(f"invalid JSON: {exc}")
+                yield line_no, fh.tell(), record
+
+
+# ---------------------------------------------------------------------------
+# Normalization
+# ---------------------------------------------------------------------------
+
+
+def _coerce_timestamp(value: Any) -> datetime:
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            raise ValueError("timestamp is required")
+        if text.replace(".", "", 1).isdigit():
+            return coerce_timestamp(float(text))
+        return coerce_timestamp(text)
+    if value is None:
+        # Unlike live ingestion, "now" is never a sensible default for a dump.
+        raise ValueError("timestamp is required")
+    return coerce_timestamp(value)
+
+
+def _coerce_int(value: Any, name: str) -> int:
+    if isinstance(value, str):
+        value = float(value) if "." in value else int(value)
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"{name} must be an integer")
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise ValueError(f"{name} must be a non-negative integer")
+    if value > INT32_MAX:
+        raise ValueError(f"{name} out of range")
+    return value
+
+
+def normalize_record(record: Any, default_device_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Map one raw record onto logexp_readings column values.
+
+    Raises:
+        ValueError: if the record is not a valid reading.
+    """
+    if isinstance(record, ValueError):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError("record must be an object")
+
+    data = {COLUMN_ALIASES.get(k, k): v for k, v in record.items()}
+
+    try:
+        usv = float(data["microsieverts_per_hour"])
+        mode = str(data["mode"]).strip()
+        row = {
+            "timestamp": _coerce_timestamp(data.get("timestamp")),
+            "counts_per_second": _coerce_int(data["counts_per_second"], "counts_per_second"),
+            "counts_per_minute": _coerce_int(data["counts_per_minute"], "counts_per_minute"),
+            "microsieverts_per_hour": usv,
+            "mode": mode,
+            "device_id": data.get("device_id") or default_device_id,
+        }
+    except KeyError as exc:
+        raise ValueError(f"missing field {exc.args[0]!r}") from exc
+    except (TypeError, OverflowError, OSError) as exc:
+        raise ValueError(str(exc)) from exc
+
+    if not math.isfinite(usv) or usv < 0:
+        raise ValueError("microsieverts_per_hour must be non-negative")
+    if not mode or len(mode) > 10:
+        raise ValueError("mode must be 1-10 characters")
+    if row["device_id"] is not None and len(str(row["device_id"])) > 64:
+        raise ValueError("device_id longer than 64 characters")
+
+    return row
+
+
+# ---------------------------------------------------------------------------
+# Checkpoints
+# ---------------------------------------------------------------------------
+
+
+def default_checkpoint_path(path: str) -> str:
+    return f"{path}.import-checkpoint.json"
+
+
+def load_checkpoint(checkpoint_path: str, path: str) -> Optional[ImportStats]:
+    """
+    Return the saved progress for path, or None if there is none.
+
+    A checkpoint written for a different source file is ignored.
+    """
+    try:
+        with open(checkpoint_path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except FileNotFoundError:
+        return None
+
+    if data.get("path") != os.path.abspath(path):
+        logger.warning(
+            "import_checkpoint_mismatch",
+            extra={"checkpoint": checkpoint_path, "path": data.get("path")},
+        )
+        return None
+
+    return ImportStats(
+        path=data["path"],
+        records=data["records"],
+        inserted=data["inserted"],
+        duplicates=data["duplicates"],
+        rejected=data["rejected"],
+        offset=data["offset"],
+        line=data.get("line", 0),
+        elapsed=data.get("elapsed", 0.0),
+    )
+
+
+def _save_checkpoint(checkpoint_path: str, stats: ImportStats) -> None:
+    payload = {
+        "path": stats.path,
+        "records": stats.records,
+        "inserted": stats.inserted,
+        "duplicates": stats.duplicates,
+        "rejected": stats.rejected,
+        "offset": stats.offset,
+        "line": stats.line,
+        "elapsed": stats.elapsed,
+    }
+    tmp = f"{checkpoint_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, checkpoint_path)
+
+
+# ---------------------------------------------------------------------------
+# Writing batches
+# ---------------------------------------------------------------------------
+
+
+def existing_reading_keys(session: Any, rows: List[Dict[str, Any]]) -> Set[Tuple[Any, datetime]]:
+    """
+    Return the (device_id, timestamp) keys from rows that are already stored.
+
+    One range query per batch, served by the (device_id, timestamp) index.
+    """
+    timestamps = [r["timestamp"] for r in rows]
+    devices = {r["device_id"] for r in rows}
+
+    device_clauses = []
+    named = [d for d in devices if d is not None]
+    if named:
+        device_clauses.append(LogExpReading.device_id.in_(named))
+    if None in devices:
+        device_clauses.append(LogExpReading.device_id.is_(None))
+
+    stmt = select(LogExpReading.device_id, LogExpReading.timestamp).where(
+        and_(
+            LogExpReading.timestamp >= min(timestamps),
+            LogExpReading.timestamp <= max(timestamps),
+            or_(*device_clauses),
+        )
+    )
+    return {(device_id, ts) for device_id, ts in session.execute(stmt)}
+
+
+def _copy_rows(session: Any, rows: List[Dict[str, Any]]) -> bool:
+    """
+    Load rows with COPY FROM STDIN. Returns False if the driver cannot COPY.
+    """
+    dbapi_conn = session.connection().connection.dbapi_connection
+    cursor = dbapi_conn.cursor()
+    try:
+        if not hasattr(cursor, "copy_expert"):
+            return False
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for r in rows:
+            writer.writerow(
+                [
+                    r["timestamp"].isoformat(),
+                    r["counts_per_second"],
+                    r["counts_per_minute"],
+                    repr(r["microsieverts_per_hour"]),
+                    r["mode"],
+                    "" if r["device_id"] is None else r["device_id"],
+                ]
+            )
+        buffer.seek(0)
+
+        cursor.copy_expert(
+            f"COPY {LogExpReading.__tablename__} ({', '.join(COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv, NULL '')",
+            buffer,
+        )
+        return True
+    finally:
+        cursor.close()
+
+
+def write_reading_rows(session: Any, rows: List[Dict[str, Any]]) -> None:
+    """
+    Write normalized rows in one round trip: COPY on Postgres (psycopg2),
+    executemany INSERT elsewhere, and fold them into the rollups. Does not
+    commit.
+    """
+    if not (session.get_bind().dialect.name == "postgresql" and _copy_rows(session, rows)):
+        session.execute(insert(LogExpReading.__table__), rows)
+    record_rollups(session, rows)
+
+
+def insert_new_readings(
+    rows: List[Dict[str, Any]],
+    db_session: Any = None,
+) -> Tuple[int, int]:
+    """
+    Insert the rows whose (device_id, timestamp) is not already stored, and
+    commit. Also drops repeats within rows itself.
+
+    Returns:
+        (inserted, duplicates)
+    """
+    session = db_session or db.session
+
+    existing = existing_reading_keys(session, rows)
+    fresh: List[Dict[str, Any]] = []
+    for row in rows:
+        key = (row["device_id"], row["timestamp"])
+        if key in existing:
+            continue
+        existing.add(key)
+        fresh.append(row)
+
+    if fresh:
+        write_reading_rows(session, fresh)
+    session.commit()
+    if fresh:
+        bump_generation()
+
+    return len(fresh), len(rows) - len(fresh)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+
+def import_readings_file(
+    path: str,
+    fmt: Optional[str] = None,
+    *,
+    batch_size: int = 5000,
+    default_device_id: Optional[str] = None,
+    checkpoint_path: Optional[str] = None,
+    resume: bool = True,
+    progress: Optional[Callable[[ImportStats], None]] = None,
+    db_session: Any = None,
+) -> ImportStats:
+    """
+    Stream a CSV or NDJSON file into logexp_readings.
+
+    Args:
+        path: Source file; ".gz" files are decompressed on the fly.
+        fmt: "csv" or "ndjson"; inferred from the extension when omitted.
+        batch_size: Rows per COPY / INSERT and per commit.
+        default_device_id: device_id for records that carry none.
+        checkpoint_path: Where progress is saved (default: next to the file).
+        resume: Continue from an existing checkpoint instead of restarting.
+        progress: Called with the running totals after every batch.
+
+    Returns:
+        ImportStats for the whole file (including any resumed progress).
+        The checkpoint is removed once the file has been fully imported.
+    """
+    session = db_session or db.session
+    fmt = fmt or detect_format(path)
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt!r}")
+
+    checkpoint_path = checkpoint_path or default_checkpoint_path(path)
+    stats = (load_checkpoint(checkpoint_path, path) if resume else None) or ImportStats(
+        path=os.path.abspath(path)
+    )
+
+    logger.info(
+        "import_start",
+        extra={"path": stats.path, "format": fmt, "resume_offset": stats.offset},
+    )
+
+    started = time.perf_counter() - stats.elapsed
+    batch: List[Dict[str, Any]] = []
+
+    def _flush(offset: int, line_no: int) -> None:
+        if batch:
+            inserted, duplicates = insert_new_readings(batch, session)
+            stats.inserted += inserted
+            stats.duplicates += duplicates
+            batch.clear()
+
+        stats.offset = offset
+        stats.line = line_no
+        stats.elapsed = time.perf_counter() - started
+        _save_checkpoint(checkpoint_path, stats)
+        if progress is not None:
+            progress(stats)
+
+    pending = 0
+    offset, line_no = stats.offset, stats.line
+    try:
+        for line_no, offset, record in iter_records(path, fmt, stats.offset, stats.line):
+            stats.records += 1
+            pending += 1
+            try:
+                batch.append(normalize_record(record, default_device_id))
+            except ValueError as exc:
+                stats.rejected += 1
+                if len(stats.errors) < MAX_REPORTED_ERRORS:
+                    stats.errors.append((line_no, str(exc)))
+
+            if pending >= batch_size:
+                _flush(offset, line_no)
+                pending = 0
+
+        _flush(offset, line_no)
+    except Exception:
+        session.rollback()
+        logger.error("import_failed", extra={"path": stats.path, "offset": stats.offset})
+        raise
+
+    os.remove(checkpoint_path)
+
+    logger.info(
+        "import_complete",
+        extra={
+            "path": stats.path,
+            "records": stats.records,
+            "inserted": stats.inserted,
+            "duplicates": stats.duplicates,
+            "rejected": stats.rejected,
+            "rows_per_second": round(stats.rows_per_second),
+        },
+    )
+    return stats
@@ -0,0 +1,179 @@
+# filename: logexp/app/services/readings_json.py
+"""
+Fast JSON encoding of ReadingResponse-shaped readings.
+
+The regular path for an API reading is
+
+    LogExpReading -> to_dict() -> ReadingResponse(...) -> model_dump() -> jsonify
+
+which costs an ORM object, a localization, two debug log calls and a
+Pydantic validation per row. This module writes the same bytes directly
+from row tuples (or ORM objects): any object with the ReadingResponse
+fields as attributes.
+
+"The same bytes" means what Flask's default JSON provider emits in compact
+mode: keys sorted, ASCII-only strings, floats as repr(), datetimes as UTC
+HTTP dates (which is also why localizing first makes no difference), and a
+trailing newline. ReadingResponse remains the schema contract: the encoder
+is checked against its fields at import, and the regular path is still what
+the fast one is tested against. When the app's JSON
+provider is configured differently (debug indentation, a custom provider),
+readings_response() falls back to the regular path.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from flask import Response, current_app
+from flask.json.provider import DefaultJSONProvider
+
+from ..schemas import ReadingResponse
+from .timezones import localize_timestamps
+
+# Columns to select for readings_response(); the ReadingResponse fields.
+READING_COLUMNS: Tuple[str, ...] = tuple(ReadingResponse.model_fields)
+
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+# ---------------------------------------------------------------------------
+# Value encoders (json.dumps semantics)
+# ---------------------------------------------------------------------------
+
+
+_NON_FINITE = {"nan": "NaN", "inf": "Infinity", "-inf": "-Infinity"}
+
+
+def _encode_float(value: Any) -> str:
+    text = float.__repr__(float(value))
+    return _NON_FINITE.get(text, text)
+
+
+@lru_cache(maxsize=256)
+def _encode_str(value: str) -> str:
+    # Modes and device ids repeat, so each distinct value is escaped once.
+    return str(encode_basestring_ascii(value))
+
+
+def _encode_optional_str(value: Optional[str]) -> str:
+    return "null" if value is None else _encode_str(value)
+
+
+def http_date(value: datetime) -> str:
+    """
+    werkzeug.http.http_date() for aware or naive-UTC datetimes, without the
+    timetuple round trip.
+    """
+    if value.tzinfo is not None and value.tzinfo is not timezone.utc:
+        value = value.astimezone(timezone.utc)
+    return "%s, %02d %s %04d %02d:%02d:%02d GMT" % (
+        _WEEKDAYS[value.weekday()],
+        value.day,
+        _MONTHS[value.month - 1],
+        value.year,
+        value.hour,
+        value.minute,
+        value.second,
+    )
+
+
+def _encode_datetime(value: datetime) -> str:
+    return f'"{http_date(value)}"'
+
+
+# The field types encode_reading() is written for. Checked against
+# ReadingResponse at import, so a schema change fails loudly instead of
+# silently diverging from the regular path.
+_FIELD_TYPES: Dict[str, Any] = {
+    "counts_per_minute": int,
+    "counts_per_second": int,
+    "device_id": Optional[str],
+    "id": int,
+    "microsieverts_per_hour": float,
+    "mode": str,
+    "timestamp": datetime,
+}
+
+if {name: f.annotation for name, f in ReadingResponse.model_fields.items()} != _FIELD_TYPES:
+    raise RuntimeError("ReadingResponse changed; update app/services/readings_json.py")
+
+# '{"counts_per_minute":%d,...}' in sorted key order; ints are formatted by
+# "%d" (which also turns bools and integral floats into JSON integers).
+_TEMPLATE = (
+    "{"
+    + ",".join(
+        f"{encode_basestring_ascii(name)}:{'%d' if kind is int else '%s'}"
+        for name, kind in sorted(_FIELD_TYPES.items())
+    )
+    + "}"
+)
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+
+
+def encode_reading(row: Any) -> str:
+    """
+    One reading as a compact JSON object.
+    """
+    return _TEMPLATE % (
+        row.counts_per_minute,
+        row.counts_per_second,
+        _encode_optional_str(row.device_id),
+        row.id,
+        _encode_float(row.microsieverts_per_hour),
+        _encode_str(row.mode),
+        _encode_datetime(row.timestamp),
+    )
+
+
+def encode_readings(rows: Iterable[Any]) -> str:
+    """
+    A JSON array of readings, as jsonify() would write it (trailing newline
+    included).
+    """
+    return "[" + ",".join(map(encode_reading, rows)) + "]\n"
+
+
+def fast_path_available() -> bool:
+    """
+    True when the app's JSON provider would write exactly what this module
+    writes.
+    """
+    provider = current_app.json
+    return (
+        type(provider) is DefaultJSONProvider
+        and provider.ensure_ascii
+        and provider.sort_keys
+        and (provider.compact is True or (provider.compact is None and not current_app.debug))
+    )
+
+
+def _slow_payloads(rows: List[Any]) -> List[Dict[str, Any]]:
+    # The regular path: localized timestamps through ReadingResponse.
+    payloads = []
+    for row, timestamp in zip(rows, localize_timestamps(row.timestamp for row in rows)):
+        data = {name: getattr(row, name) for name in READING_COLUMNS}
+        data["timestamp"] = timestamp
+        payloads.append(ReadingResponse(**data).model_dump(exclude_none=False))
+    return payloads
+
+
+def readings_response(rows: Any, *, many: bool = True) -> Response:
+    """
+    A JSON response for a list of readings (many=True) or a single reading.
+    """
+    if fast_path_available():
+        body = encode_readings(rows) if many else encode_reading(rows) + "\n"
+        return current_app.response_class(body, mimetype=current_app.json.mimetype)
+
+    if many:
+        return current_app.json.response(_slow_payloads(list(rows)))
+    return current_app.json.response(_slow_payloads([rows])[0])
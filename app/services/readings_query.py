@@ -0,0 +1,230 @@
+# filename: logexp/app/services/readings_query.py
+"""
+Bounded, keyset-paginated access to logexp_readings.
+
+The readings API must never materialize the whole table. Every query built
+here is filtered by an optional time range and device, ordered by the
+stable key (timestamp, id), and capped at a server-side page size.
+
+Cursors are opaque to clients: a URL-safe base64 encoding of the last
+(timestamp, id) pair returned on the previous page.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, and_, or_, select
+
+from ..extensions import db
+from ..logging_setup import get_logger
+from ..metrics import DB_ROWS_RETURNED
+from ..models import LogExpReading
+from ..timestamps import coerce_timestamp
+
+logger = get_logger("beamfoundry.readings")
+
+
+@dataclass(frozen=True)
+class ReadingFilters:
+    """
+    Parsed query filters for the readings endpoints.
+    """
+
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    device_id: Optional[str] = None
+    limit: int = 500
+    after: Optional[Tuple[datetime, int]] = None
+
+
+@dataclass(frozen=True)
+class ReadingsPage:
+    """
+    One page of readings plus the cursor for the next page (if any). rows
+    are LogExpReading objects, or Row tuples when columns were requested.
+    """
+
+    rows: List[Any]
+    next_cursor: Optional[str]
+
+
+# ---------------------------------------------------------------------------
+# Cursor encoding
+# ---------------------------------------------------------------------------
+
+
+def encode_cursor(timestamp: datetime, reading_id: int) -> str:
+    raw = f"{coerce_timestamp(timestamp).isoformat()}|{reading_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, int]:
+    """
+    Decode an opaque cursor back into its (timestamp, id) key.
+
+    Raises:
+        ValueError: if the cursor is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        ts_part, id_part = raw.rsplit("|", 1)
+        return coerce_timestamp(ts_part), int(id_part)
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid cursor: {token!r}") from exc
+
+
+# ---------------------------------------------------------------------------
+# Query-string parsing
+# ---------------------------------------------------------------------------
+
+
+def parse_time_bound(
+    value: Optional[str],
+    name: str,
+    naive_tz: Optional[tzinfo] = None,
+) -> Optional[datetime]:
+    """
+    Parse a since/until query argument.
+
+    Accepts ISO8601 (a trailing "Z" is allowed) or epoch seconds. Naive
+    values are interpreted in naive_tz when given (e.g. the UI's
+    datetime-local inputs), otherwise as UTC.
+    """
+    if value is None or value == "":
+        return None
+
+    text = value.strip()
+    try:
+        if text.replace(".", "", 1).isdigit():
+            return coerce_timestamp(float(text))
+        if text.endswith(("Z", "z")):
+            text = text[:-1] + "+00:00"
+        parsed = datetime.fromisoformat(text)
+    except (ValueError, OverflowError, OSError) as exc:
+        raise ValueError(f"Invalid {name!r} timestamp: {value!r}") from exc
+
+    if parsed.tzinfo is None and naive_tz is not None:
+        parsed = parsed.replace(tzinfo=naive_tz)
+
+    return coerce_timestamp(parsed)
+
+
+def parse_reading_filters(
+    args: Mapping[str, str],
+    *,
+    default_limit: int,
+    max_limit: int,
+) -> ReadingFilters:
+    """
+    Build ReadingFilters from request arguments.
+
+    The requested limit is clamped to max_limit; it is never an error to ask
+    for more than the server is willing to return.
+
+    Raises:
+        ValueError: on malformed timestamps, limits, or cursors.
+    """
+    since = parse_time_bound(args.get("since"), "since")
+    until = parse_time_bound(args.get("until"), "until")
+
+    if since is not None and until is not None and since > until:
+        raise ValueError("'since' must not be later than 'until'")
+
+    raw_limit = args.get("limit")
+    if raw_limit is None or raw_limit == "":
+        limit = default_limit
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError as exc:
+            raise ValueError(f"Invalid 'limit': {raw_limit!r}") from exc
+        if limit < 1:
+            raise ValueError("'limit' must be a positive integer")
+
+    cursor = args.get("cursor")
+    after = decode_cursor(cursor) if cursor else None
+
+    return ReadingFilters(
+        since=since,
+        until=until,
+        device_id=args.get("device_id") or None,
+        limit=min(limit, max_limit),
+        after=after,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+
+def apply_reading_filters(stmt: Select[Any], filters: ReadingFilters) -> Select[Any]:
+    """
+    Apply time range, device, and keyset predicates to a readings SELECT.
+    """
+    if filters.since is not None:
+        stmt = stmt.where(LogExpReading.timestamp >= filters.since)
+    if filters.until is not None:
+        stmt = stmt.where(LogExpReading.timestamp <= filters.until)
+    if filters.device_id is not None:
+        stmt = stmt.where(LogExpReading.device_id == filters.device_id)
+
+    if filters.after is not None:
+        after_ts, after_id = filters.after
+        stmt = stmt.where(
+            or_(
+                LogExpReading.timestamp > after_ts,
+                and_(LogExpReading.timestamp == after_ts, LogExpReading.id > after_id),
+            )
+        )
+
+    return stmt.order_by(LogExpReading.timestamp.asc(), LogExpReading.id.asc())
+
+
+def fetch_readings_page(
+    filters: ReadingFilters,
+    db_session: Any = None,
+    columns: Optional[Sequence[str]] = None,
+) -> ReadingsPage:
+    """
+    Return at most filters.limit readings plus the cursor for the next page.
+
+    One extra row is requested to detect whether another page exists, so no
+    COUNT(*) is ever issued. With columns (which must include "timestamp"
+    and "id"), rows are Row tuples of those LogExpReading columns instead of
+    ORM objects.
+    """
+    session = db_session or db.session
+
+    if columns is None:
+        stmt = apply_reading_filters(select(LogExpReading), filters).limit(filters.limit + 1)
+        rows: List[Any] = list(session.execute(stmt).scalars().all())
+    else:
+        stmt = apply_reading_filters(
+            select(*(getattr(LogExpReading, name) for name in columns)), filters
+        ).limit(filters.limit + 1)
+        rows = list(session.execute(stmt).all())
+    DB_ROWS_RETURNED.labels("readings_page").observe(len(rows))
+
+    next_cursor: Optional[str] = None
+    if len(rows) > filters.limit:
+        rows = rows[: filters.limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.timestamp, last.id)
+
+    logger.debug(
+        "readings_page_fetched",
+        extra={
+            "count": len(rows),
+            "limit": filters.limit,
+            "has_more": next_cursor is not None,
+        },
+    )
+
+    return ReadingsPage(rows=rows, next_cursor=next_cursor)
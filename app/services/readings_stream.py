@@ -0,0 +1,110 @@
+# filename: logexp/app/services/readings_stream.py
+"""
+Constant-memory streaming of logexp_readings.
+
+Rows are fetched as plain column tuples with yield_per, which uses a
+server-side cursor on Postgres and incremental fetches on SQLite, and are
+encoded batch by batch. Neither the ORM identity map nor a full result list
+is ever built, so memory stays flat regardless of export size.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import select
+
+from ..extensions import db
+from ..logging_setup import get_logger
+from ..models import LogExpReading
+from .readings_query import ReadingFilters, apply_reading_filters
+
+logger = get_logger("beamfoundry.readings")
+
+EXPORT_COLUMNS = (
+    "id",
+    "timestamp",
+    "counts_per_second",
+    "counts_per_minute",
+    "microsieverts_per_hour",
+    "mode",
+    "device_id",
+)
+
+
+def iter_reading_rows(
+    filters: ReadingFilters,
+    batch_size: int = 1000,
+    db_session: Any = None,
+) -> Iterator[Any]:
+    """
+    Yield readings as Row tuples in (timestamp, id) order.
+
+    The query is not executed until the first row is requested, and rows are
+    pulled from the cursor batch_size at a time.
+    """
+    session = db_session or db.session
+
+    stmt = apply_reading_filters(
+        select(*(getattr(LogExpReading, name) for name in EXPORT_COLUMNS)),
+        filters,
+    ).execution_options(yield_per=batch_size)
+
+    count = 0
+    for row in session.execute(stmt):
+        count += 1
+        yield row
+
+    logger.debug("readings_stream_exhausted", extra={"count": count})
+
+
+def _row_to_json(row: Any) -> str:
+    return json.dumps(
+        {
+            "id": row.id,
+            "timestamp": row.timestamp.isoformat(),
+            "counts_per_second": row.counts_per_second,
+            "counts_per_minute": row.counts_per_minute,
+            "microsieverts_per_hour": row.microsieverts_per_hour,
+            "mode": row.mode,
+            "device_id": row.device_id,
+        },
+        separators=(",", ":"),
+    )
+
+
+def iter_ndjson(rows: Iterable[Any], chunk_rows: int = 1000) -> Iterator[str]:
+    """
+    Encode rows as newline-delimited JSON, yielding one chunk per chunk_rows.
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(_row_to_json(row))
+        if len(chunk) >= chunk_rows:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def iter_json_array(rows: Iterable[Any], chunk_rows: int = 1000) -> Iterator[str]:
+    """
+    Encode rows as a single JSON array, emitted incrementally.
+    """
+    yield "["
+
+    prefix = ""
+    chunk = []
+    for row in rows:
+        chunk.append(_row_to_json(row))
+        if len(chunk) >= chunk_rows:
+            yield prefix + ",".join(chunk)
+            prefix = ","
+            chunk = []
+
+    if chunk:
+        yield prefix + ",".join(chunk)
+
+    yield "]\n"
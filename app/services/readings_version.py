@@ -0,0 +1,113 @@
+# filename: logexp/app/services/readings_version.py
+"""
+Cheap change validator for logexp_readings, used for conditional GETs.
+
+A ReadingsVersion combines
+
+    - MAX(id) and MAX(timestamp): two index probes, and every insert
+      (including backfilled, older readings) raises MAX(id);
+    - the ingestion generation of the analytics cache, bumped by every
+      in-process ingestion commit.
+
+The probe result is cached in the analytics cache, so within
+ANALYTICS_CACHE_TTL_SECONDS and between ingests a version costs no query at
+all; after the TTL the probe runs again and also picks up readings written
+by other processes.
+
+changed_at (served as Last-Modified) is when this process first saw the
+current (MAX(id), MAX(timestamp)), not a reading timestamp: readings carry
+device time, and a backfill changes the data without moving MAX(timestamp).
+HTTP dates have whole-second resolution, so changed_at is rounded up to the
+next second and every change moves it forward by at least one second;
+otherwise a change in the same second as an earlier response would compare
+as not modified under If-Modified-Since.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from ..extensions import db
+from ..logging_setup import get_logger
+from ..models import LogExpReading
+from .analytics_cache import get_analytics_cache
+
+logger = get_logger("beamfoundry.readings_version")
+
+_EXTENSION_KEY = "logexp_readings_version"
+
+_SECOND = timedelta(seconds=1)
+
+
+def _next_changed_at(now: datetime, previous: Optional[datetime]) -> datetime:
+    """now rounded up to a whole second, and at least a second after previous."""
+    changed_at = now.replace(microsecond=0)
+    if changed_at != now:
+        changed_at += _SECOND
+    if previous is not None and changed_at <= previous:
+        changed_at = previous + _SECOND
+    return changed_at
+
+
+@dataclass(frozen=True)
+class ReadingsVersion:
+    max_id: Optional[int]
+    max_timestamp: Optional[datetime]
+    generation: int
+    changed_at: datetime
+
+    def etag(self, scope: str) -> str:
+        """
+        Strong entity tag for one representation (scope: path + query, plus
+        anything else the response depends on).
+        """
+        stamp = self.max_timestamp.isoformat() if self.max_timestamp else ""
+        raw = f"{self.max_id}|{stamp}|{self.generation}|{scope}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _probe(session: Any) -> Tuple[Optional[int], Optional[datetime]]:
+    # Separate statements: each MAX is a single index probe on its own.
+    max_id = session.execute(select(func.max(LogExpReading.id))).scalar()
+    max_ts = session.execute(select(func.max(LogExpReading.timestamp))).scalar()
+    return max_id, max_ts
+
+
+def current_readings_version(db_session: Any = None) -> ReadingsVersion:
+    """
+    The version of the readings table as this process currently knows it.
+    """
+    app = current_app._get_current_object()
+    session = db_session or db.session
+    cache = get_analytics_cache(app)
+
+    state: Dict[str, Any] = app.extensions.setdefault(
+        _EXTENSION_KEY, {"lock": threading.Lock(), "key": None, "changed_at": None}
+    )
+
+    def compute() -> ReadingsVersion:
+        generation = cache.generation
+        key = _probe(session)
+        with state["lock"]:
+            if key != state["key"]:
+                state["key"] = key
+                state["changed_at"] = _next_changed_at(
+                    datetime.now(timezone.utc), state["changed_at"]
+                )
+            changed_at = state["changed_at"]
+        logger.debug(
+            "readings_version_probed",
+            extra={"max_id": key[0], "generation": generation},
+        )
+        return ReadingsVersion(
+            max_id=key[0], max_timestamp=key[1], generation=generation, changed_at=changed_at
+        )
+
+    return cache.get_or_compute(("readings_version", 0, None, None), compute)
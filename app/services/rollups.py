@@ -0,0 +1,521 @@
+# filename: logexp/app/services/rollups.py
+"""
+Pre-aggregated 1-minute / 1-hour / 1-day rollups of logexp_readings.
+
+Each rollup table holds, per (bucket_start, device_id, mode), the reading
+count and the sum/min/max of counts_per_second, counts_per_minute and
+microsieverts_per_hour. Buckets are aligned to UTC.
+
+Maintenance:
+    - Core inserts (batch ingestion, imports, spool replay) call
+      record_rollups() in the same transaction as the INSERT.
+    - ORM inserts (single-reading API, seeds, tests) are picked up by an
+      after_flush listener on the SQLAlchemy Session.
+    - rebuild_rollups() (``flask readings backfill-rollups``) recomputes
+      whole UTC days from the raw table.
+
+Both paths upsert with INSERT ... ON CONFLICT DO UPDATE, adding counts and
+sums and taking the min/max of the extremes, so concurrent writers never
+lose each other's contributions.
+
+Reading a range (summarize_range) splits it into whole days, then whole
+hours, then whole minutes, and reads each piece from the coarsest table
+that covers it exactly; only the sub-minute edges touch raw rows.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..logging_setup import get_logger
+from ..models import LogExpReading, ReadingRollup1d, ReadingRollup1h, ReadingRollup1m
+from .analytics_cache import bump_generation
+
+logger = get_logger("beamfoundry.rollups")
+
+# Coarsest first.
+RESOLUTIONS: Tuple[str, ...] = ("1d", "1h", "1m")
+
+ROLLUP_MODELS: Dict[str, Type[Any]] = {
+    "1m": ReadingRollup1m,
+    "1h": ReadingRollup1h,
+    "1d": ReadingRollup1d,
+}
+
+STEPS: Dict[str, timedelta] = {
+    "1m": timedelta(minutes=1),
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+}
+
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# [count, cps_sum, cps_min, cps_max, cpm_sum, cpm_min, cpm_max, usv_sum, usv_min, usv_max]
+_Partial = List[Any]
+_Key = Tuple[datetime, str, str]
+
+_COLUMNS = (
+    "reading_count",
+    "cps_sum",
+    "cps_min",
+    "cps_max",
+    "cpm_sum",
+    "cpm_min",
+    "cpm_max",
+    "usv_sum",
+    "usv_min",
+    "usv_max",
+)
+
+
+def rollups_enabled() -> bool:
+    return bool(current_app.config.get("ROLLUPS_ENABLED", True))
+
+
+# ---------------------------------------------------------------------------
+# Bucketing and aggregation
+# ---------------------------------------------------------------------------
+
+
+def bucket_start(ts: datetime, resolution: str) -> datetime:
+    """Floor a UTC-aware timestamp to the start of its bucket."""
+    if resolution == "1m":
+        return ts.replace(second=0, microsecond=0)
+    if resolution == "1h":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    if resolution == "1d":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown rollup resolution: {resolution!r}")
+
+
+def aggregate_rows(rows: Iterable[Dict[str, Any]]) -> Dict[str, Dict[_Key, _Partial]]:
+    """
+    Fold normalized reading rows into per-bucket partial aggregates for
+    every resolution.
+    """
+    partials: Dict[str, Dict[_Key, _Partial]] = {r: {} for r in RESOLUTIONS}
+
+    for row in rows:
+        ts: datetime = row["timestamp"]
+        device = row.get("device_id") or ""
+        mode = row["mode"]
+        cps = row["counts_per_second"]
+        cpm = row["counts_per_minute"]
+        usv = row["microsieverts_per_hour"]
+
+        for resolution in RESOLUTIONS:
+            key = (bucket_start(ts, resolution), device, mode)
+            acc = partials[resolution].get(key)
+            if acc is None:
+                partials[resolution][key] = [1, cps, cps, cps, cpm, cpm, cpm, usv, usv, usv]
+                continue
+            acc[0] += 1
+            acc[1] += cps
+            acc[4] += cpm
+            acc[7] += usv
+            if cps < acc[2]:
+                acc[2] = cps
+            if cps > acc[3]:
+                acc[3] = cps
+            if cpm < acc[5]:
+                acc[5] = cpm
+            if cpm > acc[6]:
+                acc[6] = cpm
+            if usv < acc[8]:
+                acc[8] = usv
+            if usv > acc[9]:
+                acc[9] = usv
+
+    return partials
+
+
+# ---------------------------------------------------------------------------
+# Upserts
+# ---------------------------------------------------------------------------
+
+
+_UPSERTS: Dict[Tuple[str, str], Any] = {}
+
+
+def _upsert_statement(dialect: str, resolution: str) -> Any:
+    """
+    INSERT ... ON CONFLICT (bucket_start, device_id, mode) DO UPDATE that
+    merges a partial aggregate into an existing bucket row. Built once per
+    dialect and table; constructing it costs more than executing it.
+    """
+    cached = _UPSERTS.get((dialect, resolution))
+    if cached is not None:
+        return cached
+
+    table = ROLLUP_MODELS[resolution].__table__
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        least, greatest = func.least, func.greatest
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        # SQLite's multi-argument min()/max() are scalar functions.
+        least, greatest = func.min, func.max
+    else:
+        raise NotImplementedError(f"Rollup upserts are not implemented for {dialect!r}")
+
+    stmt = dialect_insert(table)
+    excluded = stmt.excluded
+    c = table.c
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["bucket_start", "device_id", "mode"],
+        set_={
+            "reading_count": c.reading_count + excluded.reading_count,
+            "cps_sum": c.cps_sum + excluded.cps_sum,
+            "cps_min": least(c.cps_min, excluded.cps_min),
+            "cps_max": greatest(c.cps_max, excluded.cps_max),
+            "cpm_sum": c.cpm_sum + excluded.cpm_sum,
+            "cpm_min": least(c.cpm_min, excluded.cpm_min),
+            "cpm_max": greatest(c.cpm_max, excluded.cpm_max),
+            "usv_sum": c.usv_sum + excluded.usv_sum,
+            "usv_min": least(c.usv_min, excluded.usv_min),
+            "usv_max": greatest(c.usv_max, excluded.usv_max),
+        },
+    )
+    _UPSERTS[(dialect, resolution)] = stmt
+    return stmt
+
+
+def _partial_params(partials: Dict[_Key, _Partial]) -> List[Dict[str, Any]]:
+    params = []
+    for (start, device, mode), acc in partials.items():
+        values = dict(zip(_COLUMNS, acc))
+        values.update(bucket_start=start, device_id=device, mode=mode)
+        params.append(values)
+    return params
+
+
+def write_partials(connection: Any, partials: Dict[str, Dict[_Key, _Partial]]) -> int:
+    """
+    Merge partial aggregates into the rollup tables. Does not commit.
+
+    Returns the number of bucket rows written (summed over resolutions).
+    """
+    # A Connection (ORM flush) or a Session (everything else).
+    dialect_obj = getattr(connection, "dialect", None) or connection.get_bind().dialect
+    dialect = dialect_obj.name
+
+    written = 0
+    for resolution, by_key in partials.items():
+        if not by_key:
+            continue
+        connection.execute(_upsert_statement(dialect, resolution), _partial_params(by_key))
+        written += len(by_key)
+    return written
+
+
+def record_rollups(session: Any, rows: List[Dict[str, Any]]) -> None:
+    """
+    Fold freshly inserted readings into the rollups, inside the caller's
+    transaction. rows are normalized reading dicts (UTC-aware timestamps).
+    """
+    if not rows or not rollups_enabled():
+        return
+    written = write_partials(session, aggregate_rows(rows))
+    logger.debug("rollups_recorded", extra={"readings": len(rows), "buckets": written})
+
+
+@event.listens_for(Session, "after_flush")
+def _rollups_after_flush(session: Session, flush_context: Any) -> None:
+    """
+    Keep rollups current for readings inserted through the ORM. Runs on the
+    flush's own connection, so the rollup update commits or rolls back with
+    the readings.
+    """
+    if not has_app_context() or not rollups_enabled():
+        return
+
+    rows = [
+        {
+            "timestamp": obj.timestamp,
+            "counts_per_second": obj.counts_per_second,
+            "counts_per_minute": obj.counts_per_minute,
+            "microsieverts_per_hour": obj.microsieverts_per_hour,
+            "mode": obj.mode,
+            "device_id": obj.device_id,
+        }
+        for obj in session.new
+        if isinstance(obj, LogExpReading)
+    ]
+    if rows:
+        write_partials(session.connection(), aggregate_rows(rows))
+
+
+# ---------------------------------------------------------------------------
+# Backfill
+# ---------------------------------------------------------------------------
+
+
+_RAW_COLUMNS = (
+    LogExpReading.timestamp,
+    LogExpReading.counts_per_second,
+    LogExpReading.counts_per_minute,
+    LogExpReading.microsieverts_per_hour,
+    LogExpReading.mode,
+    LogExpReading.device_id,
+)
+
+
+def rebuild_rollups(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    *,
+    db_session: Any = None,
+    batch_size: int = 10000,
+    progress: Optional[Any] = None,
+) -> Dict[str, int]:
+    """
+    Recompute the rollups for every UTC day touching [since, until] from
+    the raw readings (default: all days with data). Each day is deleted and
+    rebuilt in its own transaction, so the command is idempotent and can be
+    interrupted. Rebuilding the current day while the poller is ingesting
+    can miss readings committed during the rebuild; run it again afterwards.
+
+    Returns:
+        {"days": int, "readings": int, "buckets": int}
+    """
+    session = db_session or db.session
+
+    if since is None or until is None:
+        first = session.execute(select(func.min(LogExpReading.timestamp))).scalar()
+        last = session.execute(select(func.max(LogExpReading.timestamp))).scalar()
+        if first is None:
+            return {"days": 0, "readings": 0, "buckets": 0}
+        since = since or first
+        until = until or last
+
+    totals = {"days": 0, "readings": 0, "buckets": 0}
+    day = bucket_start(since, "1d")
+    last_day = bucket_start(until, "1d")
+
+    while day <= last_day:
+        next_day = day + STEPS["1d"]
+
+        for model in ROLLUP_MODELS.values():
+            session.execute(
+                delete(model).where(model.bucket_start >= day, model.bucket_start < next_day)
+            )
+
+        stmt = (
+            select(*_RAW_COLUMNS)
+            .where(LogExpReading.timestamp >= day, LogExpReading.timestamp < next_day)
+            .execution_options(yield_per=batch_size)
+        )
+        partials = aggregate_rows(row._asdict() for row in session.execute(stmt))
+        readings = sum(acc[0] for acc in partials["1d"].values())
+        totals["buckets"] += write_partials(session, partials)
+        session.commit()
+        bump_generation()
+
+        totals["days"] += 1
+        totals["readings"] += readings
+        if progress is not None:
+            progress(day, readings, totals)
+        day = next_day
+
+    logger.info("rollups_rebuilt", extra=totals)
+    return totals
+
+
+# ---------------------------------------------------------------------------
+# Range queries
+# ---------------------------------------------------------------------------
+
+
+def _ceil_to(ts: datetime, resolution: str) -> datetime:
+    floor = bucket_start(ts, resolution)
+    return floor if floor == ts else floor + STEPS[resolution]
+
+
+def plan_range(
+    start: datetime,
+    end: datetime,
+    levels: Tuple[str, ...] = RESOLUTIONS,
+) -> List[Tuple[str, datetime, datetime]]:
+    """
+    Split the half-open range [start, end) into pieces, each read from the
+    coarsest rollup whose buckets it covers exactly; what is left at the
+    edges (less than a minute) is read from raw rows ("raw").
+    """
+    if start >= end:
+        return []
+    if not levels:
+        return [("raw", start, end)]
+
+    resolution, finer = levels[0], levels[1:]
+    inner_start = _ceil_to(start, resolution)
+    inner_end = bucket_start(end, resolution)
+    if inner_start >= inner_end:
+        return plan_range(start, end, finer)
+
+    return (
+        plan_range(start, inner_start, finer)
+        + [(resolution, inner_start, inner_end)]
+        + plan_range(inner_end, end, finer)
+    )
+
+
+def _rollup_piece(
+    session: Any, resolution: str, lo: datetime, hi: datetime, device_id: Optional[str]
+) -> List[Any]:
+    model = ROLLUP_MODELS[resolution]
+    stmt = (
+        select(
+            model.mode,
+            func.sum(model.reading_count),
+            func.sum(model.cps_sum),
+            func.min(model.cps_min),
+            func.max(model.cps_max),
+            func.sum(model.cpm_sum),
+            func.min(model.cpm_min),
+            func.max(model.cpm_max),
+            func.sum(model.usv_sum),
+            func.min(model.usv_min),
+            func.max(model.usv_max),
+        )
+        .where(model.bucket_start >= lo, model.bucket_start < hi)
+        .group_by(model.mode)
+    )
+    if device_id is not None:
+        stmt = stmt.where(model.device_id == device_id)
+    return list(session.execute(stmt))
+
+
+def _raw_piece(session: Any, lo: datetime, hi: datetime, device_id: Optional[str]) -> List[Any]:
+    r = LogExpReading
+    stmt = (
+        select(
+            r.mode,
+            func.count(),
+            func.sum(r.counts_per_second),
+            func.min(r.counts_per_second),
+            func.max(r.counts_per_second),
+            func.sum(r.counts_per_minute),
+            func.min(r.counts_per_minute),
+            func.max(r.counts_per_minute),
+            func.sum(r.microsieverts_per_hour),
+            func.min(r.microsieverts_per_hour),
+            func.max(r.microsieverts_per_hour),
+        )
+        .where(r.timestamp >= lo, r.timestamp < hi)
+        .group_by(r.mode)
+    )
+    if device_id is not None:
+        stmt = stmt.where(r.device_id == device_id)
+    return list(session.execute(stmt))
+
+
+def _merge(into: Dict[str, _Partial], rows: List[Any]) -> None:
+    for mode, *values in rows:
+        acc = into.get(mode)
+        if acc is None:
+            into[mode] = list(values)
+            continue
+        acc[0] += values[0]
+        for i in (1, 4, 7):
+            acc[i] += values[i]
+        for i in (2, 5, 8):
+            acc[i] = min(acc[i], values[i])
+        for i in (3, 6, 9):
+            acc[i] = max(acc[i], values[i])
+
+
+def summarize_range(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    device_id: Optional[str] = None,
+    db_session: Any = None,
+    min_rollup_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Count, avg/min/max of cps/cpm/µSv/h and the mode histogram for readings
+    with since <= timestamp <= until (open bounds default to the data).
+
+    Ranges shorter than min_rollup_seconds (default: config
+    ANALYTICS_ROLLUP_MIN_SECONDS) are read from raw rows only, as are all
+    ranges when rollups are disabled.
+    """
+    session = db_session or db.session
+
+    conditions = []
+    if since is not None:
+        conditions.append(LogExpReading.timestamp >= since)
+    if until is not None:
+        conditions.append(LogExpReading.timestamp <= until)
+    if device_id is not None:
+        conditions.append(LogExpReading.device_id == device_id)
+
+    # Separate MIN and MAX queries: each is a single index probe, whereas
+    # MIN and MAX together scan the whole range.
+    first = session.execute(select(func.min(LogExpReading.timestamp)).where(*conditions)).scalar()
+    last = session.execute(select(func.max(LogExpReading.timestamp)).where(*conditions)).scalar()
+
+    summary: Dict[str, Any] = {
+        "count": 0,
+        "cps": None,
+        "cpm": None,
+        "usv": None,
+        "modes": {},
+        "first_timestamp": first,
+        "last_timestamp": last,
+        "resolution": None,
+    }
+    if first is None:
+        return summary
+
+    start = since if since is not None else first
+    end = (until if until is not None else last) + _ONE_MICROSECOND
+
+    if min_rollup_seconds is None:
+        min_rollup_seconds = float(current_app.config.get("ANALYTICS_ROLLUP_MIN_SECONDS", 3600))
+    if not rollups_enabled() or (end - start).total_seconds() < min_rollup_seconds:
+        plan = [("raw", start, end)]
+    else:
+        plan = plan_range(start, end)
+
+    by_mode: Dict[str, _Partial] = {}
+    for resolution, lo, hi in plan:
+        if resolution == "raw":
+            _merge(by_mode, _raw_piece(session, lo, hi, device_id))
+        else:
+            _merge(by_mode, _rollup_piece(session, resolution, lo, hi, device_id))
+
+    count = sum(acc[0] for acc in by_mode.values())
+    if count:
+        accs = list(by_mode.values())
+        for name, base in (("cps", 1), ("cpm", 4), ("usv", 7)):
+            summary[name] = {
+                "avg": sum(a[base] for a in accs) / count,
+                "min": min(a[base + 1] for a in accs),
+                "max": max(a[base + 2] for a in accs),
+            }
+    summary["count"] = count
+    summary["modes"] = {mode: acc[0] for mode, acc in sorted(by_mode.items())}
+    summary["resolution"] = next(
+        (r for r in RESOLUTIONS + ("raw",) if any(p[0] == r for p in plan)), None
+    )
+
+    logger.debug(
+        "rollups_range_summarized",
+        extra={
+            "since": start.isoformat(),
+            "until": end.isoformat(),
+            "count": count,
+            "pieces": [p[0] for p in plan],
+        },
+    )
+
+    return summary
@@ -0,0 +1,331 @@
+# filename: logexp/app/services/timeseries.py
+"""
+Chart-sized time series over logexp_readings.
+
+query_series(start, end, max_points) returns at most max_points buckets of
+count and avg/min/max of cps/cpm/µSv/h, however long the range is:
+
+    1. choose_step() picks the smallest bucket width from STEP_LADDER for
+       which no more than max_points aligned buckets overlap the range.
+    2. source_for_step() picks the coarsest table whose buckets divide that
+       width: raw rows below one minute, otherwise the 1m, 1h or 1d rollup.
+    3. The database groups rows by the bucket (epoch seconds floored to a
+       multiple of the step) and returns one row per non-empty bucket.
+
+Because the source gets coarser as the step grows, every query reads a
+bounded number of rows (a few tens of thousands at most), so a one-year
+chart costs about the same as a one-hour chart.
+
+Buckets are aligned to multiples of the step since the Unix epoch (UTC).
+Rollup-backed series read whole rollup buckets, from the one containing
+start to the last one starting before end, so the first and last points may
+include readings up to one rollup bucket outside [start, end]. Rollups only
+cover readings recorded (or backfilled) while ROLLUPS_ENABLED was on; with
+rollups disabled every series reads raw rows.
+
+chart_series() adds a visual downsampling stage (see downsample.py) on top
+of query_series() for the readings chart endpoint.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import BigInteger, Float, cast, extract, func, select
+
+from ..extensions import db
+from ..logging_setup import get_logger
+from ..metrics import DB_ROWS_RETURNED
+from ..models import LogExpReading
+from .downsample import METHODS, downsample
+from .rollups import ROLLUP_MODELS, STEPS, bucket_start, rollups_enabled
+
+logger = get_logger("beamfoundry.timeseries")
+
+# Candidate bucket widths in seconds, finest first.
+STEP_LADDER: Tuple[int, ...] = (
+    1,
+    2,
+    5,
+    10,
+    15,
+    30,
+    60,
+    120,
+    300,
+    600,
+    900,
+    1800,
+    3600,
+    7200,
+    10800,
+    21600,
+    43200,
+    86400,
+    172800,
+    604800,
+    2592000,
+)
+
+_DAY = 86400
+
+# Coarsest first; (resolution, seconds).
+_ROLLUP_SECONDS: Tuple[Tuple[str, int], ...] = tuple(
+    (resolution, int(STEPS[resolution].total_seconds())) for resolution in ("1d", "1h", "1m")
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Buckets fetched per requested point before downsampling (chart_series).
+OVERSAMPLE = 4
+
+SERIES_METRICS: Tuple[str, ...] = ("cps", "cpm", "usv")
+
+
+@dataclass(frozen=True)
+class Series:
+    """
+    One chart series: the requested range, the bucket width and source
+    chosen for it, and the non-empty buckets in ascending time order.
+    """
+
+    start: datetime
+    end: datetime
+    step_seconds: int
+    source: str
+    points: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def max_points_default() -> int:
+    return int(current_app.config.get("TIMESERIES_MAX_POINTS", 2000))
+
+
+# ---------------------------------------------------------------------------
+# Planning
+# ---------------------------------------------------------------------------
+
+
+def choose_step(span_seconds: float, max_points: int) -> int:
+    """
+    Smallest bucket width (seconds) such that a range of span_seconds
+    overlaps at most max_points epoch-aligned buckets. Beyond the ladder,
+    whole days are used.
+    """
+    if max_points < 1:
+        raise ValueError("max_points must be at least 1")
+
+    for step in STEP_LADDER:
+        if span_seconds // step + 1 <= max_points:
+            return step
+    return (int(span_seconds // (_DAY * max(max_points - 1, 1))) + 1) * _DAY
+
+
+def source_for_step(step_seconds: int, use_rollups: bool = True) -> str:
+    """
+    The coarsest source whose buckets evenly divide step_seconds: a rollup
+    resolution ("1d", "1h", "1m") or "raw".
+    """
+    if use_rollups:
+        for resolution, seconds in _ROLLUP_SECONDS:
+            if step_seconds % seconds == 0:
+                return resolution
+    return "raw"
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+
+def _bucket_expr(column: Any, step_seconds: int, dialect: str) -> Any:
+    """
+    Epoch seconds of column, floored to a multiple of step_seconds, as an
+    integer SQL expression.
+    """
+    epoch = extract("epoch", column)
+    if dialect != "sqlite":
+        # PostgreSQL returns fractional seconds; casting would round.
+        epoch = func.floor(epoch)
+    return (cast(epoch, BigInteger) // step_seconds * step_seconds).label("bucket")
+
+
+def _raw_statement(bucket: Any, lo: datetime, hi: datetime, device_id: Optional[str]) -> Any:
+    r = LogExpReading
+    stmt = (
+        select(
+            bucket,
+            func.count(),
+            func.avg(r.counts_per_second),
+            func.min(r.counts_per_second),
+            func.max(r.counts_per_second),
+            func.avg(r.counts_per_minute),
+            func.min(r.counts_per_minute),
+            func.max(r.counts_per_minute),
+            func.avg(r.microsieverts_per_hour),
+            func.min(r.microsieverts_per_hour),
+            func.max(r.microsieverts_per_hour),
+        )
+        .where(r.timestamp >= lo, r.timestamp <= hi)
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+    if device_id is not None:
+        stmt = stmt.where(r.device_id == device_id)
+    return stmt
+
+
+def _rollup_statement(
+    model: Any, bucket: Any, lo: datetime, hi: datetime, device_id: Optional[str]
+) -> Any:
+    count = func.sum(model.reading_count)
+    stmt = (
+        select(
+            bucket,
+            count,
+            cast(func.sum(model.cps_sum), Float) / count,
+            func.min(model.cps_min),
+            func.max(model.cps_max),
+            cast(func.sum(model.cpm_sum), Float) / count,
+            func.min(model.cpm_min),
+            func.max(model.cpm_max),
+            func.sum(model.usv_sum) / count,
+            func.min(model.usv_min),
+            func.max(model.usv_max),
+        )
+        .where(model.bucket_start >= lo, model.bucket_start < hi)
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+    if device_id is not None:
+        stmt = stmt.where(model.device_id == device_id)
+    return stmt
+
+
+def _point(row: Any) -> Dict[str, Any]:
+    bucket, count, *stats = row
+    return {
+        "timestamp": _EPOCH + timedelta(seconds=int(bucket)),
+        "count": int(count),
+        "cps_avg": float(stats[0]),
+        "cps_min": stats[1],
+        "cps_max": stats[2],
+        "cpm_avg": float(stats[3]),
+        "cpm_min": stats[4],
+        "cpm_max": stats[5],
+        "usv_avg": float(stats[6]),
+        "usv_min": float(stats[7]),
+        "usv_max": float(stats[8]),
+    }
+
+
+def query_series(
+    start: datetime,
+    end: datetime,
+    max_points: Optional[int] = None,
+    device_id: Optional[str] = None,
+    db_session: Any = None,
+) -> Series:
+    """
+    Bucketed readings for start <= timestamp <= end (UTC-aware bounds),
+    with at most max_points buckets (default: config TIMESERIES_MAX_POINTS).
+    Empty buckets are omitted.
+    """
+    if start > end:
+        raise ValueError("'start' must not be later than 'end'")
+
+    session = db_session or db.session
+    if max_points is None:
+        max_points = max_points_default()
+
+    step = choose_step((end - start).total_seconds(), max_points)
+    source = source_for_step(step, rollups_enabled())
+    dialect = session.get_bind().dialect.name
+
+    if source == "raw":
+        bucket = _bucket_expr(LogExpReading.timestamp, step, dialect)
+        stmt = _raw_statement(bucket, start, end, device_id)
+    else:
+        model = ROLLUP_MODELS[source]
+        bucket = _bucket_expr(model.bucket_start, step, dialect)
+        stmt = _rollup_statement(model, bucket, bucket_start(start, source), end, device_id)
+
+    points = [_point(row) for row in session.execute(stmt)]
+    DB_ROWS_RETURNED.labels(f"series_{source}").observe(len(points))
+
+    logger.debug(
+        "timeseries_queried",
+        extra={
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "step_seconds": step,
+            "source": source,
+            "points": len(points),
+        },
+    )
+
+    return Series(start=start, end=end, step_seconds=step, source=source, points=points)
+
+
+# ---------------------------------------------------------------------------
+# Downsampled chart series
+# ---------------------------------------------------------------------------
+
+
+def chart_series(
+    start: datetime,
+    end: datetime,
+    points: int,
+    metric: str = "cpm",
+    method: str = "lttb",
+    device_id: Optional[str] = None,
+    db_session: Any = None,
+) -> Dict[str, Any]:
+    """
+    At most points (epoch-ms, value) pairs for one metric ("cps", "cpm" or
+    "usv") over [start, end], for drawing.
+
+    The range is first bucketed by query_series() at OVERSAMPLE times the
+    requested resolution, then reduced to points by downsample(): "lttb"
+    runs over the bucket averages, "minmax" over the bucket minima and
+    maxima, so the envelope of the trace survives.
+    """
+    if metric not in SERIES_METRICS:
+        raise ValueError(f"Unknown metric: {metric!r}")
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method: {method!r}")
+    if points < 2:
+        raise ValueError("'points' must be at least 2")
+
+    series = query_series(
+        start, end, max_points=points * OVERSAMPLE, device_id=device_id, db_session=db_session
+    )
+
+    epoch_ms = np.array(
+        [(p["timestamp"] - _EPOCH).total_seconds() * 1000.0 for p in series.points],
+        dtype=np.float64,
+    )
+    if method == "minmax":
+        # Two samples per bucket: its minimum and its maximum.
+        xs = np.repeat(epoch_ms, 2)
+        ys = np.array(
+            [v for p in series.points for v in (p[f"{metric}_min"], p[f"{metric}_max"])],
+            dtype=np.float64,
+        )
+    else:
+        xs = epoch_ms
+        ys = np.array([p[f"{metric}_avg"] for p in series.points], dtype=np.float64)
+
+    keep = downsample(xs, ys, points, method)
+
+    return {
+        "metric": metric,
+        "method": method,
+        "step_seconds": series.step_seconds,
+        "source": series.source,
+        "input_points": len(xs),
+        "data": [[int(xs[i]), float(ys[i])] for i in keep],
+    }
@@ -0,0 +1,86 @@
+# filename: logexp/app/services/timezones.py
+"""
+App-scoped LOCAL_TIMEZONE resolution.
+
+Readings are stored in UTC and localized for display. Serializing a page of
+readings used to look up LOCAL_TIMEZONE and build a ZoneInfo once per row;
+here the zone is resolved once per application and reused.
+
+The cached zone is keyed by the configured name, so a changed
+LOCAL_TIMEZONE (e.g. from /settings) is picked up on the next lookup
+without a restart; refresh_local_timezone() drops it explicitly.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from flask import current_app
+
+from ..logging_setup import get_logger
+
+logger = get_logger("beamfoundry.timezones")
+
+_EXTENSION_KEY = "logexp_local_timezone"
+
+
+def get_local_timezone(app: Any = None) -> ZoneInfo:
+    """
+    The ZoneInfo for LOCAL_TIMEZONE of `app` (default: current_app).
+    """
+    app = app or current_app._get_current_object()
+    # config_obj is the canonical layer; bare Flask apps (tests, scripts)
+    # may only have app.config.
+    config = getattr(app, "config_obj", None) or app.config
+    name = config.get("LOCAL_TIMEZONE") or "UTC"
+
+    cached: Optional[Tuple[str, ZoneInfo]] = app.extensions.get(_EXTENSION_KEY)
+    if cached is not None and cached[0] == name:
+        return cached[1]
+
+    zone = ZoneInfo(name)
+    # A single tuple assignment, so concurrent readers never see a name
+    # paired with another zone.
+    app.extensions[_EXTENSION_KEY] = (name, zone)
+    logger.debug("local_timezone_resolved", extra={"timezone": name})
+    return zone
+
+
+def refresh_local_timezone(app: Any = None) -> None:
+    """
+    Forget the resolved zone; the next lookup reads LOCAL_TIMEZONE again.
+    """
+    app = app or current_app._get_current_object()
+    app.extensions.pop(_EXTENSION_KEY, None)
+
+
+def localize_timestamp(
+    value: Optional[datetime], tz: Optional[ZoneInfo] = None
+) -> Optional[datetime]:
+    """
+    One UTC timestamp in LOCAL_TIMEZONE (naive values are taken as UTC).
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(tz or get_local_timezone())
+
+
+def localize_timestamps(
+    values: Iterable[Optional[datetime]], tz: Optional[ZoneInfo] = None
+) -> List[Optional[datetime]]:
+    """
+    localize_timestamp() for a batch, resolving the zone once.
+    """
+    zone = tz or get_local_timezone()
+    return [
+        (
+            value.astimezone(zone)
+            if value is not None and value.tzinfo is not None
+            else localize_timestamp(value, zone)
+        )
+        for value in values
+    ]
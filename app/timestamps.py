@@ -5,6 +5,9 @@ Canonical timestamp normalization utilities for LogExp.
 This module provides a single, well-defined normalization function used by
 ingestion, analytics, and any future data pipelines.
 
+normalize_timestamp() is the strict form; coerce_timestamp() also accepts
+epoch seconds and None, as incoming readings may carry them.
+
 Contract:
 - Accepts strings or datetime objects
 - Parses ISO8601 strings into datetime objects
@@ -16,12 +19,12 @@ Contract:
 from __future__ import annotations
 
 import datetime
-from typing import Union
+from typing import Any, Union
 from zoneinfo import ZoneInfo
 
-from ..logging_setup import get_logger
+from .logging_setup import get_lazy_logger
 
-logger = get_logger("beamfoundry.timestamps")
+logger = get_lazy_logger("beamfoundry.timestamps")
 
 UTC: ZoneInfo = ZoneInfo("UTC")
 
@@ -41,9 +44,9 @@ def normalize_timestamp(value: Union[str, datetime.datetime]) -> datetime.dateti
     - ValueError for invalid formats
     - TypeError for unsupported types
     """
-    logger.debug(
+    logger.sampled(
         "normalize_timestamp_called",
-        extra={"type": str(type(value)), "value_preview": str(value)[:50]},
+        extra=lambda: {"type": str(type(value)), "value_preview": str(value)[:50]},
     )
 
     if isinstance(value, datetime.datetime):
@@ -73,3 +76,39 @@ def normalize_timestamp(value: Union[str, datetime.datetime]) -> datetime.dateti
     logger.debug("normalize_timestamp_converted_to_utc")
 
     return utc_dt
+
+
+def coerce_timestamp(raw: Any) -> datetime.datetime:
+    """
+    Convert an incoming reading timestamp into a UTC-aware datetime.
+
+    Used per row by ingestion, imports and query bounds, so it does not log.
+
+    Accepts:
+    - float/int epoch seconds
+    - ISO8601 strings (including a trailing "Z")
+    - datetime.datetime objects (naive or aware)
+    - None, meaning now
+
+    Raises:
+    - ValueError for invalid strings
+    - TypeError for unsupported types
+    """
+    if raw is None:
+        return datetime.datetime.now(datetime.timezone.utc)
+
+    if isinstance(raw, (int, float)):
+        return datetime.datetime.fromtimestamp(raw, tz=datetime.timezone.utc)
+
+    # fromisoformat() only accepts a "Z" suffix from Python 3.11 on
+    if isinstance(raw, str):
+        if raw.endswith(("Z", "z")):
+            raw = raw[:-1] + "+00:00"
+        raw = datetime.datetime.fromisoformat(raw)
+
+    if isinstance(raw, datetime.datetime):
+        if raw.tzinfo is None:
+            return raw.replace(tzinfo=datetime.timezone.utc)
+        return raw.astimezone(datetime.timezone.utc)
+
+    raise TypeError(f"Unsupported timestamp type: {type(raw)}")
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import bisect
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Iterable, List
+from typing import Deque, Iterable, List, Tuple
 
 # ---------------------------------------------------------------------------
 # Data structures required by tests
@@ -109,3 +111,173 @@ class AnalyticsEngine:
         windowed = [r for r in readings if start <= r.timestamp <= end]
 
         return sorted(windowed, key=lambda r: r.timestamp)
+
+
+# ---------------------------------------------------------------------------
+# Incremental engine (bounded memory, O(1) metrics)
+# ---------------------------------------------------------------------------
+
+
+class IncrementalAnalyticsEngine(AnalyticsEngine):
+    """
+    Sliding-window engine for continuous streams.
+
+    Samples are kept in a time-ordered deque holding only the current window,
+    together with a running sum and monotonic deques for min/max. Samples
+    older than the window are evicted as newer ones arrive (and when
+    compute_metrics() is called with a later `now`), so memory is bounded by
+    the window and compute_metrics() is amortized O(1).
+
+    Differences from AnalyticsEngine:
+      - compute_metrics() leaves result.readings empty unless called with
+        with_readings=True, which copies the window (O(window)).
+      - Evicted samples are gone, so query times are expected to be
+        non-decreasing, as they are on a live stream.
+      - Samples older than the window on arrival are dropped.
+      - Out-of-order samples inside the window are accepted but rebuild the
+        window state (O(window)); in-order streams never take that path.
+      - Querying a `now` earlier than the newest sample falls back to a scan.
+    """
+
+    # Re-sum the window after this many evictions per retained sample, so
+    # floating-point error in the running sum cannot accumulate.
+    _RESUM_FACTOR = 4
+
+    def __init__(self, window_minutes: float = 5):
+        super().__init__(window_minutes)
+        self._window = timedelta(seconds=self.window_seconds)
+        self._samples: Deque[ReadingSample] = deque()  # type: ignore[assignment]
+        self._seq = 0
+        self._seqs: Deque[int] = deque()
+        self._sum = 0.0
+        self._evicted_since_resum = 0
+        # (seq, value) with values decreasing / increasing from the left
+        self._max: Deque[Tuple[int, float]] = deque()
+        self._min: Deque[Tuple[int, float]] = deque()
+        self.dropped = 0
+
+    # -----------------------------
+    # Stateful ingestion
+    # -----------------------------
+    def add_reading(self, sample: ReadingSample) -> None:
+        if sample.timestamp.tzinfo is None:
+            raise ValueError("timestamp must be timezone-aware")
+
+        if self._samples and sample.timestamp < self._samples[-1].timestamp:
+            self._insert_out_of_order(sample)
+            return
+
+        self._append(sample)
+        self._evict_before(sample.timestamp - self._window)
+
+    def _append(self, sample: ReadingSample) -> None:
+        seq = self._seq
+        self._seq += 1
+        value = sample.value
+
+        self._samples.append(sample)
+        self._seqs.append(seq)
+        self._sum += value
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+
+    def _evict_before(self, start: datetime) -> None:
+        samples = self._samples
+        while samples and samples[0].timestamp < start:
+            sample = samples.popleft()
+            seq = self._seqs.popleft()
+            self._sum -= sample.value
+            self._evicted_since_resum += 1
+            if self._max[0][0] == seq:
+                self._max.popleft()
+            if self._min[0][0] == seq:
+                self._min.popleft()
+
+        if not samples:
+            self._sum = 0.0
+            self._evicted_since_resum = 0
+        elif self._evicted_since_resum >= self._RESUM_FACTOR * len(samples):
+            self._sum = sum(s.value for s in samples)
+            self._evicted_since_resum = 0
+
+    def _insert_out_of_order(self, sample: ReadingSample) -> None:
+        newest = self._samples[-1].timestamp
+        if sample.timestamp < newest - self._window:
+            self.dropped += 1
+            return
+
+        ordered = list(self._samples)
+        bisect.insort_right(ordered, sample, key=lambda s: s.timestamp)
+
+        self._samples.clear()
+        self._seqs.clear()
+        self._max.clear()
+        self._min.clear()
+        self._sum = 0.0
+        self._evicted_since_resum = 0
+        for s in ordered:
+            self._append(s)
+
+    # -----------------------------
+    # Window extraction
+    # -----------------------------
+    def get_window(self, now: datetime) -> List[ReadingSample]:
+        if now.tzinfo is None:
+            raise ValueError("now must be timezone-aware")
+
+        self._evict_before(now - self._window)
+        if self._samples and self._samples[-1].timestamp > now:
+            return [s for s in self._samples if s.timestamp <= now]
+        return list(self._samples)
+
+    # -----------------------------
+    # Metrics
+    # -----------------------------
+    def compute_metrics(self, now: datetime, with_readings: bool = False) -> AnalyticsResult:
+        """
+        Metrics for [now - window, now].
+
+        The result's readings list is empty unless with_readings=True, which
+        copies the window into it and makes the call O(window).
+        """
+        if now.tzinfo is None:
+            raise ValueError("now must be timezone-aware")
+
+        start = now - self._window
+        self._evict_before(start)
+
+        samples = self._samples
+        if samples and samples[-1].timestamp > now:
+            # Query behind the newest sample: exact answer by scanning.
+            result = super().compute_metrics(now)
+            if not with_readings:
+                result.readings = []
+            return result
+
+        if not samples:
+            return AnalyticsResult(
+                count=0,
+                average=None,
+                minimum=None,
+                maximum=None,
+                readings=[],
+                window_start=start,
+                window_end=now,
+            )
+
+        count = len(samples)
+        return AnalyticsResult(
+            count=count,
+            average=self._sum / count,
+            minimum=self._min[0][1],
+            maximum=self._max[0][1],
+            readings=list(samples) if with_readings else [],
+            window_start=start,
+            window_end=now,
+        )
@@ -1,13 +1,17 @@
 # filename: beamfoundry/gunicorn.conf.py
 
+import glob
 import logging as pylogging
+import os
 import sys
 
 loglevel = "info"
 accesslog = "-"
 errorlog = "-"
 
-# Forward Python logs to stdout so Docker can capture them
+# Forward Python logs to stdout so Docker can capture them. The app's own
+# beamfoundry/logexp/app loggers do not propagate here: they write JSON lines
+# to stderr through the non-blocking queue pipeline (app/logging_setup.py).
 root = pylogging.getLogger()
 root.setLevel(pylogging.INFO)
 
@@ -34,3 +38,12 @@ errorlog = "-"
 loglevel = "info"
 
 proc_name = "logexp-gunicorn"
+
+
+def on_starting(server):
+    # Metric snapshots from a previous run would otherwise be merged into
+    # this run's /metrics totals (see app/metrics.py, multiprocess mode).
+    directory = os.environ.get("METRICS_MULTIPROC_DIR")
+    if directory:
+        for path in glob.glob(os.path.join(directory, "metrics-*.json*")):
+            os.remove(path)
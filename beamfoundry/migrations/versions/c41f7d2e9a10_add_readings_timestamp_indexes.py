@@ -0,0 +1,60 @@
+"""add logexp_readings timestamp indexes
+
+Revision ID: c41f7d2e9a10
+Revises: ba449a49ecae
+Create Date: 2026-10-18 09:12:44.402117
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c41f7d2e9a10"
+down_revision = "ba449a49ecae"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_logexp_readings_timestamp", ["timestamp"]),
+    ("ix_logexp_readings_device_id_timestamp", ["device_id", "timestamp"]),
+]
+
+
+def _is_postgres():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    # On Postgres the indexes are built CONCURRENTLY so a populated
+    # logexp_readings table stays writable (the poller keeps ingesting).
+    # CONCURRENTLY cannot run inside a transaction, hence the autocommit block.
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(
+                    name,
+                    "logexp_readings",
+                    columns,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+        return
+
+    for name, columns in INDEXES:
+        op.create_index(name, "logexp_readings", columns)
+
+
+def downgrade():
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, _ in reversed(INDEXES):
+                op.drop_index(
+                    name,
+                    table_name="logexp_readings",
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
+        return
+
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="logexp_readings")
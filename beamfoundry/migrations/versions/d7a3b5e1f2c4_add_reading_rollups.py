@@ -0,0 +1,45 @@
+"""add 1m/1h/1d reading rollup tables
+
+Revision ID: d7a3b5e1f2c4
+Revises: c41f7d2e9a10
+Create Date: 2026-10-18 15:40:03.518220
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d7a3b5e1f2c4"
+down_revision = "c41f7d2e9a10"
+branch_labels = None
+depends_on = None
+
+TABLES = ["logexp_rollups_1m", "logexp_rollups_1h", "logexp_rollups_1d"]
+
+
+def upgrade():
+    # Tables start empty; e5c9a2f7b3d1 backfills them from existing readings.
+    for name in TABLES:
+        op.create_table(
+            name,
+            sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("device_id", sa.String(length=64), nullable=False, server_default=""),
+            sa.Column("mode", sa.String(length=10), nullable=False),
+            sa.Column("reading_count", sa.BigInteger(), nullable=False),
+            sa.Column("cps_sum", sa.BigInteger(), nullable=False),
+            sa.Column("cps_min", sa.Integer(), nullable=False),
+            sa.Column("cps_max", sa.Integer(), nullable=False),
+            sa.Column("cpm_sum", sa.BigInteger(), nullable=False),
+            sa.Column("cpm_min", sa.Integer(), nullable=False),
+            sa.Column("cpm_max", sa.Integer(), nullable=False),
+            sa.Column("usv_sum", sa.Float(), nullable=False),
+            sa.Column("usv_min", sa.Float(), nullable=False),
+            sa.Column("usv_max", sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint("bucket_start", "device_id", "mode"),
+        )
+
+
+def downgrade():
+    for name in reversed(TABLES):
+        op.drop_table(name)
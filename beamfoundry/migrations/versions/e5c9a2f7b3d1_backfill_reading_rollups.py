@@ -0,0 +1,72 @@
+"""backfill reading rollups from existing readings
+
+Revision ID: e5c9a2f7b3d1
+Revises: d7a3b5e1f2c4
+Create Date: 2026-10-18 16:05:27.114903
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5c9a2f7b3d1"
+down_revision = "d7a3b5e1f2c4"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    "bucket_start, device_id, mode, reading_count, cps_sum, cps_min, cps_max, "
+    "cpm_sum, cpm_min, cpm_max, usv_sum, usv_min, usv_max"
+)
+
+# Bucket expressions must produce exactly what UTCDateTime binds, or later
+# ingest-time upserts would not conflict with the backfilled rows.
+POSTGRES_UNITS = {"1m": "minute", "1h": "hour", "1d": "day"}
+SQLITE_FORMATS = {
+    "1m": "%Y-%m-%d %H:%M:00.000000",
+    "1h": "%Y-%m-%d %H:00:00.000000",
+    "1d": "%Y-%m-%d 00:00:00.000000",
+}
+
+
+def _bucket(column, resolution):
+    if op.get_bind().dialect.name == "postgresql":
+        unit = POSTGRES_UNITS[resolution]
+        return f"date_trunc('{unit}', {column} AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+    return f"strftime('{SQLITE_FORMATS[resolution]}', {column})"
+
+
+def upgrade():
+    # Rollups only see readings ingested after d7a3b5e1f2c4, so long
+    # analytics windows would undercount until a manual backfill. Rebuild
+    # them here: 1m from the raw table, then 1h from 1m and 1d from 1h,
+    # so logexp_readings is scanned once. Stop the poller while this runs;
+    # readings ingested concurrently may be missed (re-run
+    # `flask readings backfill-rollups` afterwards if it was not stopped).
+    for name in ("logexp_rollups_1m", "logexp_rollups_1h", "logexp_rollups_1d"):
+        op.execute(f"DELETE FROM {name}")
+
+    op.execute(
+        f"INSERT INTO logexp_rollups_1m ({COLUMNS}) "
+        f"SELECT {_bucket('timestamp', '1m')} AS bucket, COALESCE(device_id, ''), mode, "
+        "COUNT(*), SUM(counts_per_second), MIN(counts_per_second), MAX(counts_per_second), "
+        "SUM(counts_per_minute), MIN(counts_per_minute), MAX(counts_per_minute), "
+        "SUM(microsieverts_per_hour), MIN(microsieverts_per_hour), "
+        "MAX(microsieverts_per_hour) "
+        "FROM logexp_readings GROUP BY bucket, COALESCE(device_id, ''), mode"
+    )
+
+    for target, source in (("1h", "1m"), ("1d", "1h")):
+        op.execute(
+            f"INSERT INTO logexp_rollups_{target} ({COLUMNS}) "
+            f"SELECT {_bucket('bucket_start', target)} AS bucket, device_id, mode, "
+            "SUM(reading_count), SUM(cps_sum), MIN(cps_min), MAX(cps_max), "
+            "SUM(cpm_sum), MIN(cpm_min), MAX(cpm_max), "
+            "SUM(usv_sum), MIN(usv_min), MAX(usv_max) "
+            f"FROM logexp_rollups_{source} GROUP BY bucket, device_id, mode"
+        )
+
+
+def downgrade():
+    # The rollups are derived data; d7a3b5e1f2c4's downgrade drops them.
+    pass
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional, Union
 
-import serial
+import serial  # noqa: F401  (the serial module is patched through here in tests)
 
+from app.geiger import SerialLineReader
 from app.logging_setup import get_logger
 
 from .poller_config import PollerConfig
@@ -38,6 +39,9 @@ class Poller:
         # Track successful ingestions separately from attempted frames
         self._successful_ingestions: int = 0
 
+        # Serial mode keeps one port handle open across polls; created lazily.
+        self._reader: Optional[SerialLineReader] = None
+
         logger.debug(
             "poller_initialized",
             extra={
@@ -112,14 +116,22 @@ class Poller:
             logger.error("serial_port_missing")
             return None
 
-        try:
-            with serial.Serial(
+        if self._reader is None:
+            self._reader = SerialLineReader(
                 self.config.serial_port,
                 self.config.serial_baudrate,
                 timeout=self.config.serial_timeout,
-            ) as ser:
-                raw = ser.readline().decode("utf-8").strip()
+            )
+
+        errors_before = self._reader.stats["errors"]
+        try:
+            raw = self._reader.readline()
         except Exception:
+            self._reader.close()
+            logger.error("serial_read_failure")
+            return None
+
+        if self._reader.stats["errors"] != errors_before:
             logger.error("serial_read_failure")
             return None
 
@@ -136,6 +148,11 @@ class Poller:
 
         return frame
 
+    def close(self) -> None:
+        """Release the serial port, if one is open."""
+        if self._reader is not None:
+            self._reader.close()
+
     def poll_forever(self) -> None:
         """
         Poll repeatedly until max_frames is reached or polling is disabled.
@@ -180,6 +197,7 @@ class Poller:
                 "port": self.config.serial_port,
                 "baudrate": self.config.serial_baudrate,
                 "timeout": self.config.serial_timeout,
+                "reader": self._reader.diagnostics() if self._reader else None,
             }
 
         return base
@@ -6,7 +6,7 @@ from flask import Flask
 
 from app.extensions import db
 from app.logging_setup import get_logger
-from app.models import LogExpReading
+from app.models import LogExpReading, ReadingRollup1d, ReadingRollup1h, ReadingRollup1m
 
 logger = get_logger("beamfoundry.seeds")
 
@@ -29,6 +29,10 @@ def seed_test_data(app: Flask) -> None:
         deleted = db.session.query(LogExpReading).delete()
         logger.debug("seed_deleted_existing_rows", extra={"count": deleted})
 
+        # The rollups describe the rows just deleted; the new sample re-adds itself.
+        for rollup in (ReadingRollup1m, ReadingRollup1h, ReadingRollup1d):
+            db.session.query(rollup).delete()
+
         sample = LogExpReading(
             counts_per_second=1,
             counts_per_minute=60,
@@ -18,6 +18,7 @@ from freezegun import freeze_time
 
 from app import create_app
 from app.extensions import db
+from app.logging_setup import set_log_propagation
 
 # Correct relative imports for the test package
 from .fixtures.analytics import shift, ts_base  # noqa: F401
@@ -34,6 +35,19 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 
+@pytest.fixture
+def caplog(caplog):
+    """
+    pytest's caplog, with app records propagating to its root handler.
+
+    configure_logging() stops beamfoundry/logexp/app records at their
+    top-level loggers so root handlers never run on the logging thread.
+    """
+    set_log_propagation(True)
+    yield caplog
+    set_log_propagation(False)
+
+
 @pytest.fixture(scope="function")
 def test_app():
     """
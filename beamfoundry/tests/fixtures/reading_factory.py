@@ -34,6 +34,7 @@ def reading_factory(db_session):
         cpm: float | int | None = None,
         microsieverts_per_hour: float = 0.01,
         mode: str = "test",
+        device_id: str | None = None,
     ) -> LogExpReading:
         # Normalize timestamp input
         if isinstance(timestamp, str):
@@ -55,6 +56,7 @@ def reading_factory(db_session):
             counts_per_minute=cpm_int,
             microsieverts_per_hour=float(microsieverts_per_hour),
             mode=mode,
+            device_id=device_id,
         )
 
         db.session.add(reading)
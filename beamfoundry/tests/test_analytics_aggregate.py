@@ -0,0 +1,52 @@
+# filename: beamfoundry/tests/test_analytics_aggregate.py
+
+import statistics
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.analytics import aggregate_window
+from app.services.ingestion import ingest_readings_batch
+
+
+def _ingest(values, start):
+    ingest_readings_batch(
+        [
+            {
+                "timestamp": (start + timedelta(seconds=i)).isoformat(),
+                "counts_per_second": cps,
+                "counts_per_minute": cpm,
+                "microsieverts_per_hour": usv,
+                "mode": "SLOW",
+            }
+            for i, (cps, cpm, usv) in enumerate(values)
+        ]
+    )
+
+
+def test_aggregate_window_matches_python(test_app):
+    values = [(i % 7, (i % 7) * 60 + i, 0.01 * (i % 5)) for i in range(40)]
+    _ingest(values, datetime.now(timezone.utc) - timedelta(seconds=45))
+
+    summary = aggregate_window()
+
+    assert summary["count"] == 40
+    for index, key in enumerate(("cps", "cpm", "usv")):
+        column = [v[index] for v in values]
+        assert summary[key]["avg"] == pytest.approx(statistics.fmean(column))
+        assert summary[key]["min"] == pytest.approx(min(column))
+        assert summary[key]["max"] == pytest.approx(max(column))
+        assert summary[key]["stddev"] == pytest.approx(statistics.pstdev(column))
+
+
+def test_aggregate_stddev_of_large_clustered_values(test_app):
+    # AVG(x*x) - AVG(x)**2 loses the 0.25 variance entirely at this magnitude
+    # (x*x ~ 4e18, where one double ulp is 512).
+    base = 2_000_000_000
+    values = [(1, base + (i % 2), 0.01) for i in range(20)]
+    _ingest(values, datetime.now(timezone.utc) - timedelta(seconds=30))
+
+    summary = aggregate_window()
+
+    assert summary["cpm"]["stddev"] == pytest.approx(0.5)
+    assert summary["cps"]["stddev"] == 0.0
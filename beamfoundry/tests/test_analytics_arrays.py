@@ -0,0 +1,126 @@
+# filename: beamfoundry/tests/test_analytics_arrays.py
+
+import random
+import statistics
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.services import analytics_arrays
+from app.services.analytics_arrays import (
+    ema,
+    ema_last,
+    histogram,
+    load_reading_arrays,
+    percentiles,
+    rolling_mean,
+    rolling_std,
+    summarize_arrays,
+)
+from app.services.analytics_utils import average, moving_average, summarize_readings
+from app.services.ingestion import ingest_readings_batch
+
+T0 = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def _loop_ema(values, alpha):
+    out = [values[0]]
+    for v in values[1:]:
+        out.append(alpha * v + (1 - alpha) * out[-1])
+    return out
+
+
+@pytest.fixture
+def values():
+    rng = random.Random(11)
+    return [rng.uniform(0, 100) for _ in range(5000)]
+
+
+@pytest.mark.parametrize("alpha", [0.001, 0.1, 0.5, 1.0])
+def test_ema_matches_loop(values, alpha, monkeypatch):
+    expected = _loop_ema(values, alpha)
+
+    assert ema(values, alpha) == pytest.approx(expected, rel=1e-9)
+    assert ema_last(values, alpha) == pytest.approx(expected[-1], rel=1e-9)
+
+    monkeypatch.setattr(analytics_arrays, "_lfilter", None)
+    assert ema(values, alpha) == pytest.approx(expected, rel=1e-9)
+
+
+def test_moving_average_wrapper(values):
+    assert moving_average(values, 0.2) == pytest.approx(_loop_ema(values, 0.2)[-1])
+    assert moving_average([], 0.2) is None
+    assert average([1, 2, 6]) == 3.0
+    assert average([]) is None
+
+
+def test_rolling_mean_and_std(values):
+    window = 50
+    means = rolling_mean(values, window)
+    stds = rolling_std(values, window, ddof=1)
+
+    assert len(means) == len(values) - window + 1
+    for i in (0, 1234, len(means) - 1):
+        chunk = values[i : i + window]
+        assert means[i] == pytest.approx(statistics.fmean(chunk))
+        assert stds[i] == pytest.approx(statistics.stdev(chunk))
+    assert len(rolling_mean(values[:10], window)) == 0
+
+
+def test_rolling_std_large_offset():
+    x = 1e9 + np.tile([0.0, 1.0], 500)
+
+    assert rolling_std(x, 10) == pytest.approx(np.full(991, 0.5))
+
+
+def test_percentiles_and_histogram(values):
+    result = percentiles(values, (50, 90))
+
+    assert result[50.0] == pytest.approx(statistics.median(values))
+    assert percentiles([], (50,)) == {}
+
+    counts, edges = histogram(values, bins=10, value_range=(0, 100))
+    assert counts.sum() == len(values)
+    assert len(edges) == 11
+
+
+def test_load_reading_arrays(test_app):
+    ingest_readings_batch(
+        [
+            {
+                "timestamp": (T0 + timedelta(seconds=i, microseconds=250 * i)).isoformat(),
+                "counts_per_second": i,
+                "counts_per_minute": i * 60,
+                "microsieverts_per_hour": i * 0.01,
+                "mode": "SLOW",
+                "device_id": "node-1" if i % 2 else "node-2",
+            }
+            for i in range(10, 0, -1)
+        ]
+    )
+
+    arrays = load_reading_arrays(since=T0 + timedelta(seconds=2))
+
+    assert len(arrays) == 9
+    assert arrays.cps.tolist() == list(range(2, 11))
+    assert arrays.usv == pytest.approx([i * 0.01 for i in range(2, 11)])
+    expected_ns = [
+        int((T0 + timedelta(seconds=i, microseconds=250 * i)).timestamp() * 1_000_000) * 1000
+        for i in range(2, 11)
+    ]
+    assert arrays.timestamps_ns.tolist() == expected_ns
+
+    odd = load_reading_arrays(device_id="node-1")
+    assert odd.cpm.tolist() == [60, 180, 300, 420, 540]
+    assert summarize_arrays(odd)["avg_cps"] == 5.0
+    assert len(load_reading_arrays(since=T0 + timedelta(days=1))) == 0
+
+
+def test_summarize_readings_wrapper(test_app, reading_factory):
+    readings = [reading_factory(T0 + timedelta(seconds=i), cps=c) for i, c in enumerate([4, 9, 1])]
+
+    summary = summarize_readings(readings)
+
+    assert (summary["count"], summary["min_cps"], summary["max_cps"]) == (3, 1, 9)
+    assert summary["first_timestamp"] == readings[0].timestamp
@@ -0,0 +1,92 @@
+# filename: beamfoundry/tests/test_analytics_cache.py
+
+from datetime import datetime, timedelta, timezone
+
+from app.services.analytics import run_analytics
+from app.services.analytics_cache import AnalyticsCache, get_analytics_cache
+from app.services.ingestion import ingest_readings_batch
+
+T0 = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _ingest(offsets, cps):
+    ingest_readings_batch(
+        [
+            {
+                "timestamp": (T0 + timedelta(seconds=s)).isoformat(),
+                "counts_per_second": cps,
+                "counts_per_minute": cps * 60,
+                "microsieverts_per_hour": 0.01,
+                "mode": "SLOW",
+            }
+            for s in offsets
+        ]
+    )
+
+
+def test_cache_ttl_and_generation():
+    clock = FakeClock()
+    cache = AnalyticsCache(ttl_seconds=5.0, clock=clock)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    key = ("x", 60, None, "raw")
+    assert cache.get_or_compute(key, compute) == 1
+    assert cache.get_or_compute(key, compute) == 1
+
+    clock.now = 6.0
+    assert cache.get_or_compute(key, compute) == 2
+
+    cache.bump_generation()
+    assert cache.get_or_compute(key, compute) == 3
+    assert cache.get_or_compute(("x", 120, None, "raw"), compute) == 4
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["generation"]) == (1, 4, 1)
+
+
+def test_cache_disabled_with_zero_ttl():
+    cache = AnalyticsCache(ttl_seconds=0)
+    calls = []
+
+    cache.get_or_compute(("x", 60, None, None), lambda: calls.append(1))
+    cache.get_or_compute(("x", 60, None, None), lambda: calls.append(1))
+
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 0
+
+
+def test_run_analytics_cached_until_ingest(test_app):
+    _ingest(range(3), cps=10)
+
+    first = run_analytics()
+    assert run_analytics() is first
+
+    _ingest([3], cps=50)
+    second = run_analytics()
+
+    assert second is not first
+    assert second["count"] == 4
+    assert second["avg_cps"] == 20
+    assert get_analytics_cache().stats()["hits"] == 1
+
+
+def test_diagnostics_expose_cache_counters(test_app, test_client):
+    test_client.get("/api/diagnostics")
+    payload = test_client.get("/api/diagnostics").get_json()
+
+    cache = payload["analytics"]["cache"]
+    assert cache["hits"] >= 1
+    assert cache["misses"] >= 1
+    assert cache["enabled"] is True
@@ -0,0 +1,94 @@
+# filename: tests/test_analytics_export.py
+
+import csv
+import datetime
+import io
+
+from app.extensions import db
+from app.models import LogExpReading
+from app.services.analytics_export import export_readings_to_csv, iter_readings_csv
+
+BASE = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+def _seed(reading_factory, count):
+    for i in range(count):
+        reading_factory(
+            BASE + datetime.timedelta(days=i),
+            cps=i,
+            microsieverts_per_hour=0.5,
+            mode="SLOW",
+            device_id="dev-1",
+        )
+    db.session.commit()
+
+
+def _parse(body):
+    return list(csv.DictReader(io.StringIO(body)))
+
+
+def test_csv_generator_yields_header_then_chunks(test_app, reading_factory):
+    _seed(reading_factory, 5)
+
+    with test_app.app_context():
+        readings = db.session.query(LogExpReading).order_by(LogExpReading.timestamp).all()
+        chunks = list(iter_readings_csv(readings, chunk_rows=2))
+
+    # header + ceil(5 / 2) data chunks
+    assert len(chunks) == 4
+    assert chunks[0].startswith("timestamp,counts_per_second,counts_per_minute")
+    assert "".join(chunks) == export_readings_to_csv(readings)
+
+
+def test_export_includes_all_columns_for_full_history(test_client, reading_factory):
+    _seed(reading_factory, 3)
+
+    resp = test_client.get("/analytics/export")
+
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    rows = _parse(resp.get_data(as_text=True))
+    assert len(rows) == 3
+    assert rows[0] == {
+        "timestamp": "2024-01-01T12:00:00+00:00",
+        "counts_per_second": "0",
+        "counts_per_minute": "0",
+        "microsieverts_per_hour": "0.5",
+        "mode": "SLOW",
+        "device_id": "dev-1",
+    }
+
+
+def test_export_date_range_and_fields(test_client, reading_factory):
+    _seed(reading_factory, 60)
+
+    resp = test_client.get(
+        "/analytics/export",
+        query_string={
+            "start": "2024-01-11T00:00:00Z",
+            "end": "2024-02-10T23:59:59Z",
+            "fields": "timestamp,counts_per_second",
+        },
+    )
+
+    rows = _parse(resp.get_data(as_text=True))
+    assert list(rows[0].keys()) == ["timestamp", "counts_per_second"]
+    assert [int(r["counts_per_second"]) for r in rows] == list(range(10, 41))
+
+
+def test_export_accepts_ui_date_aliases(test_client, reading_factory):
+    _seed(reading_factory, 3)
+
+    # test_app runs with LOCAL_TIMEZONE=UTC, so naive values are UTC.
+    resp = test_client.get(
+        "/analytics/export",
+        query_string={"start_date": "2024-01-02T00:00", "end_date": "2024-01-02T23:59"},
+    )
+
+    rows = _parse(resp.get_data(as_text=True))
+    assert [r["counts_per_second"] for r in rows] == ["1"]
+
+
+def test_export_rejects_unknown_fields(test_client, db_session):
+    resp = test_client.get("/analytics/export?fields=timestamp,password_hash")
+    assert resp.status_code == 400
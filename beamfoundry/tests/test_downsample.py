@@ -0,0 +1,135 @@
+# filename: beamfoundry/tests/test_downsample.py
+
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.services.downsample import downsample, lttb_indices, minmax_indices
+from app.services.ingestion import ingest_readings_batch
+
+T0 = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def _reference_lttb(xs, ys, n):
+    """Straightforward LTTB, one point at a time."""
+    length = len(xs)
+    every = (length - 2) / (n - 2)
+    keep = [0]
+    a = 0
+    for i in range(n - 2):
+        start = int(i * every) + 1
+        stop = int((i + 1) * every) + 1
+        next_start = stop
+        next_stop = min(int((i + 2) * every) + 1, length) if i < n - 3 else length
+        if i == n - 3:
+            next_start = length - 1
+        nx = sum(xs[next_start:next_stop]) / (next_stop - next_start)
+        ny = sum(ys[next_start:next_stop]) / (next_stop - next_start)
+        best, best_area = start, -1.0
+        for j in range(start, stop):
+            area = abs((xs[a] - nx) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (ny - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        keep.append(best)
+        a = best
+    keep.append(length - 1)
+    return keep
+
+
+def test_lttb_matches_reference():
+    rng = random.Random(7)
+    xs = [float(i) for i in range(5000)]
+    ys = [math.sin(i / 50.0) * 10 + rng.gauss(0, 1) for i in range(5000)]
+
+    keep = lttb_indices(xs, ys, 300)
+
+    assert keep.tolist() == _reference_lttb(xs, ys, 300)
+
+
+def test_lttb_keeps_spike_and_endpoints():
+    ys = np.zeros(100_000)
+    ys[31_337] = 500.0
+
+    keep = lttb_indices(np.arange(len(ys)), ys, 200)
+
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == len(ys) - 1
+    assert 31_337 in keep
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_minmax_keeps_envelope():
+    rng = np.random.default_rng(3)
+    ys = rng.normal(size=10_001)
+
+    keep = minmax_indices(ys, 100)
+
+    assert len(keep) <= 100
+    assert keep[0] == 0 and keep[-1] == len(ys) - 1
+    assert ys[keep].max() == ys.max()
+    assert ys[keep].min() == ys.min()
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_short_series_returned_unchanged(method):
+    assert downsample([0, 1, 2], [5, 6, 7], 10, method).tolist() == [0, 1, 2]
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        downsample([0, 1], [0, 1], 10, "nearest")
+
+
+def _payloads(n, step=timedelta(seconds=1)):
+    return [
+        {
+            "timestamp": (T0 + i * step).isoformat(),
+            "counts_per_second": i % 7,
+            "counts_per_minute": (i % 7) * 60 + (600 if i == 1234 else 0),
+            "microsieverts_per_hour": 0.1,
+            "mode": "SLOW",
+        }
+        for i in range(n)
+    ]
+
+
+def test_series_endpoint_downsamples(test_app, test_client):
+    ingest_readings_batch(_payloads(3600))
+
+    resp = test_client.get(
+        "/api/readings/series?since=2024-03-01T00:00:00Z&until=2024-03-01T01:00:00Z&points=100"
+    )
+
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert len(body["data"]) == 100
+    assert body["input_points"] == 360  # 4x oversampled 10 s buckets
+    assert (body["source"], body["step_seconds"]) == ("raw", 10)
+    assert body["data"][0][0] == int(T0.timestamp() * 1000)
+    assert [ms for ms, _ in body["data"]] == sorted(ms for ms, _ in body["data"])
+
+
+def test_series_endpoint_minmax_keeps_peak(test_app, test_client):
+    ingest_readings_batch(_payloads(3600))
+
+    resp = test_client.get(
+        "/api/readings/series?since=2024-03-01T00:00:00Z&until=2024-03-01T01:00:00Z"
+        "&points=50&method=minmax"
+    )
+
+    values = [v for _, v in resp.get_json()["data"]]
+    assert max(values) == (1234 % 7) * 60 + 600
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["points=abc", "points=1", "metric=dose", "method=spline", "since=2024-03-02&until=2024-03-01"],
+)
+def test_series_endpoint_rejects_bad_args(test_app, test_client, query):
+    resp = test_client.get(f"/api/readings/series?{query}")
+
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
@@ -0,0 +1,260 @@
+# filename: beamfoundry/tests/test_ingestion_queue.py
+
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import LogExpReading
+from app.services import ingestion
+from app.services.ingestion_queue import IngestionQueue
+from app.services.ingestion_spool import ReadingSpool
+from app.services.poller import get_poller_status
+
+
+def _payload(cps=1):
+    return {
+        "counts_per_second": cps,
+        "counts_per_minute": cps * 60,
+        "microsieverts_per_hour": 0.01,
+        "mode": "SLOW",
+    }
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def make_queue(test_app):
+    queues = []
+
+    def _make(**kwargs):
+        queue = IngestionQueue(test_app, **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield _make
+
+    for queue in queues:
+        queue.stop()
+
+
+def test_flushes_when_batch_is_full(make_queue):
+    queue = make_queue(batch_size=5, flush_interval=30)
+    queue.start()
+
+    for i in range(5):
+        queue.put(_payload(i))
+
+    assert _wait_for(lambda: queue.stats()["written"] == 5)
+    stats = queue.stats()
+    assert stats["batches"] == 1
+    assert stats["depth"] == 0
+    assert stats["flush_ms_last"] is not None
+    assert db.session.query(LogExpReading).count() == 5
+
+
+def test_flushes_partial_batch_after_interval(make_queue):
+    queue = make_queue(batch_size=100, flush_interval=0.05)
+    queue.start()
+
+    queue.put(_payload())
+    queue.put(_payload())
+
+    assert _wait_for(lambda: queue.stats()["written"] == 2)
+
+
+def test_readings_are_timestamped_on_put(make_queue):
+    queue = make_queue(batch_size=100, flush_interval=30)
+
+    queue.put(_payload())
+
+    assert queue._items[0][1]["timestamp"].tzinfo is not None
+
+
+def test_drop_oldest_policy(make_queue):
+    queue = make_queue(maxsize=3, overflow="drop_oldest")
+
+    for i in range(5):
+        assert queue.put(_payload(i)) is True
+
+    assert [row["counts_per_second"] for _, row, _ in queue._items] == [2, 3, 4]
+    assert queue.stats()["dropped"] == 2
+
+
+def test_block_policy_times_out(make_queue):
+    queue = make_queue(maxsize=1, overflow="block", block_timeout=0.05)
+
+    assert queue.put(_payload()) is True
+    started = time.monotonic()
+    assert queue.put(_payload()) is False
+    assert time.monotonic() - started >= 0.04
+    assert queue.stats()["dropped"] == 1
+
+
+def test_spill_policy_leaves_reading_in_spool(make_queue, tmp_path):
+    spool = ReadingSpool(str(tmp_path / "spool"))
+    queue = make_queue(maxsize=1, batch_size=10, flush_interval=0.05, overflow="spill", spool=spool)
+
+    assert queue.put(_payload(0)) is True
+    assert queue.put(_payload(1)) is False
+    assert queue.put(_payload(2)) is False
+    assert queue.stats()["spilled"] == 2
+    assert spool.stats()["appended"] == 3
+
+    queue.start()
+    assert _wait_for(lambda: spool.stats()["segments"] == 0)
+    assert db.session.query(LogExpReading).count() == 3
+    assert spool.stats()["replayed"] == 2
+
+
+def test_failed_flush_is_replayed_from_spool(make_queue, tmp_path, monkeypatch):
+    real_batch = ingestion.ingest_readings_batch
+
+    def _db_down(payloads):
+        raise RuntimeError("database unavailable")
+
+    spool = ReadingSpool(str(tmp_path / "spool"))
+    queue = make_queue(batch_size=2, spool=spool)
+    queue.put(_payload(1))
+    queue.put(_payload(2))
+    batch = [queue._items.popleft() for _ in range(2)]
+
+    monkeypatch.setattr(ingestion, "ingest_readings_batch", _db_down)
+    queue.flush(batch)
+    assert queue.stats()["failed_batches"] == 1
+    assert db.session.query(LogExpReading).count() == 0
+
+    monkeypatch.setattr(ingestion, "ingest_readings_batch", real_batch)
+    totals = queue.replay_spool()
+
+    assert totals["inserted"] == 2
+    assert db.session.query(LogExpReading).count() == 2
+    assert spool.stats()["segments"] == 0
+
+
+def test_committed_segments_are_deleted_without_replay(make_queue, tmp_path):
+    # ~40 bytes per record: two records per segment
+    spool = ReadingSpool(str(tmp_path / "spool"), segment_bytes=100)
+    queue = make_queue(batch_size=3, flush_interval=0.05, spool=spool)
+    queue.start()
+
+    for i in range(3):
+        queue.put(_payload(i))
+
+    assert _wait_for(lambda: queue.stats()["written"] == 3)
+    assert _wait_for(lambda: spool.stats()["segments_deleted"] == 1)
+    assert spool.stats()["segments"] == 1  # the active segment stays open
+    assert spool.stats()["replayed"] == 0
+
+
+def test_stop_drains_queue(make_queue):
+    queue = make_queue(batch_size=100, flush_interval=30)
+    queue.start()
+
+    for _ in range(3):
+        queue.put(_payload())
+    queue.stop()
+
+    assert queue.stats()["written"] == 3
+    assert db.session.query(LogExpReading).count() == 3
+
+
+def test_invalid_payload_rejected_on_put(make_queue):
+    queue = make_queue()
+
+    assert queue.put({"mode": "SLOW"}) is False
+    assert queue.stats()["rejected"] == 1
+    assert queue.depth() == 0
+
+
+def test_invalid_policy_rejected(test_app):
+    with pytest.raises(ValueError):
+        IngestionQueue(test_app, overflow="explode")
+    with pytest.raises(ValueError):
+        IngestionQueue(test_app, overflow="spill")
+
+
+def test_poller_status_reports_queue(test_app, make_queue):
+    class _Poller:
+        _thread = None
+        last_tick = None
+        queue = make_queue()
+
+    test_app.poller = _Poller()
+    _Poller.queue.put(_payload())
+
+    status = get_poller_status()
+
+    assert status["queue"]["depth"] == 1
+    assert status["queue"]["overflow"] == "drop_oldest"
+
+
+def test_database_outage_is_replayed_from_spool(make_queue, tmp_path, monkeypatch):
+    real_batch = ingestion.ingest_readings_batch
+    engine = create_engine(f"sqlite:///{tmp_path}/missing/readings.db")
+    unreachable = Session(engine)
+
+    spool = ReadingSpool(str(tmp_path / "spool"))
+    queue = make_queue(batch_size=3, spool=spool)
+    for i in range(3):
+        queue.put(_payload(i))
+    batch = [queue._items.popleft() for _ in range(3)]
+
+    monkeypatch.setattr(
+        ingestion,
+        "ingest_readings_batch",
+        lambda rows: real_batch(rows, db_session=unreachable),
+    )
+    queue.flush(batch)
+    unreachable.close()
+
+    stats = queue.stats()
+    assert stats["failed_batches"] == 1
+    assert stats["rejected"] == 0
+    assert spool.stats()["segments"] == 1
+
+    monkeypatch.setattr(ingestion, "ingest_readings_batch", real_batch)
+    totals = queue.replay_spool()
+
+    assert totals["inserted"] == 3
+    assert sorted(r.counts_per_second for r in db.session.query(LogExpReading)) == [0, 1, 2]
+    assert spool.stats()["segments"] == 0
+
+
+def test_row_errors_that_are_not_rejections_are_replayed(make_queue, tmp_path, monkeypatch):
+    real_batch = ingestion.ingest_readings_batch
+
+    def _rows_failed(rows):
+        errors = [{"index": i, "error": "unable to open database file"} for i in range(2)]
+        errors.append({"index": 2, "error": "UNIQUE constraint failed", "kind": "integrity"})
+        return {"received": 3, "inserted": 0, "errors": errors}
+
+    spool = ReadingSpool(str(tmp_path / "spool"))
+    queue = make_queue(batch_size=3, spool=spool)
+    for i in range(3):
+        queue.put(_payload(i))
+    batch = [queue._items.popleft() for _ in range(3)]
+
+    monkeypatch.setattr(ingestion, "ingest_readings_batch", _rows_failed)
+    queue.flush(batch)
+
+    stats = queue.stats()
+    assert stats["failed_batches"] == 1
+    assert stats["rejected"] == 1
+
+    monkeypatch.setattr(ingestion, "ingest_readings_batch", real_batch)
+    totals = queue.replay_spool()
+
+    # The segment is replayed whole; insert_new_readings() dedups what the
+    # first flush did commit.
+    assert totals["inserted"] == 3
+    assert db.session.query(LogExpReading).count() == 3
@@ -0,0 +1,123 @@
+# filename: beamfoundry/tests/test_ingestion_spool.py
+
+import os
+from datetime import datetime, timedelta, timezone
+
+from app.extensions import db
+from app.models import LogExpReading
+from app.services.ingestion_spool import (
+    ReadingSpool,
+    decode_payload,
+    encode_record,
+    iter_segment,
+)
+from app.services.readings_import import insert_new_readings
+
+T0 = datetime(2025, 3, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+
+def _row(i, device="node-1"):
+    return {
+        "timestamp": T0 + timedelta(seconds=i),
+        "counts_per_second": i,
+        "counts_per_minute": i * 60,
+        "microsieverts_per_hour": 0.0057 * i,
+        "mode": "FAST",
+        "device_id": device,
+    }
+
+
+def _segments(directory):
+    return sorted(os.path.join(directory, n) for n in os.listdir(directory))
+
+
+def test_record_round_trip():
+    for row in (_row(3), _row(4, device=None)):
+        record = encode_record(row)
+        assert decode_payload(record[8:]) == row
+
+
+def test_segments_roll_and_survive_restart(tmp_path):
+    directory = str(tmp_path)
+    spool = ReadingSpool(directory, segment_bytes=200)
+    for i in range(10):
+        spool.append(_row(i))
+    spool.close()
+
+    paths = _segments(directory)
+    assert len(paths) > 1
+    rows = [r for path in paths for r in iter_segment(path)]
+    assert rows == [_row(i) for i in range(10)]
+
+    # A new process continues numbering after the existing segments.
+    reopened = ReadingSpool(directory, segment_bytes=200)
+    reopened.append(_row(99))
+    reopened.close()
+    assert _segments(directory)[:-1] == paths
+
+
+def test_torn_tail_is_ignored(tmp_path):
+    spool = ReadingSpool(str(tmp_path))
+    for i in range(3):
+        spool.append(_row(i))
+    spool.close()
+
+    (path,) = _segments(str(tmp_path))
+    with open(path, "r+b") as fh:
+        fh.truncate(os.path.getsize(path) - 5)
+
+    assert [r["counts_per_second"] for r in iter_segment(path)] == [0, 1]
+
+
+def test_corrupt_record_stops_segment(tmp_path):
+    spool = ReadingSpool(str(tmp_path))
+    for i in range(3):
+        spool.append(_row(i))
+    spool.close()
+
+    (path,) = _segments(str(tmp_path))
+    record_len = len(encode_record(_row(0)))
+    with open(path, "r+b") as fh:
+        fh.seek(8 + record_len + 12)  # inside the second record's payload
+        fh.write(b"\xff")
+
+    assert [r["counts_per_second"] for r in iter_segment(path)] == [0]
+
+
+def test_previous_process_segments_replay_idempotently(test_app, tmp_path):
+    directory = str(tmp_path)
+    crashed = ReadingSpool(directory, segment_bytes=300)
+    for i in range(12):
+        crashed.append(_row(i))
+    crashed.close()
+
+    # Pretend the first few made it to the database before the crash.
+    insert_new_readings([_row(i) for i in range(4)])
+
+    spool = ReadingSpool(directory)
+    assert spool.has_backlog()
+
+    totals = spool.replay(insert_new_readings, batch_size=5)
+
+    assert totals["inserted"] == 8
+    assert totals["duplicates"] == 4
+    assert _segments(directory) == []
+    assert not spool.has_backlog()
+
+    stored = db.session.query(LogExpReading).order_by(LogExpReading.timestamp).all()
+    assert [r.counts_per_second for r in stored] == list(range(12))
+    assert stored[0].timestamp == T0
+
+
+def test_unsettled_segments_are_not_replayed(test_app, tmp_path):
+    spool = ReadingSpool(str(tmp_path))
+    seq = spool.append(_row(0))
+    spool.append(_row(1))
+
+    spool.mark_lost({seq: 1})  # one of two still in flight
+    assert not spool.has_backlog()
+    assert spool.replay(insert_new_readings)["segments"] == 0
+
+    spool.mark_lost({seq: 1})
+    assert spool.has_backlog()
+    assert spool.replay(insert_new_readings)["inserted"] == 2
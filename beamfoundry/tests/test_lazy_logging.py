@@ -0,0 +1,93 @@
+# filename: beamfoundry/tests/test_lazy_logging.py
+
+import logging
+
+import pytest
+
+from app.logging_setup import LazyLogger, get_lazy_logger, set_log_sampling
+from app.services.ingestion import ingest_reading
+
+
+@pytest.fixture
+def lazy():
+    return LazyLogger(logging.getLogger("beamfoundry.tests.lazy"))
+
+
+def test_fields_are_not_evaluated_below_the_level(lazy, caplog):
+    caplog.set_level(logging.INFO, logger=lazy.name)
+
+    def fields():
+        raise AssertionError("evaluated")
+
+    lazy.debug("disabled_event", extra=fields)
+    lazy.sampled("disabled_event", extra=fields)
+
+    assert caplog.records == []
+
+
+def test_enabled_record_carries_fields_and_caller(lazy, caplog):
+    caplog.set_level(logging.DEBUG, logger=lazy.name)
+
+    lazy.debug("enabled_event", extra=lambda: {"count": 3})
+    lazy.info("mapping_event", extra={"count": 4})
+
+    first, second = caplog.records
+    assert (first.getMessage(), first.levelname, first.count) == ("enabled_event", "DEBUG", 3)
+    assert first.funcName == "test_enabled_record_carries_fields_and_caller"
+    assert (second.levelname, second.count) == ("INFO", 4)
+
+
+def test_sampled_emits_first_and_every_nth(lazy, caplog):
+    caplog.set_level(logging.DEBUG, logger=lazy.name)
+
+    for i in range(7):
+        lazy.sampled("per_reading", extra=lambda: {"i": i}, every=3)
+    lazy.sampled("other_event", every=3)
+
+    records = [r for r in caplog.records if r.getMessage() == "per_reading"]
+    assert [r.i for r in records] == [0, 3, 6]
+    assert all(r.sample_every == 3 for r in records)
+    assert [r.getMessage() for r in caplog.records].count("other_event") == 1
+    assert records[0].funcName == "test_sampled_emits_first_and_every_nth"
+
+
+def test_default_sample_rate_comes_from_config(test_app, lazy, caplog):
+    caplog.set_level(logging.DEBUG, logger=lazy.name)
+    assert test_app.config_obj["LOG_SAMPLE_EVERY"] == 100
+
+    set_log_sampling(2)
+    try:
+        for _ in range(4):
+            lazy.sampled("default_rate")
+    finally:
+        set_log_sampling(test_app.config_obj["LOG_SAMPLE_EVERY"])
+
+    assert [r.sample_every for r in caplog.records] == [2, 2]
+
+
+def test_lazy_loggers_are_shared_per_name():
+    assert get_lazy_logger("beamfoundry.api") is get_lazy_logger("beamfoundry.api")
+
+
+def test_ingest_reading_logs_payload_at_debug_only(test_app, caplog):
+    caplog.set_level(logging.INFO, logger="logexp.ingestion")
+
+    ingest_reading(
+        {
+            "counts_per_second": 1,
+            "counts_per_minute": 60,
+            "microsieverts_per_hour": 0.01,
+            "mode": "SLOW",
+        }
+    )
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert "ingestion_start" in messages
+    assert "ingestion_complete" in messages
+    assert "ingestion_payload_received" not in messages
+
+
+def test_fields_are_keyword_only_like_stdlib_extra(lazy):
+    # A positional second argument means %-format args on a stdlib logger.
+    with pytest.raises(TypeError):
+        lazy.info("positional_fields", {"count": 1})
@@ -0,0 +1,168 @@
+# filename: beamfoundry/tests/test_log_pipeline.py
+
+import io
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+
+from app.logging import DroppingQueueHandler, LogPump, StructuredFormatter
+from app.logging_setup import (
+    configure_logging,
+    flush_logging,
+    get_lazy_logger,
+    log_pipeline_stats,
+)
+
+
+class SlowStream(io.StringIO):
+    """A sink that takes `delay` seconds per write, counting writes."""
+
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+        self.writes = 0
+
+    def write(self, text):
+        time.sleep(self.delay)
+        self.writes += 1
+        return super().write(text)
+
+
+def _pipeline(queue_size=100, batch_size=256, delay=0.0):
+    log_queue = queue.Queue(maxsize=queue_size)
+    stream = SlowStream(delay)
+    pump = LogPump(log_queue, StructuredFormatter(), stream=stream, batch_size=batch_size)
+    logger = logging.getLogger(f"beamfoundry.tests.pipeline.{id(stream)}")
+    logger.handlers[:] = [DroppingQueueHandler(log_queue)]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger, pump, stream
+
+
+def test_formatter_writes_extra_fields_and_exceptions():
+    logger = logging.getLogger("beamfoundry.tests.formatter")
+    record = logger.makeRecord(
+        logger.name,
+        logging.ERROR,
+        __file__,
+        1,
+        "failed %s",
+        ("once",),
+        None,
+        extra={"reading_id": 7, "when": object, "msg_extra": [1, 2]},
+    )
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record.exc_info = sys.exc_info()
+
+    payload = json.loads(StructuredFormatter().format(record))
+
+    assert payload["msg"] == "failed once"
+    assert payload["level"] == "ERROR"
+    assert payload["reading_id"] == 7
+    assert payload["msg_extra"] == [1, 2]
+    assert payload["when"] == str(object)
+    assert "ValueError: boom" in payload["exc"]
+    assert "args" not in payload and "lineno" not in payload
+
+
+def test_records_are_batched_with_extras():
+    logger, pump, stream = _pipeline()
+    for i in range(50):
+        logger.info("event_%d", i, extra={"i": i})
+    pump.start()
+    assert pump.flush()
+    pump.stop()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["i"] for line in lines] == list(range(50))
+    assert lines[3]["msg"] == "event_3"
+    assert stream.writes == 1
+    assert pump.stats()["batches"] == 1
+
+
+def test_slow_sink_does_not_block_and_overflow_is_counted():
+    logger, pump, stream = _pipeline(queue_size=20, batch_size=5, delay=0.2)
+    handler = logger.handlers[0]
+    pump.start()
+
+    t0 = time.perf_counter()
+    for i in range(200):
+        logger.info("burst", extra={"i": i})
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.2
+    assert handler.dropped >= 200 - 20 - 5
+    pump.stop(timeout=10)
+    written = len(stream.getvalue().splitlines())
+    assert written + handler.dropped == 200
+
+
+def test_exception_is_rendered_on_the_calling_thread():
+    logger, pump, stream = _pipeline()
+    try:
+        raise RuntimeError("from caller")
+    except RuntimeError:
+        logger.exception("failed")
+    pump.start()
+    pump.stop()
+
+    payload = json.loads(stream.getvalue())
+    assert "RuntimeError: from caller" in payload["exc"]
+
+
+def test_configure_logging_keeps_one_pump_and_one_handler(test_app):
+    configure_logging(queue_size=test_app.config_obj["LOG_QUEUE_SIZE"])
+    configure_logging(queue_size=test_app.config_obj["LOG_QUEUE_SIZE"])
+
+    pumps = [t for t in threading.enumerate() if t.name == "logexp-log-pump"]
+    assert len(pumps) == 1
+    assert len(logging.getLogger("logexp").handlers) == 1
+    assert logging.getLogger("logexp.ingestion").handlers == []
+    assert logging.getLogger("logexp.logging.setup").handlers == []
+    assert log_pipeline_stats()["alive"] is True
+
+
+def test_diagnostics_reports_log_pipeline(test_client):
+    payload = test_client.get("/api/diagnostics").get_json()
+
+    assert payload["logging"]["configured"] is True
+    assert {"queued", "queue_size", "dropped", "written"} <= set(payload["logging"])
+
+
+class SlowHandler(logging.Handler):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.records = []
+
+    def emit(self, record):
+        time.sleep(self.delay)
+        self.records.append(record)
+
+
+def test_slow_root_handler_does_not_block_app_loggers(test_app):
+    # gunicorn.conf.py puts a synchronous StreamHandler on the root logger.
+    slow = SlowHandler(0.05)
+    logging.getLogger().addHandler(slow)
+    try:
+        configure_logging(queue_size=test_app.config_obj["LOG_QUEUE_SIZE"])
+        written = log_pipeline_stats()["written"]
+
+        t0 = time.perf_counter()
+        for i in range(5):
+            logging.getLogger("beamfoundry.api").info("root_handler_check", extra={"i": i})
+            get_lazy_logger("logexp.ingestion").info("root_handler_check", extra={"i": i})
+        elapsed = time.perf_counter() - t0
+
+        assert flush_logging()
+    finally:
+        logging.getLogger().removeHandler(slow)
+
+    assert elapsed < 0.05
+    assert slow.records == []
+    assert log_pipeline_stats()["written"] - written >= 10
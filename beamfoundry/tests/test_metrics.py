@@ -0,0 +1,214 @@
+# filename: beamfoundry/tests/test_metrics.py
+
+import json
+import os
+
+import pytest
+
+from app.metrics import (
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    merge_snapshots,
+    render_text,
+)
+from app.services.ingestion import ingest_reading, ingest_readings_batch
+from app.services.ingestion_queue import IngestionQueue
+
+
+def _sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def _payload(cps=1):
+    return {
+        "counts_per_second": cps,
+        "counts_per_minute": cps * 60,
+        "microsieverts_per_hour": 0.01,
+        "mode": "SLOW",
+    }
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    hist = Histogram("t_seconds", "Test.", ["path"], registry=registry, buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.labels("a").observe(value)
+
+    text = render_text(registry.collect())
+
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{path="a",le="0.1"} 2' in text
+    assert 't_seconds_bucket{path="a",le="1.0"} 3' in text
+    assert 't_seconds_bucket{path="a",le="+Inf"} 4' in text
+    assert 't_seconds_count{path="a"} 4' in text
+    assert 't_seconds_sum{path="a"} 3.65' in text
+
+
+def test_counter_gauge_and_label_escaping():
+    registry = MetricsRegistry()
+    counter = Counter("t_total", "Line one\nline two.", ["name"], registry=registry)
+    gauge = Gauge("t_depth", "Depth.", registry=registry)
+    counter.labels(name='a"b\\c').inc(2)
+    gauge.set(7)
+
+    text = render_text(registry.collect())
+
+    assert "# HELP t_total Line one\\nline two." in text
+    assert 't_total{name="a\\"b\\\\c"} 2.0' in text
+    assert "t_depth 7.0" in text
+    with pytest.raises(ValueError):
+        counter.inc()
+    with pytest.raises(ValueError):
+        counter.labels("x").inc(-1)
+    with pytest.raises(ValueError):
+        Counter("t_total", "Duplicate.", registry=registry)
+
+
+def test_multiprocess_snapshots_are_merged(tmp_path):
+    registry = MetricsRegistry()
+    counter = Counter("t_total", "Test.", registry=registry)
+    hist = Histogram("t_seconds", "Test.", registry=registry, buckets=(1.0,))
+    gauge = Gauge("t_depth", "Test.", registry=registry)
+    counter.inc(3)
+    hist.observe(0.5)
+    gauge.set(4)
+
+    # A second, exited worker: its counters still count, its gauge does not.
+    other = registry.snapshot()
+    other["pid"] = 2**22 + 12345
+    (tmp_path / "metrics-other.json").write_text(json.dumps(other))
+
+    registry.configure_multiprocess(str(tmp_path), flush_seconds=60)
+    try:
+        text = registry.render()
+    finally:
+        registry.configure_multiprocess(None)
+
+    assert (tmp_path / f"metrics-{os.getpid()}.json").exists()
+    assert "t_total 6.0" in text
+    assert 't_seconds_bucket{le="1.0"} 2' in text
+    assert "t_depth 4.0" in text
+
+
+def test_gauge_modes_when_merging():
+    def snapshot(pid, value, mode):
+        return {
+            "pid": pid,
+            "metrics": {
+                "g": {
+                    "kind": "gauge",
+                    "help": "G.",
+                    "labelnames": [],
+                    "mode": mode,
+                    "series": [[[], value]],
+                }
+            },
+        }
+
+    pid = os.getpid()
+    assert merge_snapshots([snapshot(pid, 2, "max"), snapshot(pid, 5, "max")])["g"]["series"] == [
+        ((), 5)
+    ]
+    merged = merge_snapshots([snapshot(pid, 2, "all")])["g"]
+    assert merged["labelnames"] == ["pid"]
+    assert merged["series"] == [((str(pid),), 2)]
+
+
+def test_metrics_endpoint_reports_requests_and_queries(test_client):
+    test_client.get("/api/readings")
+    response = test_client.get("/metrics")
+    text = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    assert (
+        _sample(
+            text,
+            'logexp_http_request_seconds_count{endpoint="api.get_readings",method="GET",status="200"}',
+        )
+        >= 1
+    )
+    assert _sample(text, 'logexp_db_query_seconds_count{statement="select"}') >= 1
+    assert _sample(text, 'logexp_db_rows_returned_count{query="readings_page"}') >= 1
+
+
+def test_ingestion_commits_are_timed(test_app):
+    before = render_text(REGISTRY.collect())
+    ingest_reading(_payload())
+    ingest_readings_batch([_payload(2), _payload(3)])
+    after = render_text(REGISTRY.collect())
+
+    for path, rows in (("single", 1), ("batch", 2)):
+        key = f'logexp_ingest_commit_seconds_count{{path="{path}"}}'
+        assert _sample(after, key) - _sample(before, key) == 1
+        key = f'logexp_ingest_rows_total{{path="{path}"}}'
+        assert _sample(after, key) - _sample(before, key) == rows
+
+
+def test_queue_depth_gauge_follows_the_queue(test_app):
+    queue = IngestionQueue(test_app, maxsize=10, batch_size=10, flush_interval=60)
+    queue.put(_payload())
+    queue.put(_payload())
+
+    assert _sample(render_text(REGISTRY.collect()), "logexp_ingestion_queue_depth") == 2
+
+
+def test_poller_times_reads_and_records_last_tick(test_app, monkeypatch):
+    import app.geiger as geiger
+    from app.poller import GeigerPoller
+
+    class FakeReader:
+        def __init__(self, *args):
+            self.lines = ["CPS, 5, CPM, 300, uSv/hr, 0.03, SLOW", None]
+
+        def readline(self):
+            if not self.lines:
+                poller._stop_event.set()
+                return None
+            return self.lines.pop(0)
+
+        def reconnect_in(self):
+            return 0.0
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(geiger, "SerialLineReader", FakeReader)
+    test_app.config_obj.update(GEIGER_DEVICE_PATH="/dev/null", GEIGER_THRESHOLD=50)
+    poller = GeigerPoller(test_app)
+    poller.queue = IngestionQueue(test_app, maxsize=10, batch_size=10, flush_interval=60)
+
+    before = render_text(REGISTRY.collect())
+    poller._run()
+    after = render_text(REGISTRY.collect())
+
+    assert poller.last_tick is not None
+    assert poller.queue.depth() == 1
+    for key, delta in (
+        ('logexp_serial_read_seconds_count{result="line"}', 1),
+        ('logexp_serial_read_seconds_count{result="none"}', 2),
+        ("logexp_parse_seconds_count", 1),
+    ):
+        assert _sample(after, key) - _sample(before, key) == delta
+
+
+def test_failed_statements_do_not_leak_query_timers(test_app):
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    from app.extensions import db
+
+    with db.engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+            conn.rollback()
+        conn.execute(text("SELECT 1"))
+
+        assert conn.connection.info.get("logexp_query_start") == []
@@ -1,20 +1,16 @@
 # tests/test_migrations.py
 
 import os
+import sqlite3
 import subprocess
+from datetime import datetime
 from pathlib import Path
 
 import pytest
+from sqlalchemy.dialects import sqlite
 
 
-@pytest.mark.integration
-def test_migrations_apply_cleanly(tmp_path: Path) -> None:
-    """
-    Apply database migrations against a temporary SQLite database.
-    This is a fast signal that migration scripts are syntactically and
-    structurally valid before running them against Postgres in CI.
-    """
-    db_path = tmp_path / "test.db"
+def _db_upgrade(db_path: Path, revision: str = "head") -> None:
     os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
     os.environ.setdefault("LOCAL_TIMEZONE", "UTC")
     os.environ.setdefault("GEIGER_THRESHOLD", "0.1")
@@ -22,7 +18,7 @@ def test_migrations_apply_cleanly(tmp_path: Path) -> None:
 
     # Use the same CLI path you use in real life
     completed = subprocess.run(
-        ["flask", "--app", "app:create_app", "db", "upgrade"],
+        ["flask", "--app", "app:create_app", "db", "upgrade", revision],
         check=False,
         capture_output=True,
         text=True,
@@ -33,3 +29,59 @@ def test_migrations_apply_cleanly(tmp_path: Path) -> None:
             f"flask db upgrade failed:\n"
             f"STDOUT:\n{completed.stdout}\n\nSTDERR:\n{completed.stderr}"
         )
+
+
+@pytest.mark.integration
+def test_migrations_apply_cleanly(tmp_path: Path) -> None:
+    """
+    Apply database migrations against a temporary SQLite database.
+    This is a fast signal that migration scripts are syntactically and
+    structurally valid before running them against Postgres in CI.
+    """
+    _db_upgrade(tmp_path / "test.db")
+
+
+@pytest.mark.integration
+def test_rollups_are_backfilled_on_upgrade(tmp_path: Path) -> None:
+    """
+    Readings stored before the rollup tables existed must be rolled up by
+    the upgrade, with bucket keys in the format later upserts bind.
+    """
+    db_path = tmp_path / "test.db"
+    _db_upgrade(db_path, "c41f7d2e9a10")
+
+    bind = sqlite.DATETIME().bind_processor(sqlite.dialect())
+    readings = [
+        (datetime(2025, 1, 1, 23, 59, 30), 2, 120, 0.02, "SLOW", "node-1"),
+        (datetime(2025, 1, 1, 23, 59, 45, 500), 4, 240, 0.04, "SLOW", "node-1"),
+        (datetime(2025, 1, 2, 0, 0, 5), 6, 360, 0.06, "SLOW", None),
+    ]
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO logexp_readings (timestamp, counts_per_second, counts_per_minute, "
+            "microsieverts_per_hour, mode, device_id) VALUES (?, ?, ?, ?, ?, ?)",
+            [(bind(ts), *rest) for ts, *rest in readings],
+        )
+
+    _db_upgrade(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        minutes = conn.execute(
+            "SELECT bucket_start, device_id, reading_count, cps_sum, cps_min, cps_max "
+            "FROM logexp_rollups_1m ORDER BY bucket_start"
+        ).fetchall()
+        days = conn.execute(
+            "SELECT bucket_start, device_id, reading_count, cpm_sum, usv_max "
+            "FROM logexp_rollups_1d ORDER BY bucket_start"
+        ).fetchall()
+        (hours,) = conn.execute("SELECT SUM(reading_count) FROM logexp_rollups_1h").fetchone()
+
+    assert minutes == [
+        (bind(datetime(2025, 1, 1, 23, 59)), "node-1", 2, 6, 2, 4),
+        (bind(datetime(2025, 1, 2, 0, 0)), "", 1, 6, 6, 6),
+    ]
+    assert days == [
+        (bind(datetime(2025, 1, 1)), "node-1", 2, 360, 0.04),
+        (bind(datetime(2025, 1, 2)), "", 1, 360, 0.06),
+    ]
+    assert hours == 3
@@ -0,0 +1,172 @@
+# filename: beamfoundry/tests/test_query_plans.py
+"""
+Query-plan regression tests for the hot logexp_readings queries.
+
+Each hot path is executed once while the SQL it emits is captured; every
+captured SELECT is then EXPLAINed and must be served by an index rather than
+a full table scan. The Postgres variant only runs when
+LOGEXP_TEST_POSTGRES_URI points at a disposable database.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import event, text
+from tests.helpers.auth import authenticate
+
+from app import create_app
+from app.extensions import db
+from app.services.analytics import aggregate_window, compute_window, fetch_window_rows
+from app.services.analytics_readings import load_recent_reading_rows, load_recent_readings
+from app.services.readings_query import ReadingFilters, fetch_readings_page
+
+POSTGRES_URI = os.environ.get("LOGEXP_TEST_POSTGRES_URI")
+
+
+@contextmanager
+def capture_selects():
+    """
+    Record (statement, parameters) for every SELECT on logexp_readings.
+    """
+    captured = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "logexp_readings" in statement:
+            captured.append((statement, parameters))
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+
+
+def _seed(count=200):
+    base = datetime.now(timezone.utc) - timedelta(seconds=count)
+    for i in range(count):
+        db.session.execute(
+            text(
+                "INSERT INTO logexp_readings "
+                "(timestamp, counts_per_second, counts_per_minute, "
+                "microsieverts_per_hour, mode, device_id) "
+                "VALUES (:ts, :cps, :cpm, :usv, 'SLOW', :dev)"
+            ),
+            {
+                "ts": (base + timedelta(seconds=i)).replace(tzinfo=None),
+                "cps": i % 7,
+                "cpm": i % 60,
+                "usv": 0.01 * (i % 5),
+                "dev": f"dev-{i % 3}",
+            },
+        )
+    db.session.commit()
+
+
+def _run_hot_paths(client):
+    """
+    Exercise every hot query and return the SQL they emitted.
+    """
+    with capture_selects() as captured:
+        compute_window()
+        fetch_window_rows()
+        aggregate_window()
+        load_recent_readings(60)
+        load_recent_reading_rows(60)
+        fetch_readings_page(ReadingFilters(device_id="dev-1", limit=10))
+        fetch_readings_page(
+            ReadingFilters(since=datetime.now(timezone.utc) - timedelta(seconds=30), limit=10)
+        )
+
+        authenticate(client)
+        assert client.get("/api/readings/latest").status_code == 200
+        assert client.get("/api/readings.json").status_code == 200
+        assert client.get("/api/readings").status_code == 200
+
+    assert captured, "no readings queries were captured"
+    return captured
+
+
+# ---------------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------------
+
+
+def test_hot_queries_use_indexes_sqlite(test_app):
+    client = test_app.test_client()
+    _seed()
+
+    for statement, parameters in _run_hot_paths(client):
+        plan = db.session.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, parameters
+        )
+        details = [row[3] for row in plan]
+
+        table_steps = [d for d in details if "logexp_readings" in d]
+        assert table_steps, (statement, details)
+        for step in table_steps:
+            # "SEARCH logexp_readings" alone is a rowid (primary key) lookup.
+            assert (
+                "INDEX" in step or step == "SEARCH logexp_readings"
+            ), f"full scan in plan {details} for:\n{statement}"
+        assert not any("TEMP B-TREE" in d for d in details), (statement, details)
+
+
+# ---------------------------------------------------------------------------
+# Postgres (opt-in)
+# ---------------------------------------------------------------------------
+
+
+def _scan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _scan_nodes(child)
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not POSTGRES_URI, reason="LOGEXP_TEST_POSTGRES_URI not set")
+def test_hot_queries_use_indexes_postgres():
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": POSTGRES_URI,
+            "START_POLLER": False,
+            "ANALYTICS_ENABLED": True,
+            "ANALYTICS_WINDOW_SECONDS": 60,
+            "LOCAL_TIMEZONE": "UTC",
+        }
+    )
+
+    with app.app_context():
+        db.drop_all()
+        db.session.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        db.session.commit()
+        upgrade()
+        _seed()
+
+        try:
+            captured = _run_hot_paths(app.test_client())
+
+            conn = db.session.connection()
+            # With a few hundred rows the planner would rightly prefer a seq
+            # scan; disabling it shows whether an index path exists at all.
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            for statement, parameters in captured:
+                plan = conn.exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters
+                ).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+
+                nodes = list(_scan_nodes(plan[0]["Plan"]))
+                readings_scans = [n for n in nodes if n.get("Relation Name") == "logexp_readings"]
+                assert readings_scans, (statement, plan)
+                for n in readings_scans:
+                    assert n["Node Type"] != "Seq Scan", (statement, plan)
+        finally:
+            db.session.rollback()
+            db.session.remove()
+            db.drop_all()
@@ -0,0 +1,119 @@
+# filename: beamfoundry/tests/test_readings_batch.py
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+import app.bp.api.routes as api_routes
+from app.extensions import db
+from app.models import LogExpReading
+from app.services.ingestion import ingest_readings_batch
+from app.timestamps import coerce_timestamp
+
+
+def _row(**overrides):
+    row = {
+        "counts_per_second": 3,
+        "counts_per_minute": 180,
+        "microsieverts_per_hour": 0.02,
+        "mode": "SLOW",
+        "device_id": "node-1",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_batch_inserts_all_rows_in_one_call(test_app):
+    payloads = [_row(timestamp=1_700_000_000 + i, counts_per_second=i) for i in range(25)]
+
+    result = ingest_readings_batch(payloads)
+
+    assert result == {"received": 25, "inserted": 25, "errors": []}
+    rows = db.session.query(LogExpReading).order_by(LogExpReading.timestamp).all()
+    assert [r.counts_per_second for r in rows] == list(range(25))
+    assert rows[0].timestamp == datetime.fromtimestamp(1_700_000_000, tz=timezone.utc)
+    assert {r.device_id for r in rows} == {"node-1"}
+
+
+def test_batch_reports_bad_rows_without_aborting(test_app):
+    payloads = [
+        _row(timestamp="2025-01-01T00:00:00Z"),
+        _row(mode=""),
+        "not an object",
+        _row(timestamp="yesterday"),
+        _row(counts_per_second=2**40),
+        _row(timestamp="2025-01-01T00:00:01+00:00"),
+    ]
+
+    result = ingest_readings_batch(payloads)
+
+    assert result["received"] == 6
+    assert result["inserted"] == 2
+    assert [e["index"] for e in result["errors"]] == [1, 2, 3, 4]
+    assert db.session.query(LogExpReading).count() == 2
+
+
+def test_batch_endpoint(test_client):
+    resp = test_client.post("/api/readings/batch", json=[_row(), _row(counts_per_second=9)])
+
+    assert resp.status_code == 201
+    assert resp.get_json()["inserted"] == 2
+
+
+def test_batch_endpoint_partial_success(test_client):
+    resp = test_client.post("/api/readings/batch", json={"readings": [_row(), _row(mode=None)]})
+
+    assert resp.status_code == 207
+    body = resp.get_json()
+    assert body["inserted"] == 1
+    assert body["errors"][0]["index"] == 1
+
+
+def test_batch_endpoint_rejects_non_list(test_client):
+    assert test_client.post("/api/readings/batch", json={"readings": 5}).status_code == 400
+
+
+def test_batch_endpoint_enforces_max_rows(test_app, test_client):
+    test_app.config["INGESTION_BATCH_MAX_ROWS"] = 2
+
+    resp = test_client.post("/api/readings/batch", json=[_row()] * 3)
+
+    assert resp.status_code == 413
+    assert db.session.query(LogExpReading).count() == 0
+
+
+def _unreachable_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/missing/readings.db")
+    return Session(engine)
+
+
+def test_batch_raises_when_database_is_unreachable(test_app, tmp_path):
+    session = _unreachable_session(tmp_path)
+
+    with pytest.raises(OperationalError):
+        ingest_readings_batch([_row(), _row(counts_per_second=9)], db_session=session)
+
+    session.close()
+
+
+def test_batch_endpoint_reports_unavailable_database(test_client, tmp_path, monkeypatch):
+    session = _unreachable_session(tmp_path)
+    monkeypatch.setattr(
+        api_routes,
+        "ingest_readings_batch",
+        lambda payload: ingest_readings_batch(payload, db_session=session),
+    )
+
+    resp = test_client.post("/api/readings/batch", json=[_row()])
+
+    assert resp.status_code == 503
+    session.close()
+
+
+def test_coerce_timestamp_accepts_z_suffix():
+    expected = datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc)
+    assert coerce_timestamp("2025-01-01T12:30:00Z") == expected
+    assert coerce_timestamp("2025-01-01T12:30:00.000z") == expected
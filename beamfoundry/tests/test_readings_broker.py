@@ -0,0 +1,164 @@
+# filename: beamfoundry/tests/test_readings_broker.py
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.services.ingestion import ingest_readings_batch
+from app.services.readings_broker import ReadingBroker, get_readings_broker
+
+T0 = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def _row(i):
+    return {
+        "id": i,
+        "timestamp": T0 + timedelta(seconds=i),
+        "counts_per_second": i,
+        "counts_per_minute": i * 60,
+        "microsieverts_per_hour": 0.01,
+        "mode": "SLOW",
+        "device_id": None,
+    }
+
+
+def _events(chunk):
+    """[(id, event, data)] parsed from SSE text."""
+    out = []
+    for block in chunk.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in fields:
+            out.append((fields["id"], fields["event"], json.loads(fields["data"])))
+    return out
+
+
+def test_stream_delivers_only_new_readings():
+    broker = ReadingBroker(buffer_size=10)
+    broker.publish([_row(1)])
+
+    stream = broker.stream(None, heartbeat_seconds=0.01)
+    assert next(stream).startswith("retry:")
+    assert next(stream) == ": keepalive\n\n"
+
+    broker.publish([_row(2), _row(3)])
+    events = _events(next(stream))
+
+    assert [e[1] for e in events] == ["reading", "reading"]
+    assert [e[2]["counts_per_second"] for e in events] == [2, 3]
+    assert events[0][2]["timestamp"] == (T0 + timedelta(seconds=2)).isoformat()
+    assert events[1][0] == broker.event_id(3)
+
+    broker.close()
+    assert list(stream) == []
+
+
+def test_resume_from_last_event_id():
+    broker = ReadingBroker(buffer_size=10)
+    broker.publish([_row(i) for i in range(1, 6)])
+
+    stream = broker.stream(broker.event_id(3), heartbeat_seconds=0.01)
+    next(stream)
+    events = _events(next(stream))
+
+    assert [e[2]["id"] for e in events] == [4, 5]
+
+
+def test_reset_when_resume_is_impossible():
+    broker = ReadingBroker(buffer_size=3)
+    broker.publish([_row(i) for i in range(1, 8)])
+
+    for last_event_id in (broker.event_id(2), "otherepoch:7", broker.event_id(99)):
+        stream = broker.stream(last_event_id, heartbeat_seconds=0.01)
+        next(stream)
+        assert _events(next(stream)) == [(broker.event_id(7), "reset", {})]
+
+    assert broker.stats()["resets"] == 3
+
+
+def test_slow_stream_gets_reset_after_overflow():
+    broker = ReadingBroker(buffer_size=2)
+    stream = broker.stream(None, heartbeat_seconds=0.01)
+    next(stream)
+
+    broker.publish([_row(i) for i in range(1, 6)])
+
+    assert _events(next(stream))[0][1] == "reset"
+
+
+def _ingest(offsets):
+    ingest_readings_batch(
+        [
+            {
+                "timestamp": (T0 + timedelta(seconds=i)).isoformat(),
+                "counts_per_second": i,
+                "counts_per_minute": i * 60,
+                "microsieverts_per_hour": 0.01,
+                "mode": "SLOW",
+            }
+            for i in offsets
+        ]
+        + [{"counts_per_second": "bad"}]
+    )
+
+
+def test_batch_ingestion_publishes(test_app):
+    broker = get_readings_broker()
+    stream = broker.stream(None, heartbeat_seconds=0.01)
+    next(stream)
+
+    # Without an open stream the insert skips RETURNING, so ids are unknown.
+    _ingest(range(3))
+    events = _events(next(stream))
+    assert [e[2]["counts_per_second"] for e in events] == [0, 1, 2]
+    assert [e[2]["id"] for e in events] == [None] * 3
+
+    subscription = broker.subscribe()
+    _ingest(range(3, 5))
+    events = _events(next(stream))
+    subscription.close()
+    assert [e[2]["counts_per_second"] for e in events] == [3, 4]
+    assert all(isinstance(e[2]["id"], int) for e in events)
+
+
+def test_stream_route(test_app, test_client):
+    test_app.config["READINGS_STREAM_HEARTBEAT_SECONDS"] = 0.01
+    broker = get_readings_broker(test_app)
+
+    response = test_client.get("/api/readings/stream", buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+
+    statements = []
+
+    def _count(*args):
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        chunks = response.iter_encoded()
+        assert next(chunks).startswith(b"retry:")
+        assert next(chunks) == b": keepalive\n\n"
+        broker.publish([_row(1)])
+        assert _events(next(chunks).decode())[0][2]["id"] == 1
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert statements == []
+    assert broker.stats()["clients"] == 1
+
+    response.close()
+    assert broker.stats()["clients"] == 0
+
+
+def test_stream_route_client_limit(test_app, test_client):
+    broker = get_readings_broker(test_app)
+    held = [broker.subscribe() for _ in range(broker.max_clients)]
+
+    response = test_client.get("/api/readings/stream")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+    for subscription in held:
+        subscription.close()
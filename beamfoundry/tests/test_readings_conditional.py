@@ -0,0 +1,133 @@
+# filename: beamfoundry/tests/test_readings_conditional.py
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from freezegun import freeze_time
+from sqlalchemy import event
+
+from app.extensions import db
+from app.services.ingestion import ingest_readings_batch
+from app.services.readings_version import _next_changed_at
+
+T0 = datetime(2024, 7, 1, tzinfo=timezone.utc)
+
+ENDPOINTS = ["/api/readings.json", "/api/readings/latest", "/api/readings?limit=5"]
+
+
+def _ingest(offsets):
+    ingest_readings_batch(
+        [
+            {
+                "timestamp": (T0 + timedelta(seconds=i)).isoformat(),
+                "counts_per_second": i,
+                "counts_per_minute": i * 60,
+                "microsieverts_per_hour": 0.01,
+                "mode": "SLOW",
+            }
+            for i in offsets
+        ]
+    )
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(db.engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, "before_cursor_execute", self)
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_if_none_match_returns_304_without_queries(test_app, test_client, url):
+    _ingest(range(3))
+
+    first = test_client.get(url)
+    assert first.status_code == 200
+    assert first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+    assert "no-cache" in first.headers["Cache-Control"]
+
+    with _QueryCounter() as counter:
+        again = test_client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert again.status_code == 304
+    assert again.data == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert counter.statements == []
+
+
+def test_ingest_changes_etag(test_app, test_client):
+    _ingest(range(3))
+    etag = test_client.get("/api/readings.json").headers["ETag"]
+
+    _ingest([3])
+    response = test_client.get("/api/readings.json", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.get_json()) == 4
+
+
+def test_etag_depends_on_query(test_app, test_client):
+    _ingest(range(3))
+
+    a = test_client.get("/api/readings?limit=1").headers["ETag"]
+    b = test_client.get("/api/readings?limit=2").headers["ETag"]
+
+    assert a != b
+    assert test_client.get("/api/readings?limit=2", headers={"If-None-Match": a}).status_code == 200
+
+
+def test_if_modified_since(test_app, test_client):
+    _ingest(range(3))
+    last_modified = test_client.get("/api/readings.json").headers["Last-Modified"]
+
+    response = test_client.get("/api/readings.json", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    old = "Mon, 01 Jan 2001 00:00:00 GMT"
+    response = test_client.get("/api/readings.json", headers={"If-Modified-Since": old})
+    assert response.status_code == 200
+
+
+def test_error_responses_carry_no_validators(test_app, test_client):
+    response = test_client.get("/api/readings/latest")
+
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+
+
+def test_change_within_the_same_second_is_not_304(test_app, test_client):
+    with freeze_time("2024-07-01 12:00:00.200000") as clock:
+        _ingest(range(3))
+        last_modified = test_client.get("/api/readings.json").headers["Last-Modified"]
+
+        clock.move_to("2024-07-01 12:00:00.800000")
+        _ingest([3])
+        response = test_client.get(
+            "/api/readings.json", headers={"If-Modified-Since": last_modified}
+        )
+        assert response.status_code == 200
+        assert len(response.get_json()) == 4
+
+        response = test_client.get(
+            "/api/readings.json", headers={"If-Modified-Since": response.headers["Last-Modified"]}
+        )
+        assert response.status_code == 304
+
+
+def test_next_changed_at_rounds_up_and_moves_forward():
+    now = datetime(2024, 7, 1, 12, 0, 0, 200000, tzinfo=timezone.utc)
+    whole = datetime(2024, 7, 1, 12, 0, 1, tzinfo=timezone.utc)
+
+    assert _next_changed_at(now, None) == whole
+    assert _next_changed_at(whole, None) == whole
+    assert _next_changed_at(now, whole) == whole + timedelta(seconds=1)
@@ -0,0 +1,59 @@
+# filename: tests/test_readings_export.py
+
+import datetime
+import json
+
+from app.extensions import db
+
+BASE = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+def _seed(reading_factory, count, device_id=None):
+    for i in range(count):
+        reading_factory(BASE + datetime.timedelta(seconds=i), cps=i, device_id=device_id)
+    db.session.commit()
+
+
+def test_ndjson_export_streams_every_row(test_app, test_client, reading_factory):
+    test_app.config["API_EXPORT_BATCH_SIZE"] = 2
+    _seed(reading_factory, 5)
+
+    resp = test_client.get("/api/readings/export")
+
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    assert resp.mimetype == "application/x-ndjson"
+
+    lines = resp.get_data(as_text=True).splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [r["counts_per_second"] for r in rows] == [0, 1, 2, 3, 4]
+    assert rows[0]["timestamp"] == "2024-01-01T12:00:00+00:00"
+
+
+def test_json_array_export_is_valid_json(test_app, test_client, reading_factory):
+    test_app.config["API_EXPORT_BATCH_SIZE"] = 2
+    _seed(reading_factory, 5)
+
+    resp = test_client.get("/api/readings/export?format=json")
+
+    data = json.loads(resp.get_data(as_text=True))
+    assert [r["counts_per_second"] for r in data] == [0, 1, 2, 3, 4]
+
+
+def test_export_empty_table(test_client, db_session):
+    assert test_client.get("/api/readings/export").get_data(as_text=True) == ""
+    assert json.loads(test_client.get("/api/readings/export?format=json").data) == []
+
+
+def test_export_applies_filters(test_client, reading_factory):
+    _seed(reading_factory, 5, device_id="a")
+    _seed(reading_factory, 5, device_id="b")
+
+    resp = test_client.get("/api/readings/export?device_id=a&since=2024-01-01T12:00:03Z")
+
+    rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [(r["device_id"], r["counts_per_second"]) for r in rows] == [("a", 3), ("a", 4)]
+
+
+def test_export_rejects_unknown_format(test_client, db_session):
+    assert test_client.get("/api/readings/export?format=xml").status_code == 400
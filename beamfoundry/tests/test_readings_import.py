@@ -0,0 +1,190 @@
+# filename: beamfoundry/tests/test_readings_import.py
+
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from app.extensions import db
+from app.models import LogExpReading
+from app.services.readings_import import default_checkpoint_path, import_readings_file
+
+EPOCH = 1_700_000_000
+
+
+def _write_csv(path, rows, header="timestamp,cps,cpm,usv,mode,device_id"):
+    lines = [header] + [",".join(str(v) for v in row) for row in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def _write_ndjson(path, records):
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def _csv_rows(n, device="node-1"):
+    return [(EPOCH + i, i % 7, (i % 7) * 60, 0.01, "SLOW", device) for i in range(n)]
+
+
+def test_import_csv(test_app, tmp_path):
+    path = _write_csv(tmp_path / "dump.csv", _csv_rows(25))
+
+    stats = import_readings_file(path, batch_size=10)
+
+    assert (stats.records, stats.inserted, stats.duplicates, stats.rejected) == (25, 25, 0, 0)
+    rows = db.session.query(LogExpReading).order_by(LogExpReading.timestamp).all()
+    assert len(rows) == 25
+    assert rows[0].timestamp == datetime.fromtimestamp(EPOCH, tz=timezone.utc)
+    assert rows[3].counts_per_second == 3
+    assert not os.path.exists(default_checkpoint_path(path))
+
+
+def test_import_ndjson_reports_bad_lines(test_app, tmp_path):
+    good = {
+        "timestamp": "2025-01-01T00:00:00Z",
+        "counts_per_second": 1,
+        "counts_per_minute": 60,
+        "microsieverts_per_hour": 0.01,
+        "mode": "FAST",
+    }
+    path = tmp_path / "dump.ndjson"
+    path.write_text(
+        json.dumps(good)
+        + "\n{not json\n"
+        + json.dumps({**good, "timestamp": None})
+        + "\n"
+        + json.dumps({**good, "counts_per_second": -1})
+        + "\n"
+        + json.dumps({**good, "timestamp": "2025-01-01T00:00:01Z"})
+        + "\n",
+        encoding="utf-8",
+    )
+
+    stats = import_readings_file(str(path), default_device_id="sd-card")
+
+    assert (stats.inserted, stats.rejected) == (2, 3)
+    assert [line for line, _ in stats.errors] == [2, 3, 4]
+    assert {r.device_id for r in db.session.query(LogExpReading)} == {"sd-card"}
+
+
+def test_reimport_skips_duplicates(test_app, tmp_path):
+    first = _write_csv(tmp_path / "a.csv", _csv_rows(20))
+    overlap = _write_csv(tmp_path / "b.csv", _csv_rows(30) + _csv_rows(5, device="node-2"))
+
+    import_readings_file(first, batch_size=8)
+    stats = import_readings_file(overlap, batch_size=8)
+
+    assert stats.duplicates == 20
+    assert stats.inserted == 15
+    assert db.session.query(LogExpReading).count() == 35
+
+
+def test_duplicates_within_one_batch(test_app, tmp_path):
+    path = _write_csv(tmp_path / "dup.csv", _csv_rows(3) + _csv_rows(3))
+
+    stats = import_readings_file(path)
+
+    assert (stats.inserted, stats.duplicates) == (3, 3)
+
+
+def test_interrupted_import_resumes_from_checkpoint(test_app, tmp_path):
+    path = _write_csv(tmp_path / "big.csv", _csv_rows(50))
+
+    class Interrupted(Exception):
+        pass
+
+    def _stop_after_two_batches(stats):
+        if stats.records >= 20:
+            raise Interrupted
+
+    with pytest.raises(Interrupted):
+        import_readings_file(path, batch_size=10, progress=_stop_after_two_batches)
+
+    checkpoint = json.loads(open(default_checkpoint_path(path)).read())
+    assert checkpoint["records"] == 20
+    assert db.session.query(LogExpReading).count() == 20
+
+    stats = import_readings_file(path, batch_size=10)
+
+    assert stats.records == 50
+    assert stats.inserted == 50
+    assert stats.duplicates == 0
+    assert db.session.query(LogExpReading).count() == 50
+    assert not os.path.exists(default_checkpoint_path(path))
+
+
+def test_import_gzip_ndjson(test_app, tmp_path):
+    path = tmp_path / "dump.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        for i in range(5):
+            record = {"ts": EPOCH + i, "cps": 1, "cpm": 60, "usv": 0.01, "mode": "INST"}
+            fh.write(json.dumps(record) + "\n")
+
+    stats = import_readings_file(str(path))
+
+    assert stats.inserted == 5
+
+
+def test_cli_readings_import(test_app, tmp_path):
+    path = _write_csv(tmp_path / "cli.csv", _csv_rows(12))
+
+    result = test_app.test_cli_runner().invoke(
+        args=["readings", "import", path, "--batch-size", "5"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Imported 12 of 12 records" in result.output
+    assert db.session.query(LogExpReading).count() == 12
+
+
+def test_cli_rejects_unknown_extension(test_app, tmp_path):
+    path = tmp_path / "dump.txt"
+    path.write_text("x\n")
+
+    result = test_app.test_cli_runner().invoke(args=["readings", "import", str(path)])
+
+    assert result.exit_code != 0
+    assert "--format" in result.output
+
+
+def test_undecodable_lines_are_rejected(test_app, tmp_path):
+    rows = [",".join(str(v) for v in row).encode() for row in _csv_rows(3)]
+    csv_path = tmp_path / "latin1.csv"
+    csv_path.write_bytes(
+        b"timestamp,cps,cpm,usv,mode,device_id\n"
+        + rows[0]
+        + b"\n"
+        + rows[1].replace(b"node-1", b"n\xf6de-1")
+        + b"\n"
+        + rows[2]
+        + b"\n"
+    )
+    ndjson_path = tmp_path / "latin1.ndjson"
+    ndjson_path.write_bytes(b'{"mode": "\xff"}\n' + json.dumps({"x": "é"}).encode() + b"\n")
+
+    csv_stats = import_readings_file(str(csv_path))
+    ndjson_stats = import_readings_file(str(ndjson_path))
+
+    assert (csv_stats.inserted, csv_stats.rejected) == (2, 1)
+    assert csv_stats.errors == [(3, "invalid UTF-8")]
+    assert ndjson_stats.errors[0] == (1, "invalid UTF-8")
+    assert ndjson_stats.errors[1][0] == 2
+
+
+def test_csv_quoted_fields_may_span_lines(test_app, tmp_path):
+    path = tmp_path / "multiline.csv"
+    path.write_text(
+        "timestamp,cps,cpm,usv,mode,device_id,note\n"
+        f'{EPOCH},1,60,0.01,SLOW,node-1,"first\nsecond"\n'
+        f"{EPOCH + 1},2,120,0.02,SLOW,node-1,\n",
+        encoding="utf-8",
+    )
+
+    stats = import_readings_file(str(path), batch_size=1)
+
+    assert (stats.records, stats.inserted, stats.rejected) == (2, 2, 0)
+    assert stats.line == 4
+    assert [r.counts_per_second for r in db.session.query(LogExpReading)] == [1, 2]
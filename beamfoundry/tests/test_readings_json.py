@@ -0,0 +1,123 @@
+# filename: beamfoundry/tests/test_readings_json.py
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from flask import jsonify
+from sqlalchemy import select
+from werkzeug.http import http_date as werkzeug_http_date
+
+from app.extensions import db
+from app.models import LogExpReading
+from app.schemas import ReadingResponse
+from app.services.readings_json import (
+    READING_COLUMNS,
+    fast_path_available,
+    http_date,
+    readings_response,
+)
+
+T0 = datetime(2024, 3, 10, 7, 59, 58, 250000, tzinfo=timezone.utc)
+
+
+def _seed(reading_factory):
+    values = [
+        (0, 0, 0.0, "SLOW", None),
+        (7, 420, 1e-05, "FAST", "dev-1"),
+        (12, 720, 3, "INST", 'dév "two"'),
+        (1, 60, 123456789.125, "SLOW", "dev\n3"),
+    ]
+    for index, (cps, cpm, usv, mode, device_id) in enumerate(values * 3):
+        reading_factory(
+            T0 + timedelta(seconds=index),
+            cps=cps,
+            cpm=cpm,
+            microsieverts_per_hour=usv,
+            mode=mode,
+            device_id=device_id,
+        )
+
+
+def _legacy_bytes(readings, many=True):
+    # The pre-fast-path pipeline: to_dict() -> ReadingResponse -> jsonify.
+    payloads = [ReadingResponse(**r.to_dict()).model_dump(exclude_none=False) for r in readings]
+    return jsonify(payloads if many else payloads[0]).get_data()
+
+
+def _rows():
+    stmt = select(*(getattr(LogExpReading, name) for name in READING_COLUMNS)).order_by(
+        LogExpReading.id
+    )
+    return db.session.execute(stmt).all()
+
+
+@pytest.mark.parametrize("tz_name", ["UTC", "America/Chicago"])
+def test_fast_path_matches_legacy_bytes(test_app, reading_factory, tz_name):
+    test_app.config_obj["LOCAL_TIMEZONE"] = tz_name
+    _seed(reading_factory)
+    readings = db.session.query(LogExpReading).order_by(LogExpReading.id).all()
+
+    with test_app.test_request_context():
+        assert fast_path_available()
+        expected = _legacy_bytes(readings)
+        assert readings_response(_rows()).get_data() == expected
+        assert readings_response(readings).get_data() == expected
+        assert readings_response(readings[2], many=False).get_data() == _legacy_bytes(
+            readings[2:3], many=False
+        )
+        assert readings_response([]).get_data() == jsonify([]).get_data()
+
+
+def test_debug_provider_falls_back_to_legacy_path(test_app, reading_factory):
+    _seed(reading_factory)
+    readings = db.session.query(LogExpReading).order_by(LogExpReading.id).all()
+    test_app.json.compact = False
+
+    with test_app.test_request_context():
+        assert not fast_path_available()
+        assert readings_response(_rows()).get_data() == _legacy_bytes(readings)
+
+
+def test_http_date_matches_werkzeug():
+    for value in (
+        T0,
+        T0.replace(tzinfo=None),
+        datetime(1999, 12, 31, 23, 59, 59, tzinfo=timezone.utc),
+    ):
+        assert http_date(value) == werkzeug_http_date(value)
+
+
+def test_api_endpoints_serve_fast_path(test_client, reading_factory):
+    _seed(reading_factory)
+
+    page = test_client.get("/api/readings?limit=5")
+    latest = test_client.get("/api/readings/latest")
+
+    assert page.status_code == 200
+    assert page.headers["X-Next-Cursor"]
+    assert [r["id"] for r in page.get_json()] == [1, 2, 3, 4, 5]
+    assert page.get_json()[1]["microsieverts_per_hour"] == 1e-05
+    assert latest.get_json()["id"] == 12
+    assert latest.get_json()["device_id"] == "dev\n3"
+
+
+def test_non_finite_floats_match_legacy_bytes(test_app):
+    rows = [
+        SimpleNamespace(
+            id=i,
+            timestamp=T0,
+            counts_per_second=1,
+            counts_per_minute=60,
+            microsieverts_per_hour=value,
+            mode="SLOW",
+            device_id=None,
+        )
+        for i, value in enumerate([float("nan"), float("inf"), float("-inf"), -0.0])
+    ]
+
+    with test_app.test_request_context():
+        legacy = jsonify(
+            [ReadingResponse(**vars(r)).model_dump(exclude_none=False) for r in rows]
+        ).get_data()
+        assert readings_response(rows).get_data() == legacy
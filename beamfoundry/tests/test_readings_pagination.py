@@ -0,0 +1,98 @@
+# filename: tests/test_readings_pagination.py
+
+import datetime
+
+import pytest
+
+from app.extensions import db
+from app.services.readings_query import decode_cursor, encode_cursor
+
+BASE = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+def _seed(reading_factory, count, device_id=None, start=BASE):
+    for i in range(count):
+        reading_factory(start + datetime.timedelta(seconds=i), cps=i, device_id=device_id)
+    db.session.commit()
+
+
+def test_cursor_round_trip():
+    token = encode_cursor(BASE, 42)
+    assert decode_cursor(token) == (BASE, 42)
+
+
+def test_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_pages_walk_entire_table_without_overlap(test_client, reading_factory):
+    _seed(reading_factory, 7)
+
+    seen = []
+    url = "/api/readings?limit=3"
+    pages = 0
+    while url:
+        resp = test_client.get(url)
+        assert resp.status_code == 200
+        seen.extend(r["counts_per_second"] for r in resp.get_json())
+        pages += 1
+        cursor = resp.headers.get("X-Next-Cursor")
+        url = f"/api/readings?limit=3&cursor={cursor}" if cursor else None
+
+    assert pages == 3
+    assert seen == list(range(7))
+
+
+def test_keyset_breaks_timestamp_ties_by_id(test_client, reading_factory):
+    for cps in range(4):
+        reading_factory(BASE, cps=cps)
+    db.session.commit()
+
+    first = test_client.get("/api/readings?limit=2")
+    cursor = first.headers["X-Next-Cursor"]
+    second = test_client.get(f"/api/readings?limit=2&cursor={cursor}")
+
+    ids = [r["id"] for r in first.get_json() + second.get_json()]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 4
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_since_until_and_device_filters(test_client, reading_factory):
+    _seed(reading_factory, 10, device_id="a")
+    _seed(reading_factory, 10, device_id="b")
+
+    resp = test_client.get(
+        "/api/readings",
+        query_string={
+            "since": "2024-01-01T12:00:02Z",
+            "until": (BASE + datetime.timedelta(seconds=4)).isoformat(),
+            "device_id": "b",
+        },
+    )
+
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert [r["counts_per_second"] for r in data] == [2, 3, 4]
+    assert {r["device_id"] for r in data} == {"b"}
+
+
+def test_limit_is_capped_server_side(test_app, test_client, reading_factory):
+    test_app.config["API_READINGS_MAX_LIMIT"] = 5
+    _seed(reading_factory, 8)
+
+    resp = test_client.get("/api/readings?limit=1000")
+
+    assert len(resp.get_json()) == 5
+    assert resp.headers["Link"].endswith('rel="next"')
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["limit=0", "limit=abc", "since=yesterday", "cursor=%%%", "since=2024-02-01&until=2024-01-01"],
+)
+def test_invalid_arguments_return_400(test_client, db_session, query):
+    resp = test_client.get(f"/api/readings?{query}")
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
@@ -0,0 +1,173 @@
+# filename: beamfoundry/tests/test_rollups.py
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import LogExpReading, ReadingRollup1d, ReadingRollup1h, ReadingRollup1m
+from app.services.analytics import run_analytics
+from app.services.ingestion import ingest_readings_batch
+from app.services.rollups import plan_range, rebuild_rollups, summarize_range
+
+T0 = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def _payloads(n, start=T0, step=timedelta(seconds=37), device="node-1"):
+    return [
+        {
+            "timestamp": (start + i * step).isoformat(),
+            "counts_per_second": i % 13,
+            "counts_per_minute": (i % 13) * 60,
+            "microsieverts_per_hour": (i % 13) * 0.0057,
+            "mode": "FAST" if i % 5 == 0 else "SLOW",
+            "device_id": device,
+        }
+        for i in range(n)
+    ]
+
+
+def _raw_summary(since, until):
+    r = LogExpReading
+    rows = db.session.execute(
+        select(r.counts_per_second, r.mode).where(r.timestamp >= since, r.timestamp <= until)
+    ).all()
+    modes = {}
+    for _, mode in rows:
+        modes[mode] = modes.get(mode, 0) + 1
+    cps = [c for c, _ in rows]
+    return len(rows), sum(cps) / len(cps), min(cps), max(cps), modes
+
+
+def test_batch_ingestion_maintains_rollups(test_app):
+    ingest_readings_batch(_payloads(200))
+
+    for model in (ReadingRollup1m, ReadingRollup1h, ReadingRollup1d):
+        total, cps_sum = db.session.execute(
+            select(func.sum(model.reading_count), func.sum(model.cps_sum))
+        ).one()
+        assert total == 200
+        assert cps_sum == sum(i % 13 for i in range(200))
+
+    day = db.session.execute(
+        select(ReadingRollup1d).where(ReadingRollup1d.mode == "FAST")
+    ).scalar_one()
+    assert day.bucket_start == T0
+    assert day.device_id == "node-1"
+    assert day.reading_count == 40
+    assert (day.cps_min, day.cps_max) == (0, 12)
+
+
+def test_orm_inserts_maintain_rollups(test_app, reading_factory):
+    reading_factory(T0 + timedelta(seconds=5), cps=4)
+    reading_factory(T0 + timedelta(seconds=50), cps=9)
+    db.session.commit()
+
+    minute = db.session.execute(select(ReadingRollup1m)).scalar_one()
+    assert minute.device_id == ""
+    assert (minute.reading_count, minute.cps_sum, minute.cps_min, minute.cps_max) == (2, 13, 4, 9)
+
+
+def test_rollups_disabled(test_app):
+    test_app.config["ROLLUPS_ENABLED"] = False
+    ingest_readings_batch(_payloads(10))
+
+    assert db.session.execute(select(func.count()).select_from(ReadingRollup1m)).scalar() == 0
+
+
+def test_plan_range_uses_coarsest_buckets():
+    start = T0 + timedelta(hours=22, minutes=58, seconds=30)
+    end = T0 + timedelta(days=3, hours=1, minutes=2, seconds=15)
+
+    plan = plan_range(start, end)
+
+    assert [p[0] for p in plan] == ["raw", "1m", "1h", "1d", "1h", "1m", "raw"]
+    assert plan[0][1] == start and plan[-1][2] == end
+    assert all(a[2] == b[1] for a, b in zip(plan, plan[1:]))
+    assert plan[3][1:] == (T0 + timedelta(days=1), T0 + timedelta(days=3))
+
+
+def test_summarize_range_matches_raw(test_app):
+    ingest_readings_batch(_payloads(9000))  # ~3.9 days
+    since = T0 + timedelta(hours=5, seconds=11)
+    until = T0 + timedelta(days=3, hours=2, seconds=3)
+
+    summary = summarize_range(since, until)
+    count, avg, lo, hi, modes = _raw_summary(since, until)
+
+    assert summary["resolution"] == "1d"
+    assert summary["count"] == count
+    assert summary["cps"]["avg"] == pytest.approx(avg)
+    assert (summary["cps"]["min"], summary["cps"]["max"]) == (lo, hi)
+    assert summary["modes"] == modes
+
+
+def test_summarize_short_range_reads_raw(test_app):
+    ingest_readings_batch(_payloads(100))
+
+    summary = summarize_range(T0, T0 + timedelta(minutes=10))
+
+    assert summary["resolution"] == "raw"
+    assert summary["count"] == _raw_summary(T0, T0 + timedelta(minutes=10))[0]
+
+
+def test_summarize_range_filters_device(test_app):
+    ingest_readings_batch(_payloads(300) + _payloads(100, device="node-2"))
+
+    summary = summarize_range(T0, T0 + timedelta(days=2), device_id="node-2")
+
+    assert summary["count"] == 100
+
+
+def test_rebuild_rollups_is_idempotent(test_app):
+    ingest_readings_batch(_payloads(5000))
+    before = summarize_range(T0, T0 + timedelta(days=3))
+
+    for model in (ReadingRollup1m, ReadingRollup1h, ReadingRollup1d):
+        db.session.execute(model.__table__.delete())
+    db.session.commit()
+
+    first = rebuild_rollups()
+    second = rebuild_rollups()
+
+    assert first == second
+    assert first["readings"] == 5000
+    assert summarize_range(T0, T0 + timedelta(days=3)) == before
+
+
+def test_cli_backfill_rollups(test_app):
+    ingest_readings_batch(_payloads(50))
+
+    result = test_app.test_cli_runner().invoke(args=["readings", "backfill-rollups"])
+
+    assert result.exit_code == 0, result.output
+    assert "Rebuilt 1 day(s): 50 readings" in result.output
+
+
+def test_run_analytics_long_window_uses_rollups(test_app):
+    ingest_readings_batch(_payloads(2000))
+    test_app.config["ANALYTICS_WINDOW_SECONDS"] = 6 * 3600
+
+    result = run_analytics()
+
+    last = T0 + 1999 * timedelta(seconds=37)
+    count, avg, _, _, _ = _raw_summary(last - timedelta(hours=6), last)
+    assert result["count"] == count
+    assert result["avg_cps"] == pytest.approx(avg)
+    assert result["last_timestamp"] == last
+
+
+@pytest.mark.parametrize("query", ["range=1h", ""])
+def test_analytics_page_default_ranges_follow_local_timezone(test_app, test_client, query):
+    # The quick/default ranges are local wall-clock times; reading them in
+    # the server's zone instead shifted the window by the UTC offset.
+    test_app.config["LOGIN_DISABLED"] = True
+    test_app.config_obj["LOCAL_TIMEZONE"] = "Asia/Tokyo"
+    start = datetime.now(timezone.utc) - timedelta(minutes=50)
+    ingest_readings_batch(_payloads(40, start=start, step=timedelta(minutes=1)))
+
+    resp = test_client.get(f"/analytics/?{query}")
+
+    assert resp.status_code == 200
+    assert b"<strong>Readings:</strong> 40</p>" in resp.data
@@ -0,0 +1,132 @@
+# filename: logexp/beamfoundry/tests/test_serial_reader.py
+
+from __future__ import annotations
+
+from typing import Any, List
+
+import serial
+from poller_config import PollerConfig
+from tests.fixtures.poller.fake_serial import FakeSerial, serial_exception
+
+from app.geiger import SerialLineReader
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _patch_serial(monkeypatch: Any, *ports: List[Any]) -> List[FakeSerial]:
+    """Each serial.Serial() call opens the next fake port in order."""
+    pending = list(ports)
+    opened: List[FakeSerial] = []
+
+    def _open(*args: Any, **kwargs: Any) -> FakeSerial:
+        if not pending:
+            raise serial_exception("no such device")
+        item = pending.pop(0)
+        if isinstance(item, BaseException):
+            raise item
+        fake = FakeSerial(item, *args, **kwargs)
+        opened.append(fake)
+        return fake
+
+    monkeypatch.setattr(serial, "Serial", _open)
+    return opened
+
+
+def test_reader_keeps_one_handle_open(monkeypatch):
+    opened = _patch_serial(monkeypatch, [b"CPS, 1\n", b"CPS, 2\n", b"CPS, 3\n"])
+    reader = SerialLineReader("/dev/ttyFAKE", 9600)
+
+    lines = [reader.readline() for _ in range(3)]
+
+    assert lines == ["CPS, 1", "CPS, 2", "CPS, 3"]
+    assert len(opened) == 1
+    assert reader.stats["opens"] == 1
+    assert reader.stats["lines"] == 3
+
+
+def test_reader_joins_partial_lines(monkeypatch):
+    _patch_serial(monkeypatch, [b"CPS, 1", b"2, CPM\n", b"", b"\r\n"])
+    reader = SerialLineReader("/dev/ttyFAKE", 9600)
+
+    assert reader.readline() is None
+    assert reader.readline() == "CPS, 12, CPM"
+    assert reader.readline() is None  # timeout
+    assert reader.readline() is None  # blank line
+
+
+def test_reader_discards_runaway_buffer(monkeypatch):
+    junk = b"x" * (SerialLineReader.MAX_LINE_BYTES + 1)
+    _patch_serial(monkeypatch, [junk, b"OK\n"])
+    reader = SerialLineReader("/dev/ttyFAKE", 9600)
+
+    assert reader.readline() is None
+    assert reader.readline() == "OK"
+    assert reader.stats["discarded_bytes"] == len(junk)
+
+
+def test_reader_reconnects_with_backoff(monkeypatch):
+    clock = _Clock()
+    opened = _patch_serial(
+        monkeypatch,
+        [b"A\n", serial_exception("device unplugged")],
+        serial_exception("still gone"),
+        [b"B\n"],
+    )
+    reader = SerialLineReader(
+        "/dev/ttyFAKE", 9600, backoff_initial=1.0, backoff_max=8.0, clock=clock
+    )
+
+    assert reader.readline() == "A"
+    assert reader.readline() is None
+    assert not reader.is_open
+    assert reader.reconnect_in() == 1.0
+
+    # Still inside the backoff window: no reopen attempt.
+    clock.now = 0.5
+    assert reader.readline() is None
+    assert len(opened) == 1
+
+    # First reopen fails, so the backoff doubles.
+    clock.now = 1.0
+    assert reader.readline() is None
+    assert reader.reconnect_in() == 2.0
+
+    clock.now = 3.0
+    assert reader.readline() == "B"
+    assert reader.stats["opens"] == 2
+    assert reader.stats["errors"] == 2
+    assert reader.stats["last_error"] == "still gone"
+    assert reader.reconnect_in() == 0.0
+
+
+def test_poller_reuses_serial_handle(make_poller, monkeypatch):
+    opened = _patch_serial(monkeypatch, [b"ONE\n", b"TWO\n"])
+    poller = make_poller(config=PollerConfig(mode="serial", serial_port="/dev/ttyFAKE"))
+
+    assert poller.poll_once() == {"raw": "ONE"}
+    assert poller.poll_once() == {"raw": "TWO"}
+
+    diag = poller.get_diagnostics()
+    assert len(opened) == 1
+    assert diag["frames_ingested"] == 2
+    assert diag["serial"]["reader"]["opens"] == 1
+
+
+def test_poller_serial_error_returns_none(make_poller):
+    poller = make_poller(
+        config=PollerConfig(mode="serial", serial_port="/dev/ttyFAKE"),
+        fake_serial_items=[serial.SerialException("boom")],
+    )
+
+    assert poller.poll_once() is None
+
+    diag = poller.get_diagnostics()
+    assert diag["frames_ingested"] == 0
+    assert diag["serial"]["reader"]["errors"] == 1
+    assert diag["serial"]["reader"]["open"] is False
@@ -0,0 +1,152 @@
+# filename: beamfoundry/tests/test_timeseries.py
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import LogExpReading
+from app.services.ingestion import ingest_readings_batch
+from app.services.timeseries import choose_step, query_series, source_for_step
+
+T0 = datetime(2024, 3, 1, tzinfo=timezone.utc)
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _payloads(n, start=T0, step=timedelta(seconds=37), device="node-1"):
+    return [
+        {
+            "timestamp": (start + i * step).isoformat(),
+            "counts_per_second": i % 13,
+            "counts_per_minute": (i % 13) * 60,
+            "microsieverts_per_hour": (i % 13) * 0.0057,
+            "mode": "FAST" if i % 5 == 0 else "SLOW",
+            "device_id": device,
+        }
+        for i in range(n)
+    ]
+
+
+def _raw_buckets(since, until, step):
+    r = LogExpReading
+    rows = db.session.execute(
+        select(r.timestamp, r.counts_per_second).where(r.timestamp >= since, r.timestamp <= until)
+    ).all()
+    buckets = {}
+    for ts, cps in rows:
+        seconds = int((ts - EPOCH).total_seconds()) // step * step
+        buckets.setdefault(EPOCH + timedelta(seconds=seconds), []).append(cps)
+    return buckets
+
+
+@pytest.mark.parametrize(
+    "span, step, source",
+    [
+        (timedelta(minutes=10), 1, "raw"),
+        (timedelta(hours=1), 2, "raw"),
+        (timedelta(hours=24), 60, "1m"),
+        (timedelta(days=7), 600, "1m"),
+        (timedelta(days=90), 7200, "1h"),
+        (timedelta(days=365), 21600, "1h"),
+        (timedelta(days=365 * 3), 86400, "1d"),
+        (timedelta(days=365 * 50), 2592000, "1d"),
+    ],
+)
+def test_step_and_source_selection(span, step, source):
+    assert choose_step(span.total_seconds(), 2000) == step
+    assert source_for_step(step) == source
+
+
+def test_step_beyond_ladder_uses_whole_days():
+    step = choose_step(timedelta(days=365 * 500).total_seconds(), 2000)
+
+    assert step % 86400 == 0
+    assert timedelta(days=365 * 500).total_seconds() // step + 1 <= 2000
+
+
+def test_raw_series_matches_python_grouping(test_app):
+    ingest_readings_batch(_payloads(200))
+    until = T0 + timedelta(minutes=30)
+
+    series = query_series(T0, until, max_points=100)
+
+    assert (series.step_seconds, series.source) == (30, "raw")
+    expected = _raw_buckets(T0, until, 30)
+    assert [p["timestamp"] for p in series.points] == sorted(expected)
+    for point in series.points:
+        values = expected[point["timestamp"]]
+        assert point["count"] == len(values)
+        assert point["cps_avg"] == pytest.approx(sum(values) / len(values))
+        assert (point["cps_min"], point["cps_max"]) == (min(values), max(values))
+
+
+def test_rollup_series_matches_raw(test_app):
+    ingest_readings_batch(_payloads(9000))  # ~3.9 days
+    until = T0 + timedelta(days=3, hours=5)
+
+    series = query_series(T0, until, max_points=50)
+
+    assert series.source == "1h"
+    assert len(series.points) <= 50
+    expected = _raw_buckets(T0, until - timedelta(microseconds=1), series.step_seconds)
+    for point in series.points:
+        values = expected[point["timestamp"]]
+        assert point["count"] == len(values)
+        assert point["cps_avg"] == pytest.approx(sum(values) / len(values))
+        assert (point["cps_min"], point["cps_max"]) == (min(values), max(values))
+        assert point["usv_max"] == pytest.approx(max(values) * 0.0057)
+
+
+def test_rollups_disabled_reads_raw(test_app):
+    ingest_readings_batch(_payloads(3000))
+    until = T0 + timedelta(days=1)
+    with_rollups = query_series(T0, until, max_points=24)
+
+    test_app.config["ROLLUPS_ENABLED"] = False
+    without = query_series(T0, until, max_points=24)
+
+    assert (with_rollups.source, without.source) == ("1h", "raw")
+    assert [p["count"] for p in without.points] == [p["count"] for p in with_rollups.points]
+
+
+def test_series_filters_device(test_app):
+    ingest_readings_batch(_payloads(300) + _payloads(100, device="node-2"))
+
+    series = query_series(T0, T0 + timedelta(days=1), device_id="node-2")
+
+    assert sum(p["count"] for p in series.points) == 100
+
+
+def test_series_rejects_inverted_range(test_app):
+    with pytest.raises(ValueError):
+        query_series(T0 + timedelta(hours=1), T0)
+
+
+def test_analytics_page_renders_range_chart(test_app, test_client):
+    test_app.config["LOGIN_DISABLED"] = True
+    ingest_readings_batch(_payloads(500))
+
+    resp = test_client.get(
+        "/analytics/?start_date=2024-03-01T00:00&end_date=2024-03-02T00:00&metric=cps"
+    )
+
+    assert resp.status_code == 200
+    assert b'id="rangeChart"' in resp.data
+    assert b"from 1m" in resp.data
+
+
+@pytest.mark.parametrize("query", ["range=1h", ""])
+def test_analytics_page_chart_follows_local_timezone(test_app, test_client, query):
+    # The page's quick/default bounds are local wall-clock times; the chart
+    # must cover the readings of the last hour whatever LOCAL_TIMEZONE is.
+    test_app.config["LOGIN_DISABLED"] = True
+    test_app.config_obj["LOCAL_TIMEZONE"] = "America/Chicago"
+    start = datetime.now(timezone.utc) - timedelta(minutes=50)
+    ingest_readings_batch(_payloads(40, start=start, step=timedelta(minutes=1)))
+
+    resp = test_client.get(f"/analytics/?{query}")
+
+    assert resp.status_code == 200
+    assert b'id="rangeChart"' in resp.data
+    assert b"(40 points," in resp.data
@@ -0,0 +1,55 @@
+# filename: beamfoundry/tests/test_timezones.py
+
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from app.services.timezones import (
+    get_local_timezone,
+    localize_timestamp,
+    localize_timestamps,
+    refresh_local_timezone,
+)
+
+SUMMER = datetime(2024, 7, 1, 12, 0, tzinfo=timezone.utc)
+WINTER = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_zone_is_resolved_once_per_app(test_app):
+    zone = get_local_timezone()
+
+    assert zone.key == "UTC"
+    assert get_local_timezone() is zone
+    assert test_app.extensions["logexp_local_timezone"] == ("UTC", zone)
+
+
+def test_config_change_is_picked_up_and_refresh_drops_cache(test_app):
+    get_local_timezone()
+    test_app.config_obj["LOCAL_TIMEZONE"] = "America/Chicago"
+
+    assert get_local_timezone().key == "America/Chicago"
+
+    refresh_local_timezone()
+    assert "logexp_local_timezone" not in test_app.extensions
+    assert get_local_timezone().key == "America/Chicago"
+
+
+def test_localize_timestamps_matches_per_value_conversion(test_app):
+    test_app.config_obj["LOCAL_TIMEZONE"] = "America/Chicago"
+    chicago = ZoneInfo("America/Chicago")
+    values = [SUMMER, WINTER, None, WINTER.replace(tzinfo=None)]
+
+    localized = localize_timestamps(values)
+
+    assert localized == [localize_timestamp(v) for v in values]
+    assert localized[0].utcoffset().total_seconds() == -5 * 3600
+    assert localized[1].utcoffset().total_seconds() == -6 * 3600
+    assert localized[2] is None
+    assert localized[3] == WINTER and localized[3].tzinfo is chicago
+
+
+def test_settings_update_refreshes_zone(test_app, test_client):
+    get_local_timezone()
+
+    test_client.post("/settings/", data={"port": "/dev/null", "baudrate": "9600"})
+
+    assert "logexp_local_timezone" not in test_app.extensions
@@ -0,0 +1,95 @@
+# logexp/tests/unit/analytics/test_incremental_engine.py
+
+import datetime as dt
+import random
+
+import pytest
+from analytics.engine import AnalyticsEngine, IncrementalAnalyticsEngine, ReadingSample
+
+T0 = dt.datetime(2025, 1, 1, 12, 0, 0, tzinfo=dt.timezone.utc)
+
+
+def _sample(seconds: float, value: float) -> ReadingSample:
+    return ReadingSample(timestamp=T0 + dt.timedelta(seconds=seconds), value=value)
+
+
+def test_matches_reference_engine_on_stream():
+    rng = random.Random(1234)
+    reference = AnalyticsEngine(window_minutes=1)
+    engine = IncrementalAnalyticsEngine(window_minutes=1)
+
+    t = 0.0
+    now = T0
+    for _ in range(2000):
+        t += rng.choice([0.5, 1.0, 1.0, 3.0])
+        sample = _sample(t, float(rng.randint(0, 100)))
+        reference.add_reading(sample)
+        engine.add_reading(sample)
+
+        # Query times never go backwards, as with a live stream.
+        now = max(now, T0 + dt.timedelta(seconds=t + rng.choice([0.0, 0.0, 5.0])))
+        expected = reference.compute_metrics(now)
+        actual = engine.compute_metrics(now, with_readings=True)
+
+        assert actual.count == expected.count
+        assert actual.minimum == expected.minimum
+        assert actual.maximum == expected.maximum
+        assert actual.average == pytest.approx(expected.average)
+        assert actual.readings == expected.readings
+        assert actual.window_start == expected.window_start
+
+
+def test_memory_bounded_by_window():
+    engine = IncrementalAnalyticsEngine(window_minutes=1)
+
+    for i in range(10_000):
+        engine.add_reading(_sample(i, 1.0))
+
+    # [now - 60 s, now] inclusive at 1 Hz
+    assert len(engine._samples) == 61
+    assert len(engine._min) <= 61
+    assert len(engine._max) <= 61
+
+
+def test_query_evicts_and_empties_window():
+    engine = IncrementalAnalyticsEngine(window_minutes=1)
+    engine.add_readings([_sample(0, 4.0), _sample(30, 9.0)])
+
+    result = engine.compute_metrics(T0 + dt.timedelta(seconds=75))
+    assert (result.count, result.minimum, result.maximum) == (1, 9.0, 9.0)
+    assert result.readings == []
+
+    result = engine.compute_metrics(T0 + dt.timedelta(seconds=200))
+    assert result.count == 0
+    assert result.average is None
+    assert len(engine._samples) == 0
+
+
+def test_out_of_order_samples():
+    engine = IncrementalAnalyticsEngine(window_minutes=1)
+    engine.add_readings([_sample(100, 5.0), _sample(110, 1.0)])
+
+    engine.add_reading(_sample(105, 20.0))  # inside the window: kept in order
+    engine.add_reading(_sample(10, 50.0))  # older than the window: dropped
+
+    result = engine.compute_metrics(T0 + dt.timedelta(seconds=110), with_readings=True)
+    assert [s.value for s in result.readings] == [5.0, 20.0, 1.0]
+    assert result.maximum == 20.0
+    assert engine.dropped == 1
+
+
+def test_query_behind_newest_sample():
+    engine = IncrementalAnalyticsEngine(window_minutes=1)
+    engine.add_readings([_sample(0, 2.0), _sample(10, 8.0)])
+
+    result = engine.compute_metrics(T0 + dt.timedelta(seconds=5))
+    assert (result.count, result.maximum) == (1, 2.0)
+
+
+def test_requires_timezone_aware():
+    engine = IncrementalAnalyticsEngine(window_minutes=1)
+
+    with pytest.raises(ValueError):
+        engine.add_reading(ReadingSample(timestamp=dt.datetime(2025, 1, 1), value=1.0))
+    with pytest.raises(ValueError):
+        engine.compute_metrics(dt.datetime(2025, 1, 1))
@@ -3,9 +3,17 @@
 # No datetime.now(). No implicit nondeterminism. No passing now=.
 
 import datetime
+import statistics
+
+import pytest
 
 from app.extensions import db
-from app.services.analytics import compute_window, run_analytics
+from app.services.analytics import (
+    aggregate_window,
+    compute_window,
+    fetch_window_rows,
+    run_analytics,
+)
 
 FIXED_NOW = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
 
@@ -90,3 +98,61 @@ def test_out_of_order_readings(test_app, reading_factory):
         result = run_analytics()
         assert result is not None
         assert result["first_timestamp"] < result["last_timestamp"]
+
+
+def test_window_rows_project_columns(test_app, reading_factory):
+    """
+    fetch_window_rows() returns the same window as compute_window(), as
+    tuples of the requested columns only.
+    """
+    with test_app.app_context():
+        reading_factory(FIXED_NOW - datetime.timedelta(seconds=120), cps=20)
+        reading_factory(FIXED_NOW - datetime.timedelta(seconds=30), cps=10)
+        reading_factory(FIXED_NOW, cps=40)
+
+        db.session.commit()
+
+        rows = fetch_window_rows()
+        assert [tuple(r) for r in rows] == [
+            (r.timestamp, r.counts_per_second) for r in compute_window()
+        ]
+        assert rows[0].counts_per_second == 10
+
+        rows = fetch_window_rows(columns=("counts_per_minute", "mode"))
+        assert rows[0]._fields == ("counts_per_minute", "mode")
+
+
+def test_aggregate_window_matches_rows(test_app, reading_factory):
+    """
+    aggregate_window() summarizes exactly the compute_window() window in SQL,
+    including a sub-second window start taken from MAX(timestamp).
+    """
+    with test_app.app_context():
+        last = FIXED_NOW + datetime.timedelta(microseconds=500000)
+        reading_factory(last - datetime.timedelta(seconds=60, microseconds=1), cps=99)
+        reading_factory(last - datetime.timedelta(seconds=60), cps=4, microsieverts_per_hour=0.02)
+        reading_factory(last - datetime.timedelta(seconds=10), cps=9, microsieverts_per_hour=0.05)
+        reading_factory(last, cps=5, microsieverts_per_hour=0.03)
+
+        db.session.commit()
+
+        readings = compute_window()
+        summary = aggregate_window()
+
+        assert summary["count"] == len(readings) == 3
+        assert summary["first_timestamp"] == readings[0].timestamp
+        assert summary["last_timestamp"] == last
+        cps = [r.counts_per_second for r in readings]
+        assert summary["cps"]["avg"] == pytest.approx(statistics.fmean(cps))
+        assert (summary["cps"]["min"], summary["cps"]["max"]) == (4, 9)
+        assert summary["cps"]["stddev"] == pytest.approx(statistics.pstdev(cps))
+        assert summary["cpm"]["max"] == 540
+        assert summary["usv"]["stddev"] == pytest.approx(statistics.pstdev([0.02, 0.05, 0.03]))
+
+        explicit = aggregate_window(now=last - datetime.timedelta(seconds=50))
+        assert explicit["count"] == 4
+
+
+def test_aggregate_window_empty(test_app):
+    with test_app.app_context():
+        assert aggregate_window() is None
@@ -24,6 +24,7 @@ if app.config_obj.get("START_POLLER", False):
     from app.poller import GeigerPoller
 
     poller = GeigerPoller(app)
+    app.poller = poller  # read by get_poller_status() and the /api/poller routes
     poller.start()
 
     logger.info("wsgi_poller_started")
@@ -0,0 +1,105 @@
+# filename: scripts/bench_analytics_cache.py
+
+"""
+Benchmark repeated dashboard analytics calls with and without the result
+cache.
+
+Loads --rows 1 Hz readings into a throwaway SQLite database with the
+analytics window covering the last --window seconds, then times
+run_analytics() + get_analytics_status() per call:
+
+    uncached   ANALYTICS_CACHE_TTL_SECONDS=0 (every call queries)
+    cached     default TTL (first call queries, the rest are lookups)
+    ingest     cached, with one reading ingested before every call
+
+Usage:
+    PYTHONPATH=. python scripts/bench_analytics_cache.py --rows 200000 --window 3600
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict
+
+from flask_migrate import upgrade
+
+from app import create_app
+from app.extensions import db
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _reading(i: int) -> Dict[str, Any]:
+    return {
+        "timestamp": START + timedelta(seconds=i),
+        "counts_per_second": i % 50,
+        "counts_per_minute": (i % 50) * 60,
+        "microsieverts_per_hour": (i % 50) * 0.0057,
+        "mode": "SLOW",
+    }
+
+
+def _per_call(fn: Callable[[int], Any], calls: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - t0) / calls
+
+
+def main() -> int:
+    """Time cached against uncached dashboard analytics."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--window", type=int, default=3600)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    from app.services.analytics import run_analytics
+    from app.services.analytics_diagnostics import get_analytics_status
+    from app.services.ingestion import ingest_readings_batch
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        results = {}
+        for label, ttl in (("uncached", 0.0), ("cached", 60.0), ("ingest", 60.0)):
+            app = create_app(
+                {
+                    "SQLALCHEMY_DATABASE_URI": uri,
+                    "START_POLLER": False,
+                    "ANALYTICS_WINDOW_SECONDS": args.window,
+                    "ANALYTICS_CACHE_TTL_SECONDS": ttl,
+                }
+            )
+            with app.app_context():
+                if label == "uncached":
+                    upgrade()
+                    for offset in range(0, args.rows, 20000):
+                        ingest_readings_batch(
+                            [_reading(i) for i in range(offset, min(args.rows, offset + 20000))]
+                        )
+
+                def dashboard(i: int, ingest: bool = label == "ingest") -> None:
+                    if ingest:
+                        ingest_readings_batch([_reading(args.rows + i)])
+                    run_analytics()
+                    get_analytics_status()
+
+                results[label] = _per_call(dashboard, args.calls)
+                db.session.remove()
+                db.engine.dispose()
+
+    base = results["uncached"]
+    for label, seconds in results.items():
+        print(f"{label:<10}{seconds * 1000:>9.3f} ms/call {base / seconds:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+# filename: scripts/bench_analytics_engine.py
+
+"""
+Benchmark AnalyticsEngine against IncrementalAnalyticsEngine.
+
+Feeds --rows samples at 1 Hz into each engine and calls compute_metrics()
+every --query-every inserts. The original engine keeps every sample and
+rescans them all per query; the incremental engine keeps only the window.
+The incremental engine is also timed with a query after every insert, and
+with with_readings=True, which copies the window into every result.
+
+Usage:
+    PYTHONPATH=beamfoundry python scripts/bench_analytics_engine.py --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Tuple
+
+from analytics.engine import AnalyticsEngine, IncrementalAnalyticsEngine, ReadingSample
+
+
+def _run(
+    engine: Any, samples: List[ReadingSample], query_every: int, **kwargs: Any
+) -> Tuple[float, float]:
+    """Return (total seconds, seconds spent in compute_metrics)."""
+    query_time = 0.0
+    started = time.perf_counter()
+    for i, sample in enumerate(samples, 1):
+        engine.add_reading(sample)
+        if i % query_every == 0:
+            t0 = time.perf_counter()
+            engine.compute_metrics(sample.timestamp, **kwargs)
+            query_time += time.perf_counter() - t0
+    return time.perf_counter() - started, query_time
+
+
+def main() -> int:
+    """Compare insert + query throughput of the two analytics engines."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--query-every", type=int, default=10_000)
+    parser.add_argument("--window-minutes", type=float, default=5)
+    args = parser.parse_args()
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    samples = [
+        ReadingSample(timestamp=start + timedelta(seconds=i), value=float(i % 50))
+        for i in range(args.rows)
+    ]
+    runs = [
+        ("list (original)", AnalyticsEngine(args.window_minutes), args.query_every, {}),
+        ("incremental", IncrementalAnalyticsEngine(args.window_minutes), args.query_every, {}),
+        ("incremental, every row", IncrementalAnalyticsEngine(args.window_minutes), 1, {}),
+        (
+            "  + with_readings",
+            IncrementalAnalyticsEngine(args.window_minutes),
+            1,
+            {"with_readings": True},
+        ),
+    ]
+
+    for label, engine, every, kwargs in runs:
+        elapsed, query_time = _run(engine, samples, every, **kwargs)
+        queries = args.rows // every
+        print(
+            f"{label:<24}{args.rows:>10,} inserts {queries:>10,} queries "
+            f"{elapsed:>7.2f} s total {query_time / queries * 1e6:>10,.1f} us/query  "
+            f"retained={len(engine._samples):,}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
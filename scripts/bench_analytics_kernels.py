@@ -0,0 +1,201 @@
+# filename: scripts/bench_analytics_kernels.py
+
+"""
+Benchmark the NumPy analytics kernels against the pure-Python loops they
+replace, at 10^4 .. 10^--max-exp samples.
+
+    ema_last    final EMA value: Python loop vs weighted dot product
+    ema         full EMA series: Python loop vs scipy lfilter (if
+                installed) vs blocked cumulative sums
+    mean        sum()/len() vs ndarray.mean()
+    rolling     50-sample rolling mean/std: Python running sums vs
+                prefix-sum kernels
+    p50/p99     sorted() indexing vs np.percentile
+    histogram   Python bucket counting vs np.histogram
+
+With --db-rows N, also loads N readings into a throwaway SQLite database
+and compares extracting CPS/timestamps from ORM objects with
+load_reading_arrays().
+
+Usage:
+    PYTHONPATH=. python scripts/bench_analytics_kernels.py --max-exp 7 --db-rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List
+
+import numpy as np
+
+from app.services import analytics_arrays
+from app.services.analytics_arrays import (
+    ema,
+    ema_last,
+    histogram,
+    load_reading_arrays,
+    percentiles,
+    rolling_mean,
+    rolling_std,
+)
+
+WINDOW = 50
+
+
+def _time(fn: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def py_ema_last(values: List[float], alpha: float) -> float:
+    acc = values[0]
+    for v in values[1:]:
+        acc = alpha * v + (1 - alpha) * acc
+    return acc
+
+
+def py_ema(values: List[float], alpha: float) -> List[float]:
+    out = [values[0]]
+    for v in values[1:]:
+        out.append(alpha * v + (1 - alpha) * out[-1])
+    return out
+
+
+def py_rolling(values: List[float], window: int) -> List[tuple[float, float]]:
+    out = []
+    s = sq = 0.0
+    for i, v in enumerate(values):
+        s += v
+        sq += v * v
+        if i >= window:
+            old = values[i - window]
+            s -= old
+            sq -= old * old
+        if i >= window - 1:
+            mean = s / window
+            out.append((mean, math.sqrt(max(sq / window - mean * mean, 0.0))))
+    return out
+
+
+def py_percentiles(values: List[float]) -> tuple[float, float]:
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2], ordered[int(len(ordered) * 0.99)]
+
+
+def py_histogram(values: List[float], bins: int = 20) -> List[int]:
+    lo, hi = min(values), max(values)
+    width = (hi - lo) / bins or 1.0
+    counts = [0] * bins
+    for v in values:
+        counts[min(int((v - lo) / width), bins - 1)] += 1
+    return counts
+
+
+def _row(label: str, py: float, np_time: float, extra: str = "") -> None:
+    print(
+        f"  {label:<10}python {py * 1000:>10.2f} ms   numpy {np_time * 1000:>9.2f} ms "
+        f"{py / np_time:>8.1f}x{extra}"
+    )
+
+
+def bench_kernels(max_exp: int) -> None:
+    rng = np.random.default_rng(0)
+    for exp in range(4, max_exp + 1):
+        n = 10**exp
+        arr = rng.poisson(30, n).astype(np.float64)
+        values = arr.tolist()
+        print(f"n = 10^{exp}")
+
+        _row("ema_last", _time(lambda: py_ema_last(values, 0.1)), _time(lambda: ema_last(arr, 0.1)))
+
+        py = _time(lambda: py_ema(values, 0.1))
+        if analytics_arrays._lfilter is not None:
+            _row("ema", py, _time(lambda: ema(arr, 0.1)), "  (lfilter)")
+        _row(
+            "ema",
+            py,
+            _time(lambda: analytics_arrays._ema_cumulative(arr, 0.1)),
+            "  (cumulative)",
+        )
+        _row("mean", _time(lambda: sum(values) / len(values)), _time(lambda: arr.mean()))
+        _row(
+            "rolling",
+            _time(lambda: py_rolling(values, WINDOW)),
+            _time(lambda: (rolling_mean(arr, WINDOW), rolling_std(arr, WINDOW))),
+        )
+        _row(
+            "p50/p99",
+            _time(lambda: py_percentiles(values)),
+            _time(lambda: percentiles(arr, (50, 99))),
+        )
+        _row("histogram", _time(lambda: py_histogram(values)), _time(lambda: histogram(arr)))
+
+
+def bench_loading(rows: int) -> None:
+    from flask_migrate import upgrade
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import LogExpReading
+    from app.services.ingestion import ingest_readings_batch
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = create_app({"SQLALCHEMY_DATABASE_URI": uri, "START_POLLER": False})
+        with app.app_context():
+            upgrade()
+            for offset in range(0, rows, 10000):
+                ingest_readings_batch(
+                    [
+                        {
+                            "timestamp": start + timedelta(seconds=i),
+                            "counts_per_second": i % 50,
+                            "counts_per_minute": (i % 50) * 60,
+                            "microsieverts_per_hour": (i % 50) * 0.0057,
+                            "mode": "SLOW",
+                        }
+                        for i in range(offset, min(rows, offset + 10000))
+                    ]
+                )
+
+            def orm() -> Any:
+                readings = db.session.query(LogExpReading).order_by(LogExpReading.timestamp).all()
+                cps = [r.counts_per_second for r in readings]
+                ts = [r.timestamp for r in readings]
+                db.session.expunge_all()
+                return cps, ts
+
+            print(f"loading {rows:,} readings (SQLite)")
+            _row("columns", _time(orm), _time(load_reading_arrays), "  (ORM objects vs arrays)")
+
+            db.session.remove()
+            db.engine.dispose()
+
+
+def main() -> int:
+    """Time the array kernels against Python loops."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-exp", type=int, default=6)
+    parser.add_argument("--db-rows", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    bench_kernels(args.max_exp)
+    if args.db_rows:
+        bench_loading(args.db_rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
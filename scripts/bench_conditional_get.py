@@ -0,0 +1,85 @@
+# filename: scripts/bench_conditional_get.py
+
+"""
+Benchmark conditional GETs on the polled readings endpoints.
+
+Loads --rows readings into a throwaway SQLite database, then for each
+endpoint times --requests polls through the Flask test client:
+
+    full    no validators (query + ORM + serialization every time)
+    304     If-None-Match with the current ETag (nothing changed)
+
+Usage:
+    PYTHONPATH=. python scripts/bench_conditional_get.py --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask_migrate import upgrade
+
+from app import create_app
+from app.extensions import db
+
+ENDPOINTS = ("/api/readings.json", "/api/readings/latest", "/api/readings?limit=500")
+
+
+def main() -> int:
+    """Time full responses against 304 revalidations."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    from app.services.ingestion import ingest_readings_batch
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = create_app({"SQLALCHEMY_DATABASE_URI": uri, "START_POLLER": False})
+        with app.app_context():
+            upgrade()
+            for offset in range(0, args.rows, 20000):
+                ingest_readings_batch(
+                    [
+                        {
+                            "timestamp": start + timedelta(seconds=i),
+                            "counts_per_second": i % 50,
+                            "counts_per_minute": (i % 50) * 60,
+                            "microsieverts_per_hour": (i % 50) * 0.0057,
+                            "mode": "SLOW",
+                        }
+                        for i in range(offset, min(args.rows, offset + 20000))
+                    ]
+                )
+
+            client = app.test_client()
+            for url in ENDPOINTS:
+                etag = client.get(url).headers["ETag"]
+                timings = {}
+                for label, headers in (("full", {}), ("304", {"If-None-Match": etag})):
+                    t0 = time.perf_counter()
+                    for _ in range(args.requests):
+                        client.get(url, headers=headers)
+                    timings[label] = (time.perf_counter() - t0) / args.requests
+                print(
+                    f"{url:<28} full {timings['full'] * 1000:>7.2f} ms   "
+                    f"304 {timings['304'] * 1000:>6.2f} ms "
+                    f"{timings['full'] / timings['304']:>7.1f}x"
+                )
+
+            db.session.remove()
+            db.engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
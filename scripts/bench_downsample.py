@@ -0,0 +1,113 @@
+# filename: scripts/bench_downsample.py
+
+"""
+Benchmark chart downsampling on a long reading series.
+
+Builds a synthetic 1 Hz CPM trace of --samples points (a random walk with
+occasional spikes), then times, for each --points target:
+
+    python   a pure-Python LTTB loop (the reference algorithm)
+    lttb     app.services.downsample.lttb_indices (NumPy per bucket)
+    minmax   app.services.downsample.minmax_indices (fully vectorized)
+
+and reports the JSON payload of the full series against the downsampled
+one, plus how well each method keeps the spikes.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_downsample.py --samples 1000000 --points 1000 --points 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, List
+
+import numpy as np
+
+from app.services.downsample import lttb_indices, minmax_indices
+
+
+def python_lttb(xs: List[float], ys: List[float], n: int) -> List[int]:
+    """Reference LTTB: one Python iteration per input point."""
+    length = len(xs)
+    every = (length - 2) / (n - 2)
+    keep = [0]
+    a = 0
+    for i in range(n - 2):
+        start = int(i * every) + 1
+        stop = int((i + 1) * every) + 1
+        if i == n - 3:
+            next_start, next_stop = length - 1, length
+        else:
+            next_start, next_stop = stop, int((i + 2) * every) + 1
+        span = next_stop - next_start
+        nx = sum(xs[next_start:next_stop]) / span
+        ny = sum(ys[next_start:next_stop]) / span
+        xa, ya = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, stop):
+            area = abs((xa - nx) * (ys[j] - ya) - (xa - xs[j]) * (ny - ya))
+            if area > best_area:
+                best, best_area = j, area
+        keep.append(best)
+        a = best
+    keep.append(length - 1)
+    return keep
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def _payload_bytes(xs: Any, ys: Any) -> int:
+    return len(json.dumps([[int(x), float(y)] for x, y in zip(xs, ys)]).encode("utf-8"))
+
+
+def main() -> int:
+    """Time the downsampling kernels and compare payload sizes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--points", type=int, action="append")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    xs = (1_700_000_000 + np.arange(args.samples, dtype=np.float64)) * 1000.0
+    ys = np.clip(600 + np.cumsum(rng.normal(0, 2, args.samples)), 0, None)
+    spikes = rng.choice(args.samples, size=20, replace=False)
+    ys[spikes] += 5000
+    xs_list, ys_list = xs.tolist(), ys.tolist()
+
+    full = _payload_bytes(xs, ys)
+    print(f"{args.samples:,} samples, full JSON payload {full / 1e6:.1f} MB")
+
+    for n in args.points or [1000, 2000]:
+        rows = [
+            ("python", lambda: python_lttb(xs_list, ys_list, n), 1),
+            ("lttb", lambda: lttb_indices(xs, ys, n), args.repeat),
+            ("minmax", lambda: minmax_indices(ys, n), args.repeat),
+        ]
+        base = None
+        for label, fn, repeat in rows:
+            elapsed, keep = _time(fn, repeat)
+            keep = np.asarray(keep)
+            base = base or elapsed
+            kept_spikes = np.isin(spikes, keep).sum()
+            print(
+                f"n={n:<6}{label:<8}{elapsed * 1000:>9.1f} ms {base / elapsed:>7.1f}x  "
+                f"payload {_payload_bytes(xs[keep], ys[keep]) / 1e3:>6.1f} kB  "
+                f"spikes kept {kept_spikes}/{len(spikes)}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+# filename: scripts/bench_export_formats.py
+
+"""
+Compare the CSV, Arrow IPC and Parquet readings exporters.
+
+Seeds an in-memory SQLite database with synthetic 1 Hz readings, then runs
+each exporter over the full table and reports output size and rows/sec.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_export_formats.py --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from app import create_app
+from app.extensions import db
+from app.models import LogExpReading
+from app.services.analytics_export import CSV_FIELDS, iter_readings_csv
+from app.services.analytics_export_arrow import (
+    arrow_available,
+    iter_readings_arrow,
+    iter_readings_parquet,
+)
+from app.services.readings_query import ReadingFilters
+from app.services.readings_stream import iter_reading_rows
+
+MODES = ("SLOW", "FAST", "INST")
+
+
+def _seed(rows: int, batch: int = 10_000) -> None:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    table = LogExpReading.__table__
+
+    for offset in range(0, rows, batch):
+        payload: List[Dict[str, Any]] = [
+            {
+                "timestamp": start + timedelta(seconds=i),
+                "counts_per_second": i % 50,
+                "counts_per_minute": (i % 50) * 60,
+                "microsieverts_per_hour": (i % 50) * 0.0057,
+                "mode": MODES[i % 3],
+                "device_id": f"node-{i % 4}",
+            }
+            for i in range(offset, min(offset + batch, rows))
+        ]
+        db.session.execute(table.insert(), payload)
+    db.session.commit()
+
+
+def _measure(
+    name: str,
+    encoder: Callable[[Iterable[Any]], Iterator[Any]],
+    rows: int,
+) -> None:
+    started = time.perf_counter()
+    size = 0
+    for chunk in encoder(iter_reading_rows(ReadingFilters(), batch_size=5000)):
+        size += len(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:<8} {size / 1_048_576:>9.2f} MiB {size / rows:>8.1f} B/row "
+        f"{rows / elapsed:>12,.0f} rows/s"
+    )
+
+
+def main() -> int:
+    """Benchmark readings export formats over a synthetic dataset."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    app = create_app({"TESTING": True, "START_POLLER": False})
+
+    with app.app_context():
+        db.create_all()
+        _seed(args.rows)
+
+        print(f"{args.rows:,} rows")
+        _measure("csv", lambda rows: iter_readings_csv(rows, CSV_FIELDS, 5000), args.rows)
+
+        if not arrow_available():
+            print("pyarrow not installed; skipping arrow/parquet")
+            return 0
+
+        _measure("arrow", lambda rows: iter_readings_arrow(rows, CSV_FIELDS), args.rows)
+        _measure("parquet", lambda rows: iter_readings_parquet(rows, CSV_FIELDS), args.rows)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+# filename: scripts/bench_ingestion.py
+
+"""
+Compare per-reading ingestion with the bulk batch path.
+
+Runs against a throwaway file-backed SQLite database, so every commit pays
+for a real fsync. Reports rows/sec for:
+
+    single  services.ingestion.ingest_reading, one commit per reading
+    batch   services.ingestion.ingest_readings_batch, --batch rows per call
+
+Usage:
+    PYTHONPATH=. python scripts/bench_ingestion.py --rows 5000 --batch 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from flask_migrate import upgrade
+
+from app import create_app
+from app.extensions import db
+from app.models import LogExpReading
+from app.services.ingestion import ingest_reading, ingest_readings_batch
+
+
+def _payloads(rows: int) -> List[Dict[str, Any]]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "timestamp": (start + timedelta(seconds=i)).isoformat(),
+            "counts_per_second": i % 50,
+            "counts_per_minute": (i % 50) * 60,
+            "microsieverts_per_hour": (i % 50) * 0.0057,
+            "mode": "SLOW",
+            "device_id": "bench",
+        }
+        for i in range(rows)
+    ]
+
+
+def _report(name: str, rows: int, elapsed: float) -> float:
+    rate = rows / elapsed
+    print(f"{name:<8} {rows:>9,} rows {elapsed:>8.2f} s {rate:>12,.0f} rows/s")
+    return rate
+
+
+def main() -> int:
+    """Benchmark single-row vs batch ingestion."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    # Per-reading INFO logs would dominate the single-row timing.
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = create_app({"SQLALCHEMY_DATABASE_URI": uri, "START_POLLER": False})
+
+        with app.app_context():
+            upgrade()
+            payloads = _payloads(args.rows)
+
+            started = time.perf_counter()
+            for payload in payloads:
+                ingest_reading(payload)
+            single = _report("single", args.rows, time.perf_counter() - started)
+
+            db.session.query(LogExpReading).delete()
+            db.session.commit()
+
+            started = time.perf_counter()
+            for offset in range(0, args.rows, args.batch):
+                ingest_readings_batch(payloads[offset : offset + args.batch])
+            batch = _report("batch", args.rows, time.perf_counter() - started)
+
+            print(f"speedup  {batch / single:>.1f}x")
+
+            db.session.remove()
+            db.engine.dispose()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+# filename: scripts/bench_log_pipeline.py
+
+"""
+Benchmark per-call logging latency against a slow sink.
+
+Each setup logs --records INFO records with extra fields, one call at a
+time, to a stream whose write() sleeps --sink-ms milliseconds:
+
+    direct      StreamHandler + StructuredFormatter on the calling thread
+    pipeline    DroppingQueueHandler -> bounded queue -> LogPump thread
+
+Reports the p50/p99/max time each logger.info() call took on the calling
+thread, plus what the pipeline wrote and dropped.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_log_pipeline.py --records 2000 --sink-ms 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import queue
+import time
+from typing import Dict, List
+
+from app.logging import DroppingQueueHandler, LogPump, StructuredFormatter
+
+
+class SlowSink:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _latencies(handler: logging.Handler, records: int) -> List[float]:
+    logger = logging.getLogger("beamfoundry.bench.pipeline")
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    timings: List[float] = []
+    for i in range(records):
+        t0 = time.perf_counter()
+        logger.info("reading_ingested", extra={"reading_id": i, "cps": i % 50})
+        timings.append(time.perf_counter() - t0)
+    return sorted(timings)
+
+
+def _summary(timings: List[float]) -> Dict[str, float]:
+    return {
+        "p50": timings[len(timings) // 2],
+        "p99": timings[int(len(timings) * 0.99)],
+        "max": timings[-1],
+    }
+
+
+def main() -> int:
+    """Compare call latency of a direct handler and the queued pipeline."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--sink-ms", type=float, default=1.0)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    sink = SlowSink(args.sink_ms / 1000)
+
+    direct = logging.StreamHandler(sink)  # type: ignore[arg-type]
+    direct.setFormatter(StructuredFormatter())
+    results = {"direct": _summary(_latencies(direct, args.records))}
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=args.queue_size)
+    handler = DroppingQueueHandler(log_queue)
+    pump = LogPump(log_queue, StructuredFormatter(), stream=sink, batch_size=args.batch_size)  # type: ignore[arg-type]
+    pump.start()
+    results["pipeline"] = _summary(_latencies(handler, args.records))
+    pump.stop(timeout=60)
+
+    print(f"{'':<9} {'p50':>10} {'p99':>10} {'max':>10}")
+    for label, row in results.items():
+        print(
+            f"{label:<9} {row['p50'] * 1e6:>7.1f} us {row['p99'] * 1e6:>7.1f} us "
+            f"{row['max'] * 1e6:>7.1f} us"
+        )
+    stats = pump.stats()
+    print(
+        f"pipeline wrote {stats['written']} records in {stats['batches']} batches, "
+        f"dropped {handler.dropped}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,159 @@
+# filename: scripts/bench_logging.py
+
+"""
+Benchmark the cost of logging on the ingestion and serialization hot paths.
+
+Runs the same workload under three logging setups, with every beamfoundry.*
+and logexp.* logger writing structured records to os.devnull:
+
+    off         WARNING (production-like: debug calls are level-gated)
+    debug       DEBUG, per-reading events sampled at LOG_SAMPLE_EVERY
+    debug-all   DEBUG, every per-reading event emitted (LOG_SAMPLE_EVERY=1)
+
+Workloads (best of --repeat):
+
+    ingest      ingest_reading() for --ingest payloads (one commit each)
+    parse       parse_geiger_line() + ReadingCreate validation per line
+    serialize   to_dict() -> ReadingResponse -> jsonify for --rows readings
+
+Usage:
+    PYTHONPATH=. python scripts/bench_logging.py --rows 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from flask import jsonify
+from flask_migrate import upgrade
+
+from app import create_app
+from app.extensions import db
+from app.logging import StructuredFormatter
+from app.logging_setup import set_log_sampling
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+def _set_logging(level: int, handler: logging.Handler) -> None:
+    names = [
+        name
+        for name in logging.root.manager.loggerDict
+        if name.split(".")[0] in ("beamfoundry", "logexp", "app")
+    ]
+    for name in names + ["beamfoundry", "logexp"]:
+        target = logging.getLogger(name)
+        target.handlers[:] = [handler]
+        target.setLevel(level)
+        target.propagate = False
+
+
+def main() -> int:
+    """Time hot paths with logging off, sampled and fully on."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--ingest", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from app.geiger import parse_geiger_line
+    from app.models import LogExpReading
+    from app.schemas import ReadingCreate, ReadingResponse
+    from app.services.ingestion import ingest_reading
+
+    app = create_app(
+        {"SQLALCHEMY_DATABASE_URI": "sqlite://", "START_POLLER": False, "TESTING": True}
+    )
+    sample_every = int(app.config_obj["LOG_SAMPLE_EVERY"])
+
+    devnull = open(os.devnull, "w")
+    handler = logging.StreamHandler(devnull)
+    handler.setFormatter(StructuredFormatter())
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    lines = [
+        f"CPS, {i % 60}, CPM, {(i % 60) * 60}, uSv/hr, 0.{i % 90:02d}, SLOW" for i in range(2000)
+    ]
+
+    with app.app_context(), app.test_request_context():
+        upgrade()
+        readings = [
+            LogExpReading(
+                id=i,
+                timestamp=start + timedelta(seconds=i),
+                counts_per_second=i % 50,
+                counts_per_minute=(i % 50) * 60,
+                microsieverts_per_hour=(i % 50) * 0.0057,
+                mode="SLOW",
+            )
+            for i in range(args.rows)
+        ]
+
+        def ingest() -> None:
+            for i in range(args.ingest):
+                ingest_reading(
+                    {
+                        "counts_per_second": i % 50,
+                        "counts_per_minute": (i % 50) * 60,
+                        "microsieverts_per_hour": 0.01,
+                        "mode": "SLOW",
+                    }
+                )
+
+        def parse() -> None:
+            for line in lines:
+                ReadingCreate(**parse_geiger_line(line))
+
+        def serialize() -> None:
+            jsonify(
+                [ReadingResponse(**r.to_dict()).model_dump(exclude_none=False) for r in readings]
+            ).get_data()
+
+        setups = (
+            ("off", logging.WARNING, sample_every),
+            ("debug", logging.DEBUG, sample_every),
+            ("debug-all", logging.DEBUG, 1),
+        )
+        results: Dict[str, Dict[str, float]] = {}
+        for label, level, every in setups:
+            _set_logging(level, handler)
+            set_log_sampling(every)
+            results[label] = {
+                "ingest": _best(ingest, args.repeat) / args.ingest,
+                "parse": _best(parse, args.repeat) / len(lines),
+                "serialize": _best(serialize, args.repeat) / args.rows,
+            }
+
+        print(f"{'':<10} {'ingest/row':>12} {'parse/line':>12} {'serialize/row':>14}")
+        for label, row in results.items():
+            print(
+                f"{label:<10} {row['ingest'] * 1e6:>9.1f} us {row['parse'] * 1e6:>9.2f} us "
+                f"{row['serialize'] * 1e6:>11.2f} us"
+            )
+
+        db.session.remove()
+        db.engine.dispose()
+    devnull.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+# filename: scripts/bench_metrics.py
+
+"""
+Benchmark the cost of metrics instrumentation.
+
+Times, best of --repeat:
+
+    observe         Histogram child .observe() (what the poller loop does)
+    labels+observe  .labels(...).observe() with three labels (per request)
+    timer           `with child.time():` around an empty block
+    render          one /metrics render with --series request series
+    merge           multiprocess render over --workers snapshot files
+
+Usage:
+    PYTHONPATH=. python scripts/bench_metrics.py --ops 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, List
+
+from app.metrics import LATENCY_BUCKETS, Counter, Histogram, MetricsRegistry
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+def main() -> int:
+    """Time hot-path observations and scrape rendering."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--series", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    hist = Histogram("bench_seconds", "Bench.", registry=registry, buckets=LATENCY_BUCKETS)
+    requests = Histogram(
+        "bench_request_seconds", "Bench.", ["endpoint", "method", "status"], registry=registry
+    )
+    rows = Counter("bench_rows_total", "Bench.", ["path"], registry=registry)
+    child = hist.labels()
+    ops = range(args.ops)
+
+    def observe() -> None:
+        for i in ops:
+            child.observe(0.001)
+
+    def labels_observe() -> None:
+        for i in ops:
+            requests.labels("api.get_readings", "GET", "200").observe(0.001)
+
+    def timer() -> None:
+        for i in ops:
+            with child.time():
+                pass
+
+    def baseline() -> None:
+        for i in ops:
+            pass
+
+    loop = _best(baseline, args.repeat)
+    for label, fn in (("observe", observe), ("labels+observe", labels_observe), ("timer", timer)):
+        seconds = _best(fn, args.repeat) - loop
+        print(f"{label:<15} {seconds / args.ops * 1e9:>8.0f} ns/op")
+
+    for i in range(args.series):
+        requests.labels(f"bp.endpoint_{i}", "GET", "200").observe(0.01)
+        rows.labels(f"path_{i}").inc(i)
+    seconds = _best(registry.render, args.repeat)
+    print(f"{'render':<15} {seconds * 1000:>8.2f} ms  ({args.series} request series)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot = registry.snapshot()
+        for worker in range(args.workers - 1):
+            snapshot["pid"] = os.getpid() + worker + 1
+            path = os.path.join(directory, f"metrics-{snapshot['pid']}.json")
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump(snapshot, fh)
+        registry.configure_multiprocess(directory, flush_seconds=60)
+        try:
+            seconds = _best(registry.render, args.repeat)
+        finally:
+            registry.configure_multiprocess(None)
+        print(f"{'merge':<15} {seconds * 1000:>8.2f} ms  ({args.workers} worker snapshots)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+# filename: scripts/bench_readings_json.py
+
+"""
+Benchmark serialization of a large readings response.
+
+Loads --rows readings into a throwaway SQLite database and builds the same
+JSON body --repeat times each way:
+
+    legacy  ORM rows -> to_dict() -> ReadingResponse -> model_dump -> jsonify
+    fast    column tuples -> readings_response()
+
+"encode" times serialization alone (rows already fetched); "total" includes
+the SELECT. The bodies are compared byte for byte.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_readings_json.py --rows 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List
+
+from flask import jsonify
+from flask_migrate import upgrade
+from sqlalchemy import select
+
+from app import create_app
+from app.extensions import db
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    # Like timeit: collect first and keep the collector out of the timings.
+    timings: List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+def main() -> int:
+    """Time legacy against fast readings serialization."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--timezone", default="America/Chicago")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    from app.models import LogExpReading
+    from app.schemas import ReadingResponse
+    from app.services.ingestion import ingest_readings_batch
+    from app.services.readings_json import READING_COLUMNS, readings_response
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": uri,
+                "START_POLLER": False,
+                "LOCAL_TIMEZONE": args.timezone,
+            }
+        )
+        with app.app_context(), app.test_request_context():
+            upgrade()
+            ingest_readings_batch(
+                [
+                    {
+                        "timestamp": start + timedelta(seconds=i),
+                        "counts_per_second": i % 50,
+                        "counts_per_minute": (i % 50) * 60,
+                        "microsieverts_per_hour": (i % 50) * 0.0057,
+                        "mode": "SLOW",
+                        "device_id": f"dev-{i % 3}",
+                    }
+                    for i in range(args.rows)
+                ]
+            )
+
+            def fetch_objects() -> List[Any]:
+                db.session.expunge_all()
+                return db.session.query(LogExpReading).order_by(LogExpReading.id).all()
+
+            def fetch_tuples() -> List[Any]:
+                stmt = select(*(getattr(LogExpReading, n) for n in READING_COLUMNS)).order_by(
+                    LogExpReading.id
+                )
+                return list(db.session.execute(stmt).all())
+
+            def legacy(rows: List[Any]) -> bytes:
+                payloads = [
+                    ReadingResponse(**r.to_dict()).model_dump(exclude_none=False) for r in rows
+                ]
+                return jsonify(payloads).get_data()
+
+            def fast(rows: List[Any]) -> bytes:
+                return readings_response(rows).get_data()
+
+            objects, tuples = fetch_objects(), fetch_tuples()
+            if legacy(objects) != fast(tuples):
+                print("MISMATCH: fast path bytes differ from the legacy path")
+                return 1
+
+            results = {
+                "legacy": (
+                    _best(lambda: legacy(objects), args.repeat),
+                    _best(lambda: legacy(fetch_objects()), args.repeat),
+                ),
+                "fast": (
+                    _best(lambda: fast(tuples), args.repeat),
+                    _best(lambda: fast(fetch_tuples()), args.repeat),
+                ),
+            }
+            for label, (encode, total) in results.items():
+                print(
+                    f"{label:<7} encode {encode * 1000:>8.1f} ms   total {total * 1000:>8.1f} ms   "
+                    f"{args.rows / total:>10,.0f} rows/s"
+                )
+            print(
+                f"speedup encode {results['legacy'][0] / results['fast'][0]:.1f}x   "
+                f"total {results['legacy'][1] / results['fast'][1]:.1f}x"
+            )
+
+            db.session.remove()
+            db.engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
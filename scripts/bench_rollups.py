@@ -0,0 +1,99 @@
+# filename: scripts/bench_rollups.py
+
+"""
+Benchmark range summaries from the rollup tables against raw-row scans.
+
+Loads --days of 1 Hz readings into a throwaway file-backed SQLite database
+through ingest_readings_batch() (which maintains the rollups), then times
+summarize_range() for the analytics quick ranges, once from the rollups and
+once forced onto raw rows.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_rollups.py --days 14
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask_migrate import upgrade
+
+from app import create_app
+from app.extensions import db
+from app.services.ingestion import ingest_readings_batch
+from app.services.rollups import summarize_range
+
+RANGES = (("1h", timedelta(hours=1)), ("24h", timedelta(hours=24)), ("7d", timedelta(days=7)))
+
+
+def main() -> int:
+    """Time rollup-backed vs raw range summaries."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=float, default=14.0)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = int(args.days * 86400)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end = start + timedelta(seconds=rows - 1)
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = create_app({"SQLALCHEMY_DATABASE_URI": uri, "START_POLLER": False})
+
+        with app.app_context():
+            upgrade()
+
+            started = time.perf_counter()
+            for offset in range(0, rows, args.batch):
+                ingest_readings_batch(
+                    [
+                        {
+                            "timestamp": start + timedelta(seconds=i),
+                            "counts_per_second": i % 50,
+                            "counts_per_minute": (i % 50) * 60,
+                            "microsieverts_per_hour": (i % 50) * 0.0057,
+                            "mode": "SLOW",
+                            "device_id": "node-1",
+                        }
+                        for i in range(offset, min(rows, offset + args.batch))
+                    ]
+                )
+            elapsed = time.perf_counter() - started
+            print(f"loaded {rows:,} readings in {elapsed:.1f} s ({rows / elapsed:,.0f} rows/s)")
+
+            for label, span in RANGES:
+                # Start mid-minute so every plan has raw edges, like a UI range.
+                since = end - span + timedelta(seconds=17)
+                timings = {}
+                for source, min_seconds in (("rollup", 0.0), ("raw", float("inf"))):
+                    best = float("inf")
+                    for _ in range(args.repeat):
+                        t0 = time.perf_counter()
+                        summary = summarize_range(since, end, min_rollup_seconds=min_seconds)
+                        best = min(best, time.perf_counter() - t0)
+                    timings[source] = (best, summary["count"], summary["resolution"])
+
+                (r_time, r_count, r_res), (w_time, w_count, _) = timings["rollup"], timings["raw"]
+                assert r_count == w_count
+                print(
+                    f"{label:<4}{r_count:>10,} readings  raw {w_time * 1000:>9.1f} ms  "
+                    f"rollup {r_time * 1000:>7.1f} ms (coarsest {r_res})  "
+                    f"{w_time / r_time:>7.1f}x"
+                )
+
+            db.session.remove()
+            db.engine.dispose()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
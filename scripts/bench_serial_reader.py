@@ -0,0 +1,162 @@
+# filename: scripts/bench_serial_reader.py
+
+"""
+Benchmark serial capture: open-per-read polling vs the persistent reader.
+
+Simulates a Geiger counter that emits one line per second (1 Hz) on a
+FakeSerial port driven by a virtual clock, so no real time passes. Lines
+the device sends while the port is closed are lost, as they are on a real
+tty. Opening the port costs --open-ms of virtual time.
+
+Strategies compared over --minutes of device output:
+
+    per-open   open, readline, close, sleep POLL_INTERVAL (the old loop),
+               for each --interval value
+    persistent SerialLineReader, one handle, reconnect with backoff
+
+With --outage N, the device disappears for N seconds at the start of every
+minute (readline/open raise SerialException) to exercise reconnects.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_serial_reader.py --minutes 60 --outage 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+from typing import Any, Callable, List, Set
+
+import serial
+
+from app.geiger import SerialLineReader
+from beamfoundry.tests.fixtures.poller.fake_serial import FakeSerial
+
+TX_SECONDS = 0.04  # ~40 bytes at 9600 baud
+
+
+class SimDevice:
+    """Virtual clock plus a 1 Hz line source with optional outages."""
+
+    def __init__(self, minutes: float, open_cost: float, outage: float) -> None:
+        self.now = 0.0
+        self.end = minutes * 60.0
+        self.open_cost = open_cost
+        self.outage = outage
+        self.opens = 0
+        self.captured: Set[int] = set()
+
+    def clock(self) -> float:
+        return self.now
+
+    def down(self, t: float) -> bool:
+        return (t % 60.0) < self.outage
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class SimSerial(FakeSerial):
+    """FakeSerial whose readline() follows the simulated device."""
+
+    def __init__(self, device: SimDevice, *args: Any, **kwargs: Any) -> None:
+        super().__init__([], *args, **kwargs)
+        self.device = device
+        device.advance(device.open_cost)
+        if device.down(device.now):
+            raise serial.SerialException("device not present")
+        device.opens += 1
+        self.opened_at = device.now
+
+    def readline(self) -> bytes:
+        dev = self.device
+        if dev.down(dev.now):
+            raise serial.SerialException("device disconnected")
+
+        # Next line whose transmission starts after the port was opened.
+        k = math.ceil(max(dev.now, self.opened_at))
+        if k - dev.now > self.timeout or dev.down(k):
+            dev.advance(self.timeout)
+            return b""
+
+        dev.now = k + TX_SECONDS
+        return f"CPS, {k % 50}, CPM, {k}, uSv/hr, 0.10, SLOW\n".encode("ascii")
+
+
+def _install(device: SimDevice) -> None:
+    def _open(*args: Any, **kwargs: Any) -> SimSerial:
+        return SimSerial(device, *args, **kwargs)
+
+    serial.Serial = _open  # type: ignore[misc,assignment]
+
+
+def _record(device: SimDevice, raw: Any) -> None:
+    if raw:
+        text = raw.decode("ascii") if isinstance(raw, bytes) else raw
+        device.captured.add(int(text.split(",")[3]))
+
+
+def run_per_open(device: SimDevice, interval: float) -> None:
+    while device.now < device.end:
+        try:
+            with serial.Serial("/dev/ttySIM", 9600, timeout=2) as ser:
+                _record(device, ser.readline())
+        except serial.SerialException:
+            pass
+        device.advance(interval)
+
+
+def run_persistent(device: SimDevice) -> None:
+    reader = SerialLineReader("/dev/ttySIM", 9600, clock=device.clock)
+    while device.now < device.end:
+        line = reader.readline()
+        if line is None:
+            device.advance(reader.reconnect_in())
+            continue
+        _record(device, line)
+    reader.close()
+
+
+def _report(label: str, device: SimDevice, minutes: float) -> None:
+    emitted = sum(1 for k in range(int(device.end)) if not device.down(k))
+    frames = len([k for k in device.captured if k < device.end])
+    print(
+        f"{label:<24}{frames / minutes:>8.1f} frames/min "
+        f"{100.0 * frames / emitted:>6.1f}% of emitted  "
+        f"{device.opens / minutes:>6.1f} opens/min"
+    )
+
+
+def main() -> int:
+    """Compare frames captured per minute for each capture strategy."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, default=60.0)
+    parser.add_argument("--open-ms", type=float, default=50.0)
+    parser.add_argument("--outage", type=float, default=0.0)
+    parser.add_argument("--interval", type=float, action="append")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    intervals: List[float] = args.interval or [5.0, 1.0, 0.0]
+
+    runs: List[tuple[str, Callable[[SimDevice], None]]] = [
+        (f"per-open interval={i:g}s", lambda d, i=i: run_per_open(d, i)) for i in intervals
+    ]
+    runs.append(("persistent", run_persistent))
+
+    real_serial = serial.Serial
+    try:
+        for label, run in runs:
+            device = SimDevice(args.minutes, args.open_ms / 1000.0, args.outage)
+            _install(device)
+            run(device)
+            _report(label, device, args.minutes)
+    finally:
+        serial.Serial = real_serial  # type: ignore[misc]
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
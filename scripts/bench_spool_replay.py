@@ -0,0 +1,98 @@
+# filename: scripts/bench_spool_replay.py
+
+"""
+Benchmark the ingestion spool for a database outage backlog.
+
+Appends --hours of 1 Hz readings to a fresh spool (as the poller would while
+the database is down), then replays the backlog into a throwaway file-backed
+SQLite database, and replays the same segments a second time to measure the
+cost of the (device_id, timestamp) dedup when everything is already stored.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_spool_replay.py --hours 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask_migrate import upgrade
+
+from app import create_app
+from app.extensions import db
+from app.models import LogExpReading
+from app.services.ingestion_spool import ReadingSpool
+from app.services.readings_import import insert_new_readings
+
+
+def main() -> int:
+    """Benchmark spool append and replay throughput."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--batch", type=int, default=5000)
+    args = parser.parse_args()
+
+    rows = int(args.hours * 3600)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spool_dir = os.path.join(tmp, "spool")
+        spool = ReadingSpool(spool_dir)
+
+        started = time.perf_counter()
+        for i in range(rows):
+            spool.append(
+                {
+                    "timestamp": start + timedelta(seconds=i),
+                    "counts_per_second": i % 50,
+                    "counts_per_minute": (i % 50) * 60,
+                    "microsieverts_per_hour": (i % 50) * 0.0057,
+                    "mode": "SLOW",
+                    "device_id": "node-1",
+                }
+            )
+        spool.close()
+        elapsed = time.perf_counter() - started
+        stats = spool.stats()
+        print(
+            f"append   {rows:>9,} rows {elapsed:>8.2f} s {rows / elapsed:>12,.0f} rows/s  "
+            f"{stats['bytes'] / 1_048_576:.2f} MiB in {stats['segments']} segment(s), "
+            f"{stats['fsyncs']} fsyncs"
+        )
+
+        backup = os.path.join(tmp, "spool-copy")
+        shutil.copytree(spool_dir, backup)
+
+        uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = create_app({"SQLALCHEMY_DATABASE_URI": uri, "START_POLLER": False})
+
+        with app.app_context():
+            upgrade()
+
+            for label, directory in (("replay", spool_dir), ("re-replay", backup)):
+                started = time.perf_counter()
+                totals = ReadingSpool(directory).replay(insert_new_readings, args.batch)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"{label:<9}{rows:>9,} rows {elapsed:>8.2f} s "
+                    f"{rows / elapsed:>12,.0f} rows/s  "
+                    f"inserted={totals['inserted']:,} duplicates={totals['duplicates']:,}"
+                )
+
+            assert db.session.query(LogExpReading).count() == rows
+
+            db.session.remove()
+            db.engine.dispose()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+# filename: scripts/bench_timeseries.py
+
+"""
+Benchmark chart series (query_series) across range lengths.
+
+Loads --raw-days of 1 Hz readings through ingest_readings_batch() (which
+maintains the rollups) into a throwaway file-backed SQLite database, and
+writes synthetic 1m/1h/1d rollup rows for the --history-days before them,
+as a backfill of a year of 1 Hz data would. Then times query_series() for
+ranges from one hour to the whole history, plus the raw-only query
+(ROLLUPS_ENABLED off) for the ranges that raw rows cover.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_timeseries.py --raw-days 7 --history-days 358
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from flask_migrate import upgrade
+
+from app import create_app
+from app.extensions import db
+from app.services.ingestion import ingest_readings_batch
+from app.services.rollups import RESOLUTIONS, STEPS, bucket_start, write_partials
+from app.services.timeseries import query_series
+
+RANGES = (
+    ("1h", timedelta(hours=1)),
+    ("24h", timedelta(hours=24)),
+    ("7d", timedelta(days=7)),
+    ("30d", timedelta(days=30)),
+    ("90d", timedelta(days=90)),
+    ("1y", timedelta(days=365)),
+)
+
+
+def _synthetic_history(start: datetime, end: datetime) -> Dict[str, Dict[Any, List[Any]]]:
+    """Rollup partials for 1 Hz readings with cps = second-of-minute % 50."""
+    minute_cps = sum(s % 50 for s in range(60))
+    partials: Dict[str, Dict[Any, List[Any]]] = {r: {} for r in RESOLUTIONS}
+    ts = start
+    while ts < end:
+        for resolution in RESOLUTIONS:
+            key = (bucket_start(ts, resolution), "node-1", "SLOW")
+            acc = partials[resolution].get(key)
+            if acc is None:
+                acc = partials[resolution][key] = [0, 0, 0, 49, 0, 0, 2940, 0.0, 0.0, 0.2793]
+            acc[0] += 60
+            acc[1] += minute_cps
+            acc[4] += minute_cps * 60
+            acc[7] += minute_cps * 0.0057
+        ts += STEPS["1m"]
+    return partials
+
+
+def main() -> int:
+    """Time query_series() for each range length."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--raw-days", type=float, default=7.0)
+    parser.add_argument("--history-days", type=int, default=358)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = int(args.raw_days * 86400)
+    raw_start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    history_start = raw_start - timedelta(days=args.history_days)
+    end = raw_start + timedelta(seconds=rows - 1)
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = create_app({"SQLALCHEMY_DATABASE_URI": uri, "START_POLLER": False})
+
+        with app.app_context():
+            upgrade()
+
+            started = time.perf_counter()
+            write_partials(db.session, _synthetic_history(history_start, raw_start))
+            db.session.commit()
+            for offset in range(0, rows, args.batch):
+                ingest_readings_batch(
+                    [
+                        {
+                            "timestamp": raw_start + timedelta(seconds=i),
+                            "counts_per_second": i % 50,
+                            "counts_per_minute": (i % 50) * 60,
+                            "microsieverts_per_hour": (i % 50) * 0.0057,
+                            "mode": "SLOW",
+                            "device_id": "node-1",
+                        }
+                        for i in range(offset, min(rows, offset + args.batch))
+                    ]
+                )
+            print(
+                f"loaded {args.history_days} days of rollups and {rows:,} raw readings "
+                f"in {time.perf_counter() - started:.1f} s"
+            )
+
+            def _best(since: datetime) -> tuple[float, Any]:
+                best, series = float("inf"), None
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    series = query_series(since, end)
+                    best = min(best, time.perf_counter() - t0)
+                return best, series
+
+            for label, span in RANGES:
+                # Start mid-minute, like a UI range.
+                since = end - span + timedelta(seconds=17)
+                elapsed, series = _best(since)
+                line = (
+                    f"{label:<4}{len(series.points):>6} points  step {series.step_seconds:>6} s  "
+                    f"{series.source:<4}{elapsed * 1000:>8.1f} ms"
+                )
+                if since >= raw_start:
+                    app.config["ROLLUPS_ENABLED"] = False
+                    raw_elapsed, _ = _best(since)
+                    app.config["ROLLUPS_ENABLED"] = True
+                    line += f"   raw only {raw_elapsed * 1000:>8.1f} ms"
+                print(line)
+
+            db.session.remove()
+            db.engine.dispose()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+# filename: scripts/bench_timezones.py
+
+"""
+Microbenchmark LOCAL_TIMEZONE resolution in reading serialization.
+
+Builds --rows transient LogExpReading objects and times, best of --repeat:
+
+    uncached    the previous to_dict() localization: config lookup and
+                ZoneInfo(name) per row
+    cached      per-row localization through get_local_timezone()
+    batch       localize_timestamps() over all timestamps
+    to_dict     LogExpReading.to_dict() over all rows
+
+Usage:
+    PYTHONPATH=. python scripts/bench_timezones.py --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List
+from zoneinfo import ZoneInfo
+
+from flask import current_app
+
+from app import create_app
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+def main() -> int:
+    """Time uncached against cached timezone localization."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--timezone", default="America/Chicago")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    from app.models import LogExpReading
+    from app.services.timezones import get_local_timezone, localize_timestamp, localize_timestamps
+
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": "sqlite://",
+            "START_POLLER": False,
+            "LOCAL_TIMEZONE": args.timezone,
+        }
+    )
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with app.app_context():
+        readings = [
+            LogExpReading(
+                id=i,
+                timestamp=start + timedelta(seconds=i),
+                counts_per_second=i % 50,
+                counts_per_minute=(i % 50) * 60,
+                microsieverts_per_hour=(i % 50) * 0.0057,
+                mode="SLOW",
+            )
+            for i in range(args.rows)
+        ]
+        stamps = [r.timestamp for r in readings]
+
+        def uncached() -> List[Any]:
+            return [
+                ts.astimezone(ZoneInfo(current_app.config_obj.get("LOCAL_TIMEZONE", "UTC")))
+                for ts in stamps
+            ]
+
+        def cached() -> List[Any]:
+            return [localize_timestamp(ts, get_local_timezone()) for ts in stamps]
+
+        if uncached() != localize_timestamps(stamps):
+            print("MISMATCH: cached localization differs")
+            return 1
+
+        timings = {
+            "uncached": _best(uncached, args.repeat),
+            "cached": _best(cached, args.repeat),
+            "batch": _best(lambda: localize_timestamps(stamps), args.repeat),
+        }
+        for label, seconds in timings.items():
+            print(
+                f"{label:<9} {seconds * 1000:>8.1f} ms   {args.rows / seconds:>12,.0f} rows/s   "
+                f"{timings['uncached'] / seconds:>5.1f}x vs uncached"
+            )
+
+        seconds = _best(lambda: [r.to_dict() for r in readings], args.repeat)
+        print(f"{'to_dict':<9} {seconds * 1000:>8.1f} ms   {args.rows / seconds:>12,.0f} rows/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
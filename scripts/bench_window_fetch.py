@@ -0,0 +1,143 @@
+# filename: scripts/bench_window_fetch.py
+
+"""
+Benchmark fetching an analytics window: ORM objects vs column projections
+vs an aggregate computed in SQL.
+
+Loads --rows 1 Hz readings into a throwaway SQLite database, sets the
+analytics window to cover all of them, then runs each variant in a fresh
+subprocess and reports rows/s and the process's peak RSS:
+
+    orm      compute_window()        full LogExpReading objects
+    rows     fetch_window_rows()     (timestamp, counts_per_second) tuples
+    arrays   load_reading_arrays()   NumPy columns
+    agg      aggregate_window()      one aggregate row (no rows transferred)
+
+Usage:
+    PYTHONPATH=. python scripts/bench_window_fetch.py --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+from flask_migrate import upgrade
+
+from app import create_app
+from app.extensions import db
+
+VARIANTS = ("orm", "rows", "arrays", "agg")
+
+
+def _app(path: str, window_seconds: int) -> Any:
+    return create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+            "START_POLLER": False,
+            "ANALYTICS_WINDOW_SECONDS": window_seconds,
+            "ROLLUPS_ENABLED": False,
+        }
+    )
+
+
+def _load(path: str, rows: int) -> None:
+    from app.services.ingestion import ingest_readings_batch
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    app = _app(path, rows)
+    with app.app_context():
+        upgrade()
+        for offset in range(0, rows, 20000):
+            ingest_readings_batch(
+                [
+                    {
+                        "timestamp": start + timedelta(seconds=i),
+                        "counts_per_second": i % 50,
+                        "counts_per_minute": (i % 50) * 60,
+                        "microsieverts_per_hour": (i % 50) * 0.0057,
+                        "mode": "SLOW",
+                    }
+                    for i in range(offset, min(rows, offset + 20000))
+                ]
+            )
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _run_variant(path: str, rows: int, variant: str) -> Dict[str, Any]:
+    from app.services.analytics import aggregate_window, compute_window, fetch_window_rows
+    from app.services.analytics_arrays import load_reading_arrays
+
+    app = _app(path, rows)
+    with app.app_context():
+        base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        t0 = time.perf_counter()
+        if variant == "orm":
+            fetched = len(compute_window())
+        elif variant == "rows":
+            fetched = len(fetch_window_rows())
+        elif variant == "arrays":
+            fetched = len(load_reading_arrays(since=datetime(2024, 1, 1, tzinfo=timezone.utc)))
+        else:
+            fetched = (aggregate_window() or {"count": 0})["count"]
+        elapsed = time.perf_counter() - t0
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux.
+    return {
+        "rows": fetched,
+        "seconds": elapsed,
+        "rss_mb": peak_rss / 1024,
+        "delta_mb": (peak_rss - base_rss) / 1024,
+    }
+
+
+def main() -> int:
+    """Compare window fetch strategies by throughput and peak RSS."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    if args.variant:
+        print(json.dumps(_run_variant(args.db, args.rows, args.variant)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        started = time.perf_counter()
+        _load(path, args.rows)
+        print(f"loaded {args.rows:,} readings in {time.perf_counter() - started:.1f} s")
+
+        for variant in VARIANTS:
+            out = subprocess.run(
+                [sys.executable, __file__, "--rows", str(args.rows), "--variant", variant]
+                + ["--db", path],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(
+                f"{variant:<8}{r['rows']:>10,} rows {r['seconds']:>7.2f} s "
+                f"{r['rows'] / r['seconds']:>11,.0f} rows/s  "
+                f"peak RSS {r['rss_mb']:>7.0f} MB (+{r['delta_mb']:.0f} MB)"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())